@@ -19,23 +19,16 @@ from pydantic import BaseModel
 from src.agents.messages import InternalErrorMessage, InvalidReviewRecoveryContract
 from src.cyberagent.core.agent_naming import normalize_message_source
 from src.cyberagent.db.models.system import get_system_from_agent_id
-from src.cyberagent.memory.config import (
-    build_memory_registry,
-    load_memory_backend_config,
-)
 from src.cyberagent.memory.crud import MemoryActorContext
 from src.cyberagent.memory.memengine import MemEngine
 from src.cyberagent.memory.models import MemoryScope
-from src.cyberagent.memory.observability import (
-    LoggingMemoryAuditSink,
-    build_memory_metrics,
-)
 from src.cyberagent.memory.reflection import MemoryReflectionService
 from src.cyberagent.memory.retrieval import (
     MemoryInjectionConfig,
     MemoryInjector,
     MemoryRetrievalService,
 )
+from src.cyberagent.memory.runtime import get_memory_runtime
 from src.cyberagent.memory.session import MemorySessionConfig, MemorySessionRecorder
 from src.cyberagent.services import policies as policy_service
 from src.cyberagent.services import systems as system_service
@@ -362,15 +355,16 @@ class SystemBaseMixin:
             system_type=system.type,
         )
         query_text = last_message.to_text()
-        config = load_memory_backend_config()
-        registry = build_memory_registry(config)
-        metrics = build_memory_metrics()
+        runtime = get_memory_runtime()
+        registry = runtime.registry
+        metrics = runtime.metrics
         engine = MemEngine(registry=registry, metrics=metrics)
         retrieval = MemoryRetrievalService(
             registry=registry,
             metrics=metrics,
             engine=engine,
-            audit_sink=LoggingMemoryAuditSink(),
+            audit_sink=runtime.audit_sink,
+            result_cache=runtime.result_cache,
         )
         injector = MemoryInjector(
             config=MemoryInjectionConfig(
@@ -396,27 +390,43 @@ class SystemBaseMixin:
             )
 
         entries = []
-        for scope, namespace in _resolve_memory_scopes(actor):
-            try:
-                result = retrieval.search_entries(
-                    actor=actor,
-                    scope=scope,
-                    namespace=namespace,
-                    query_text=query_text,
-                    limit=_env_int("MEMORY_RETRIEVAL_LIMIT", 6),
-                )
-            except PermissionError:
-                continue
-            except (sqlite3.Error, OSError) as exc:
-                logger.warning(
-                    "Memory retrieval skipped for %s/%s: %s",
-                    scope.value,
-                    namespace,
-                    exc,
-                )
-                continue
+        memory_scopes = _resolve_memory_scopes(actor)
+        try:
+            result = retrieval.search_targets(
+                actor=actor,
+                targets=memory_scopes,
+                query_text=query_text,
+                limit=_env_int("MEMORY_RETRIEVAL_LIMIT", 6),
+            )
+        except (sqlite3.Error, OSError) as exc:
+            # One unreadable scope must not blank the others; retry each alone.
+            logger.warning(
+                "Fused memory retrieval failed, searching per scope: %s", exc
+            )
+            for scope, namespace in memory_scopes:
+                try:
+                    result = retrieval.search_entries(
+                        actor=actor,
+                        scope=scope,
+                        namespace=namespace,
+                        query_text=query_text,
+                        limit=_env_int("MEMORY_RETRIEVAL_LIMIT", 6),
+                    )
+                except PermissionError:
+                    continue
+                except (sqlite3.Error, OSError) as scope_exc:
+                    logger.warning(
+                        "Memory retrieval skipped for %s/%s: %s",
+                        scope.value,
+                        namespace,
+                        scope_exc,
+                    )
+                    continue
+                entries.extend(result.items)
+        else:
             entries.extend(result.items)
 
+        for scope, namespace in memory_scopes:
             # Identity collection during onboarding must be able to recall the
             # onboarding summary/profile even when semantic search misses.
             if scope == MemoryScope.GLOBAL and _should_force_onboarding_profile(
@@ -498,8 +508,8 @@ class SystemBaseMixin:
     def _get_session_recorder(self) -> MemorySessionRecorder:
         if self._session_recorder is not None:
             return self._session_recorder
-        config = load_memory_backend_config()
-        registry = build_memory_registry(config)
+        runtime = get_memory_runtime()
+        registry = runtime.registry
         engine = MemEngine(registry=registry)
         reflection = MemoryReflectionService(registry=registry, engine=engine)
         session_config = MemorySessionConfig(
@@ -513,11 +523,13 @@ class SystemBaseMixin:
             max_entries_per_namespace=_env_int(
                 "MEMORY_MAX_ENTRIES_PER_NAMESPACE", 1000
             ),
+            prune_high_water_entries=_env_int("MEMORY_PRUNE_HIGH_WATER_ENTRIES", 0),
         )
         self._session_recorder = MemorySessionRecorder(
             registry=registry,
             reflection_service=reflection,
             config=session_config,
+            reflection_worker=runtime.reflection_worker,
         )
         return self._session_recorder
 
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Mapping, Sequence
+
+from src.cyberagent.cli.runtime_queue_backend import (
+    LANE_BACKFILL,
+    LANE_CONTROL,
+    LANE_INTERACTIVE,
+    QUEUE_LANES,
+    QueuedAgentMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_IN_FLIGHT_ENV = "CYBERAGENT_AGENT_MESSAGE_MAX_IN_FLIGHT"
+MAX_IN_FLIGHT_PER_RECIPIENT_ENV = "CYBERAGENT_AGENT_MESSAGE_MAX_IN_FLIGHT_PER_RECIPIENT"
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MAX_IN_FLIGHT_PER_RECIPIENT = 1
+LANE_WEIGHTS_ENV = "CYBERAGENT_AGENT_MESSAGE_LANE_WEIGHTS"
+DEFAULT_LANE_WEIGHTS = {LANE_INTERACTIVE: 8, LANE_CONTROL: 4, LANE_BACKFILL: 1}
+
+
+@dataclass(frozen=True)
+class AgentMessageDispatchConfig:
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    max_in_flight_per_recipient: int = DEFAULT_MAX_IN_FLIGHT_PER_RECIPIENT
+    lane_weights: Mapping[str, int] = field(
+        default_factory=lambda: dict(DEFAULT_LANE_WEIGHTS)
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if self.max_in_flight_per_recipient < 1:
+            raise ValueError("max_in_flight_per_recipient must be at least 1")
+        for lane, weight in self.lane_weights.items():
+            if lane not in QUEUE_LANES:
+                raise ValueError(f"Unknown runtime queue lane: {lane}")
+            if weight < 1:
+                raise ValueError("lane weights must be at least 1")
+
+    def lane_weight(self, lane: str) -> int:
+        return self.lane_weights.get(lane, DEFAULT_LANE_WEIGHTS.get(lane, 1))
+
+
+def load_agent_message_dispatch_config() -> AgentMessageDispatchConfig:
+    """Read dispatcher concurrency limits from the environment."""
+
+    return AgentMessageDispatchConfig(
+        max_in_flight=max(1, _env_int(MAX_IN_FLIGHT_ENV, DEFAULT_MAX_IN_FLIGHT)),
+        max_in_flight_per_recipient=max(
+            1,
+            _env_int(
+                MAX_IN_FLIGHT_PER_RECIPIENT_ENV, DEFAULT_MAX_IN_FLIGHT_PER_RECIPIENT
+            ),
+        ),
+        lane_weights=_env_lane_weights(LANE_WEIGHTS_ENV),
+    )
+
+
+class AgentMessageDispatcher:
+    """Deliver queued agent messages concurrently, FIFO per recipient.
+
+    Due messages are grouped by priority lane and lanes take turns by smooth
+    weighted round-robin, so interactive work goes first while backfill still
+    gets a share of the slots. Within a lane messages start in queue order: a
+    message whose recipient is at its in-flight limit holds back every later
+    message for that recipient in the same lane, so with the default
+    per-recipient limit of 1 each agent sees a lane's messages in enqueue
+    order. Messages still waiting for ``next_attempt_at`` are skipped without
+    blocking their recipient, matching the sequential consumer.
+
+    When ``claim`` is given it is called right before a delivery starts. A
+    refused claim means another consumer holds the message, so its recipient
+    is held back exactly like a recipient at its in-flight limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        deliver: Callable[[QueuedAgentMessage], Awaitable[None]],
+        config: AgentMessageDispatchConfig | None = None,
+        on_complete: Callable[[], None] | None = None,
+        claim: Callable[[QueuedAgentMessage], bool] | None = None,
+    ) -> None:
+        self._deliver = deliver
+        self._config = config or AgentMessageDispatchConfig()
+        self._on_complete = on_complete
+        self._claim = claim
+        self._tasks: dict[Path, asyncio.Task[None]] = {}
+        self._recipient_counts: Counter[str] = Counter()
+        self._lane_credit: Counter[str] = Counter()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def is_in_flight(self, message: QueuedAgentMessage) -> bool:
+        return message.path in self._tasks
+
+    def dispatch_ready(
+        self, messages: Sequence[QueuedAgentMessage], *, now: float
+    ) -> float | None:
+        """Start deliveries for due messages within the concurrency limits.
+
+        Returns the earliest ``next_attempt_at`` among messages that are not yet
+        due, so the caller can bound its next wait.
+        """
+
+        next_due_at: float | None = None
+        lanes: dict[str, deque[QueuedAgentMessage]] = {
+            lane: deque() for lane in QUEUE_LANES
+        }
+        for message in messages:
+            if message.path in self._tasks:
+                continue
+            if message.next_attempt_at > now:
+                next_due_at = (
+                    message.next_attempt_at
+                    if next_due_at is None
+                    else min(next_due_at, message.next_attempt_at)
+                )
+                continue
+            lanes.setdefault(message.lane, deque()).append(message)
+        pending = {lane: queue for lane, queue in lanes.items() if queue}
+        held: set[tuple[str, str]] = set()
+        while pending and len(self._tasks) < self._config.max_in_flight:
+            lane = self._next_lane(pending)
+            queue = pending[lane]
+            while queue:
+                message = queue.popleft()
+                if self._try_start(message, lane, held):
+                    break
+            if not queue:
+                del pending[lane]
+        return next_due_at
+
+    def _next_lane(self, pending: Mapping[str, object]) -> str:
+        # Smooth weighted round-robin; ties go to the higher-priority lane.
+        total = 0
+        for lane in pending:
+            weight = self._config.lane_weight(lane)
+            self._lane_credit[lane] += weight
+            total += weight
+        chosen = max(pending, key=lambda lane: self._lane_credit[lane])
+        self._lane_credit[chosen] -= total
+        return chosen
+
+    def _try_start(
+        self, message: QueuedAgentMessage, lane: str, held: set[tuple[str, str]]
+    ) -> bool:
+        key = (message.recipient, lane)
+        if key in held:
+            return False
+        if (
+            self._recipient_counts[message.recipient]
+            >= self._config.max_in_flight_per_recipient
+        ):
+            held.add(key)
+            return False
+        if self._claim is not None and not self._claim(message):
+            held.add(key)
+            return False
+        self._start(message)
+        return True
+
+    async def aclose(self) -> None:
+        """Cancel in-flight deliveries; unacked messages stay queued for replay."""
+
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._recipient_counts.clear()
+
+    def _start(self, message: QueuedAgentMessage) -> None:
+        task = asyncio.create_task(self._deliver(message))
+        self._tasks[message.path] = task
+        self._recipient_counts[message.recipient] += 1
+        task.add_done_callback(lambda done: self._finish(message, done))
+
+    def _finish(self, message: QueuedAgentMessage, task: asyncio.Task[None]) -> None:
+        if self._tasks.get(message.path) is task:
+            del self._tasks[message.path]
+            self._recipient_counts[message.recipient] -= 1
+            if self._recipient_counts[message.recipient] <= 0:
+                del self._recipient_counts[message.recipient]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "Agent message delivery task failed for %s",
+                message.path,
+                exc_info=task.exception(),
+            )
+        if self._on_complete is not None:
+            self._on_complete()
+
+
+def _env_lane_weights(name: str) -> dict[str, int]:
+    """Parse ``lane=weight`` pairs such as ``interactive=8,backfill=1``."""
+
+    weights = dict(DEFAULT_LANE_WEIGHTS)
+    raw = os.environ.get(name)
+    if not raw:
+        return weights
+    for item in raw.split(","):
+        lane, _, value = item.partition("=")
+        lane = lane.strip().lower()
+        if lane not in QUEUE_LANES:
+            logger.warning("Ignoring unknown lane %r in %s", lane, name)
+            continue
+        try:
+            weights[lane] = max(1, int(value))
+        except ValueError:
+            logger.warning("Ignoring invalid weight %r for lane %s", value, lane)
+    return weights
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 from src.cyberagent.cli.runtime_queue_backend import (
+    LANE_CONTROL,
+    AgentMessageEnqueueRequest,
     QueuedAgentMessage,
-    build_runtime_queue_backend,
     default_sqlite_queue_path,
+    get_runtime_queue_backend,
+)
+from src.cyberagent.cli.runtime_queue_metrics import QueueHealth
+from src.cyberagent.cli.runtime_queue_notify import (
+    AGENT_MESSAGE_QUEUE,
+    RuntimeQueueWaiter,
 )
 from src.cyberagent.core.paths import resolve_logs_path
 
@@ -22,6 +29,7 @@ def enqueue_agent_message(
     message_type: str,
     payload: dict[str, Any],
     idempotency_key: str | None = None,
+    lane: str = LANE_CONTROL,
 ) -> Path:
     """Persist an agent message payload for the background runtime to process."""
 
@@ -32,9 +40,19 @@ def enqueue_agent_message(
         message_type=message_type,
         payload=payload,
         idempotency_key=idempotency_key,
+        lane=lane,
     )
 
 
+def enqueue_agent_messages(
+    requests: Sequence[AgentMessageEnqueueRequest],
+) -> list[Path]:
+    """Persist several agent messages at once, deduplicating like the single call."""
+
+    backend = _build_backend()
+    return backend.enqueue_agent_messages(requests)
+
+
 def read_queued_agent_messages() -> list[QueuedAgentMessage]:
     """Load queued agent messages in stable order without deleting them."""
 
@@ -49,6 +67,13 @@ def ack_agent_message(path: Path) -> None:
     backend.ack_agent_message(path)
 
 
+def ack_agent_messages(paths: Sequence[Path]) -> None:
+    """Remove several processed agent messages at once."""
+
+    backend = _build_backend()
+    backend.ack_agent_messages(paths)
+
+
 def list_dead_letter_agent_messages() -> list[QueuedAgentMessage]:
     """Load dead-lettered agent messages in stable order."""
 
@@ -63,16 +88,20 @@ def requeue_dead_letter_agent_message(path: Path) -> Path | None:
     return backend.requeue_dead_letter_agent_message(path)
 
 
+def requeue_dead_letter_agent_messages(paths: Sequence[Path]) -> list[Path]:
+    """Move several dead-letter messages back to the active queue."""
+
+    backend = _build_backend()
+    return backend.requeue_dead_letter_agent_messages(paths)
+
+
 def requeue_all_dead_letter_agent_messages(limit: int | None = None) -> int:
     """Requeue dead-letter messages up to ``limit`` entries."""
 
-    moved = 0
-    for message in list_dead_letter_agent_messages():
-        if limit is not None and moved >= limit:
-            break
-        if requeue_dead_letter_agent_message(message.path) is not None:
-            moved += 1
-    return moved
+    messages = list_dead_letter_agent_messages()
+    if limit is not None:
+        messages = messages[: max(0, limit)]
+    return len(requeue_dead_letter_agent_messages([item.path for item in messages]))
 
 
 def defer_agent_message(
@@ -100,6 +129,60 @@ def defer_agent_message(
     )
 
 
+def claim_agent_message(
+    path: Path,
+    *,
+    consumer_id: str,
+    lease_seconds: float,
+    now_ts: float | None = None,
+) -> bool:
+    """Lease a queued agent message to ``consumer_id``; False if held elsewhere."""
+
+    backend = _build_backend()
+    return backend.claim_agent_message(
+        path, consumer_id=consumer_id, lease_seconds=lease_seconds, now_ts=now_ts
+    )
+
+
+def renew_agent_message_leases(*, consumer_id: str, lease_seconds: float) -> int:
+    """Extend every agent-message lease held by ``consumer_id``."""
+
+    backend = _build_backend()
+    return backend.renew_leases(
+        AGENT_MESSAGE_QUEUE, consumer_id=consumer_id, lease_seconds=lease_seconds
+    )
+
+
+def release_agent_message_leases(
+    *, consumer_id: str, paths: Sequence[Path] | None = None
+) -> int:
+    """Hand agent messages leased by ``consumer_id`` back to the queue."""
+
+    backend = _build_backend()
+    return backend.release_leases(
+        AGENT_MESSAGE_QUEUE, consumer_id=consumer_id, paths=paths
+    )
+
+
+def read_agent_message_queue_health(now_ts: float | None = None) -> QueueHealth:
+    """Summarise agent-message queue depth, age, attempts and ack latency."""
+
+    backend = _build_backend()
+    return backend.queue_health(AGENT_MESSAGE_QUEUE, now_ts=now_ts)
+
+
+def build_agent_message_queue_waiter(poll_seconds: float) -> RuntimeQueueWaiter:
+    """Create a waiter that wakes the consumer when agent messages change."""
+
+    backend = _build_backend()
+    return RuntimeQueueWaiter(
+        queue=AGENT_MESSAGE_QUEUE,
+        change_token=lambda: backend.queue_change_token(AGENT_MESSAGE_QUEUE),
+        watch_targets=backend.queue_watch_targets(AGENT_MESSAGE_QUEUE),
+        poll_seconds=poll_seconds,
+    )
+
+
 def _build_backend():
     backend_name = os.environ.get("CYBERAGENT_RUNTIME_QUEUE_BACKEND", "file")
     sqlite_path = Path(
@@ -108,7 +191,7 @@ def _build_backend():
             str(default_sqlite_queue_path()),
         )
     )
-    return build_runtime_queue_backend(
+    return get_runtime_queue_backend(
         backend=backend_name,
         suggest_queue_dir=resolve_logs_path("suggest_queue"),
         agent_message_queue_dir=AGENT_MESSAGE_QUEUE_DIR,
@@ -73,6 +73,7 @@ from src.cyberagent.core.state import get_last_team_id
 from src.cyberagent.db.db_utils import get_db
 from src.cyberagent.db.init_db import init_db
 from src.cyberagent.db.models.team import Team
+from src.cyberagent.memory.runtime import get_memory_runtime
 from src.cyberagent.tools.cli_executor.cli_tool import CliTool
 from src.cyberagent.tools.cli_executor.factory import create_cli_executor
 from src.cyberagent.tools.cli_executor.skill_loader import (
@@ -196,6 +197,8 @@ def _handle_status(args: argparse.Namespace) -> int:
         res_args.append("--json")
     if getattr(args, "details", False):
         res_args.append("--details")
+    if getattr(args, "queues", False):
+        res_args.append("--queues")
     return status_main(res_args)
 
 
@@ -528,9 +531,14 @@ async def _handle_dev(args: argparse.Namespace) -> int:
         args,
         handle_tool_test=_handle_tool_test,
         handle_dev_system_run=_handle_dev_system_run,
+        handle_memory_check=_handle_memory_check,
     )
 
 
+def _handle_memory_check(args: argparse.Namespace) -> int:
+    return dev_cli.handle_memory_check(args, get_memory_runtime=get_memory_runtime)
+
+
 async def _handle_dev_system_run(args: argparse.Namespace) -> int:
     return await dev_cli.handle_dev_system_run(
         args,
@@ -10,6 +10,10 @@ from autogen_core import AgentId
 
 from src.cyberagent.agents.messages import UserMessage
 from src.cyberagent.cli.message_catalog import get_message
+from src.cyberagent.memory.backends.hybrid import HybridMemoryStore
+from src.cyberagent.memory.models import MemoryScope
+from src.cyberagent.memory.runtime import MemoryRuntime
+from src.cyberagent.memory.vector_consistency import check_vector_consistency
 
 
 async def handle_dev(
@@ -17,15 +21,62 @@ async def handle_dev(
     *,
     handle_tool_test: Callable[[argparse.Namespace], Awaitable[int]],
     handle_dev_system_run: Callable[[argparse.Namespace], Awaitable[int]],
+    handle_memory_check: Callable[[argparse.Namespace], int] | None = None,
 ) -> int:
     if args.dev_command == "tool-test":
         return await handle_tool_test(args)
     if args.dev_command == "system-run":
         return await handle_dev_system_run(args)
+    if args.dev_command == "memory-check" and handle_memory_check is not None:
+        return handle_memory_check(args)
     print(get_message("dev", "unknown_dev_command"), file=sys.stderr)
     return 1
 
 
+def handle_memory_check(
+    args: argparse.Namespace,
+    *,
+    get_memory_runtime: Callable[[], MemoryRuntime],
+) -> int:
+    store = get_memory_runtime().registry.resolve(MemoryScope.AGENT)
+    if not isinstance(store, HybridMemoryStore):
+        print(get_message("dev", "memory_check_unsupported"), file=sys.stderr)
+        return 1
+    report = check_vector_consistency(store, repair=args.repair)
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "supported": report.supported,
+                    "records": report.record_count,
+                    "indexed": report.indexed_count,
+                    "missing": report.missing,
+                    "orphaned": report.orphaned,
+                    "repaired": report.repaired,
+                },
+                indent=2,
+            )
+        )
+    if not report.supported:
+        if not args.json:
+            print(get_message("dev", "memory_check_unsupported"), file=sys.stderr)
+        return 1
+    if not args.json:
+        print(
+            get_message(
+                "dev",
+                "memory_check_summary",
+                records=report.record_count,
+                indexed=report.indexed_count,
+                missing=len(report.missing),
+                orphaned=len(report.orphaned),
+            )
+        )
+        if report.repaired:
+            print(get_message("dev", "memory_check_repaired"))
+    return 0 if report.consistent or report.repaired else 1
+
+
 async def handle_dev_system_run(
     args: argparse.Namespace,
     *,
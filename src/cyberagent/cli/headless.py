@@ -5,7 +5,8 @@ import logging
 import os
 import sys
 import time
-from typing import Protocol
+from pathlib import Path
+from typing import Callable, Protocol
 
 from autogen_core import AgentId, CancellationToken
 from src.cyberagent.agents.messages import InitiativeAssignMessage, TaskReviewMessage, UserMessage
@@ -17,12 +18,30 @@ from src.cyberagent.channels.telegram.webhook import TelegramWebhookServer
 from src.cyberagent.cli.suggestion_queue import (
     SUGGEST_QUEUE_POLL_SECONDS,
     ack_suggestion,
+    build_suggestion_queue_waiter,
+    claim_suggestion,
     read_queued_suggestions,
+    release_suggestion_leases,
+    renew_suggestion_leases,
+)
+from src.cyberagent.cli.agent_message_dispatcher import (
+    AgentMessageDispatcher,
+    load_agent_message_dispatch_config,
 )
 from src.cyberagent.cli.agent_message_queue import (
+    QueuedAgentMessage,
     ack_agent_message,
+    ack_agent_messages,
+    build_agent_message_queue_waiter,
+    claim_agent_message,
     defer_agent_message,
     read_queued_agent_messages,
+    release_agent_message_leases,
+    renew_agent_message_leases,
+)
+from src.cyberagent.cli.runtime_queue_backend import (
+    build_queue_consumer_id,
+    load_queue_lease_seconds,
 )
 from src.cyberagent.cli.processed_message_journal import (
     mark_processed_message,
@@ -170,34 +189,67 @@ async def run_headless_session(initial_message: str | None = None) -> None:
 async def _process_suggestion_queue(
     runtime: SuggestionRuntime, stop_event: asyncio.Event
 ) -> None:
-    while not stop_event.is_set():
-        suggestions = read_queued_suggestions()
-        for suggestion in suggestions:
-            if stop_event.is_set():
-                break
-            if was_processed_message("suggestion", suggestion.idempotency_key):
-                ack_suggestion(suggestion.path)
-                continue
-            message = UserMessage(content=suggestion.payload_text, source="User")
-            message.metadata = {
-                "channel": DEFAULT_CHANNEL,
-                "session_id": DEFAULT_SESSION_ID,
-            }
-            try:
-                await runtime.send_message(
-                    message=message,
-                    recipient=AgentId(type="System4", key="root"),
-                    sender=AgentId(type="UserAgent", key="root"),
-                )
-                mark_processed_message("suggestion", suggestion.idempotency_key)
-                ack_suggestion(suggestion.path)
-            except Exception as exc:  # pragma: no cover - safety net
-                if _is_disk_io_error(exc):
-                    _handle_disk_io_error(exc, stop_event, "suggestion delivery")
+    waiter = build_suggestion_queue_waiter(SUGGEST_QUEUE_POLL_SECONDS)
+    consumer_id = build_queue_consumer_id()
+    lease_seconds = load_queue_lease_seconds()
+    renew_task = asyncio.create_task(
+        _renew_queue_leases(
+            renew_suggestion_leases, consumer_id, lease_seconds, stop_event
+        )
+    )
+    try:
+        while not stop_event.is_set():
+            waiter.snapshot()
+            retry_after: float | None = None
+            suggestions = read_queued_suggestions()
+            for suggestion in suggestions:
+                if stop_event.is_set():
                     break
-                logger.exception("Failed to deliver suggestion %s", suggestion.path)
-                break
-        await asyncio.sleep(SUGGEST_QUEUE_POLL_SECONDS)
+                now = time.time()
+                if suggestion.is_leased_by_other(consumer_id, now):
+                    # Another worker owns the head of the queue; keep order and
+                    # look again once its lease would have expired.
+                    retry_after = max(0.0, suggestion.lease_expires_at - now)
+                    break
+                if was_processed_message("suggestion", suggestion.idempotency_key):
+                    ack_suggestion(suggestion.path)
+                    continue
+                if not claim_suggestion(
+                    suggestion.path,
+                    consumer_id=consumer_id,
+                    lease_seconds=lease_seconds,
+                ):
+                    break
+                message = UserMessage(content=suggestion.payload_text, source="User")
+                message.metadata = {
+                    "channel": DEFAULT_CHANNEL,
+                    "session_id": DEFAULT_SESSION_ID,
+                }
+                try:
+                    await runtime.send_message(
+                        message=message,
+                        recipient=AgentId(type="System4", key="root"),
+                        sender=AgentId(type="UserAgent", key="root"),
+                    )
+                    mark_processed_message("suggestion", suggestion.idempotency_key)
+                    ack_suggestion(suggestion.path)
+                except Exception as exc:  # pragma: no cover - safety net
+                    if _is_disk_io_error(exc):
+                        _handle_disk_io_error(exc, stop_event, "suggestion delivery")
+                        break
+                    logger.exception(
+                        "Failed to deliver suggestion %s", suggestion.path
+                    )
+                    release_suggestion_leases(
+                        consumer_id=consumer_id, paths=[suggestion.path]
+                    )
+                    retry_after = SUGGEST_QUEUE_POLL_SECONDS
+                    break
+            await waiter.wait(stop_event, timeout=retry_after)
+    finally:
+        renew_task.cancel()
+        _release_queue_leases(release_suggestion_leases, consumer_id)
+        waiter.close()
 
 
 def _build_agent_message(message_type: str, payload: dict[str, object]) -> object:
@@ -237,34 +289,124 @@ def _build_agent_message(message_type: str, payload: dict[str, object]) -> objec
 async def _process_agent_message_queue(
     runtime: SuggestionRuntime, stop_event: asyncio.Event
 ) -> None:
-    while not stop_event.is_set():
-        messages = read_queued_agent_messages()
-        for message in messages:
+    waiter = build_agent_message_queue_waiter(SUGGEST_QUEUE_POLL_SECONDS)
+    consumer_id = build_queue_consumer_id()
+    lease_seconds = load_queue_lease_seconds()
+
+    async def _deliver(message: QueuedAgentMessage) -> None:
+        await _deliver_agent_message(runtime, message, stop_event)
+
+    def _claim(message: QueuedAgentMessage) -> bool:
+        if message.is_leased_by_other(consumer_id, time.time()):
+            return False
+        return claim_agent_message(
+            message.path, consumer_id=consumer_id, lease_seconds=lease_seconds
+        )
+
+    dispatcher = AgentMessageDispatcher(
+        deliver=_deliver,
+        config=load_agent_message_dispatch_config(),
+        on_complete=waiter.wake,
+        claim=_claim,
+    )
+    renew_task = asyncio.create_task(
+        _renew_queue_leases(
+            renew_agent_message_leases, consumer_id, lease_seconds, stop_event
+        )
+    )
+    try:
+        while not stop_event.is_set():
+            waiter.snapshot()
+            ready: list[QueuedAgentMessage] = []
+            replayed: list[Path] = []
+            lease_expiry: float | None = None
+            for message in read_queued_agent_messages():
+                if stop_event.is_set():
+                    break
+                if dispatcher.is_in_flight(message):
+                    continue
+                now = time.time()
+                if message.is_leased_by_other(consumer_id, now):
+                    lease_expiry = (
+                        message.lease_expires_at
+                        if lease_expiry is None
+                        else min(lease_expiry, message.lease_expires_at)
+                    )
+                elif message.next_attempt_at <= now and was_processed_message(
+                    "agent_message", message.idempotency_key
+                ):
+                    replayed.append(message.path)
+                    continue
+                ready.append(message)
+            if replayed:
+                ack_agent_messages(replayed)
             if stop_event.is_set():
                 break
-            if message.next_attempt_at > time.time():
-                continue
-            if was_processed_message("agent_message", message.idempotency_key):
-                ack_agent_message(message.path)
-                continue
-            try:
-                payload_message = _build_agent_message(
-                    message.message_type, message.payload
-                )
-                recipient = AgentId.from_str(message.recipient)
-                sender = AgentId.from_str(message.sender) if message.sender else None
-                await runtime.send_message(
-                    message=payload_message,
-                    recipient=recipient,
-                    sender=sender,
-                )
-                mark_processed_message("agent_message", message.idempotency_key)
-                ack_agent_message(message.path)
-            except Exception as exc:  # pragma: no cover - safety net
-                if _is_disk_io_error(exc):
-                    _handle_disk_io_error(exc, stop_event, "agent message delivery")
-                    break
-                defer_agent_message(path=message.path, error=str(exc))
-                logger.exception("Failed to deliver agent message %s", message.path)
-                continue
-        await asyncio.sleep(SUGGEST_QUEUE_POLL_SECONDS)
+            next_due_at = dispatcher.dispatch_ready(ready, now=time.time())
+            # Deferred messages and leases expiring after a consumer crash do not
+            # change the queue, so bound the wait by the earliest of those times.
+            wake_at = min(
+                (at for at in (next_due_at, lease_expiry) if at is not None),
+                default=None,
+            )
+            timeout = None if wake_at is None else max(0.0, wake_at - time.time())
+            await waiter.wait(stop_event, timeout=timeout)
+    finally:
+        renew_task.cancel()
+        await dispatcher.aclose()
+        _release_queue_leases(release_agent_message_leases, consumer_id)
+        waiter.close()
+
+
+async def _renew_queue_leases(
+    renew: Callable[..., int],
+    consumer_id: str,
+    lease_seconds: float,
+    stop_event: asyncio.Event,
+) -> None:
+    interval = lease_seconds / 3
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            return
+        try:
+            renew(consumer_id=consumer_id, lease_seconds=lease_seconds)
+        except Exception as exc:  # pragma: no cover - safety net
+            logger.warning("Failed to renew queue leases: %s", exc)
+
+
+def _release_queue_leases(release: Callable[..., int], consumer_id: str) -> None:
+    # Crashed consumers rely on lease expiry instead.
+    try:
+        release(consumer_id=consumer_id)
+    except Exception as exc:  # pragma: no cover - safety net
+        logger.warning("Failed to release queue leases: %s", exc)
+
+
+async def _deliver_agent_message(
+    runtime: SuggestionRuntime,
+    message: QueuedAgentMessage,
+    stop_event: asyncio.Event,
+) -> None:
+    try:
+        payload_message = _build_agent_message(message.message_type, message.payload)
+        recipient = AgentId.from_str(message.recipient)
+        sender = AgentId.from_str(message.sender) if message.sender else None
+        await runtime.send_message(
+            message=payload_message,
+            recipient=recipient,
+            sender=sender,
+        )
+        mark_processed_message("agent_message", message.idempotency_key)
+        ack_agent_message(message.path)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:  # pragma: no cover - safety net
+        if _is_disk_io_error(exc):
+            _handle_disk_io_error(exc, stop_event, "agent message delivery")
+            return
+        defer_agent_message(path=message.path, error=str(exc))
+        logger.exception("Failed to deliver agent message %s", message.path)
@@ -9,6 +9,7 @@ from src.cyberagent.cli.onboarding_defaults import (
     load_procedure_defaults,
     load_root_team_defaults,
 )
+from src.cyberagent.cli.runtime_queue_backend import LANE_INTERACTIVE
 from src.cyberagent.core.agent_naming import normalize_message_source
 from src.cyberagent.db.db_utils import get_db
 from src.cyberagent.db.models.initiative import Initiative
@@ -109,6 +110,8 @@ def auto_execute_onboarding_sop_if_configured(team_id: int) -> None:
                 "source": normalize_message_source(sender),
                 "content": f"Start initiative {run.initiative_id}.",
             },
+            # The user has just finished onboarding and waits on this kickoff.
+            lane=LANE_INTERACTIVE,
         )
     except Exception:
         logger.exception(
@@ -8,10 +8,6 @@ from typing import Any, TypeVar
 from autogen_core import AgentId, CancellationToken
 
 from src.cyberagent.db.models.system import get_system_by_type
-from src.cyberagent.memory.config import (
-    build_memory_registry,
-    load_memory_backend_config,
-)
 from src.cyberagent.memory.crud import MemoryActorContext, MemoryCrudService
 from src.cyberagent.memory.models import (
     MemoryLayer,
@@ -19,6 +15,7 @@ from src.cyberagent.memory.models import (
     MemoryScope,
     MemorySource,
 )
+from src.cyberagent.memory.runtime import get_memory_runtime
 from src.cyberagent.tools.memory_crud import (
     MemoryCrudArgs,
     MemoryCrudResponse,
@@ -180,9 +177,7 @@ def _build_system4_actor(team_id: int) -> MemoryActorContext | None:
 
 
 def _build_memory_service() -> MemoryCrudService:
-    config = load_memory_backend_config()
-    registry = build_memory_registry(config)
-    return MemoryCrudService(registry=registry)
+    return MemoryCrudService(registry=get_memory_runtime().registry)
 
 
 def _build_memory_tool(actor: MemoryActorContext) -> MemoryCrudTool:
@@ -150,6 +150,11 @@ def build_parser() -> argparse.ArgumentParser:
             "Warning: may print memory/notes."
         ),
     )
+    status_parser.add_argument(
+        "--queues",
+        action="store_true",
+        help="Show runtime queue depth, age, retry attempts and ack latency.",
+    )
 
     task_parser = subparsers.add_parser(
         "task",
@@ -294,6 +299,20 @@ def build_parser() -> argparse.ArgumentParser:
     )
     system_run_parser.add_argument("system_id", type=str)
     system_run_parser.add_argument("message", type=str)
+    memory_check_parser = dev_subparsers.add_parser(
+        "memory-check",
+        help="Compare memory records with the vector index.",
+    )
+    memory_check_parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Re-index missing entries and drop orphaned vectors.",
+    )
+    memory_check_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON.",
+    )
 
     help_parser = subparsers.add_parser("help", help="Show CLI help.")
     help_parser.add_argument(
@@ -1,57 +1,192 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import sqlite3
+import threading
 import time
 from pathlib import Path
+from typing import Iterable
 
 from src.cyberagent.core.paths import resolve_logs_path
 
+logger = logging.getLogger(__name__)
+
 JOURNAL_DIR = resolve_logs_path("queue_journal")
+JOURNAL_DB_FILENAME = "processed_messages.db"
+JOURNAL_TTL_ENV = "CYBERAGENT_QUEUE_JOURNAL_TTL_SECONDS"
+DEFAULT_JOURNAL_TTL_SECONDS = 7 * 24 * 60 * 60
+COMPACTION_INTERVAL_SECONDS = 60 * 60
+_MIGRATED_SUFFIX = ".migrated"
+
+_lock = threading.Lock()
+_connections: dict[Path, sqlite3.Connection] = {}
+_last_compacted_at: dict[Path, float] = {}
 
 
 def was_processed_message(scope: str, idempotency_key: str) -> bool:
     """
     Return True when an idempotency key is already present in the journal.
     """
-    journal_path = _journal_path(scope)
-    if not journal_path.exists():
-        return False
     try:
-        with journal_path.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if entry.get("idempotency_key") == idempotency_key:
-                    return True
-    except OSError:
+        with _lock:
+            conn = _connection()
+            row = conn.execute(
+                "SELECT 1 FROM processed_messages "
+                "WHERE scope = ? AND idempotency_key = ? LIMIT 1;",
+                (_safe_scope(scope), idempotency_key),
+            ).fetchone()
+    except sqlite3.Error as exc:
+        logger.warning("Failed to read processed-message journal: %s", exc)
         return False
-    return False
+    return row is not None
 
 
 def mark_processed_message(scope: str, idempotency_key: str) -> None:
     """
-    Append a processed idempotency marker to the journal.
+    Record a processed idempotency marker in the journal.
+    """
+    mark_processed_messages(scope, [idempotency_key])
+
+
+def mark_processed_messages(scope: str, idempotency_keys: Iterable[str]) -> None:
+    """
+    Record several processed idempotency markers in one transaction.
     """
-    if was_processed_message(scope, idempotency_key):
+    recorded_at = time.time()
+    rows = [(_safe_scope(scope), key, recorded_at) for key in idempotency_keys]
+    if not rows:
         return
+    with _lock:
+        conn = _connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO processed_messages"
+                "(scope, idempotency_key, recorded_at) VALUES (?, ?, ?);",
+                rows,
+            )
+        _maybe_compact(conn, now=recorded_at)
+
+
+def compact_processed_messages(
+    max_age_seconds: float | None = None, now: float | None = None
+) -> int:
+    """
+    Drop journal entries older than ``max_age_seconds``; returns rows removed.
+    """
+    ttl = _journal_ttl_seconds() if max_age_seconds is None else max_age_seconds
+    timestamp = time.time() if now is None else now
+    with _lock:
+        conn = _connection()
+        return _compact(conn, cutoff=timestamp - ttl)
+
+
+def _connection() -> sqlite3.Connection:
+    db_path = JOURNAL_DIR / JOURNAL_DB_FILENAME
+    conn = _connections.get(db_path)
+    if conn is not None:
+        return conn
     JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
-    journal_path = _journal_path(scope)
-    entry = {
-        "idempotency_key": idempotency_key,
-        "recorded_at": time.time(),
-    }
-    with journal_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(entry, ensure_ascii=True))
-        handle.write("\n")
-
-
-def _journal_path(scope: str) -> Path:
-    safe_scope = "".join(
-        ch if ch.isalnum() or ch in {"_", "-"} else "_" for ch in scope
-    )
-    return JOURNAL_DIR / f"{safe_scope}.jsonl"
+    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA busy_timeout=5000;")
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed_messages (
+                scope TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL,
+                recorded_at REAL NOT NULL,
+                PRIMARY KEY (scope, idempotency_key)
+            ) WITHOUT ROWID;
+            """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_processed_messages_recorded_at
+                ON processed_messages(recorded_at);
+            """)
+    _migrate_jsonl_journals(conn, JOURNAL_DIR)
+    _connections[db_path] = conn
+    return conn
+
+
+def _migrate_jsonl_journals(conn: sqlite3.Connection, journal_dir: Path) -> None:
+    """Import legacy ``<scope>.jsonl`` journals once, then set them aside."""
+
+    for journal_path in sorted(journal_dir.glob("*.jsonl")):
+        rows: list[tuple[str, str, float]] = []
+        try:
+            with journal_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    key = entry.get("idempotency_key")
+                    if not isinstance(key, str) or not key:
+                        continue
+                    recorded_at = entry.get("recorded_at")
+                    rows.append(
+                        (
+                            journal_path.stem,
+                            key,
+                            (
+                                float(recorded_at)
+                                if isinstance(recorded_at, (int, float))
+                                else time.time()
+                            ),
+                        )
+                    )
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO processed_messages"
+                    "(scope, idempotency_key, recorded_at) VALUES (?, ?, ?);",
+                    rows,
+                )
+            journal_path.replace(
+                journal_path.with_name(f"{journal_path.name}{_MIGRATED_SUFFIX}")
+            )
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning(
+                "Failed to migrate processed-message journal %s: %s", journal_path, exc
+            )
+            continue
+        logger.info(
+            "Migrated %d processed-message keys from %s", len(rows), journal_path
+        )
+
+
+def _maybe_compact(conn: sqlite3.Connection, *, now: float) -> None:
+    db_path = JOURNAL_DIR / JOURNAL_DB_FILENAME
+    last = _last_compacted_at.get(db_path)
+    if last is not None and now - last < COMPACTION_INTERVAL_SECONDS:
+        return
+    _last_compacted_at[db_path] = now
+    try:
+        _compact(conn, cutoff=now - _journal_ttl_seconds())
+    except sqlite3.Error as exc:
+        logger.warning("Failed to compact processed-message journal: %s", exc)
+
+
+def _compact(conn: sqlite3.Connection, *, cutoff: float) -> int:
+    with conn:
+        cursor = conn.execute(
+            "DELETE FROM processed_messages WHERE recorded_at < ?;", (cutoff,)
+        )
+    return cursor.rowcount
+
+
+def _journal_ttl_seconds() -> float:
+    raw = os.environ.get(JOURNAL_TTL_ENV)
+    if raw is None:
+        return float(DEFAULT_JOURNAL_TTL_SECONDS)
+    try:
+        return float(raw)
+    except ValueError:
+        return float(DEFAULT_JOURNAL_TTL_SECONDS)
+
+
+def _safe_scope(scope: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in {"_", "-"} else "_" for ch in scope)
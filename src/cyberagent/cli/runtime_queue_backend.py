@@ -3,17 +3,44 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
+import socket
 import sqlite3
+import threading
 import time
 import uuid
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Protocol
-
+from typing import Any, Protocol, Sequence
+
+from src.cyberagent.cli.runtime_queue_metrics import (
+    ACK_LATENCY_SAMPLE_LIMIT,
+    AckLatencyLog,
+    QueueHealth,
+    QueueItemSample,
+    summarize_queue,
+)
+from src.cyberagent.cli.runtime_queue_notify import (
+    AGENT_MESSAGE_QUEUE,
+    SUGGESTION_QUEUE,
+    QueueWatchTarget,
+    notify_queue_changed,
+)
 from src.cyberagent.core.paths import resolve_data_path
 
 logger = logging.getLogger(__name__)
 
+QUEUE_LEASE_SECONDS_ENV = "CYBERAGENT_RUNTIME_QUEUE_LEASE_SECONDS"
+DEFAULT_QUEUE_LEASE_SECONDS = 60.0
+
+# Agent-message priority lanes, highest first. Consumers interleave lanes by
+# weight (see ``agent_message_dispatcher``) so lower lanes still progress.
+LANE_INTERACTIVE = "interactive"
+LANE_CONTROL = "control"
+LANE_BACKFILL = "backfill"
+QUEUE_LANES = (LANE_INTERACTIVE, LANE_CONTROL, LANE_BACKFILL)
+
 
 @dataclass(frozen=True)
 class QueuedSuggestion:
@@ -21,6 +48,13 @@ class QueuedSuggestion:
     payload_text: str
     idempotency_key: str
     queued_at: float
+    lease_owner: str | None = None
+    lease_expires_at: float = 0.0
+
+    def is_leased_by_other(self, consumer_id: str, now: float) -> bool:
+        return _is_leased_by_other(
+            self.lease_owner, self.lease_expires_at, consumer_id, now
+        )
 
 
 @dataclass(frozen=True)
@@ -34,10 +68,47 @@ class QueuedAgentMessage:
     queued_at: float
     attempts: int
     next_attempt_at: float
+    lane: str = LANE_CONTROL
+    lease_owner: str | None = None
+    lease_expires_at: float = 0.0
+
+    def is_leased_by_other(self, consumer_id: str, now: float) -> bool:
+        return _is_leased_by_other(
+            self.lease_owner, self.lease_expires_at, consumer_id, now
+        )
+
+
+@dataclass(frozen=True)
+class AgentMessageEnqueueRequest:
+    recipient: str
+    sender: str | None
+    message_type: str
+    payload: dict[str, Any]
+    idempotency_key: str | None = None
+    lane: str = LANE_CONTROL
+
+    def __post_init__(self) -> None:
+        if self.lane not in QUEUE_LANES:
+            raise ValueError(f"Unknown runtime queue lane: {self.lane}")
+
+    def resolved_idempotency_key(self) -> str:
+        return self.idempotency_key or _build_agent_message_idempotency_key(
+            recipient=self.recipient,
+            sender=self.sender,
+            message_type=self.message_type,
+            payload=self.payload,
+        )
 
 
 class RuntimeQueueBackend(Protocol):
-    """Contract for runtime suggestion + agent-message queue backends."""
+    """Contract for runtime suggestion + agent-message queue backends.
+
+    Consumers that may run in several processes claim an entry before
+    delivering it. A claim is a lease that expires after ``lease_seconds``
+    unless renewed, so entries held by a crashed consumer become claimable
+    again without manual intervention. Ack, defer and dead-letter drop the
+    lease together with the entry state.
+    """
 
     def enqueue_suggestion(
         self, payload_text: str, idempotency_key: str | None = None
@@ -55,16 +126,27 @@ class RuntimeQueueBackend(Protocol):
         message_type: str,
         payload: dict[str, Any],
         idempotency_key: str | None = None,
+        lane: str = LANE_CONTROL,
     ) -> Path: ...
 
+    def enqueue_agent_messages(
+        self, requests: Sequence[AgentMessageEnqueueRequest]
+    ) -> list[Path]: ...
+
     def read_queued_agent_messages(self) -> list[QueuedAgentMessage]: ...
 
     def ack_agent_message(self, path: Path) -> None: ...
 
+    def ack_agent_messages(self, paths: Sequence[Path]) -> None: ...
+
     def list_dead_letter_agent_messages(self) -> list[QueuedAgentMessage]: ...
 
     def requeue_dead_letter_agent_message(self, path: Path) -> Path | None: ...
 
+    def requeue_dead_letter_agent_messages(
+        self, paths: Sequence[Path]
+    ) -> list[Path]: ...
+
     def defer_agent_message(
         self,
         *,
@@ -76,9 +158,77 @@ class RuntimeQueueBackend(Protocol):
         max_attempts: int = 8,
     ) -> bool: ...
 
+    def claim_suggestion(
+        self,
+        path: Path,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> bool: ...
+
+    def claim_agent_message(
+        self,
+        path: Path,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> bool: ...
+
+    def renew_leases(
+        self,
+        queue: str,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> int: ...
+
+    def release_leases(
+        self,
+        queue: str,
+        *,
+        consumer_id: str,
+        paths: Sequence[Path] | None = None,
+    ) -> int: ...
+
+    def queue_health(self, queue: str, now_ts: float | None = None) -> QueueHealth: ...
+
+    def queue_change_token(self, queue: str) -> object: ...
+
+    def queue_watch_targets(self, queue: str) -> list[QueueWatchTarget]: ...
+
+
+@dataclass(frozen=True)
+class _CachedAgentMessage:
+    signature: tuple[int, int, int, int]
+    message: QueuedAgentMessage | None
+
 
 class FileRuntimeQueueBackend:
-    """Filesystem-backed queue backend (default)."""
+    """Filesystem-backed queue backend (default).
+
+    Pending agent messages are indexed by idempotency key in a sibling
+    ``<queue_dir>_index`` directory holding one marker file per key hash, so
+    enqueue dedupe costs a constant number of file reads. Markers are written
+    before the queue file and removed after it, so a crash can only leave a
+    stale marker. Lookups verify the marked file, and the index is rebuilt from
+    the queue files whenever it is missing or inconsistent.
+
+    Leases live in sibling ``<queue_dir>_leases`` directories as one small
+    JSON marker per claimed file. A fresh claim is an exclusive create; taking
+    over an expired lease is a replace followed by a read-back, which is good
+    enough for a few local consumers. Use the SQLite backend when several
+    processes drain the same queue.
+
+    Queue files are minified JSON. Parsed agent messages are cached per file
+    and keyed by the file's stat signature. A deep retry backlog therefore
+    costs one directory scan per poll instead of re-decoding every deferred
+    file: each write replaces the file, which changes the signature.
+    """
+
+    _INDEX_SENTINEL = ".complete"
 
     def __init__(
         self,
@@ -86,10 +236,36 @@ class FileRuntimeQueueBackend:
         suggest_queue_dir: Path,
         agent_message_queue_dir: Path,
         agent_message_dead_letter_dir: Path,
+        agent_message_index_dir: Path | None = None,
     ) -> None:
         self._suggest_queue_dir = suggest_queue_dir
         self._agent_message_queue_dir = agent_message_queue_dir
         self._agent_message_dead_letter_dir = agent_message_dead_letter_dir
+        self._agent_message_index_dir = (
+            agent_message_index_dir
+            if agent_message_index_dir is not None
+            else agent_message_queue_dir.with_name(
+                f"{agent_message_queue_dir.name}_index"
+            )
+        )
+        self._lease_dirs = {
+            SUGGESTION_QUEUE: suggest_queue_dir.with_name(
+                f"{suggest_queue_dir.name}_leases"
+            ),
+            AGENT_MESSAGE_QUEUE: agent_message_queue_dir.with_name(
+                f"{agent_message_queue_dir.name}_leases"
+            ),
+        }
+        self._message_cache: dict[Path, dict[str, _CachedAgentMessage]] = {}
+        self._ack_latency_logs = {
+            queue: AckLatencyLog(
+                directory.with_name(f"{directory.name}_ack_latency.log")
+            )
+            for queue, directory in (
+                (SUGGESTION_QUEUE, suggest_queue_dir),
+                (AGENT_MESSAGE_QUEUE, agent_message_queue_dir),
+            )
+        }
 
     def enqueue_suggestion(
         self, payload_text: str, idempotency_key: str | None = None
@@ -104,12 +280,14 @@ class FileRuntimeQueueBackend:
         file_id = f"{time.time_ns()}_{uuid.uuid4().hex}"
         target = self._suggest_queue_dir / f"{file_id}.json"
         _write_json_atomically(target, payload)
+        notify_queue_changed(SUGGESTION_QUEUE)
         return target
 
     def read_queued_suggestions(self) -> list[QueuedSuggestion]:
         if not self._suggest_queue_dir.exists():
             return []
         suggestions: list[QueuedSuggestion] = []
+        leases = self._read_leases(SUGGESTION_QUEUE)
         for path in sorted(self._suggest_queue_dir.glob("*.json")):
             try:
                 data = json.loads(path.read_text(encoding="utf-8"))
@@ -128,21 +306,28 @@ class FileRuntimeQueueBackend:
             )
             queued_at = data.get("queued_at")
             queued_at_value = queued_at if isinstance(queued_at, (int, float)) else 0.0
+            lease_owner, lease_expires_at = leases.get(path.name, (None, 0.0))
             suggestions.append(
                 QueuedSuggestion(
                     path=path,
                     payload_text=payload_text,
                     idempotency_key=idempotency_key,
                     queued_at=queued_at_value,
+                    lease_owner=lease_owner,
+                    lease_expires_at=lease_expires_at,
                 )
             )
         return suggestions
 
     def ack_suggestion(self, path: Path) -> None:
+        data = _read_json_object(path)
         try:
             path.unlink()
         except OSError as exc:
             logger.warning("Failed to remove suggestion %s: %s", path, exc)
+            return
+        self._remove_lease(SUGGESTION_QUEUE, path.name)
+        self._record_ack_latency(SUGGESTION_QUEUE, [data])
 
     def enqueue_agent_message(
         self,
@@ -152,48 +337,112 @@ class FileRuntimeQueueBackend:
         message_type: str,
         payload: dict[str, Any],
         idempotency_key: str | None = None,
+        lane: str = LANE_CONTROL,
     ) -> Path:
+        return self.enqueue_agent_messages(
+            [
+                AgentMessageEnqueueRequest(
+                    recipient=recipient,
+                    sender=sender,
+                    message_type=message_type,
+                    payload=payload,
+                    idempotency_key=idempotency_key,
+                    lane=lane,
+                )
+            ]
+        )[0]
+
+    def enqueue_agent_messages(
+        self, requests: Sequence[AgentMessageEnqueueRequest]
+    ) -> list[Path]:
+        """Enqueue several messages, checking the index once per batch.
+
+        File names share one timestamp prefix plus a sequence number, so the
+        batch keeps its order in the queue.
+        """
+
+        if not requests:
+            return []
         self._agent_message_queue_dir.mkdir(parents=True, exist_ok=True)
-        resolved_idempotency_key = idempotency_key or _build_agent_message_idempotency_key(
-            recipient=recipient,
-            sender=sender,
-            message_type=message_type,
-            payload=payload,
-        )
-        existing_path = self._find_queued_message_by_idempotency_key(
-            resolved_idempotency_key
-        )
-        if existing_path is not None:
-            return existing_path
-
-        payload_data = {
-            "recipient": recipient,
-            "sender": sender,
-            "message_type": message_type,
-            "payload": payload,
-            "idempotency_key": resolved_idempotency_key,
-            "queued_at": time.time(),
-            "attempts": 0,
-            "next_attempt_at": 0.0,
-        }
-        file_id = f"{time.time_ns()}_{uuid.uuid4().hex}"
-        target = self._agent_message_queue_dir / f"{file_id}.json"
-        _write_json_atomically(target, payload_data)
-        return target
+        self._ensure_idempotency_index()
+        batch_ns = time.time_ns()
+        queued_at = batch_ns / 1e9
+        targets: list[Path] = []
+        added: dict[str, Path] = {}
+        for sequence, request in enumerate(requests):
+            resolved_idempotency_key = request.resolved_idempotency_key()
+            existing_path = added.get(
+                resolved_idempotency_key
+            ) or self._find_queued_message_by_idempotency_key(resolved_idempotency_key)
+            if existing_path is not None:
+                targets.append(existing_path)
+                continue
+            payload_data = {
+                "recipient": request.recipient,
+                "sender": request.sender,
+                "message_type": request.message_type,
+                "payload": request.payload,
+                "idempotency_key": resolved_idempotency_key,
+                "queued_at": queued_at,
+                "attempts": 0,
+                "next_attempt_at": 0.0,
+                "lane": request.lane,
+            }
+            file_id = f"{batch_ns}_{sequence:06d}_{uuid.uuid4().hex}"
+            target = self._agent_message_queue_dir / f"{file_id}.json"
+            self._write_index_marker(resolved_idempotency_key, target)
+            _write_json_atomically(target, payload_data)
+            added[resolved_idempotency_key] = target
+            targets.append(target)
+        if added:
+            notify_queue_changed(AGENT_MESSAGE_QUEUE)
+        return targets
 
     def read_queued_agent_messages(self) -> list[QueuedAgentMessage]:
-        return self._read_agent_messages_from_dir(self._agent_message_queue_dir)
+        return self._read_agent_messages_from_dir(
+            self._agent_message_queue_dir,
+            leases=self._read_leases(AGENT_MESSAGE_QUEUE),
+        )
 
     def ack_agent_message(self, path: Path) -> None:
-        try:
-            path.unlink()
-        except OSError as exc:
-            logger.warning("Failed to remove agent message %s: %s", path, exc)
+        self.ack_agent_messages([path])
+
+    def ack_agent_messages(self, paths: Sequence[Path]) -> None:
+        acked: list[dict[str, Any] | None] = []
+        for path in paths:
+            data = _read_json_object(path)
+            try:
+                path.unlink()
+            except OSError as exc:
+                logger.warning("Failed to remove agent message %s: %s", path, exc)
+                continue
+            idempotency_key = (data or {}).get("idempotency_key")
+            if isinstance(idempotency_key, str) and idempotency_key:
+                self._remove_index_marker(idempotency_key, path)
+            self._remove_lease(AGENT_MESSAGE_QUEUE, path.name)
+            acked.append(data)
+        self._record_ack_latency(AGENT_MESSAGE_QUEUE, acked)
 
     def list_dead_letter_agent_messages(self) -> list[QueuedAgentMessage]:
         return self._read_agent_messages_from_dir(self._agent_message_dead_letter_dir)
 
     def requeue_dead_letter_agent_message(self, path: Path) -> Path | None:
+        requeued = self._requeue_dead_letter_file(path)
+        if requeued is not None:
+            notify_queue_changed(AGENT_MESSAGE_QUEUE)
+        return requeued
+
+    def requeue_dead_letter_agent_messages(self, paths: Sequence[Path]) -> list[Path]:
+        requeued = [
+            target
+            for target in (self._requeue_dead_letter_file(path) for path in paths)
+            if target is not None
+        ]
+        if requeued:
+            notify_queue_changed(AGENT_MESSAGE_QUEUE)
+        return requeued
+
+    def _requeue_dead_letter_file(self, path: Path) -> Path | None:
         try:
             data = json.loads(path.read_text(encoding="utf-8"))
         except (OSError, json.JSONDecodeError) as exc:
@@ -206,15 +455,19 @@ class FileRuntimeQueueBackend:
         data.pop("last_failed_at", None)
         data["attempts"] = 0
         data["next_attempt_at"] = 0.0
+        data["lane"] = LANE_BACKFILL
         self._agent_message_queue_dir.mkdir(parents=True, exist_ok=True)
         target = self._agent_message_queue_dir / path.name
+        idempotency_key = data.get("idempotency_key")
         try:
+            if isinstance(idempotency_key, str) and idempotency_key:
+                self._write_index_marker(idempotency_key, target)
             _write_json_atomically(target, data)
             path.unlink(missing_ok=True)
-            return target
         except OSError as exc:
             logger.warning("Failed to requeue dead-letter message %s: %s", path, exc)
             return None
+        return target
 
     def defer_agent_message(
         self,
@@ -249,6 +502,10 @@ class FileRuntimeQueueBackend:
             try:
                 _write_json_atomically(target, data)
                 path.unlink(missing_ok=True)
+                idempotency_key = data.get("idempotency_key")
+                if isinstance(idempotency_key, str) and idempotency_key:
+                    self._remove_index_marker(idempotency_key, path)
+                self._remove_lease(AGENT_MESSAGE_QUEUE, path.name)
                 logger.error("Moved agent message to dead-letter: %s", target)
                 return True
             except OSError as exc:
@@ -263,54 +520,406 @@ class FileRuntimeQueueBackend:
             _write_json_atomically(path, data)
         except OSError as exc:
             logger.warning("Failed to update deferred agent message %s: %s", path, exc)
+        self._remove_lease(AGENT_MESSAGE_QUEUE, path.name)
         return False
 
-    def _find_queued_message_by_idempotency_key(self, idempotency_key: str) -> Path | None:
-        if not self._agent_message_queue_dir.exists():
+    def claim_suggestion(
+        self,
+        path: Path,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> bool:
+        return self._claim(
+            SUGGESTION_QUEUE,
+            path,
+            consumer_id=consumer_id,
+            lease_seconds=lease_seconds,
+            now_ts=now_ts,
+        )
+
+    def claim_agent_message(
+        self,
+        path: Path,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> bool:
+        return self._claim(
+            AGENT_MESSAGE_QUEUE,
+            path,
+            consumer_id=consumer_id,
+            lease_seconds=lease_seconds,
+            now_ts=now_ts,
+        )
+
+    def renew_leases(
+        self,
+        queue: str,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> int:
+        expires_at = (time.time() if now_ts is None else now_ts) + lease_seconds
+        queue_dir = self._queue_dir(queue)
+        renewed = 0
+        for name, (owner, _) in self._read_leases(queue).items():
+            if owner != consumer_id:
+                continue
+            if not (queue_dir / name).exists():
+                self._remove_lease(queue, name)
+                continue
+            _write_text_atomically(
+                self._lease_dirs[queue] / name,
+                _encode_lease(consumer_id, expires_at),
+            )
+            renewed += 1
+        return renewed
+
+    def release_leases(
+        self,
+        queue: str,
+        *,
+        consumer_id: str,
+        paths: Sequence[Path] | None = None,
+    ) -> int:
+        names = None if paths is None else {path.name for path in paths}
+        released = 0
+        for name, (owner, _) in self._read_leases(queue).items():
+            if owner != consumer_id or (names is not None and name not in names):
+                continue
+            self._remove_lease(queue, name)
+            released += 1
+        if released:
+            notify_queue_changed(queue)
+        return released
+
+    def queue_health(self, queue: str, now_ts: float | None = None) -> QueueHealth:
+        if queue not in self._ack_latency_logs:
+            raise ValueError(f"Unknown runtime queue: {queue}")
+        latencies = self._ack_latency_logs[queue].read()
+        if queue == SUGGESTION_QUEUE:
+            return summarize_queue(
+                queue,
+                pending=(
+                    QueueItemSample(
+                        queued_at=item.queued_at,
+                        lease_owner=item.lease_owner,
+                        lease_expires_at=item.lease_expires_at,
+                    )
+                    for item in self.read_queued_suggestions()
+                ),
+                ack_latencies=latencies,
+                now=now_ts,
+            )
+        dead_dir = self._agent_message_dead_letter_dir
+        dead_letter_count = (
+            sum(1 for _ in dead_dir.glob("*.json")) if dead_dir.exists() else 0
+        )
+        return summarize_queue(
+            queue,
+            pending=(
+                QueueItemSample(
+                    queued_at=item.queued_at,
+                    recipient=item.recipient,
+                    lane=item.lane,
+                    attempts=item.attempts,
+                    next_attempt_at=item.next_attempt_at,
+                    lease_owner=item.lease_owner,
+                    lease_expires_at=item.lease_expires_at,
+                )
+                for item in self.read_queued_agent_messages()
+            ),
+            dead_letter_count=dead_letter_count,
+            ack_latencies=latencies,
+            now=now_ts,
+        )
+
+    def queue_change_token(self, queue: str) -> object:
+        """Cheap token that changes whenever a queue file is added or replaced."""
+
+        directory = self._queue_dir(queue)
+        try:
+            stat = directory.stat()
+        except OSError:
             return None
-        for path in sorted(self._agent_message_queue_dir.glob("*.json")):
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    def queue_watch_targets(self, queue: str) -> list[QueueWatchTarget]:
+        return [QueueWatchTarget(directory=self._queue_dir(queue), name_suffix=".json")]
+
+    def _queue_dir(self, queue: str) -> Path:
+        if queue == SUGGESTION_QUEUE:
+            return self._suggest_queue_dir
+        if queue == AGENT_MESSAGE_QUEUE:
+            return self._agent_message_queue_dir
+        raise ValueError(f"Unknown runtime queue: {queue}")
+
+    def rebuild_idempotency_index(self) -> int:
+        """Recreate the idempotency index from queued files; returns entries indexed."""
+
+        index_dir = self._agent_message_index_dir
+        index_dir.mkdir(parents=True, exist_ok=True)
+        for marker in index_dir.iterdir():
             try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-            except (OSError, json.JSONDecodeError):
+                marker.unlink()
+            except OSError as exc:
+                logger.warning(
+                    "Failed to remove idempotency marker %s: %s", marker, exc
+                )
+        indexed = 0
+        if self._agent_message_queue_dir.exists():
+            for path in sorted(self._agent_message_queue_dir.glob("*.json")):
+                idempotency_key = _read_idempotency_key(path)
+                if idempotency_key is None:
+                    continue
+                marker = self._index_marker_path(idempotency_key)
+                if marker.exists():
+                    # Oldest file wins, matching queue order.
+                    continue
+                _write_text_atomically(marker, path.name)
+                indexed += 1
+        (index_dir / self._INDEX_SENTINEL).write_text(
+            str(time.time()), encoding="utf-8"
+        )
+        return indexed
+
+    def _find_queued_message_by_idempotency_key(
+        self, idempotency_key: str
+    ) -> Path | None:
+        self._ensure_idempotency_index()
+        found, consistent = self._lookup_index_marker(idempotency_key)
+        if consistent:
+            return found
+        logger.warning(
+            "Agent message idempotency index is inconsistent; rebuilding %s",
+            self._agent_message_index_dir,
+        )
+        self.rebuild_idempotency_index()
+        found, _ = self._lookup_index_marker(idempotency_key)
+        return found
+
+    def _lookup_index_marker(self, idempotency_key: str) -> tuple[Path | None, bool]:
+        """Return ``(path, consistent)`` for the marker of ``idempotency_key``."""
+
+        marker = self._index_marker_path(idempotency_key)
+        try:
+            file_name = marker.read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None, True
+        except OSError:
+            return None, False
+        if not file_name or Path(file_name).name != file_name:
+            return None, False
+        target = self._agent_message_queue_dir / file_name
+        # A marker without its file is left by an interrupted enqueue or ack, or
+        # by an out-of-band removal; both warrant a rebuild from the queue files.
+        if _read_idempotency_key(target) != idempotency_key:
+            return None, False
+        return target, True
+
+    def _ensure_idempotency_index(self) -> None:
+        if (self._agent_message_index_dir / self._INDEX_SENTINEL).exists():
+            return
+        self.rebuild_idempotency_index()
+
+    def _write_index_marker(self, idempotency_key: str, target: Path) -> None:
+        self._ensure_idempotency_index()
+        _write_text_atomically(self._index_marker_path(idempotency_key), target.name)
+
+    def _remove_index_marker(self, idempotency_key: str, path: Path) -> None:
+        marker = self._index_marker_path(idempotency_key)
+        try:
+            if marker.read_text(encoding="utf-8").strip() != path.name:
+                return
+            marker.unlink()
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            logger.warning("Failed to remove idempotency marker %s: %s", marker, exc)
+
+    def _index_marker_path(self, idempotency_key: str) -> Path:
+        digest = hashlib.sha256(idempotency_key.encode("utf-8")).hexdigest()
+        return self._agent_message_index_dir / digest
+
+    def _claim(
+        self,
+        queue: str,
+        path: Path,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None,
+    ) -> bool:
+        timestamp = time.time() if now_ts is None else now_ts
+        queue_file = self._queue_dir(queue) / path.name
+        if not queue_file.exists():
+            return False
+        lease_dir = self._lease_dirs[queue]
+        lease_dir.mkdir(parents=True, exist_ok=True)
+        lease_path = lease_dir / path.name
+        encoded = _encode_lease(consumer_id, timestamp + lease_seconds)
+        tmp_path = lease_dir / f".{path.name}.{uuid.uuid4().hex}.tmp"
+        tmp_path.write_text(encoded, encoding="utf-8")
+        try:
+            # link() publishes a fully written marker or fails if one exists.
+            os.link(tmp_path, lease_path)
+        except FileExistsError:
+            owner, expires_at = _read_lease(lease_path)
+            if _is_leased_by_other(owner, expires_at, consumer_id, timestamp):
+                return False
+            _write_text_atomically(lease_path, encoded)
+            # Two consumers may take over the same expired lease; the last
+            # writer wins and the other backs off after reading it back.
+            if _read_lease(lease_path)[0] != consumer_id:
+                return False
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        if not queue_file.exists():
+            # Acked between the existence check and the claim.
+            self._remove_lease(queue, path.name)
+            return False
+        return True
+
+    def _record_ack_latency(
+        self, queue: str, acked: Sequence[dict[str, Any] | None]
+    ) -> None:
+        now = time.time()
+        self._ack_latency_logs[queue].record(
+            now - float(data["queued_at"])
+            for data in acked
+            if data is not None and isinstance(data.get("queued_at"), (int, float))
+        )
+
+    def _read_leases(self, queue: str) -> dict[str, tuple[str | None, float]]:
+        lease_dir = self._lease_dirs[queue]
+        try:
+            names = os.listdir(lease_dir)
+        except FileNotFoundError:
+            return {}
+        leases: dict[str, tuple[str | None, float]] = {}
+        for name in names:
+            if not name.endswith(".json"):
                 continue
-            queued_key = data.get("idempotency_key")
-            if queued_key == idempotency_key:
-                return path
-        return None
+            leases[name] = _read_lease(lease_dir / name)
+        return leases
+
+    def _remove_lease(self, queue: str, name: str) -> None:
+        try:
+            (self._lease_dirs[queue] / name).unlink()
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            logger.warning("Failed to remove queue lease %s: %s", name, exc)
 
-    def _read_agent_messages_from_dir(self, directory: Path) -> list[QueuedAgentMessage]:
-        if not directory.exists():
+    def _read_agent_messages_from_dir(
+        self,
+        directory: Path,
+        *,
+        leases: dict[str, tuple[str | None, float]] | None = None,
+    ) -> list[QueuedAgentMessage]:
+        try:
+            entries = sorted(
+                (
+                    entry
+                    for entry in os.scandir(directory)
+                    if entry.name.endswith(".json") and not entry.name.startswith(".")
+                ),
+                key=lambda entry: entry.name,
+            )
+        except FileNotFoundError:
+            self._message_cache.pop(directory, None)
             return []
+        previous = self._message_cache.get(directory, {})
+        current: dict[str, _CachedAgentMessage] = {}
         messages: list[QueuedAgentMessage] = []
-        for path in sorted(directory.glob("*.json")):
+        for entry in entries:
             try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-            except (OSError, json.JSONDecodeError) as exc:
-                logger.warning("Failed to read agent message %s: %s", path, exc)
+                stat = entry.stat()
+            except FileNotFoundError:
                 continue
-            parsed = _parse_agent_message(path=path, data=data)
-            if parsed is not None:
-                messages.append(parsed)
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+            path = directory / entry.name
+            cached = previous.get(entry.name)
+            if cached is not None and cached.signature == signature:
+                parsed = cached.message
+            else:
+                try:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, json.JSONDecodeError) as exc:
+                    logger.warning("Failed to read agent message %s: %s", path, exc)
+                    continue
+                parsed = (
+                    _parse_agent_message(path=path, data=data)
+                    if isinstance(data, dict)
+                    else None
+                )
+            current[entry.name] = _CachedAgentMessage(signature, parsed)
+            if parsed is None:
+                continue
+            if leases and path.name in leases:
+                lease_owner, lease_expires_at = leases[path.name]
+                parsed = replace(
+                    parsed, lease_owner=lease_owner, lease_expires_at=lease_expires_at
+                )
+            messages.append(parsed)
+        self._message_cache[directory] = current
         return messages
 
 
 class SQLiteRuntimeQueueBackend:
-    """SQLite-backed queue backend for safer multi-process coordination."""
+    """SQLite-backed queue backend for safer multi-process coordination.
+
+    Each thread keeps one WAL-mode connection for the lifetime of the backend,
+    so the schema pass and pragmas run once and sqlite3's per-connection
+    statement cache reuses prepared statements across calls.
+
+    Claims are single conditional ``UPDATE`` statements on the
+    ``lease_owner``/``lease_expires_at`` columns, so at most one consumer
+    holds a live lease on a row at a time.
+    """
 
     _SUGGESTION_TOKEN_PREFIX = "sqlite_suggestion_"
     _AGENT_TOKEN_PREFIX = "sqlite_agent_"
     _AGENT_DEAD_TOKEN_PREFIX = "sqlite_dead_agent_"
+    _QUEUE_TABLES = {
+        SUGGESTION_QUEUE: "queue_suggestions",
+        AGENT_MESSAGE_QUEUE: "queue_agent_messages",
+    }
+
+    # Columns introduced after the original schema, added to older databases.
+    _ADDED_COLUMNS = {
+        "queue_suggestions": (
+            ("lease_owner", "TEXT"),
+            ("lease_expires_at", "REAL NOT NULL DEFAULT 0.0"),
+        ),
+        "queue_agent_messages": (
+            ("lease_owner", "TEXT"),
+            ("lease_expires_at", "REAL NOT NULL DEFAULT 0.0"),
+            ("lane", "TEXT NOT NULL DEFAULT 'control'"),
+        ),
+    }
+
+    _STATEMENT_CACHE_SIZE = 64
 
     def __init__(self, *, db_path: Path) -> None:
         self._db_path = db_path
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections_lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
         self._ensure_schema()
 
     def enqueue_suggestion(
         self, payload_text: str, idempotency_key: str | None = None
     ) -> Path:
         queued_at = time.time()
-        resolved_key = idempotency_key or _build_suggestion_idempotency_key(payload_text)
+        resolved_key = idempotency_key or _build_suggestion_idempotency_key(
+            payload_text
+        )
         with self._connect() as conn:
             row = conn.execute(
                 """
@@ -322,23 +931,25 @@ class SQLiteRuntimeQueueBackend:
             ).fetchone()
             if row is None:
                 raise RuntimeError("failed to enqueue suggestion")
-            return self._suggestion_token(int(row[0]))
+        notify_queue_changed(SUGGESTION_QUEUE)
+        return self._suggestion_token(int(row[0]))
 
     def read_queued_suggestions(self) -> list[QueuedSuggestion]:
         with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, payload_text, idempotency_key, queued_at
+            rows = conn.execute("""
+                SELECT id, payload_text, idempotency_key, queued_at,
+                       lease_owner, lease_expires_at
                 FROM queue_suggestions
                 ORDER BY id ASC;
-                """
-            ).fetchall()
+                """).fetchall()
         return [
             QueuedSuggestion(
                 path=self._suggestion_token(int(row["id"])),
                 payload_text=str(row["payload_text"]),
                 idempotency_key=str(row["idempotency_key"]),
                 queued_at=float(row["queued_at"]),
+                lease_owner=row["lease_owner"],
+                lease_expires_at=float(row["lease_expires_at"]),
             )
             for row in rows
         ]
@@ -348,6 +959,7 @@ class SQLiteRuntimeQueueBackend:
         if suggestion_id is None:
             return
         with self._connect() as conn:
+            self._record_ack_latency(conn, SUGGESTION_QUEUE, [suggestion_id])
             conn.execute("DELETE FROM queue_suggestions WHERE id=?;", (suggestion_id,))
 
     def enqueue_agent_message(
@@ -358,103 +970,147 @@ class SQLiteRuntimeQueueBackend:
         message_type: str,
         payload: dict[str, Any],
         idempotency_key: str | None = None,
+        lane: str = LANE_CONTROL,
     ) -> Path:
-        resolved_idempotency_key = idempotency_key or _build_agent_message_idempotency_key(
-            recipient=recipient,
-            sender=sender,
-            message_type=message_type,
-            payload=payload,
-        )
-        payload_json = json.dumps(payload, sort_keys=True)
+        return self.enqueue_agent_messages(
+            [
+                AgentMessageEnqueueRequest(
+                    recipient=recipient,
+                    sender=sender,
+                    message_type=message_type,
+                    payload=payload,
+                    idempotency_key=idempotency_key,
+                    lane=lane,
+                )
+            ]
+        )[0]
+
+    def enqueue_agent_messages(
+        self, requests: Sequence[AgentMessageEnqueueRequest]
+    ) -> list[Path]:
+        """Enqueue several messages in one transaction."""
+
+        if not requests:
+            return []
         queued_at = time.time()
+        message_ids: list[int] = []
+        inserted = False
         with self._connect() as conn:
-            existing = conn.execute(
-                """
-                SELECT id
-                FROM queue_agent_messages
-                WHERE state='pending' AND idempotency_key=?
-                LIMIT 1;
-                """,
-                (resolved_idempotency_key,),
-            ).fetchone()
-            if existing is not None:
-                return self._agent_token(int(existing["id"]))
-
-            row = conn.execute(
-                """
-                INSERT INTO queue_agent_messages(
-                    recipient,
-                    sender,
-                    message_type,
-                    payload_json,
-                    idempotency_key,
-                    queued_at,
-                    attempts,
-                    next_attempt_at,
-                    state
-                )
-                VALUES (?, ?, ?, ?, ?, ?, 0, 0.0, 'pending')
-                RETURNING id;
-                """,
-                (
-                    recipient,
-                    sender,
-                    message_type,
-                    payload_json,
-                    resolved_idempotency_key,
-                    queued_at,
-                ),
-            ).fetchone()
-            if row is None:
-                raise RuntimeError("failed to enqueue agent message")
-            return self._agent_token(int(row[0]))
+            for request in requests:
+                resolved_idempotency_key = request.resolved_idempotency_key()
+                existing = conn.execute(
+                    """
+                    SELECT id
+                    FROM queue_agent_messages
+                    WHERE state='pending' AND idempotency_key=?
+                    LIMIT 1;
+                    """,
+                    (resolved_idempotency_key,),
+                ).fetchone()
+                if existing is not None:
+                    message_ids.append(int(existing["id"]))
+                    continue
+                row = conn.execute(
+                    """
+                    INSERT INTO queue_agent_messages(
+                        recipient,
+                        sender,
+                        message_type,
+                        payload_json,
+                        idempotency_key,
+                        queued_at,
+                        attempts,
+                        next_attempt_at,
+                        state,
+                        lane
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, 0, 0.0, 'pending', ?)
+                    RETURNING id;
+                    """,
+                    (
+                        request.recipient,
+                        request.sender,
+                        request.message_type,
+                        json.dumps(request.payload, sort_keys=True),
+                        resolved_idempotency_key,
+                        queued_at,
+                        request.lane,
+                    ),
+                ).fetchone()
+                if row is None:
+                    raise RuntimeError("failed to enqueue agent message")
+                message_ids.append(int(row[0]))
+                inserted = True
+        if inserted:
+            notify_queue_changed(AGENT_MESSAGE_QUEUE)
+        return [self._agent_token(message_id) for message_id in message_ids]
 
     def read_queued_agent_messages(self) -> list[QueuedAgentMessage]:
         return self._read_agent_messages(state="pending")
 
     def ack_agent_message(self, path: Path) -> None:
-        message_id = self._decode_token(path, self._AGENT_TOKEN_PREFIX)
-        if message_id is None:
+        self.ack_agent_messages([path])
+
+    def ack_agent_messages(self, paths: Sequence[Path]) -> None:
+        message_ids = self._decode_tokens(paths, self._AGENT_TOKEN_PREFIX)
+        if not message_ids:
             return
         with self._connect() as conn:
-            conn.execute(
+            self._record_ack_latency(conn, AGENT_MESSAGE_QUEUE, message_ids)
+            conn.executemany(
                 "DELETE FROM queue_agent_messages WHERE id=? AND state='pending';",
-                (message_id,),
+                [(message_id,) for message_id in message_ids],
             )
 
     def list_dead_letter_agent_messages(self) -> list[QueuedAgentMessage]:
         return self._read_agent_messages(state="dead_letter")
 
     def requeue_dead_letter_agent_message(self, path: Path) -> Path | None:
-        message_id = self._decode_token(path, self._AGENT_DEAD_TOKEN_PREFIX)
-        if message_id is None:
-            return None
+        requeued = self.requeue_dead_letter_agent_messages([path])
+        return requeued[0] if requeued else None
+
+    def requeue_dead_letter_agent_messages(self, paths: Sequence[Path]) -> list[Path]:
+        """Requeue dead-letter rows in one transaction.
+
+        A row whose idempotency key is already pending again is left in the
+        dead-letter state instead of failing the whole batch.
+        """
+
+        message_ids = self._decode_tokens(paths, self._AGENT_DEAD_TOKEN_PREFIX)
+        if not message_ids:
+            return []
+        requeued: list[Path] = []
         with self._connect() as conn:
-            row = conn.execute(
-                """
-                SELECT id
-                FROM queue_agent_messages
-                WHERE id=? AND state='dead_letter'
-                LIMIT 1;
-                """,
-                (message_id,),
-            ).fetchone()
-            if row is None:
-                return None
-            conn.execute(
-                """
-                UPDATE queue_agent_messages
-                SET state='pending',
-                    attempts=0,
-                    next_attempt_at=0.0,
-                    dead_lettered_at=NULL,
-                    last_error=NULL,
-                    last_failed_at=NULL
-                WHERE id=?;
-                """,
-                (message_id,),
-            )
-        return self._agent_token(message_id)
+            for message_id in message_ids:
+                try:
+                    cursor = conn.execute(
+                        """
+                        UPDATE queue_agent_messages
+                        SET state='pending',
+                            lane='backfill',
+                            attempts=0,
+                            next_attempt_at=0.0,
+                            dead_lettered_at=NULL,
+                            last_error=NULL,
+                            last_failed_at=NULL,
+                            lease_owner=NULL,
+                            lease_expires_at=0.0
+                        WHERE id=? AND state='dead_letter';
+                        """,
+                        (message_id,),
+                    )
+                except sqlite3.IntegrityError:
+                    logger.warning(
+                        "Skipping requeue of dead-letter message id=%s; "
+                        "its idempotency key is already pending",
+                        message_id,
+                    )
+                    continue
+                if cursor.rowcount == 1:
+                    requeued.append(self._agent_token(message_id))
+        if requeued:
+            notify_queue_changed(AGENT_MESSAGE_QUEUE)
+        return requeued
 
     def defer_agent_message(
         self,
@@ -494,33 +1150,266 @@ class SQLiteRuntimeQueueBackend:
                         next_attempt_at=0.0,
                         last_error=?,
                         last_failed_at=?,
-                        dead_lettered_at=?
+                        dead_lettered_at=?,
+                        lease_owner=NULL,
+                        lease_expires_at=0.0
                     WHERE id=?;
                     """,
                     (attempts, str(error), timestamp, timestamp, message_id),
                 )
                 return True
 
-            delay = min(base_delay_seconds * (2 ** max(0, attempts - 1)), max_delay_seconds)
+            delay = min(
+                base_delay_seconds * (2 ** max(0, attempts - 1)), max_delay_seconds
+            )
             conn.execute(
                 """
                 UPDATE queue_agent_messages
                 SET attempts=?,
                     next_attempt_at=?,
                     last_error=?,
-                    last_failed_at=?
+                    last_failed_at=?,
+                    lease_owner=NULL,
+                    lease_expires_at=0.0
                 WHERE id=?;
                 """,
                 (attempts, timestamp + delay, str(error), timestamp, message_id),
             )
         return False
 
+    def claim_suggestion(
+        self,
+        path: Path,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> bool:
+        suggestion_id = self._decode_token(path, self._SUGGESTION_TOKEN_PREFIX)
+        if suggestion_id is None:
+            return False
+        return self._claim(
+            SUGGESTION_QUEUE,
+            suggestion_id,
+            consumer_id=consumer_id,
+            lease_seconds=lease_seconds,
+            now_ts=now_ts,
+        )
+
+    def claim_agent_message(
+        self,
+        path: Path,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> bool:
+        message_id = self._decode_token(path, self._AGENT_TOKEN_PREFIX)
+        if message_id is None:
+            return False
+        return self._claim(
+            AGENT_MESSAGE_QUEUE,
+            message_id,
+            consumer_id=consumer_id,
+            lease_seconds=lease_seconds,
+            now_ts=now_ts,
+        )
+
+    def renew_leases(
+        self,
+        queue: str,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None = None,
+    ) -> int:
+        table = self._queue_table(queue)
+        expires_at = (time.time() if now_ts is None else now_ts) + lease_seconds
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE {table} SET lease_expires_at=? WHERE lease_owner=?;",
+                (expires_at, consumer_id),
+            )
+        return cursor.rowcount
+
+    def release_leases(
+        self,
+        queue: str,
+        *,
+        consumer_id: str,
+        paths: Sequence[Path] | None = None,
+    ) -> int:
+        table = self._queue_table(queue)
+        prefix = (
+            self._SUGGESTION_TOKEN_PREFIX
+            if queue == SUGGESTION_QUEUE
+            else self._AGENT_TOKEN_PREFIX
+        )
+        sql = (
+            f"UPDATE {table} SET lease_owner=NULL, lease_expires_at=0.0 "
+            "WHERE lease_owner=?"
+        )
+        params: list[object] = [consumer_id]
+        if paths is not None:
+            ids = self._decode_tokens(paths, prefix)
+            if not ids:
+                return 0
+            sql += f" AND id IN ({', '.join('?' for _ in ids)})"
+            params.extend(ids)
+        with self._connect() as conn:
+            cursor = conn.execute(f"{sql};", params)
+        if cursor.rowcount:
+            notify_queue_changed(queue)
+        return cursor.rowcount
+
+    def queue_health(self, queue: str, now_ts: float | None = None) -> QueueHealth:
+        table = self._queue_table(queue)
+        with self._connect() as conn:
+            latencies = [
+                float(row["latency_seconds"])
+                for row in conn.execute(
+                    """
+                    SELECT latency_seconds
+                    FROM queue_ack_latency
+                    WHERE queue=?
+                    ORDER BY id DESC
+                    LIMIT ?;
+                    """,
+                    (queue, ACK_LATENCY_SAMPLE_LIMIT),
+                )
+            ]
+            if queue == SUGGESTION_QUEUE:
+                rows = conn.execute(
+                    f"SELECT queued_at, lease_owner, lease_expires_at FROM {table};"
+                ).fetchall()
+                return summarize_queue(
+                    queue,
+                    pending=(
+                        QueueItemSample(
+                            queued_at=float(row["queued_at"]),
+                            lease_owner=row["lease_owner"],
+                            lease_expires_at=float(row["lease_expires_at"]),
+                        )
+                        for row in rows
+                    ),
+                    ack_latencies=latencies,
+                    now=now_ts,
+                )
+            rows = conn.execute(f"""
+                SELECT queued_at, recipient, lane, attempts, next_attempt_at,
+                       lease_owner, lease_expires_at
+                FROM {table}
+                WHERE state='pending';
+                """).fetchall()
+            dead_row = conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE state='dead_letter';"
+            ).fetchone()
+        return summarize_queue(
+            queue,
+            pending=(
+                QueueItemSample(
+                    queued_at=float(row["queued_at"]),
+                    recipient=str(row["recipient"]),
+                    lane=str(row["lane"]),
+                    attempts=int(row["attempts"]),
+                    next_attempt_at=float(row["next_attempt_at"]),
+                    lease_owner=row["lease_owner"],
+                    lease_expires_at=float(row["lease_expires_at"]),
+                )
+                for row in rows
+            ),
+            dead_letter_count=int(dead_row[0]) if dead_row is not None else 0,
+            ack_latencies=latencies,
+            now=now_ts,
+        )
+
+    def queue_change_token(self, queue: str) -> object:
+        """Trigger-maintained change counter; one indexed row read per call."""
+
+        self._queue_table(queue)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT version FROM queue_versions WHERE queue=?;", (queue,)
+            ).fetchone()
+        return int(row["version"]) if row is not None else 0
+
+    def queue_watch_targets(self, queue: str) -> list[QueueWatchTarget]:
+        # Commits touch the database file or its -wal/-journal sidecar.
+        return [
+            QueueWatchTarget(
+                directory=self._db_path.parent, name_prefix=self._db_path.name
+            )
+        ]
+
+    def _claim(
+        self,
+        queue: str,
+        row_id: int,
+        *,
+        consumer_id: str,
+        lease_seconds: float,
+        now_ts: float | None,
+    ) -> bool:
+        table = self._queue_table(queue)
+        timestamp = time.time() if now_ts is None else now_ts
+        pending = " AND state='pending'" if queue == AGENT_MESSAGE_QUEUE else ""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"""
+                UPDATE {table}
+                SET lease_owner=?, lease_expires_at=?
+                WHERE id=?{pending}
+                  AND (lease_owner IS NULL OR lease_owner=? OR lease_expires_at<=?);
+                """,
+                (
+                    consumer_id,
+                    timestamp + lease_seconds,
+                    row_id,
+                    consumer_id,
+                    timestamp,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def _record_ack_latency(
+        self, conn: sqlite3.Connection, queue: str, row_ids: Sequence[int]
+    ) -> None:
+        table = self._queue_table(queue)
+        pending = " AND state='pending'" if queue == AGENT_MESSAGE_QUEUE else ""
+        now = time.time()
+        conn.executemany(
+            f"""
+            INSERT INTO queue_ack_latency(queue, acked_at, latency_seconds)
+            SELECT ?, ?, MAX(0.0, ? - queued_at) FROM {table} WHERE id=?{pending};
+            """,
+            [(queue, now, now, row_id) for row_id in row_ids],
+        )
+        conn.execute(
+            """
+            DELETE FROM queue_ack_latency
+            WHERE queue=? AND id <= (
+                SELECT id FROM queue_ack_latency
+                WHERE queue=?
+                ORDER BY id DESC
+                LIMIT 1 OFFSET ?
+            );
+            """,
+            (queue, queue, ACK_LATENCY_SAMPLE_LIMIT),
+        )
+
+    def _queue_table(self, queue: str) -> str:
+        table = self._QUEUE_TABLES.get(queue)
+        if table is None:
+            raise ValueError(f"Unknown runtime queue: {queue}")
+        return table
+
     def _read_agent_messages(self, *, state: str) -> list[QueuedAgentMessage]:
         with self._connect() as conn:
             rows = conn.execute(
                 """
                 SELECT id, recipient, sender, message_type, payload_json, idempotency_key,
-                       queued_at, attempts, next_attempt_at
+                       queued_at, attempts, next_attempt_at, lane, lease_owner,
+                       lease_expires_at
                 FROM queue_agent_messages
                 WHERE state=?
                 ORDER BY id ASC;
@@ -562,32 +1451,68 @@ class SQLiteRuntimeQueueBackend:
                     queued_at=float(row["queued_at"]),
                     attempts=int(row["attempts"]),
                     next_attempt_at=float(row["next_attempt_at"]),
+                    lane=(
+                        str(row["lane"]) if row["lane"] in QUEUE_LANES else LANE_CONTROL
+                    ),
+                    lease_owner=row["lease_owner"],
+                    lease_expires_at=float(row["lease_expires_at"]),
                 )
             )
         return messages
 
+    def close(self) -> None:
+        """Close every pooled connection; later calls reconnect lazily."""
+
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                continue
+        self._local = threading.local()
+
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self._db_path))
+        """Return this thread's pooled connection, opening it on first use.
+
+        Callers use it as ``with self._connect() as conn:`` which scopes a
+        transaction without closing the connection.
+        """
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+        # Each connection is only used by the thread that opened it; sharing
+        # is allowed so ``close()`` can release every thread's connection.
+        conn = sqlite3.connect(
+            str(self._db_path),
+            cached_statements=self._STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys=ON;")
         conn.execute("PRAGMA journal_mode=WAL;")
         conn.execute("PRAGMA busy_timeout=5000;")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        with self._connections_lock:
+            self._connections.append(conn)
         return conn
 
     def _ensure_schema(self) -> None:
         with self._connect() as conn:
-            conn.execute(
-                """
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS queue_suggestions (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     payload_text TEXT NOT NULL,
                     idempotency_key TEXT NOT NULL,
-                    queued_at REAL NOT NULL
+                    queued_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at REAL NOT NULL DEFAULT 0.0
                 );
-                """
-            )
-            conn.execute(
-                """
+                """)
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS queue_agent_messages (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     recipient TEXT NOT NULL,
@@ -601,23 +1526,69 @@ class SQLiteRuntimeQueueBackend:
                     state TEXT NOT NULL CHECK (state IN ('pending', 'dead_letter')),
                     last_error TEXT,
                     last_failed_at REAL,
-                    dead_lettered_at REAL
+                    dead_lettered_at REAL,
+                    lease_owner TEXT,
+                    lease_expires_at REAL NOT NULL DEFAULT 0.0,
+                    lane TEXT NOT NULL DEFAULT 'control'
                 );
-                """
-            )
-            conn.execute(
-                """
+                """)
+            for table in self._QUEUE_TABLES.values():
+                columns = {
+                    str(row["name"])
+                    for row in conn.execute(f"PRAGMA table_info({table});")
+                }
+                for column, definition in self._ADDED_COLUMNS.get(table, ()):
+                    if column not in columns:
+                        conn.execute(
+                            f"ALTER TABLE {table} ADD COLUMN {column} {definition};"
+                        )
+                conn.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table}_lease_owner
+                        ON {table}(lease_owner)
+                        WHERE lease_owner IS NOT NULL;
+                    """)
+            conn.execute("""
                 CREATE UNIQUE INDEX IF NOT EXISTS idx_queue_agent_pending_idempotency
                     ON queue_agent_messages(idempotency_key)
                     WHERE state='pending';
-                """
-            )
-            conn.execute(
-                """
+                """)
+            conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_queue_agent_state_next_attempt
                     ON queue_agent_messages(state, next_attempt_at, queued_at);
-                """
-            )
+                """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue_ack_latency (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    queue TEXT NOT NULL,
+                    acked_at REAL NOT NULL,
+                    latency_seconds REAL NOT NULL
+                );
+                """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_queue_ack_latency_queue
+                    ON queue_ack_latency(queue, id);
+                """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue_versions (
+                    queue TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                );
+                """)
+            for queue, table in self._QUEUE_TABLES.items():
+                conn.execute(
+                    "INSERT OR IGNORE INTO queue_versions(queue, version) VALUES (?, 0);",
+                    (queue,),
+                )
+                for operation in ("INSERT", "UPDATE", "DELETE"):
+                    conn.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS
+                            trg_{table}_{operation.lower()}_version
+                        AFTER {operation} ON {table}
+                        BEGIN
+                            UPDATE queue_versions SET version = version + 1
+                            WHERE queue = '{queue}';
+                        END;
+                        """)
 
     def _suggestion_token(self, suggestion_id: int) -> Path:
         return Path(f"{self._SUGGESTION_TOKEN_PREFIX}{suggestion_id}.json")
@@ -628,6 +1599,13 @@ class SQLiteRuntimeQueueBackend:
     def _agent_dead_token(self, message_id: int) -> Path:
         return Path(f"{self._AGENT_DEAD_TOKEN_PREFIX}{message_id}.json")
 
+    def _decode_tokens(self, paths: Sequence[Path], prefix: str) -> list[int]:
+        return [
+            row_id
+            for row_id in (self._decode_token(path, prefix) for path in paths)
+            if row_id is not None
+        ]
+
     @staticmethod
     def _decode_token(path: Path, prefix: str) -> int | None:
         token = path.name
@@ -662,18 +1640,149 @@ def build_runtime_queue_backend(
     raise ValueError(f"Unsupported runtime queue backend: {backend}")
 
 
+_BACKEND_CACHE_SIZE = 8
+_backend_cache_lock = threading.Lock()
+_backend_cache: OrderedDict[tuple[str, ...], RuntimeQueueBackend] = OrderedDict()
+
+
+def get_runtime_queue_backend(
+    *,
+    backend: str,
+    suggest_queue_dir: Path,
+    agent_message_queue_dir: Path,
+    agent_message_dead_letter_dir: Path,
+    sqlite_db_path: Path,
+) -> RuntimeQueueBackend:
+    """Return a process-wide backend, building it only when the config changes."""
+
+    normalized_backend = backend.strip().lower()
+    if normalized_backend == "sqlite":
+        key: tuple[str, ...] = (normalized_backend, str(sqlite_db_path))
+    else:
+        key = (
+            normalized_backend,
+            str(suggest_queue_dir),
+            str(agent_message_queue_dir),
+            str(agent_message_dead_letter_dir),
+        )
+    with _backend_cache_lock:
+        cached = _backend_cache.get(key)
+        if cached is not None:
+            _backend_cache.move_to_end(key)
+            return cached
+        created = build_runtime_queue_backend(
+            backend=backend,
+            suggest_queue_dir=suggest_queue_dir,
+            agent_message_queue_dir=agent_message_queue_dir,
+            agent_message_dead_letter_dir=agent_message_dead_letter_dir,
+            sqlite_db_path=sqlite_db_path,
+        )
+        _backend_cache[key] = created
+        while len(_backend_cache) > _BACKEND_CACHE_SIZE:
+            _, evicted = _backend_cache.popitem(last=False)
+            _close_backend(evicted)
+        return created
+
+
+def reset_runtime_queue_backend_cache() -> None:
+    """Drop cached backends and close their connections."""
+
+    with _backend_cache_lock:
+        backends = list(_backend_cache.values())
+        _backend_cache.clear()
+    for cached in backends:
+        _close_backend(cached)
+
+
+def _close_backend(backend: RuntimeQueueBackend) -> None:
+    close = getattr(backend, "close", None)
+    if callable(close):
+        close()
+
+
 def default_sqlite_queue_path() -> Path:
     """Default SQLite queue database path."""
 
     return resolve_data_path("runtime_queue.db")
 
 
+def build_queue_consumer_id() -> str:
+    """Return an identifier that is unique per queue consumer instance."""
+
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def load_queue_lease_seconds() -> float:
+    """Read the claim visibility timeout from the environment."""
+
+    raw = os.environ.get(QUEUE_LEASE_SECONDS_ENV)
+    if raw is None:
+        return DEFAULT_QUEUE_LEASE_SECONDS
+    try:
+        value = float(raw)
+    except ValueError:
+        return DEFAULT_QUEUE_LEASE_SECONDS
+    return value if value > 0 else DEFAULT_QUEUE_LEASE_SECONDS
+
+
+def _is_leased_by_other(
+    owner: str | None, expires_at: float, consumer_id: str, now: float
+) -> bool:
+    return owner is not None and owner != consumer_id and expires_at > now
+
+
+def _encode_lease(consumer_id: str, expires_at: float) -> str:
+    return json.dumps({"owner": consumer_id, "expires_at": expires_at})
+
+
+def _read_lease(path: Path) -> tuple[str | None, float]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None, 0.0
+    if not isinstance(data, dict):
+        return None, 0.0
+    owner = data.get("owner")
+    expires_at = data.get("expires_at")
+    return (
+        owner if isinstance(owner, str) and owner else None,
+        float(expires_at) if isinstance(expires_at, (int, float)) else 0.0,
+    )
+
+
 def _write_json_atomically(path: Path, payload: dict[str, Any]) -> None:
     tmp_path = path.with_suffix(".tmp")
-    tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp_path.write_text(
+        json.dumps(payload, separators=(",", ":"), ensure_ascii=False),
+        encoding="utf-8",
+    )
+    tmp_path.replace(path)
+
+
+def _write_text_atomically(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
     tmp_path.replace(path)
 
 
+def _read_json_object(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _read_idempotency_key(path: Path) -> str | None:
+    data = _read_json_object(path)
+    if data is None:
+        return None
+    idempotency_key = data.get("idempotency_key")
+    if isinstance(idempotency_key, str) and idempotency_key:
+        return idempotency_key
+    return None
+
+
 def _parse_agent_message(path: Path, data: dict[str, Any]) -> QueuedAgentMessage | None:
     recipient = data.get("recipient")
     message_type = data.get("message_type")
@@ -709,6 +1818,7 @@ def _parse_agent_message(path: Path, data: dict[str, Any]) -> QueuedAgentMessage
     next_attempt_at_value = (
         next_attempt_at if isinstance(next_attempt_at, (int, float)) else 0.0
     )
+    lane = data.get("lane")
     return QueuedAgentMessage(
         path=path,
         recipient=recipient,
@@ -719,6 +1829,7 @@ def _parse_agent_message(path: Path, data: dict[str, Any]) -> QueuedAgentMessage
         queued_at=queued_at_value,
         attempts=attempts_value,
         next_attempt_at=next_attempt_at_value,
+        lane=lane if lane in QUEUE_LANES else LANE_CONTROL,
     )
 
 
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+logger = logging.getLogger(__name__)
+
+ACK_LATENCY_SAMPLE_LIMIT = 1000
+# Attempts at or above this value share the last histogram bucket.
+ATTEMPT_HISTOGRAM_CAP = 5
+
+
+@dataclass(frozen=True)
+class QueueItemSample:
+    """Scheduling fields of one queued entry, without its payload."""
+
+    queued_at: float
+    recipient: str | None = None
+    lane: str | None = None
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    lease_owner: str | None = None
+    lease_expires_at: float = 0.0
+
+
+@dataclass(frozen=True)
+class QueueLatencySummary:
+    count: int = 0
+    p50_seconds: float | None = None
+    p90_seconds: float | None = None
+    p99_seconds: float | None = None
+    max_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class QueueHealth:
+    queue: str
+    depth_by_state: dict[str, int]
+    depth_by_recipient: dict[str, int] = field(default_factory=dict)
+    depth_by_lane: dict[str, int] = field(default_factory=dict)
+    attempts_histogram: dict[str, int] = field(default_factory=dict)
+    deferred: int = 0
+    leased: int = 0
+    oldest_queued_at: float | None = None
+    oldest_age_seconds: float | None = None
+    ack_latency: QueueLatencySummary = field(default_factory=QueueLatencySummary)
+
+    @property
+    def pending(self) -> int:
+        return self.depth_by_state.get("pending", 0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def summarize_queue(
+    queue: str,
+    *,
+    pending: Iterable[QueueItemSample],
+    dead_letter_count: int | None = None,
+    ack_latencies: Sequence[float] = (),
+    now: float | None = None,
+) -> QueueHealth:
+    """Aggregate pending entries and ack latencies into a health summary.
+
+    ``dead_letter_count`` is left out of ``depth_by_state`` when the queue has
+    no dead-letter state.
+    """
+
+    timestamp = time.time() if now is None else now
+    by_recipient: Counter[str] = Counter()
+    by_lane: Counter[str] = Counter()
+    attempts: Counter[str] = Counter()
+    pending_count = 0
+    deferred = 0
+    leased = 0
+    oldest: float | None = None
+    for item in pending:
+        pending_count += 1
+        if item.recipient is not None:
+            by_recipient[item.recipient] += 1
+        if item.lane is not None:
+            by_lane[item.lane] += 1
+        attempts[_attempt_bucket(item.attempts)] += 1
+        if item.next_attempt_at > timestamp:
+            deferred += 1
+        if item.lease_owner is not None and item.lease_expires_at > timestamp:
+            leased += 1
+        if oldest is None or item.queued_at < oldest:
+            oldest = item.queued_at
+    depth_by_state = {"pending": pending_count}
+    if dead_letter_count is not None:
+        depth_by_state["dead_letter"] = dead_letter_count
+    return QueueHealth(
+        queue=queue,
+        depth_by_state=depth_by_state,
+        depth_by_recipient=dict(by_recipient.most_common()),
+        depth_by_lane=dict(sorted(by_lane.items())),
+        attempts_histogram=dict(sorted(attempts.items(), key=_bucket_order)),
+        deferred=deferred,
+        leased=leased,
+        oldest_queued_at=oldest,
+        oldest_age_seconds=None if oldest is None else max(0.0, timestamp - oldest),
+        ack_latency=summarize_latencies(ack_latencies),
+    )
+
+
+def summarize_latencies(samples: Sequence[float]) -> QueueLatencySummary:
+    """Nearest-rank percentiles over recent enqueue-to-ack latencies."""
+
+    if not samples:
+        return QueueLatencySummary()
+    ordered = sorted(samples)
+    return QueueLatencySummary(
+        count=len(ordered),
+        p50_seconds=_percentile(ordered, 50),
+        p90_seconds=_percentile(ordered, 90),
+        p99_seconds=_percentile(ordered, 99),
+        max_seconds=ordered[-1],
+    )
+
+
+class AckLatencyLog:
+    """Bounded on-disk log of recent enqueue-to-ack latencies.
+
+    The file backend appends one line per ack, so consumers in other
+    processes (``cyberagent status``, the dashboard) can read the samples.
+    The file is trimmed back to ``limit`` lines once it doubles in size.
+    """
+
+    _LINE_BYTES_ESTIMATE = 24
+
+    def __init__(self, path: Path, *, limit: int = ACK_LATENCY_SAMPLE_LIMIT) -> None:
+        self._path = path
+        self._limit = limit
+
+    def record(self, latencies: Iterable[float]) -> None:
+        lines = "".join(f"{max(0.0, value):.6f}\n" for value in latencies)
+        if not lines:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as handle:
+                handle.write(lines)
+            if self._path.stat().st_size > 2 * self._limit * self._LINE_BYTES_ESTIMATE:
+                self._trim()
+        except OSError as exc:
+            logger.warning("Failed to record queue ack latency: %s", exc)
+
+    def read(self) -> list[float]:
+        try:
+            raw = self._path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return []
+        except OSError as exc:
+            logger.warning("Failed to read queue ack latency log: %s", exc)
+            return []
+        samples: list[float] = []
+        for line in raw.splitlines():
+            try:
+                samples.append(float(line))
+            except ValueError:
+                continue
+        return samples[-self._limit :]
+
+    def _trim(self) -> None:
+        samples = self.read()
+        # Several processes may trim at once; each needs its own temp file.
+        temp_name: str | None = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self._path.parent,
+                prefix=f".{self._path.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as handle:
+                temp_name = handle.name
+                handle.write("".join(f"{value:.6f}\n" for value in samples))
+            os.replace(temp_name, self._path)
+        except OSError:
+            if temp_name is not None:
+                Path(temp_name).unlink(missing_ok=True)
+            raise
+
+
+def render_queue_health_json(
+    health: Sequence[QueueHealth], *, backend: str, now: float | None = None
+) -> str:
+    """Serialise queue health as the JSON snapshot shared with the dashboard."""
+
+    return json.dumps(
+        build_queue_health_snapshot(health, backend=backend, now=now), indent=2
+    )
+
+
+def build_queue_health_snapshot(
+    health: Sequence[QueueHealth], *, backend: str, now: float | None = None
+) -> dict[str, Any]:
+    return {
+        "backend": backend,
+        "generated_at": time.time() if now is None else now,
+        "queues": [item.to_dict() for item in health],
+    }
+
+
+def _attempt_bucket(attempts: int) -> str:
+    if attempts >= ATTEMPT_HISTOGRAM_CAP:
+        return f"{ATTEMPT_HISTOGRAM_CAP}+"
+    return str(max(0, attempts))
+
+
+def _bucket_order(item: tuple[str, int]) -> int:
+    return int(item[0].rstrip("+"))
+
+
+def _percentile(ordered: Sequence[float], percent: float) -> float:
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
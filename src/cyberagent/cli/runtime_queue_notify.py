@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_QUEUE = "suggestion"
+AGENT_MESSAGE_QUEUE = "agent_message"
+
+# Safety-net poll interval while an inotify watch is active. Watches can be lost
+# (e.g. queue directory removed and recreated), so consumers still re-check the
+# cheap change token occasionally.
+WATCHED_IDLE_POLL_SECONDS = 5.0
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+@dataclass(frozen=True)
+class QueueWatchTarget:
+    """Directory whose entries signal queue changes, optionally filtered by name."""
+
+    directory: Path
+    name_prefix: str = ""
+    name_suffix: str = ""
+
+    def matches(self, name: str) -> bool:
+        return name.startswith(self.name_prefix) and name.endswith(self.name_suffix)
+
+
+_waiters_lock = threading.Lock()
+_waiters: dict[str, weakref.WeakSet[RuntimeQueueWaiter]] = {}
+
+
+def notify_queue_changed(queue: str) -> None:
+    """Wake in-process consumers waiting on ``queue``.
+
+    Safe to call from any thread; consumers in other processes rely on the
+    filesystem watch or change-token polling instead.
+    """
+
+    with _waiters_lock:
+        waiters = list(_waiters.get(queue, ()))
+    for waiter in waiters:
+        waiter.wake()
+
+
+class RuntimeQueueWaiter:
+    """Blocks a queue consumer until the queue changes, a timeout or stop."""
+
+    def __init__(
+        self,
+        *,
+        queue: str,
+        change_token: Callable[[], object],
+        watch_targets: Sequence[QueueWatchTarget] = (),
+        poll_seconds: float,
+        watched_poll_seconds: float = WATCHED_IDLE_POLL_SECONDS,
+    ) -> None:
+        self._queue = queue
+        self._change_token = change_token
+        self._watch_targets = tuple(watch_targets)
+        self._poll_seconds = poll_seconds
+        self._watched_poll_seconds = watched_poll_seconds
+        self._last_token: object = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event: asyncio.Event | None = None
+        self._watcher: _InotifyWatcher | None = None
+        self._closed = False
+        with _waiters_lock:
+            _waiters.setdefault(queue, weakref.WeakSet()).add(self)
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.active
+
+    def snapshot(self) -> None:
+        """Record the current change token; call right before reading the queue."""
+
+        self._last_token = self._read_token()
+
+    def wake(self) -> None:
+        loop = self._loop
+        event = self._event
+        if loop is None or event is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            return
+
+    async def wait(
+        self, stop_event: asyncio.Event, timeout: float | None = None
+    ) -> None:
+        """Return once the queue may have new work, ``timeout`` elapses or stop."""
+
+        self._bind_loop()
+        assert self._event is not None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not stop_event.is_set():
+            if self._watcher is not None:
+                self._watcher.refresh()
+            if self._event.is_set():
+                self._event.clear()
+                return
+            if self._read_token() != self._last_token:
+                return
+            interval = (
+                self._watched_poll_seconds if self.watching else self._poll_seconds
+            )
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                interval = min(interval, remaining)
+            await _wait_first(self._event, stop_event, interval)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        with _waiters_lock:
+            waiters = _waiters.get(self._queue)
+            if waiters is not None:
+                waiters.discard(self)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._event is not None:
+            return
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        self._loop = loop
+        self._event = asyncio.Event()
+        if self._watch_targets:
+            self._watcher = _InotifyWatcher.create(
+                loop=loop, targets=self._watch_targets, on_change=self._event.set
+            )
+
+    def _read_token(self) -> object:
+        try:
+            return self._change_token()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Failed to read %s queue change token: %s", self._queue, exc)
+            return None
+
+
+async def _wait_first(
+    event: asyncio.Event, stop_event: asyncio.Event, timeout: float
+) -> None:
+    if timeout <= 0:
+        await asyncio.sleep(0)
+        return
+    waiters = {
+        asyncio.ensure_future(event.wait()),
+        asyncio.ensure_future(stop_event.wait()),
+    }
+    try:
+        await asyncio.wait(
+            waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+class _InotifyWatcher:
+    """Minimal ctypes inotify binding attached to an asyncio loop (Linux only)."""
+
+    def __init__(
+        self,
+        *,
+        libc: ctypes.CDLL,
+        fd: int,
+        loop: asyncio.AbstractEventLoop,
+        targets: Sequence[QueueWatchTarget],
+        on_change: Callable[[], None],
+    ) -> None:
+        self._libc = libc
+        self._fd = fd
+        self._loop = loop
+        self._targets = tuple(targets)
+        self._on_change = on_change
+        self._watches: dict[int, QueueWatchTarget] = {}
+        self._loop.add_reader(self._fd, self._drain)
+        self.refresh()
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        targets: Sequence[QueueWatchTarget],
+        on_change: Callable[[], None],
+    ) -> _InotifyWatcher | None:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+            init = libc.inotify_init1
+        except (OSError, AttributeError):
+            return None
+        init.argtypes = [ctypes.c_int]
+        init.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        fd = init(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            logger.debug("inotify unavailable: errno=%s", ctypes.get_errno())
+            return None
+        try:
+            return cls(
+                libc=libc, fd=fd, loop=loop, targets=targets, on_change=on_change
+            )
+        except (NotImplementedError, OSError, RuntimeError) as exc:
+            # Some loops (e.g. Windows proactor) do not support add_reader.
+            logger.debug("inotify watcher could not attach to loop: %s", exc)
+            os.close(fd)
+            return None
+
+    @property
+    def active(self) -> bool:
+        return self._fd >= 0 and bool(self._watches)
+
+    def refresh(self) -> None:
+        """Add watches for targets whose directory did not exist before."""
+
+        if self._fd < 0 or len(self._watches) == len(self._targets):
+            return
+        watched = set(self._watches.values())
+        for target in self._targets:
+            if target in watched or not target.directory.is_dir():
+                continue
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(str(target.directory)), _WATCH_MASK
+            )
+            if wd < 0:
+                logger.debug(
+                    "inotify_add_watch failed for %s: errno=%s",
+                    target.directory,
+                    ctypes.get_errno(),
+                )
+                continue
+            self._watches[wd] = target
+
+    def close(self) -> None:
+        if self._fd < 0:
+            return
+        try:
+            self._loop.remove_reader(self._fd)
+        except (RuntimeError, ValueError):
+            pass
+        os.close(self._fd)
+        self._fd = -1
+        self._watches.clear()
+
+    def _drain(self) -> None:
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            except OSError as exc:
+                logger.debug("inotify read failed: %s", exc)
+                break
+            if not data:
+                break
+            changed = self._parse_events(data) or changed
+        if changed:
+            self._on_change()
+
+    def _parse_events(self, data: bytes) -> bool:
+        changed = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset : offset + name_len].rstrip(b"\0")
+            offset += name_len
+            target = self._watches.get(wd)
+            if target is None:
+                continue
+            if mask & _IN_IGNORED:
+                # Watched directory disappeared; refresh() re-adds it later.
+                self._watches.pop(wd, None)
+                changed = True
+                continue
+            name = os.fsdecode(raw_name)
+            if target.matches(name):
+                changed = True
+        return changed
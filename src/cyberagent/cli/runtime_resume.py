@@ -3,7 +3,11 @@ from __future__ import annotations
 import sqlite3
 import uuid
 
-from src.cyberagent.cli.agent_message_queue import enqueue_agent_message
+from src.cyberagent.cli.agent_message_queue import (
+    AgentMessageEnqueueRequest,
+    enqueue_agent_messages,
+)
+from src.cyberagent.cli.runtime_queue_backend import LANE_BACKFILL
 from src.cyberagent.core.agent_naming import normalize_message_source
 from src.cyberagent.db.init_db import get_database_path
 
@@ -17,7 +21,6 @@ def queue_in_progress_initiatives(team_id: int) -> int:
     for completed-but-unapproved tasks.
     """
     db_path = get_database_path()
-    queued = 0
     try:
         conn = sqlite3.connect(db_path)
         conn.row_factory = sqlite3.Row
@@ -65,8 +68,8 @@ def queue_in_progress_initiatives(team_id: int) -> int:
     except sqlite3.Error:
         return 0
 
-    for initiative_id in initiative_ids:
-        enqueue_agent_message(
+    requests = [
+        AgentMessageEnqueueRequest(
             recipient=recipient,
             sender="System4/root",
             message_type="initiative_assign",
@@ -79,11 +82,12 @@ def queue_in_progress_initiatives(team_id: int) -> int:
                 f"resume:team:{team_id}:initiative:{initiative_id}:"
                 f"{uuid.uuid4().hex}"
             ),
+            lane=LANE_BACKFILL,
         )
-        queued += 1
-
-    for task_id, assignee, review_content in review_tasks:
-        enqueue_agent_message(
+        for initiative_id in initiative_ids
+    ]
+    requests.extend(
+        AgentMessageEnqueueRequest(
             recipient=recipient,
             sender=assignee,
             message_type="task_review",
@@ -96,6 +100,11 @@ def queue_in_progress_initiatives(team_id: int) -> int:
             idempotency_key=(
                 f"resume:team:{team_id}:task_review:{task_id}:{uuid.uuid4().hex}"
             ),
+            lane=LANE_BACKFILL,
         )
-        queued += 1
-    return queued
+        for task_id, assignee, review_content in review_tasks
+    )
+    # One batch keeps startup resume to a single queue transaction; the backfill
+    # lane keeps it from delaying fresh control flow.
+    enqueue_agent_messages(requests)
+    return len(requests)
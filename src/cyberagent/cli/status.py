@@ -1,11 +1,18 @@
 import argparse
 import json
+import os
 import sqlite3
 from dataclasses import asdict, dataclass
-from typing import Iterable, Optional
+from typing import Iterable, Mapping, Optional
 
 from src.cyberagent.db.init_db import get_database_path, init_db
+from src.cyberagent.cli.agent_message_queue import read_agent_message_queue_health
 from src.cyberagent.cli.message_catalog import get_message
+from src.cyberagent.cli.runtime_queue_metrics import (
+    QueueHealth,
+    render_queue_health_json,
+)
+from src.cyberagent.cli.suggestion_queue import read_suggestion_queue_health
 
 TERMINAL_STATUSES = {"completed", "approved", "rejected"}
 START_COMMAND = "cyberagent start"
@@ -369,6 +376,97 @@ def render_status_json(teams: list[TeamView], *, include_details: bool = False)
     return json.dumps(compact, indent=2)
 
 
+def collect_queue_health(now_ts: Optional[float] = None) -> list[QueueHealth]:
+    """Read health summaries for the suggestion and agent-message queues."""
+    return [
+        read_suggestion_queue_health(now_ts=now_ts),
+        read_agent_message_queue_health(now_ts=now_ts),
+    ]
+
+
+def runtime_queue_backend_name() -> str:
+    return os.environ.get("CYBERAGENT_RUNTIME_QUEUE_BACKEND", "file")
+
+
+def _format_counts(counts: Mapping[str, int]) -> str:
+    if not counts:
+        return "-"
+    return ", ".join(f"{key}={value}" for key, value in counts.items())
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def render_queue_health(health: list[QueueHealth]) -> str:
+    """Render queue depth, age, attempts and ack latency for the terminal."""
+    lines = [
+        get_message("status", "queues_header", backend=runtime_queue_backend_name())
+    ]
+    for item in health:
+        lines.append(
+            get_message(
+                "status",
+                "queue_line",
+                queue=item.queue,
+                pending=item.pending,
+                deferred=item.deferred,
+                leased=item.leased,
+            )
+        )
+        if "dead_letter" in item.depth_by_state:
+            lines.append(
+                get_message(
+                    "status",
+                    "queue_dead_letter",
+                    count=item.depth_by_state["dead_letter"],
+                )
+            )
+        lines.append(
+            get_message(
+                "status",
+                "queue_oldest",
+                age=_format_seconds(item.oldest_age_seconds),
+            )
+        )
+        if item.depth_by_recipient:
+            lines.append(
+                get_message(
+                    "status",
+                    "queue_by_recipient",
+                    counts=_format_counts(item.depth_by_recipient),
+                )
+            )
+        if item.depth_by_lane:
+            lines.append(
+                get_message(
+                    "status",
+                    "queue_by_lane",
+                    counts=_format_counts(item.depth_by_lane),
+                )
+            )
+        lines.append(
+            get_message(
+                "status",
+                "queue_attempts",
+                counts=_format_counts(item.attempts_histogram),
+            )
+        )
+        latency = item.ack_latency
+        lines.append(
+            get_message(
+                "status",
+                "queue_ack_latency",
+                count=latency.count,
+                p50=_format_seconds(latency.p50_seconds),
+                p90=_format_seconds(latency.p90_seconds),
+                p99=_format_seconds(latency.p99_seconds),
+                max=_format_seconds(latency.max_seconds),
+            )
+        )
+    return "\n".join(lines)
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="main.py status",
@@ -382,12 +480,26 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Include truncated free-form fields (purpose content + descriptions).",
     )
+    parser.add_argument(
+        "--queues",
+        action="store_true",
+        help="Show runtime queue depth, age, retry attempts and ack latency.",
+    )
     return parser
 
 
 def main(argv: list[str]) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
+    if args.queues:
+        health = collect_queue_health()
+        if args.json:
+            print(
+                render_queue_health_json(health, backend=runtime_queue_backend_name())
+            )
+        else:
+            print(render_queue_health(health))
+        return 0
     init_db()
     status = collect_status(team_id=args.team, active_only=args.active_only)
     if args.json:
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Sequence
 
 from src.cyberagent.cli.runtime_queue_backend import (
     QueuedSuggestion,
-    build_runtime_queue_backend,
     default_sqlite_queue_path,
+    get_runtime_queue_backend,
 )
+from src.cyberagent.cli.runtime_queue_metrics import QueueHealth
+from src.cyberagent.cli.runtime_queue_notify import SUGGESTION_QUEUE, RuntimeQueueWaiter
 from src.cyberagent.core.paths import resolve_logs_path
 
 SUGGEST_QUEUE_DIR = resolve_logs_path("suggest_queue")
@@ -35,6 +38,62 @@ def ack_suggestion(path: Path) -> None:
     backend.ack_suggestion(path)
 
 
+def claim_suggestion(
+    path: Path,
+    *,
+    consumer_id: str,
+    lease_seconds: float,
+    now_ts: float | None = None,
+) -> bool:
+    """Lease a queued suggestion to ``consumer_id``; False if held elsewhere."""
+
+    backend = _build_backend()
+    return backend.claim_suggestion(
+        path, consumer_id=consumer_id, lease_seconds=lease_seconds, now_ts=now_ts
+    )
+
+
+def renew_suggestion_leases(*, consumer_id: str, lease_seconds: float) -> int:
+    """Extend every suggestion lease held by ``consumer_id``."""
+
+    backend = _build_backend()
+    return backend.renew_leases(
+        SUGGESTION_QUEUE, consumer_id=consumer_id, lease_seconds=lease_seconds
+    )
+
+
+def release_suggestion_leases(
+    *, consumer_id: str, paths: Sequence[Path] | None = None
+) -> int:
+    """Hand suggestions leased by ``consumer_id`` back to the queue."""
+
+    backend = _build_backend()
+    return backend.release_leases(
+        SUGGESTION_QUEUE, consumer_id=consumer_id, paths=paths
+    )
+
+
+def read_suggestion_queue_health(now_ts: float | None = None) -> QueueHealth:
+    """Summarise suggestion queue depth, age and ack latency."""
+
+    backend = _build_backend()
+    return backend.queue_health(SUGGESTION_QUEUE, now_ts=now_ts)
+
+
+def build_suggestion_queue_waiter(
+    poll_seconds: float = SUGGEST_QUEUE_POLL_SECONDS,
+) -> RuntimeQueueWaiter:
+    """Create a waiter that wakes the consumer when suggestions are enqueued."""
+
+    backend = _build_backend()
+    return RuntimeQueueWaiter(
+        queue=SUGGESTION_QUEUE,
+        change_token=lambda: backend.queue_change_token(SUGGESTION_QUEUE),
+        watch_targets=backend.queue_watch_targets(SUGGESTION_QUEUE),
+        poll_seconds=poll_seconds,
+    )
+
+
 def _build_backend():
     backend_name = os.environ.get("CYBERAGENT_RUNTIME_QUEUE_BACKEND", "file")
     sqlite_path = Path(
@@ -43,7 +102,7 @@ def _build_backend():
             str(default_sqlite_queue_path()),
         )
     )
-    return build_runtime_queue_backend(
+    return get_runtime_queue_backend(
         backend=backend_name,
         suggest_queue_dir=SUGGEST_QUEUE_DIR,
         agent_message_queue_dir=resolve_logs_path("agent_message_queue"),
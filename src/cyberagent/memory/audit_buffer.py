@@ -0,0 +1,280 @@
+"""Buffered memory audit sink that batches events into SQLite."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+
+from src.cyberagent.memory.models import MemoryAuditEvent
+
+_LOGGER = logging.getLogger(__name__)
+DEFAULT_MAX_BUFFER = 10000
+DEFAULT_FLUSH_THRESHOLD = 500
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+DEFAULT_RETENTION_SECONDS = 30 * 24 * 60 * 60
+PRUNE_INTERVAL_SECONDS = 60 * 60
+_AUDIT_FILENAME = "memory_audit.db"
+AUDIT_SINK_ENV_KEYS = (
+    "MEMORY_AUDIT_SINK",
+    "MEMORY_AUDIT_DB_PATH",
+    "MEMORY_AUDIT_FLUSH_THRESHOLD",
+    "MEMORY_AUDIT_FLUSH_INTERVAL_SECONDS",
+    "MEMORY_AUDIT_RETENTION_SECONDS",
+)
+_RETRIEVAL_ACTION = "memory_retrieval"
+
+
+@dataclass(slots=True)
+class BufferedMemoryAuditSink:
+    """Collect audit events in a ring buffer and write them in batches.
+
+    ``record`` only appends under a lock. A daemon thread flushes every
+    ``flush_interval_seconds`` or as soon as ``flush_threshold`` events are
+    waiting. Retrieval events that share a ``query_id`` are stored as one
+    row listing every returned entry. When the buffer is full the oldest
+    events are dropped and counted in ``dropped_count``; a batch that fails
+    to write is put back at the head of the buffer for the next flush.
+    Rows older than ``retention_seconds`` are pruned at most once per hour
+    (``0`` keeps them forever).
+    """
+
+    path: Path
+    max_buffer: int = DEFAULT_MAX_BUFFER
+    flush_threshold: int = DEFAULT_FLUSH_THRESHOLD
+    flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS
+    retention_seconds: float = DEFAULT_RETENTION_SECONDS
+    dropped_count: int = field(default=0, init=False)
+    written_count: int = field(default=0, init=False)
+    _buffer: deque[MemoryAuditEvent] = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _flush_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _wake: threading.Event = field(default_factory=threading.Event, init=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False)
+    _thread: threading.Thread | None = field(default=None, init=False)
+    _last_pruned_at: float | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self._buffer = deque(maxlen=max(1, self.max_buffer))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.path) as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS memory_audit_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    action TEXT NOT NULL,
+                    actor_id TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    namespace TEXT NOT NULL,
+                    resource_id TEXT NOT NULL,
+                    success INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    details_json TEXT NOT NULL
+                )
+                """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memory_audit_events_timestamp "
+                "ON memory_audit_events(timestamp)"
+            )
+            connection.commit()
+
+    def record(self, event: MemoryAuditEvent) -> None:
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped_count += 1
+            self._buffer.append(event)
+            backlog = len(self._buffer)
+        if backlog >= self.flush_threshold:
+            self._wake.set()
+
+    @property
+    def backlog(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self, now: float | None = None) -> int:
+        """Write every buffered event; return the number of rows stored."""
+
+        with self._flush_lock:
+            with self._lock:
+                events = list(self._buffer)
+                self._buffer.clear()
+            if not events:
+                return 0
+            rows = _aggregate(events)
+            try:
+                with sqlite3.connect(self.path, timeout=5.0) as connection:
+                    connection.executemany(
+                        """
+                        INSERT INTO memory_audit_events (
+                            action, actor_id, scope, namespace, resource_id,
+                            success, timestamp, details_json
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        rows,
+                    )
+                    connection.commit()
+                    self._maybe_prune(
+                        connection, now=time.time() if now is None else now
+                    )
+            except sqlite3.Error:
+                self._requeue(events)
+                raise
+            self.written_count += len(rows)
+            return len(rows)
+
+    def _requeue(self, events: list[MemoryAuditEvent]) -> None:
+        # Failed events go back in front of anything recorded meanwhile; if
+        # that overflows the ring, the oldest events are the ones dropped.
+        with self._lock:
+            combined = events + list(self._buffer)
+            overflow = max(0, len(combined) - (self._buffer.maxlen or 0))
+            self.dropped_count += overflow
+            self._buffer.clear()
+            self._buffer.extend(combined[overflow:])
+
+    def _maybe_prune(self, connection: sqlite3.Connection, *, now: float) -> None:
+        if self.retention_seconds <= 0:
+            return
+        last = self._last_pruned_at
+        if last is not None and now - last < PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_pruned_at = now
+        cutoff = datetime.fromtimestamp(now - self.retention_seconds, timezone.utc)
+        try:
+            connection.execute(
+                "DELETE FROM memory_audit_events WHERE timestamp < ?",
+                (cutoff.isoformat(),),
+            )
+            connection.commit()
+        except sqlite3.Error as exc:
+            _LOGGER.warning("Memory audit prune failed: %s", exc)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="memory-audit-flusher", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        try:
+            self.flush()
+        except sqlite3.Error as exc:  # pragma: no cover - sqlite failures
+            _LOGGER.warning("Memory audit flush failed: %s", exc)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as exc:  # pragma: no cover - sqlite failures
+                _LOGGER.warning("Memory audit flush failed: %s", exc)
+
+
+def _aggregate(
+    events: Sequence[MemoryAuditEvent],
+) -> list[tuple[str, str, str, str, str, int, str, str]]:
+    rows: list[tuple[str, str, str, str, str, int, str, str]] = []
+    retrievals: dict[str, tuple[int, MemoryAuditEvent, dict[str, list[str]]]] = {}
+    for event in events:
+        query_id = event.details.get("query_id")
+        if event.action != _RETRIEVAL_ACTION or not query_id:
+            rows.append(_row(event, event.resource_id, dict(event.details)))
+            continue
+        if query_id not in retrievals:
+            retrievals[query_id] = (len(rows), event, {})
+            rows.append(_row(event, "", {}))
+        targets = retrievals[query_id][2]
+        targets.setdefault(f"{event.scope.value}:{event.namespace}", []).append(
+            event.resource_id
+        )
+    for query_id, (position, first, targets) in retrievals.items():
+        entry_ids = [entry_id for ids in targets.values() for entry_id in ids]
+        rows[position] = _row(
+            first,
+            "",
+            {"query_id": query_id, "entry_ids": entry_ids, "targets": targets},
+        )
+    return rows
+
+
+def _row(
+    event: MemoryAuditEvent, resource_id: str, details: dict[str, object]
+) -> tuple[str, str, str, str, str, int, str, str]:
+    return (
+        event.action,
+        event.actor_id,
+        event.scope.value,
+        event.namespace,
+        resource_id,
+        int(event.success),
+        event.timestamp.isoformat(),
+        json.dumps(details),
+    )
+
+
+def build_memory_audit_sink(sqlite_path: str) -> BufferedMemoryAuditSink | None:
+    """Start a buffered sink unless ``MEMORY_AUDIT_SINK`` selects ``log``.
+
+    Events go to ``memory_audit.db`` next to the memory database unless
+    ``MEMORY_AUDIT_DB_PATH`` points elsewhere.
+    """
+
+    mode = os.environ.get("MEMORY_AUDIT_SINK", "buffered").lower()
+    if mode == "log":
+        return None
+    if mode != "buffered":
+        raise ValueError("MEMORY_AUDIT_SINK must be 'buffered' or 'log'.")
+    threshold_raw = os.environ.get(
+        "MEMORY_AUDIT_FLUSH_THRESHOLD", str(DEFAULT_FLUSH_THRESHOLD)
+    )
+    interval_raw = os.environ.get(
+        "MEMORY_AUDIT_FLUSH_INTERVAL_SECONDS", str(DEFAULT_FLUSH_INTERVAL_SECONDS)
+    )
+    try:
+        threshold = int(threshold_raw)
+    except ValueError as exc:
+        raise ValueError("MEMORY_AUDIT_FLUSH_THRESHOLD must be an integer.") from exc
+    try:
+        interval = float(interval_raw)
+    except ValueError as exc:
+        raise ValueError(
+            "MEMORY_AUDIT_FLUSH_INTERVAL_SECONDS must be a number."
+        ) from exc
+    if interval <= 0:
+        raise ValueError("MEMORY_AUDIT_FLUSH_INTERVAL_SECONDS must be positive.")
+    retention_raw = os.environ.get(
+        "MEMORY_AUDIT_RETENTION_SECONDS", str(DEFAULT_RETENTION_SECONDS)
+    )
+    try:
+        retention = float(retention_raw)
+    except ValueError as exc:
+        raise ValueError("MEMORY_AUDIT_RETENTION_SECONDS must be a number.") from exc
+    path = os.environ.get("MEMORY_AUDIT_DB_PATH") or str(
+        Path(sqlite_path).with_name(_AUDIT_FILENAME)
+    )
+    sink = BufferedMemoryAuditSink(
+        Path(path),
+        flush_threshold=max(1, threshold),
+        flush_interval_seconds=interval,
+        retention_seconds=retention,
+    )
+    sink.start()
+    return sink
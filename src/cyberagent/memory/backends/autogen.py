@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Sequence
 from uuid import uuid4
 
 from autogen_core.memory import Memory, MemoryContent, MemoryMimeType
@@ -44,6 +44,28 @@ class AutoGenMemoryStore(MemoryStore):
                 return entry
         return None
 
+    def get_many(
+        self,
+        entry_ids: Sequence[str],
+        scope: MemoryScope,
+        namespace: str,
+        *,
+        layer: MemoryLayer | None = None,
+        owner_agent_id: str | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> list[MemoryEntry]:
+        wanted = dict.fromkeys(entry_ids)
+        by_id = {
+            entry.id: entry
+            for entry in self._query_all(
+                scope=scope, namespace=namespace, owner_agent_id=owner_agent_id
+            )
+            if entry.id in wanted
+            and (layer is None or entry.layer == layer)
+            and set(tags or ()).issubset(entry.tags)
+        }
+        return [by_id[entry_id] for entry_id in wanted if entry_id in by_id]
+
     def update(self, entry: MemoryEntry) -> MemoryEntry:
         raise NotImplementedError("AutoGen memory does not support updates.")
 
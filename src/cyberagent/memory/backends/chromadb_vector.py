@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from typing import Any
+from pathlib import Path
+from typing import Any, Sequence
 
 from autogen_core.memory import MemoryContent, MemoryMimeType
 
@@ -12,6 +13,8 @@ from src.cyberagent.memory.backends.chromadb import ChromaDBMemoryFactory
 from src.cyberagent.memory.backends.vector_index import MemoryVectorIndex
 from src.cyberagent.memory.models import MemoryEntry
 
+_DEFAULT_EMBEDDER_ID = "chroma-default"
+
 
 @dataclass(slots=True)
 class ChromaDBVectorIndex(MemoryVectorIndex):
@@ -24,19 +27,24 @@ class ChromaDBVectorIndex(MemoryVectorIndex):
         self._memory = factory.create_memory(config=self.config)
 
     def upsert(self, entry: MemoryEntry) -> None:
-        content = MemoryContent(
-            content=entry.content,
-            mime_type=MemoryMimeType.TEXT,
-            metadata={
-                "id": entry.id,
-                "scope": entry.scope.value,
-                "namespace": entry.namespace,
-                "owner_agent_id": entry.owner_agent_id,
-                "tags": list(entry.tags),
-                "layer": entry.layer.value,
-            },
+        self.upsert_many([entry])
+
+    def upsert_many(self, entries: Sequence[MemoryEntry]) -> None:
+        if not entries:
+            return
+        collection = self._collection()
+        if collection is None:
+            # Memories without a Chroma collection only expose ``add``.
+            for entry in entries:
+                _run_async(self._memory.add(_content(entry)))
+            return
+        # One call embeds and writes the whole batch. Entry ids double as
+        # Chroma ids, so re-upserting an entry replaces its vector.
+        collection.upsert(
+            ids=[entry.id for entry in entries],
+            documents=[entry.content for entry in entries],
+            metadatas=[_content(entry).metadata for entry in entries],
         )
-        _run_async(self._memory.add(content))
 
     def delete(self, entry_id: str) -> None:
         # AutoGen Memory protocol does not support deletes; rely on record store filter.
@@ -52,6 +60,50 @@ class ChromaDBVectorIndex(MemoryVectorIndex):
                 break
         return ids
 
+    def _collection(self) -> Any | None:
+        ensure_initialized = getattr(self._memory, "_ensure_initialized", None)
+        if ensure_initialized is None:
+            return None
+        ensure_initialized()
+        return getattr(self._memory, "_collection", None)
+
+
+def cached_default_embedding_function(*, cache_path: str, max_entries: int) -> Any:
+    """Chroma's default embedding function behind the shared embedding cache."""
+
+    from chromadb.utils import embedding_functions
+
+    from src.cyberagent.memory.backends.embedding_cache import (
+        CachedEmbedder,
+        CachedEmbeddingFunction,
+        EmbeddingCache,
+        FunctionEmbedder,
+    )
+
+    return CachedEmbeddingFunction(
+        CachedEmbedder(
+            FunctionEmbedder(embedding_functions.DefaultEmbeddingFunction()),
+            EmbeddingCache(Path(cache_path), max_entries=max_entries),
+            embedder_id=_DEFAULT_EMBEDDER_ID,
+        )
+    )
+
+
+def _content(entry: MemoryEntry) -> MemoryContent:
+    return MemoryContent(
+        content=entry.content,
+        mime_type=MemoryMimeType.TEXT,
+        metadata={
+            "id": entry.id,
+            "scope": entry.scope.value,
+            "namespace": entry.namespace,
+            "owner_agent_id": entry.owner_agent_id,
+            "tags": list(entry.tags),
+            "layer": entry.layer.value,
+            "mime_type": str(MemoryMimeType.TEXT),
+        },
+    )
+
 
 def _run_async(coro):  # type: ignore[no-untyped-def]
     try:
@@ -0,0 +1,244 @@
+"""Content-hash embedding cache shared by document and query embeddings."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from src.cyberagent.memory.backends.local_vector import MemoryEmbedder
+
+_LOGGER = logging.getLogger(__name__)
+DEFAULT_MAX_ENTRIES = 50000
+_HOT_ENTRIES = 1024
+_EVICTION_CHECK_INTERVAL = 256
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class EmbeddingCache:
+    """SQLite-backed vector cache keyed by ``(embedder_id, content hash)``.
+
+    ``last_used`` is refreshed on every hit. Every few hundred inserts the
+    table size is checked and the least recently used rows beyond
+    ``max_entries`` are evicted.
+    """
+
+    path: Path
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _puts_since_check: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    embedder_id TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (embedder_id, content_hash)
+                ) WITHOUT ROWID
+                """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used "
+                "ON embedding_cache(last_used)"
+            )
+            connection.commit()
+
+    def get_many(
+        self, embedder_id: str, hashes: Sequence[str]
+    ) -> dict[str, np.ndarray]:
+        if not hashes:
+            return {}
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                """
+                SELECT content_hash, vector FROM embedding_cache
+                WHERE embedder_id = ?
+                AND content_hash IN (SELECT value FROM json_each(?))
+                """,
+                (embedder_id, json.dumps(list(hashes))),
+            ).fetchall()
+            if rows:
+                connection.execute(
+                    """
+                    UPDATE embedding_cache SET last_used = ?
+                    WHERE embedder_id = ?
+                    AND content_hash IN (SELECT value FROM json_each(?))
+                    """,
+                    (time.time(), embedder_id, json.dumps([row[0] for row in rows])),
+                )
+                connection.commit()
+        return {
+            str(row[0]): np.frombuffer(row[1], dtype=np.float32).copy() for row in rows
+        }
+
+    def put_many(self, embedder_id: str, vectors: dict[str, np.ndarray]) -> None:
+        if not vectors:
+            return
+        now = time.time()
+        with self._lock, self._connect() as connection:
+            connection.executemany(
+                """
+                INSERT OR REPLACE INTO embedding_cache
+                    (embedder_id, content_hash, vector, last_used)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (
+                        embedder_id,
+                        key,
+                        np.asarray(vector, dtype=np.float32).tobytes(),
+                        now,
+                    )
+                    for key, vector in vectors.items()
+                ],
+            )
+            self._puts_since_check += len(vectors)
+            if self._puts_since_check >= _EVICTION_CHECK_INTERVAL:
+                self._puts_since_check = 0
+                self._evict(connection)
+            connection.commit()
+
+    def evict(self) -> int:
+        with self._lock, self._connect() as connection:
+            removed = self._evict(connection)
+            connection.commit()
+        return removed
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        count = int(
+            connection.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        )
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        connection.execute(
+            """
+            DELETE FROM embedding_cache WHERE (embedder_id, content_hash) IN (
+                SELECT embedder_id, content_hash FROM embedding_cache
+                ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (excess,),
+        )
+        return excess
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+
+@dataclass(slots=True)
+class CachedEmbedder:
+    """Embedder wrapper that only embeds texts missing from the cache.
+
+    A small in-process LRU sits in front of the on-disk cache so repeated
+    query text (the same prompt searched once per scope) skips SQLite too.
+    """
+
+    embedder: MemoryEmbedder
+    cache: EmbeddingCache
+    embedder_id: str
+    _hot: OrderedDict[str, np.ndarray] = field(default_factory=OrderedDict, init=False)
+    _hot_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @property
+    def dimension(self) -> int:
+        return self.embedder.dimension
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        hashes = [content_hash(text) for text in texts]
+        found = self._hot_lookup(hashes)
+        cold = [key for key in dict.fromkeys(hashes) if key not in found]
+        if cold:
+            try:
+                found.update(self.cache.get_many(self.embedder_id, cold))
+            except sqlite3.Error as exc:
+                _LOGGER.warning("Embedding cache read failed: %s", exc)
+        missing = {key: text for key, text in zip(hashes, texts) if key not in found}
+        if missing:
+            fresh = np.asarray(
+                self.embedder.embed(list(missing.values())), dtype=np.float32
+            )
+            computed = dict(zip(missing, fresh))
+            found.update(computed)
+            try:
+                self.cache.put_many(self.embedder_id, computed)
+            except sqlite3.Error as exc:
+                _LOGGER.warning("Embedding cache write failed: %s", exc)
+        self._hot_store(found)
+        if not hashes:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        # Built from the vectors themselves so a full cache hit never has to
+        # ask the wrapped embedder for its dimension.
+        return np.stack([found[key] for key in hashes]).astype(np.float32)
+
+    def _hot_lookup(self, hashes: Sequence[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        with self._hot_lock:
+            for key in hashes:
+                vector = self._hot.get(key)
+                if vector is not None:
+                    self._hot.move_to_end(key)
+                    found[key] = vector
+        return found
+
+    def _hot_store(self, vectors: dict[str, np.ndarray]) -> None:
+        with self._hot_lock:
+            for key, vector in vectors.items():
+                self._hot[key] = vector
+                self._hot.move_to_end(key)
+            while len(self._hot) > _HOT_ENTRIES:
+                self._hot.popitem(last=False)
+
+
+@dataclass(slots=True)
+class FunctionEmbedder:
+    """``MemoryEmbedder`` over a Chroma-style ``function(texts) -> vectors``.
+
+    The dimension is learned from the first batch the function returns.
+    """
+
+    function: Callable[[list[str]], Any]
+    _dimension: int | None = field(default=None, init=False)
+
+    @property
+    def dimension(self) -> int:
+        if self._dimension is None:
+            self.embed([""])
+        assert self._dimension is not None
+        return self._dimension
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.asarray(self.function(list(texts)), dtype=np.float32)
+        if vectors.ndim == 2:
+            self._dimension = int(vectors.shape[1])
+        return vectors
+
+
+@dataclass(slots=True)
+class CachedEmbeddingFunction:
+    """Chroma embedding function that serves repeated texts from the cache.
+
+    Chroma calls it for both upserted documents and query texts, so the
+    same content is only embedded once across writes and searches.
+    """
+
+    embedder: CachedEmbedder
+
+    def __call__(self, input: Sequence[str]) -> list[list[float]]:
+        return self.embedder.embed(list(input)).tolist()
@@ -3,10 +3,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Sequence
 
 from src.cyberagent.memory.backends.vector_index import MemoryVectorIndex
-from src.cyberagent.memory.models import MemoryEntry, MemoryListResult, MemoryQuery
-from src.cyberagent.memory.store import MemoryStore
+from src.cyberagent.memory.fusion import reciprocal_rank_fusion
+from src.cyberagent.memory.models import (
+    MemoryEntry,
+    MemoryLayer,
+    MemoryListResult,
+    MemoryQuery,
+    MemoryQueryTarget,
+    MemoryScope,
+)
+from src.cyberagent.memory.store import (
+    MemoryStore,
+    ExpiringMemoryStore,
+    MultiTargetMemoryStore,
+    PrunableMemoryStore,
+)
 
 _CURSOR_PREFIX = "offset:"
 
@@ -18,6 +33,13 @@ class HybridMemoryStore(MemoryStore):
     record_store: MemoryStore
     vector_index: MemoryVectorIndex
 
+    def close(self) -> None:
+        """Flush and stop a write-behind vector index, if there is one."""
+
+        close = getattr(self.vector_index, "close", None)
+        if callable(close):
+            close()
+
     def add(self, entry: MemoryEntry) -> MemoryEntry:
         created = self.record_store.add(entry)
         self.vector_index.upsert(entry)
@@ -26,6 +48,9 @@ class HybridMemoryStore(MemoryStore):
     def get(self, entry_id: str, scope, namespace):  # type: ignore[override]
         return self.record_store.get(entry_id, scope, namespace)
 
+    def get_many(self, entry_ids, scope, namespace, **filters):  # type: ignore[override]
+        return self.record_store.get_many(entry_ids, scope, namespace, **filters)
+
     def update(self, entry: MemoryEntry) -> MemoryEntry:
         updated = self.record_store.update(entry)
         self.vector_index.upsert(entry)
@@ -44,21 +69,155 @@ class HybridMemoryStore(MemoryStore):
         vector_ids = self.vector_index.query(query.text, query.limit)
         merged = list(keyword_result.items)
         seen = {entry.id for entry in merged}
-        for entry_id in vector_ids:
-            if entry_id in seen:
-                continue
-            entry = self.record_store.get(entry_id, query.scope, query.namespace)
-            if entry is None:
-                continue
-            if query.layer and entry.layer != query.layer:
-                continue
-            if query.owner_agent_id and entry.owner_agent_id != query.owner_agent_id:
-                continue
-            if query.tags and not set(query.tags).issubset(set(entry.tags)):
-                continue
-            merged.append(entry)
-            seen.add(entry_id)
-        return _slice_entries(merged, query.limit, query.cursor)
+        merged.extend(
+            self.record_store.get_many(
+                [entry_id for entry_id in vector_ids if entry_id not in seen],
+                query.scope,
+                query.namespace,
+                layer=query.layer,
+                owner_agent_id=query.owner_agent_id,
+                tags=query.tags,
+            )
+        )
+        result = _slice_entries(merged, query.limit, query.cursor)
+        result.snippets = {
+            entry.id: keyword_result.snippets[entry.id]
+            for entry in result.items
+            if entry.id in keyword_result.snippets
+        }
+        return result
+
+    def query_targets(
+        self,
+        text: str | None,
+        targets: Sequence[MemoryQueryTarget],
+        *,
+        layer: MemoryLayer | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> list[MemoryListResult]:
+        """Keyword-rank all targets in one call and share one vector query.
+
+        Per target, keyword and vector rankings are merged with
+        reciprocal-rank fusion and cut to the target's limit.
+        """
+
+        keyword_results = self._keyword_targets(text, targets, layer=layer, tags=tags)
+        if not text or not targets:
+            return keyword_results
+        vector_ids = self.vector_index.query(
+            text, sum(target.limit for target in targets)
+        )
+        results: list[MemoryListResult] = []
+        for target, keyword_result in zip(targets, keyword_results):
+            vector_entries = (
+                self.record_store.get_many(
+                    vector_ids,
+                    target.scope,
+                    target.namespace,
+                    layer=layer,
+                    owner_agent_id=target.owner_agent_id,
+                    tags=tags,
+                )
+                if vector_ids
+                else []
+            )
+            fused = reciprocal_rank_fusion([keyword_result.items, vector_entries])
+            items = fused[: target.limit]
+            results.append(
+                MemoryListResult(
+                    items=items,
+                    next_cursor=None,
+                    has_more=False,
+                    snippets={
+                        entry.id: keyword_result.snippets[entry.id]
+                        for entry in items
+                        if entry.id in keyword_result.snippets
+                    },
+                )
+            )
+        return results
+
+    def _keyword_targets(
+        self,
+        text: str | None,
+        targets: Sequence[MemoryQueryTarget],
+        *,
+        layer: MemoryLayer | None,
+        tags: Sequence[str] | None,
+    ) -> list[MemoryListResult]:
+        if isinstance(self.record_store, MultiTargetMemoryStore):
+            return self.record_store.query_targets(
+                text, targets, layer=layer, tags=tags
+            )
+        results: list[MemoryListResult] = []
+        for target in targets:
+            result = self.record_store.query(
+                MemoryQuery(
+                    text=text,
+                    scope=target.scope,
+                    namespace=target.namespace,
+                    limit=target.limit,
+                    layer=layer,
+                    tags=tags,
+                    owner_agent_id=target.owner_agent_id,
+                )
+            )
+            results.append(
+                MemoryListResult(
+                    items=result.items,
+                    next_cursor=None,
+                    has_more=False,
+                    snippets=result.snippets,
+                )
+            )
+        return results
+
+    def count_entries(
+        self,
+        scope: MemoryScope,
+        namespace: str,
+        owner_agent_id: str | None = None,
+    ) -> int:
+        return self._prunable_records().count_entries(scope, namespace, owner_agent_id)
+
+    def prune_namespace(
+        self,
+        scope: MemoryScope,
+        namespace: str,
+        *,
+        max_entries: int,
+        owner_agent_id: str | None = None,
+        now: datetime | None = None,
+    ) -> list[str]:
+        deleted = self._prunable_records().prune_namespace(
+            scope,
+            namespace,
+            max_entries=max_entries,
+            owner_agent_id=owner_agent_id,
+            now=now,
+        )
+        for entry_id in deleted:
+            self.vector_index.delete(entry_id)
+        return deleted
+
+    def delete_expired(
+        self, *, limit: int, now: datetime | None = None
+    ) -> list[MemoryEntry]:
+        if not isinstance(self.record_store, ExpiringMemoryStore):
+            return []
+        deleted = self.record_store.delete_expired(limit=limit, now=now)
+        for entry in deleted:
+            self.vector_index.delete(entry.id)
+        return deleted
+
+    @property
+    def supports_sql_pruning(self) -> bool:
+        return isinstance(self.record_store, PrunableMemoryStore)
+
+    def _prunable_records(self) -> PrunableMemoryStore:
+        if not isinstance(self.record_store, PrunableMemoryStore):
+            raise TypeError("record store does not support namespace pruning")
+        return self.record_store
 
     def list(self, scope, namespace, limit, cursor, owner_agent_id=None):  # type: ignore[override]
         return self.record_store.list(scope, namespace, limit, cursor, owner_agent_id)
@@ -0,0 +1,424 @@
+"""In-process vector index backed by a memory-mapped float32 matrix."""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol, Sequence, cast
+
+import numpy as np
+
+from src.cyberagent.memory.backends.vector_index import MemoryVectorIndex
+from src.cyberagent.memory.models import MemoryEntry
+
+_LOGGER = logging.getLogger(__name__)
+_MATRIX_FILENAME = "vectors.f32"
+_IDS_FILENAME = "ids.json"
+_IDS_LOG_FILENAME = "ids.log"
+_MIN_CAPACITY = 256
+_TOKEN_PATTERN = re.compile(r"\w+")
+_KMEANS_ITERATIONS = 8
+_KMEANS_SAMPLE_ROWS = 16384
+
+
+class MemoryEmbedder(Protocol):
+    """Turns text into fixed-size vectors for the local index."""
+
+    @property
+    def dimension(self) -> int: ...
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a ``(len(texts), dimension)`` float32 matrix."""
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class HashingEmbedder:
+    """Dependency-free embedder using signed feature hashing.
+
+    Words and character trigrams are hashed into ``dimension`` buckets, so
+    texts that share vocabulary or word fragments land close together. It
+    needs no model download, which makes it the default local embedder.
+    """
+
+    dimension: int = 384
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in _hash_features(text):
+                bucket = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if bucket & 0x80000000 else -1.0
+                matrix[row, bucket % self.dimension] += sign * weight
+        return matrix
+
+
+def load_embedder(spec: str) -> MemoryEmbedder:
+    """Resolve ``hashing``, ``hashing:<dimension>`` or ``module.path:factory``.
+
+    A dotted factory is called with no arguments and must return an object
+    with ``dimension`` and ``embed``, e.g. a wrapper around a local
+    sentence-transformers model.
+    """
+
+    name, _, argument = spec.strip().partition(":")
+    if name in {"", "hashing"}:
+        return HashingEmbedder(int(argument)) if argument else HashingEmbedder()
+    if not argument:
+        raise ValueError(f"Unsupported memory embedder '{spec}'.")
+    factory = getattr(importlib.import_module(name), argument)
+    return cast(MemoryEmbedder, factory())
+
+
+@dataclass(slots=True)
+class LocalVectorIndex(MemoryVectorIndex):
+    """Exact (or IVF-approximate) cosine search over a memory-mapped matrix.
+
+    Row ``i`` of ``vectors.f32`` holds the normalised embedding of the id at
+    position ``i`` in ``ids.json``; deleted rows are zeroed and reused. A query
+    is one matrix-vector product plus ``argpartition`` for the top-k.
+
+    Row assignments are appended to ``ids.log`` as ``[row, id]`` lines, so a
+    write costs the rows it touches rather than a rewrite of the id map. The
+    log is folded back into ``ids.json`` once it reaches half the map's size,
+    which keeps the full rewrite amortised over many writes.
+
+    When ``ivf_lists`` is set and the index holds at least ``ivf_min_rows``
+    rows, queries probe only the ``ivf_probe`` closest k-means clusters. The
+    clustering is rebuilt lazily once the index has grown by half since the
+    last build. The files are meant for one writer process; other processes
+    replay its log as it grows and reload when ``ids.json`` is replaced.
+    """
+
+    path: Path
+    embedder: MemoryEmbedder = field(default_factory=HashingEmbedder)
+    ivf_lists: int = 0
+    ivf_probe: int = 8
+    ivf_min_rows: int = 4096
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _matrix: np.memmap | None = field(default=None, init=False)
+    _ids: list[str | None] = field(default_factory=list, init=False)
+    _rows: dict[str, int] = field(default_factory=dict, init=False)
+    _free_rows: list[int] = field(default_factory=list, init=False)
+    _ids_mtime_ns: int = field(default=0, init=False)
+    _log_offset: int = field(default=0, init=False)
+    _log_entries: int = field(default=0, init=False)
+    _centroids: np.ndarray | None = field(default=None, init=False)
+    _assignments: np.ndarray | None = field(default=None, init=False)
+    _clustered_rows: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._load()
+
+    @property
+    def size(self) -> int:
+        return len(self._rows)
+
+    def indexed_ids(self) -> set[str]:
+        with self._lock:
+            self._reload_if_changed()
+            return set(self._rows)
+
+    def upsert(self, entry: MemoryEntry) -> None:
+        self.upsert_many([entry])
+
+    def upsert_many(self, entries: Sequence[MemoryEntry]) -> None:
+        if not entries:
+            return
+        vectors = _normalise(
+            self.embedder.embed([_entry_text(entry) for entry in entries])
+        )
+        with self._lock:
+            self._reload_if_changed()
+            changes: list[tuple[int, str | None]] = []
+            for entry, vector in zip(entries, vectors):
+                row = self._rows.get(entry.id)
+                if row is None:
+                    row = self._allocate_row(entry.id)
+                    changes.append((row, entry.id))
+                matrix = self._require_matrix()
+                matrix[row] = vector
+                if self._assignments is not None and row < len(self._assignments):
+                    self._assignments[row] = self._nearest_centroid(vector)
+            self._require_matrix().flush()
+            self._append_log(changes)
+
+    def delete(self, entry_id: str) -> None:
+        with self._lock:
+            self._reload_if_changed()
+            row = self._rows.pop(entry_id, None)
+            if row is None:
+                return
+            self._require_matrix()[row] = 0.0
+            self._ids[row] = None
+            self._free_rows.append(row)
+            self._require_matrix().flush()
+            self._append_log([(row, None)])
+
+    def query(self, text: str, limit: int) -> list[str]:
+        if limit <= 0:
+            return []
+        vector = _normalise(self.embedder.embed([text]))[0]
+        if not np.any(vector):
+            return []
+        with self._lock:
+            self._reload_if_changed()
+            if not self._rows or self._matrix is None:
+                return []
+            candidates = self._candidate_rows(vector)
+            if candidates is None:
+                scores = self._matrix[: len(self._ids)] @ vector
+                rows = np.arange(len(scores))
+            else:
+                scores = self._matrix[candidates] @ vector
+                rows = candidates
+            # Deleted rows are zeroed, so they never score above zero.
+            scores = np.where(scores > 0.0, scores, -np.inf)
+            top = min(limit, int(np.count_nonzero(np.isfinite(scores))))
+            if top == 0:
+                return []
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            ids = (self._ids[int(rows[index])] for index in best)
+            return [entry_id for entry_id in ids if entry_id is not None]
+
+    def _candidate_rows(self, vector: np.ndarray) -> np.ndarray | None:
+        if self.ivf_lists <= 0 or len(self._rows) < self.ivf_min_rows:
+            return None
+        if self._centroids is None or len(self._ids) > 1.5 * self._clustered_rows:
+            self._build_clusters()
+        assert self._centroids is not None and self._assignments is not None
+        probe = min(self.ivf_probe, len(self._centroids))
+        closest = np.argpartition(-(self._centroids @ vector), probe - 1)[:probe]
+        candidates = np.flatnonzero(np.isin(self._assignments, closest))
+        # Rows appended since the last clustering have no assignment yet.
+        tail = np.arange(len(self._assignments), len(self._ids))
+        return np.concatenate([candidates, tail])
+
+    def _build_clusters(self) -> None:
+        matrix = self._require_matrix()[: len(self._ids)]
+        live_rows = np.array(sorted(self._rows.values()))
+        lists = min(self.ivf_lists, len(live_rows))
+        rng = np.random.default_rng(0)
+        sample = matrix[
+            rng.choice(
+                live_rows,
+                size=min(len(live_rows), _KMEANS_SAMPLE_ROWS),
+                replace=False,
+            )
+        ]
+        centroids = sample[rng.choice(len(sample), size=lists, replace=False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(lists):
+                members = sample[labels == cluster]
+                if len(members):
+                    centroids[cluster] = members.sum(axis=0)
+            centroids = _normalise(centroids)
+        self._centroids = centroids
+        self._assignments = np.argmax(matrix @ centroids.T, axis=1)
+        self._clustered_rows = len(self._ids)
+
+    def _nearest_centroid(self, vector: np.ndarray) -> int:
+        assert self._centroids is not None
+        return int(np.argmax(self._centroids @ vector))
+
+    def _allocate_row(self, entry_id: str) -> int:
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._ids[row] = entry_id
+        else:
+            row = len(self._ids)
+            self._ids.append(entry_id)
+            self._ensure_capacity(len(self._ids))
+        self._rows[entry_id] = row
+        return row
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if self._matrix is not None and self._matrix.shape[0] >= rows:
+            return
+        capacity = max(_MIN_CAPACITY, rows)
+        if self._matrix is not None:
+            capacity = max(capacity, 2 * self._matrix.shape[0])
+            self._matrix.flush()
+        self._open_matrix(capacity)
+
+    def _open_matrix(self, capacity: int) -> None:
+        matrix_path = self.path / _MATRIX_FILENAME
+        row_bytes = self.embedder.dimension * np.dtype(np.float32).itemsize
+        with matrix_path.open("ab") as handle:
+            if handle.tell() < capacity * row_bytes:
+                handle.truncate(capacity * row_bytes)
+        self._matrix = np.memmap(
+            matrix_path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(capacity, self.embedder.dimension),
+        )
+
+    def _require_matrix(self) -> np.memmap:
+        if self._matrix is None:
+            self._ensure_capacity(len(self._ids) or 1)
+        assert self._matrix is not None
+        return self._matrix
+
+    def _load(self) -> None:
+        ids_path = self.path / _IDS_FILENAME
+        self._ids_mtime_ns = 0
+        try:
+            # Stat first: a map replaced mid-read is then reloaded next time.
+            self._ids_mtime_ns = ids_path.stat().st_mtime_ns
+            payload = json.loads(ids_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            payload = {}
+        except (OSError, ValueError) as exc:
+            _LOGGER.warning("Ignoring unreadable vector id map %s: %s", ids_path, exc)
+            payload = {}
+        dimension = payload.get("dimension", self.embedder.dimension)
+        if dimension != self.embedder.dimension:
+            raise ValueError(
+                f"Vector index at {self.path} has dimension {dimension}, "
+                f"embedder produces {self.embedder.dimension}."
+            )
+        self._ids = list(payload.get("ids", []))
+        self._log_offset = 0
+        self._log_entries = 0
+        self._replay_log()
+        self._rows = {
+            entry_id: row for row, entry_id in enumerate(self._ids) if entry_id
+        }
+        self._free_rows = [
+            row for row, entry_id in enumerate(self._ids) if not entry_id
+        ]
+        self._centroids = None
+        self._assignments = None
+        if self._ids or (self.path / _MATRIX_FILENAME).exists():
+            self._ensure_capacity(max(len(self._ids), 1))
+
+    def _replay_log(self) -> list[tuple[int, str | None, str | None]]:
+        """Apply complete ``ids.log`` lines past ``_log_offset`` to ``_ids``.
+
+        Returns ``(row, previous_id, entry_id)`` for each applied line.
+        """
+
+        log_path = self.path / _IDS_LOG_FILENAME
+        try:
+            with log_path.open("rb") as handle:
+                handle.seek(self._log_offset)
+                data = handle.read()
+        except FileNotFoundError:
+            return []
+        # A trailing line without a newline is still being written.
+        complete = data[: data.rfind(b"\n") + 1]
+        changes: list[tuple[int, str | None, str | None]] = []
+        for line in complete.splitlines():
+            try:
+                row, entry_id = json.loads(line)
+            except ValueError as exc:
+                _LOGGER.warning("Stopping at unreadable vector id log line: %s", exc)
+                break
+            if row >= len(self._ids):
+                self._ids.extend([None] * (row + 1 - len(self._ids)))
+            changes.append((row, self._ids[row], entry_id))
+            self._ids[row] = entry_id
+        self._log_offset += len(complete)
+        self._log_entries += len(changes)
+        return changes
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime_ns = (self.path / _IDS_FILENAME).stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = 0
+        try:
+            log_size = (self.path / _IDS_LOG_FILENAME).stat().st_size
+        except FileNotFoundError:
+            log_size = 0
+        if mtime_ns != self._ids_mtime_ns or log_size < self._log_offset:
+            self._load()
+        elif log_size > self._log_offset:
+            self._apply_log_tail()
+
+    def _apply_log_tail(self) -> None:
+        changes = self._replay_log()
+        self._ensure_capacity(max(len(self._ids), 1))
+        free_rows = set(self._free_rows)
+        for row, previous_id, entry_id in changes:
+            if previous_id is not None and self._rows.get(previous_id) == row:
+                del self._rows[previous_id]
+            if entry_id is None:
+                free_rows.add(row)
+                continue
+            self._rows[entry_id] = row
+            free_rows.discard(row)
+            if self._assignments is not None and row < len(self._assignments):
+                self._assignments[row] = self._nearest_centroid(
+                    self._require_matrix()[row]
+                )
+        self._free_rows = sorted(free_rows)
+
+    def _append_log(self, changes: list[tuple[int, str | None]]) -> None:
+        if not changes:
+            return
+        if not self._ids_mtime_ns:
+            # Write the id map first so the dimension check has a record.
+            self._persist()
+            return
+        lines = "".join(
+            json.dumps(change, separators=(",", ":")) + "\n" for change in changes
+        ).encode("utf-8")
+        with (self.path / _IDS_LOG_FILENAME).open("ab") as handle:
+            handle.write(lines)
+        self._log_offset += len(lines)
+        self._log_entries += len(changes)
+        if self._log_entries > max(_MIN_CAPACITY, len(self._ids) // 2):
+            self._persist()
+
+    def _persist(self) -> None:
+        self._require_matrix().flush()
+        ids_path = self.path / _IDS_FILENAME
+        tmp_path = ids_path.with_name(f"{ids_path.name}.tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"dimension": self.embedder.dimension, "ids": self._ids},
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, ids_path)
+        self._ids_mtime_ns = ids_path.stat().st_mtime_ns
+        # The map now holds every logged change; readers that see the new
+        # ``ids.json`` reload it, and replaying a stale log is idempotent.
+        (self.path / _IDS_LOG_FILENAME).open("wb").close()
+        self._log_offset = 0
+        self._log_entries = 0
+
+
+def _entry_text(entry: MemoryEntry) -> str:
+    return f"{entry.content} {' '.join(entry.tags)}"
+
+
+def _hash_features(text: str) -> list[tuple[str, float]]:
+    features: list[tuple[str, float]] = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        features.append((f"w:{token}", 1.0))
+        padded = f"#{token}#"
+        features.extend(
+            (f"c:{padded[index : index + 3]}", 0.5) for index in range(len(padded) - 2)
+        )
+    return features
+
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
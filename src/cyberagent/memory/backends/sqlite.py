@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 from difflib import SequenceMatcher
 import sqlite3
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, Sequence
 
 from src.cyberagent.memory.models import (
     MemoryEntry,
@@ -17,6 +18,7 @@ from src.cyberagent.memory.models import (
     MemoryListResult,
     MemoryPriority,
     MemoryQuery,
+    MemoryQueryTarget,
     MemoryScope,
     MemorySource,
 )
@@ -24,15 +26,35 @@ from src.cyberagent.memory.store import MemoryStore
 from src.cyberagent.core.paths import resolve_data_path
 
 _CURSOR_PREFIX = "offset:"
+_KEYSET_CURSOR_PREFIX = "key:"
 _DEFAULT_DB_FILENAME = "memory.db"
 _LOGGER = logging.getLogger(__name__)
+_FTS_TABLE = "memory_entries_fts"
+_TAGS_TABLE = "memory_entry_tags"
+_PRIORITY_RANK = (
+    "CASE m.priority WHEN 'low' THEN 0 WHEN 'medium' THEN 1 WHEN 'high' THEN 2 "
+    "ELSE 0 END"
+)
+_META_TABLE = "memory_meta"
+_FTS_TOKEN_PATTERN = re.compile(r"\w+")
+_SNIPPET_TOKENS = 24
 
 
 @dataclass(slots=True)
 class SqliteMemoryStore(MemoryStore):
-    """SQLite implementation for memory CRUD and keyword search."""
+    """SQLite implementation for memory CRUD and keyword search.
+
+    Text queries use an FTS5 index over content and tags, kept in sync by
+    triggers and ranked with BM25. When the SQLite build lacks FTS5, queries
+    fall back to the in-Python token and fuzzy scorer.
+
+    Lists and text-less queries page with keyset cursors over
+    ``(created_at, id)``, so each page is an index seek. ``offset:`` cursors
+    issued before keyset paging are still accepted.
+    """
 
     db_path: Path
+    fts_enabled: bool = field(default=False, init=False)
 
     def __post_init__(self) -> None:
         self.db_path = self.db_path.expanduser()
@@ -58,7 +80,7 @@ class SqliteMemoryStore(MemoryStore):
                 entry.priority.value,
                 entry.created_at.isoformat(),
                 (entry.updated_at or entry.created_at).isoformat(),
-                entry.expires_at.isoformat() if entry.expires_at else None,
+                _format_expiry(entry.expires_at),
                 entry.source.value,
                 entry.confidence,
                 entry.layer.value,
@@ -81,6 +103,35 @@ class SqliteMemoryStore(MemoryStore):
             return None
         return _row_to_entry(rows[0])
 
+    def get_many(
+        self,
+        entry_ids: Sequence[str],
+        scope: MemoryScope,
+        namespace: str,
+        *,
+        layer: MemoryLayer | None = None,
+        owner_agent_id: str | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> list[MemoryEntry]:
+        ids = list(dict.fromkeys(entry_ids))
+        if not ids:
+            return []
+        clauses, params = _entry_filters(
+            scope, namespace, layer=layer, owner_agent_id=owner_agent_id, tags=tags
+        )
+        # json_each binds the whole id list as one parameter, so the batch
+        # size is not capped by SQLite's host parameter limit.
+        rows = self._fetch(
+            f"""
+            SELECT m.* FROM memory_entries AS m
+            WHERE m.id IN (SELECT value FROM json_each(?))
+            AND {" AND ".join(clauses)}
+            """,
+            [json.dumps(ids), *params],
+        )
+        by_id = {str(row["id"]): _row_to_entry(row) for row in rows}
+        return [by_id[entry_id] for entry_id in ids if entry_id in by_id]
+
     def update(self, entry: MemoryEntry) -> MemoryEntry:
         self._execute(
             """
@@ -95,7 +146,7 @@ class SqliteMemoryStore(MemoryStore):
                 json.dumps(entry.tags),
                 entry.priority.value,
                 (entry.updated_at or entry.created_at).isoformat(),
-                entry.expires_at.isoformat() if entry.expires_at else None,
+                _format_expiry(entry.expires_at),
                 entry.source.value,
                 entry.confidence,
                 entry.layer.value,
@@ -119,11 +170,114 @@ class SqliteMemoryStore(MemoryStore):
         return cursor.rowcount > 0
 
     def query(self, query: MemoryQuery) -> MemoryListResult:
-        entries = self._fetch_scope_entries(query.scope, query.namespace)
-        filtered = _filter_entries(entries, query)
-        ranked = _rank_entries(filtered, query.text)
+        clauses, params = _entry_filters(
+            query.scope,
+            query.namespace,
+            layer=query.layer,
+            owner_agent_id=query.owner_agent_id,
+            tags=query.tags,
+        )
+        if query.text and self.fts_enabled:
+            match = _build_match_expression(query.text)
+            if match is not None:
+                return self._query_fts(query, match, clauses, params)
+        if not query.text:
+            return self._fetch_page(clauses, params, query.limit, query.cursor)
+        rows = self._fetch(
+            f"""
+            SELECT m.* FROM memory_entries AS m
+            WHERE {" AND ".join(clauses)}
+            ORDER BY m.created_at ASC, m.id ASC
+            """,
+            params,
+        )
+        ranked = _rank_entries([_row_to_entry(row) for row in rows], query.text)
         return _slice_entries(ranked, query.limit, query.cursor)
 
+    def query_targets(
+        self,
+        text: str | None,
+        targets: Sequence[MemoryQueryTarget],
+        *,
+        layer: MemoryLayer | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> list[MemoryListResult]:
+        """Rank every target with one FTS statement, top ``limit`` per target.
+
+        Without FTS5 or query text each target falls back to ``query``.
+        """
+
+        match = _build_match_expression(text) if text and self.fts_enabled else None
+        if match is None or not targets:
+            return [
+                _without_cursor(
+                    self.query(
+                        MemoryQuery(
+                            text=text,
+                            scope=target.scope,
+                            namespace=target.namespace,
+                            limit=target.limit,
+                            layer=layer,
+                            tags=tags,
+                            owner_agent_id=target.owner_agent_id,
+                        )
+                    )
+                )
+                for target in targets
+            ]
+        cases: list[str] = []
+        case_params: list[object] = []
+        for index, target in enumerate(targets):
+            clauses, params = _target_filters(
+                target.scope, target.namespace, target.owner_agent_id
+            )
+            cases.append(f"WHEN {' AND '.join(clauses)} THEN {index}")
+            case_params.extend(params)
+        shared_clauses, shared_params = _shared_filters(layer, tags)
+        where = " AND ".join([f"{_FTS_TABLE} MATCH ?", *shared_clauses])
+        rows = self._fetch(
+            f"""
+            SELECT * FROM (
+                SELECT ranked.*, ROW_NUMBER() OVER (
+                    PARTITION BY target_index ORDER BY rank, updated_at DESC
+                ) AS target_rank
+                FROM (
+                    SELECT m.*,
+                        snippet({_FTS_TABLE}, 0, '', '', '...', {_SNIPPET_TOKENS})
+                            AS snippet,
+                        bm25({_FTS_TABLE}) AS rank,
+                        CASE {" ".join(cases)} END AS target_index
+                    FROM {_FTS_TABLE}
+                    JOIN memory_entries AS m ON m.rowid = {_FTS_TABLE}.rowid
+                    WHERE {where}
+                ) AS ranked
+                WHERE target_index IS NOT NULL
+            )
+            WHERE target_rank <= ?
+            ORDER BY target_index, target_rank
+            """,
+            [
+                *case_params,
+                match,
+                *shared_params,
+                max(target.limit for target in targets),
+            ],
+        )
+        grouped: list[list[sqlite3.Row]] = [[] for _ in targets]
+        for row in rows:
+            index = int(row["target_index"])
+            if len(grouped[index]) < targets[index].limit:
+                grouped[index].append(row)
+        return [
+            MemoryListResult(
+                items=[_row_to_entry(row) for row in group],
+                next_cursor=None,
+                has_more=False,
+                snippets={str(row["id"]): str(row["snippet"]) for row in group},
+            )
+            for group in grouped
+        ]
+
     def list(
         self,
         scope: MemoryScope,
@@ -132,25 +286,231 @@ class SqliteMemoryStore(MemoryStore):
         cursor: str | None,
         owner_agent_id: str | None = None,
     ) -> MemoryListResult:
-        entries = self._fetch_scope_entries(scope, namespace)
-        if owner_agent_id:
-            entries = [
-                entry for entry in entries if entry.owner_agent_id == owner_agent_id
+        clauses, params = _entry_filters(
+            scope, namespace, owner_agent_id=owner_agent_id or None
+        )
+        return self._fetch_page(clauses, params, limit, cursor)
+
+    def rebuild_search_index(self) -> int:
+        """Repopulate the FTS5 index from memory_entries; returns rows indexed."""
+
+        if not self.fts_enabled:
+            return 0
+        with self._connect() as connection:
+            self._rebuild_fts(connection)
+            connection.commit()
+            row = connection.execute(f"SELECT COUNT(*) FROM {_FTS_TABLE}").fetchone()
+        return int(row[0])
+
+    def iter_entries(
+        self, *, updated_since: str | None = None, batch_size: int = 500
+    ) -> Iterator[MemoryEntry]:
+        """Yield every entry in ``(updated_at, id)`` order, one page per query.
+
+        ``updated_since`` is an ISO timestamp as stored in ``updated_at``;
+        entries updated at or after it are yielded.
+        """
+
+        clauses = ["m.updated_at >= ?"] if updated_since is not None else []
+        params: list[object] = [updated_since] if updated_since is not None else []
+        after: tuple[str, str] | None = None
+        while True:
+            page_clauses = list(clauses)
+            page_params = list(params)
+            if after is not None:
+                page_clauses.append("(m.updated_at, m.id) > (?, ?)")
+                page_params.extend(after)
+            where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+            rows = self._fetch(
+                f"""
+                SELECT m.* FROM memory_entries AS m {where}
+                ORDER BY m.updated_at ASC, m.id ASC
+                LIMIT ?
+                """,
+                [*page_params, batch_size],
+            )
+            for row in rows:
+                yield _row_to_entry(row)
+            if len(rows) < batch_size:
+                return
+            after = (str(rows[-1]["updated_at"]), str(rows[-1]["id"]))
+
+    def entry_ids(self) -> set[str]:
+        return {
+            str(row["id"]) for row in self._fetch("SELECT id FROM memory_entries", ())
+        }
+
+    def latest_updated_at(self) -> str | None:
+        rows = self._fetch("SELECT MAX(updated_at) AS latest FROM memory_entries", ())
+        return rows[0]["latest"] if rows else None
+
+    def count_entries(
+        self,
+        scope: MemoryScope,
+        namespace: str,
+        owner_agent_id: str | None = None,
+    ) -> int:
+        clauses, params = _target_filters(scope, namespace, owner_agent_id)
+        rows = self._fetch(
+            f"""
+            SELECT COUNT(*) AS total FROM memory_entries AS m
+            WHERE {" AND ".join(clauses)}
+            """,
+            params,
+        )
+        return int(rows[0]["total"])
+
+    def prune_namespace(
+        self,
+        scope: MemoryScope,
+        namespace: str,
+        *,
+        max_entries: int,
+        owner_agent_id: str | None = None,
+        now: datetime | None = None,
+    ) -> list[str]:
+        """Delete expired rows, then the overflow beyond ``max_entries``.
+
+        Overflow is chosen lowest priority first, oldest first. Both deletes
+        run in one transaction.
+        """
+
+        clauses, params = _target_filters(scope, namespace, owner_agent_id)
+        where = " AND ".join(clauses)
+        cutoff = _format_expiry(now or datetime.now(timezone.utc))
+        with self._connect() as connection:
+            deleted = [
+                str(row["id"])
+                for row in connection.execute(
+                    f"""
+                    DELETE FROM memory_entries AS m
+                    WHERE {where} AND m.expires_at IS NOT NULL
+                    AND m.expires_at <= ?
+                    RETURNING id
+                    """,
+                    (*params, cutoff),
+                ).fetchall()
             ]
-        return _slice_entries(entries, limit, cursor)
+            deleted.extend(
+                str(row["id"])
+                for row in connection.execute(
+                    f"""
+                    DELETE FROM memory_entries WHERE id IN (
+                        SELECT m.id FROM memory_entries AS m
+                        WHERE {where}
+                        ORDER BY {_PRIORITY_RANK}, m.created_at ASC, m.id ASC
+                        LIMIT max(
+                            (SELECT COUNT(*) FROM memory_entries AS m
+                             WHERE {where}) - ?,
+                            0
+                        )
+                    )
+                    RETURNING id
+                    """,
+                    (*params, *params, max_entries),
+                ).fetchall()
+            )
+            connection.commit()
+        return deleted
 
-    def _fetch_scope_entries(
-        self, scope: MemoryScope, namespace: str
+    def delete_expired(
+        self, *, limit: int, now: datetime | None = None
     ) -> list[MemoryEntry]:
+        """Delete up to ``limit`` expired entries across all namespaces.
+
+        Candidates are read from the partial ``expires_at`` index, oldest
+        expiry first.
+        """
+
+        cutoff = _format_expiry(now or datetime.now(timezone.utc))
+        with self._connect() as connection:
+            rows = connection.execute(
+                """
+                DELETE FROM memory_entries WHERE id IN (
+                    SELECT id FROM memory_entries
+                    WHERE expires_at IS NOT NULL AND expires_at <= ?
+                    ORDER BY expires_at
+                    LIMIT ?
+                )
+                RETURNING *
+                """,
+                (cutoff, limit),
+            ).fetchall()
+            connection.commit()
+        return [_row_to_entry(row) for row in rows]
+
+    def get_meta(self, key: str) -> str | None:
+        rows = self._fetch(f"SELECT value FROM {_META_TABLE} WHERE key = ?", (key,))
+        return str(rows[0]["value"]) if rows else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._execute(
+            f"""
+            INSERT INTO {_META_TABLE} (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """,
+            (key, value),
+        )
+
+    def _fetch_page(
+        self,
+        clauses: list[str],
+        params: list[object],
+        limit: int,
+        cursor: str | None,
+    ) -> MemoryListResult:
+        keyset = _decode_keyset_cursor(cursor)
+        offset = 0
+        if keyset is not None:
+            clauses = [*clauses, "(m.created_at, m.id) > (?, ?)"]
+            params = [*params, *keyset]
+        else:
+            offset = _decode_cursor(cursor)
         rows = self._fetch(
-            """
-            SELECT * FROM memory_entries
-            WHERE scope = ? AND namespace = ?
-            ORDER BY created_at ASC
+            f"""
+            SELECT m.* FROM memory_entries AS m
+            WHERE {" AND ".join(clauses)}
+            ORDER BY m.created_at ASC, m.id ASC
+            LIMIT ? OFFSET ?
             """,
-            (scope.value, namespace),
+            [*params, limit + 1, offset],
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return MemoryListResult(
+            items=[_row_to_entry(row) for row in rows],
+            next_cursor=_encode_keyset_cursor(rows[-1]) if has_more else None,
+            has_more=has_more,
+        )
+
+    def _query_fts(
+        self,
+        query: MemoryQuery,
+        match: str,
+        clauses: list[str],
+        params: list[object],
+    ) -> MemoryListResult:
+        offset = _decode_cursor(query.cursor)
+        rows = self._fetch(
+            f"""
+            SELECT m.*, snippet({_FTS_TABLE}, 0, '', '', '...', {_SNIPPET_TOKENS})
+                AS snippet
+            FROM {_FTS_TABLE}
+            JOIN memory_entries AS m ON m.rowid = {_FTS_TABLE}.rowid
+            WHERE {_FTS_TABLE} MATCH ? AND {" AND ".join(clauses)}
+            ORDER BY bm25({_FTS_TABLE}), m.updated_at DESC
+            LIMIT ? OFFSET ?
+            """,
+            [match, *params, query.limit + 1, offset],
+        )
+        has_more = len(rows) > query.limit
+        rows = rows[: query.limit]
+        return MemoryListResult(
+            items=[_row_to_entry(row) for row in rows],
+            next_cursor=_encode_cursor(offset + query.limit) if has_more else None,
+            has_more=has_more,
+            snippets={str(row["id"]): str(row["snippet"]) for row in rows},
         )
-        return [_row_to_entry(row) for row in rows]
 
     def _ensure_schema(self) -> None:
         with self._connect() as connection:
@@ -181,8 +541,126 @@ class SqliteMemoryStore(MemoryStore):
             connection.execute(
                 "CREATE INDEX IF NOT EXISTS idx_memory_namespace ON memory_entries(namespace)"
             )
+            connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_memory_scope_namespace_owner_layer
+                ON memory_entries(scope, namespace, owner_agent_id, layer, updated_at)
+                """)
+            connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_memory_scope_namespace_created
+                ON memory_entries(scope, namespace, created_at, id)
+                """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memory_updated_at "
+                "ON memory_entries(updated_at, id)"
+            )
+            connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_memory_expires_at
+                ON memory_entries(expires_at) WHERE expires_at IS NOT NULL
+                """)
+            connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS {_META_TABLE} (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+                """)
+            self._ensure_tag_schema(connection)
+            self.fts_enabled = self._ensure_fts_schema(connection)
             connection.commit()
 
+    def _ensure_tag_schema(self, connection: sqlite3.Connection) -> None:
+        existed = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (_TAGS_TABLE,),
+        ).fetchone()
+        connection.execute(f"""
+            CREATE TABLE IF NOT EXISTS {_TAGS_TABLE} (
+                tag TEXT NOT NULL,
+                entry_id TEXT NOT NULL,
+                PRIMARY KEY (tag, entry_id)
+            ) WITHOUT ROWID
+            """)
+        connection.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_memory_entry_tags_entry
+            ON {_TAGS_TABLE}(entry_id)
+            """)
+        connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_entry_tags_insert
+            AFTER INSERT ON memory_entries BEGIN
+                INSERT OR IGNORE INTO {_TAGS_TABLE}(tag, entry_id)
+                SELECT value, new.id FROM json_each(new.tags);
+            END
+            """)
+        connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_entry_tags_delete
+            AFTER DELETE ON memory_entries BEGIN
+                DELETE FROM {_TAGS_TABLE} WHERE entry_id = old.id;
+            END
+            """)
+        connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_entry_tags_update
+            AFTER UPDATE OF tags ON memory_entries BEGIN
+                DELETE FROM {_TAGS_TABLE} WHERE entry_id = old.id;
+                INSERT OR IGNORE INTO {_TAGS_TABLE}(tag, entry_id)
+                SELECT value, new.id FROM json_each(new.tags);
+            END
+            """)
+        if not existed:
+            connection.execute(f"""
+                INSERT OR IGNORE INTO {_TAGS_TABLE}(tag, entry_id)
+                SELECT tags.value, m.id
+                FROM memory_entries AS m, json_each(m.tags) AS tags
+                """)
+
+    def _ensure_fts_schema(self, connection: sqlite3.Connection) -> bool:
+        try:
+            connection.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} "
+                "USING fts5(content, tags)"
+            )
+        except sqlite3.OperationalError as exc:
+            _LOGGER.info("SQLite FTS5 unavailable; using in-Python scoring: %s", exc)
+            return False
+        # The index row shares the entry's rowid, so triggers and the query
+        # join address it directly instead of scanning an id column.
+        connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_entries_fts_insert
+            AFTER INSERT ON memory_entries BEGIN
+                INSERT INTO {_FTS_TABLE}(rowid, content, tags)
+                VALUES (new.rowid, new.content, new.tags);
+            END
+            """)
+        connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_entries_fts_delete
+            AFTER DELETE ON memory_entries BEGIN
+                DELETE FROM {_FTS_TABLE} WHERE rowid = old.rowid;
+            END
+            """)
+        connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_entries_fts_update
+            AFTER UPDATE OF content, tags ON memory_entries BEGIN
+                DELETE FROM {_FTS_TABLE} WHERE rowid = old.rowid;
+                INSERT INTO {_FTS_TABLE}(rowid, content, tags)
+                VALUES (new.rowid, new.content, new.tags);
+            END
+            """)
+        entries_count = connection.execute(
+            "SELECT COUNT(*) FROM memory_entries"
+        ).fetchone()[0]
+        indexed_count = connection.execute(
+            f"SELECT COUNT(*) FROM {_FTS_TABLE}"
+        ).fetchone()[0]
+        if entries_count != indexed_count:
+            # Databases created before the index existed need a one-off backfill.
+            self._rebuild_fts(connection)
+        return True
+
+    def _rebuild_fts(self, connection: sqlite3.Connection) -> None:
+        connection.execute(f"DELETE FROM {_FTS_TABLE}")
+        connection.execute(f"""
+            INSERT INTO {_FTS_TABLE}(rowid, content, tags)
+            SELECT rowid, content, tags FROM memory_entries
+            """)
+
     def _connect(self) -> sqlite3.Connection:
         try:
             return self._open_connection(self.db_path)
@@ -242,38 +720,64 @@ def _row_to_entry(row: sqlite3.Row) -> MemoryEntry:
     )
 
 
+def _format_expiry(value: datetime | None) -> str | None:
+    # Aware timestamps are stored in UTC so SQL can compare them as text.
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.isoformat()
+
+
 def _parse_datetime(value: str) -> datetime:
     return datetime.fromisoformat(value)
 
 
-def _filter_entries(
-    entries: list[MemoryEntry], query: MemoryQuery
-) -> list[MemoryEntry]:
-    filtered = entries
-    if query.layer is not None:
-        filtered = [entry for entry in filtered if entry.layer == query.layer]
-    if query.owner_agent_id is not None:
-        filtered = [
-            entry for entry in filtered if entry.owner_agent_id == query.owner_agent_id
-        ]
-    if query.tags:
-        required = set(query.tags)
-        filtered = [entry for entry in filtered if required.issubset(set(entry.tags))]
-    if query.text:
-        filtered = [entry for entry in filtered if _score_entry(entry, query.text) > 0]
-    return filtered
-
-
-def _rank_entries(
-    entries: list[MemoryEntry], query_text: str | None
-) -> list[MemoryEntry]:
-    if not query_text:
-        return entries
-    return sorted(
-        entries,
-        key=lambda entry: (_score_entry(entry, query_text), entry.updated_at),
-        reverse=True,
-    )
+def _entry_filters(
+    scope: MemoryScope,
+    namespace: str,
+    *,
+    layer: MemoryLayer | None = None,
+    owner_agent_id: str | None = None,
+    tags: Sequence[str] | None = None,
+) -> tuple[list[str], list[object]]:
+    """WHERE clauses over ``memory_entries AS m`` for every query predicate."""
+
+    clauses, params = _target_filters(scope, namespace, owner_agent_id)
+    shared_clauses, shared_params = _shared_filters(layer, tags)
+    return [*clauses, *shared_clauses], [*params, *shared_params]
+
+
+def _target_filters(
+    scope: MemoryScope, namespace: str, owner_agent_id: str | None
+) -> tuple[list[str], list[object]]:
+    clauses = ["m.scope = ?", "m.namespace = ?"]
+    params: list[object] = [scope.value, namespace]
+    if owner_agent_id is not None:
+        clauses.append("m.owner_agent_id = ?")
+        params.append(owner_agent_id)
+    return clauses, params
+
+
+def _shared_filters(
+    layer: MemoryLayer | None, tags: Sequence[str] | None
+) -> tuple[list[str], list[object]]:
+    clauses: list[str] = []
+    params: list[object] = []
+    if layer is not None:
+        clauses.append("m.layer = ?")
+        params.append(layer.value)
+    for tag in dict.fromkeys(tags or ()):
+        clauses.append(f"m.id IN (SELECT entry_id FROM {_TAGS_TABLE} WHERE tag = ?)")
+        params.append(tag)
+    return clauses, params
+
+
+def _rank_entries(entries: list[MemoryEntry], query_text: str) -> list[MemoryEntry]:
+    scored = [(_score_entry(entry, query_text), entry) for entry in entries]
+    matched = [pair for pair in scored if pair[0] > 0]
+    matched.sort(key=lambda pair: (pair[0], pair[1].updated_at), reverse=True)
+    return [entry for _, entry in matched]
 
 
 def _score_entry(entry: MemoryEntry, query_text: str) -> int:
@@ -288,6 +792,26 @@ def _score_entry(entry: MemoryEntry, query_text: str) -> int:
     return keyword_score + fuzzy_score
 
 
+def _build_match_expression(query_text: str) -> str | None:
+    """Quote each query token and OR them, so user text cannot inject FTS syntax."""
+
+    tokens = dict.fromkeys(
+        token.lower() for token in _FTS_TOKEN_PATTERN.findall(query_text)
+    )
+    if not tokens:
+        return None
+    return " OR ".join(f'"{token}"' for token in tokens)
+
+
+def _without_cursor(result: MemoryListResult) -> MemoryListResult:
+    return MemoryListResult(
+        items=result.items,
+        next_cursor=None,
+        has_more=False,
+        snippets=result.snippets,
+    )
+
+
 def _slice_entries(
     entries: list[MemoryEntry], limit: int, cursor: str | None
 ) -> MemoryListResult:
@@ -309,3 +833,20 @@ def _decode_cursor(cursor: str | None) -> int:
     if not cursor.startswith(_CURSOR_PREFIX):
         raise ValueError("Invalid cursor format.")
     return int(cursor[len(_CURSOR_PREFIX) :])
+
+
+def _encode_keyset_cursor(row: sqlite3.Row) -> str:
+    return f"{_KEYSET_CURSOR_PREFIX}{row['created_at']}|{row['id']}"
+
+
+def _decode_keyset_cursor(cursor: str | None) -> tuple[str, str] | None:
+    """Return the ``(created_at, id)`` after which the next page starts."""
+
+    if not cursor or not cursor.startswith(_KEYSET_CURSOR_PREFIX):
+        return None
+    created_at, separator, entry_id = cursor[len(_KEYSET_CURSOR_PREFIX) :].partition(
+        "|"
+    )
+    if not separator or not created_at or not entry_id:
+        raise ValueError("Invalid cursor format.")
+    return created_at, entry_id
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Protocol, Sequence
 
 from src.cyberagent.memory.models import MemoryEntry
 
@@ -13,6 +13,10 @@ class MemoryVectorIndex(Protocol):
         """Add or update an entry in the vector index."""
         ...
 
+    def upsert_many(self, entries: Sequence[MemoryEntry]) -> None:
+        """Add or update several entries, embedding them as one batch."""
+        ...
+
     def delete(self, entry_id: str) -> None:
         """Remove an entry from the vector index."""
         ...
@@ -29,6 +33,9 @@ class NoopVectorIndex:
     def upsert(self, entry: MemoryEntry) -> None:
         return None
 
+    def upsert_many(self, entries: Sequence[MemoryEntry]) -> None:
+        return None
+
     def delete(self, entry_id: str) -> None:
         return None
 
@@ -0,0 +1,277 @@
+"""Write-behind vector upserts that batch embeddings off the request path."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
+from src.cyberagent.memory.backends.vector_index import MemoryVectorIndex
+from src.cyberagent.memory.models import MemoryEntry
+
+_LOGGER = logging.getLogger(__name__)
+VECTOR_CHECKPOINT_KEY = "vector_index_checkpoint"
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL_SECONDS = 0.25
+_RETRY_DELAY_SECONDS = 1.0
+_MAX_ATTEMPTS = 5
+
+
+@dataclass(slots=True)
+class WriteBehindVectorIndex(MemoryVectorIndex):
+    """Queue vector upserts and apply them in batches on a worker thread.
+
+    ``upsert`` and ``delete`` only record the latest operation per id, so a
+    burst of updates to one entry costs a single embedding. The worker waits
+    up to ``flush_interval_seconds`` to fill a batch and hands it to the
+    wrapped index's ``upsert_many``. Queries go straight to the wrapped index,
+    so an entry becomes semantically searchable once its batch is applied;
+    keyword search sees it as soon as the SQLite row is committed.
+
+    With a ``source`` store the worker keeps a checkpoint in ``memory_meta``:
+    every entry updated before it has been indexed. On start it replays rows
+    updated at or after the checkpoint, so a crash loses no upserts. Deletes
+    are not replayed; ``check_vector_consistency`` removes the orphans.
+
+    A failed batch is retried one entry at a time so a single bad entry does
+    not hold back the rest. An entry that still fails after ``_MAX_ATTEMPTS``
+    tries is dropped and logged; ``check_vector_consistency`` reports it as
+    missing from the index.
+    """
+
+    index: MemoryVectorIndex
+    source: SqliteMemoryStore | None = None
+    batch_size: int = DEFAULT_BATCH_SIZE
+    flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS
+    _pending: dict[str, MemoryEntry | None] = field(default_factory=dict, init=False)
+    _attempts: dict[str, int] = field(default_factory=dict, init=False)
+    _in_flight: int = field(default=0, init=False)
+    _condition: threading.Condition = field(
+        default_factory=threading.Condition, init=False
+    )
+    _closed: bool = field(default=False, init=False)
+    _replayed: bool = field(default=False, init=False)
+    _flush_waiters: int = field(default=0, init=False)
+    _checkpoint: str | None = field(default=None, init=False)
+    _high_water: str | None = field(default=None, init=False)
+    _thread: threading.Thread | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="memory-vector-write-behind", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending) + self._in_flight
+
+    def upsert(self, entry: MemoryEntry) -> None:
+        self._enqueue(entry.id, entry)
+
+    def upsert_many(self, entries: Sequence[MemoryEntry]) -> None:
+        for entry in entries:
+            self._enqueue(entry.id, entry)
+
+    def delete(self, entry_id: str) -> None:
+        self._enqueue(entry_id, None)
+
+    def query(self, text: str, limit: int) -> list[str]:
+        return self.index.query(text, limit)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued operation is applied; False on timeout."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            try:
+                while not self._replayed or self._pending or self._in_flight:
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Apply queued operations, then stop the worker thread."""
+
+        with self._condition:
+            if self._closed:
+                return
+        worker = self._thread
+        if worker is not None and worker is not threading.current_thread():
+            if not self.flush(timeout):
+                _LOGGER.warning(
+                    "Vector write-behind closed with %d operations pending",
+                    self.pending,
+                )
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+        # Let a closed index (and its queue) be collected before exit.
+        atexit.unregister(self.close)
+
+    def _enqueue(self, entry_id: str, entry: MemoryEntry | None) -> None:
+        with self._condition:
+            # Re-inserting moves the id to the back, keeping batches FIFO.
+            self._pending.pop(entry_id, None)
+            self._pending[entry_id] = entry
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+
+    def _run(self) -> None:
+        self._replay()
+        with self._condition:
+            self._replayed = True
+            self._condition.notify_all()
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                if (
+                    len(self._pending) < self.batch_size
+                    and not self._closed
+                    and not self._flush_waiters
+                ):
+                    self._condition.wait(self.flush_interval_seconds)
+                batch = self._take_batch()
+            failed = self._apply(batch)
+            with self._condition:
+                self._in_flight = 0
+                retry = self._requeue_failed(batch, failed)
+                self._advance_checkpoint(batch)
+                self._condition.notify_all()
+            if retry:
+                if self._closed:
+                    # Left for the replay on next start.
+                    return
+                time.sleep(_RETRY_DELAY_SECONDS)
+
+    def _take_batch(self) -> dict[str, MemoryEntry | None]:
+        batch: dict[str, MemoryEntry | None] = {}
+        for entry_id in list(self._pending)[: self.batch_size]:
+            batch[entry_id] = self._pending.pop(entry_id)
+        self._in_flight = len(batch)
+        return batch
+
+    def _apply(
+        self, batch: dict[str, MemoryEntry | None]
+    ) -> dict[str, MemoryEntry | None]:
+        """Apply ``batch`` and return the operations that failed."""
+
+        if self._apply_batch(batch):
+            return {}
+        if len(batch) == 1:
+            return batch
+        return {
+            entry_id: entry
+            for entry_id, entry in batch.items()
+            if not self._apply_batch({entry_id: entry})
+        }
+
+    def _requeue_failed(
+        self,
+        batch: dict[str, MemoryEntry | None],
+        failed: dict[str, MemoryEntry | None],
+    ) -> bool:
+        retry = False
+        for entry_id in batch:
+            if entry_id not in failed or entry_id in self._pending:
+                # Applied, or superseded by a newer operation.
+                self._attempts.pop(entry_id, None)
+                continue
+            attempts = self._attempts.get(entry_id, 0) + 1
+            if attempts >= _MAX_ATTEMPTS:
+                self._attempts.pop(entry_id, None)
+                _LOGGER.error(
+                    "Dropping vector index update for %s after %d failed attempts",
+                    entry_id,
+                    attempts,
+                )
+                continue
+            self._attempts[entry_id] = attempts
+            self._pending[entry_id] = failed[entry_id]
+            retry = True
+        return retry
+
+    def _apply_batch(self, batch: dict[str, MemoryEntry | None]) -> bool:
+        upserts = [entry for entry in batch.values() if entry is not None]
+        try:
+            if upserts:
+                self.index.upsert_many(upserts)
+            for entry_id, entry in batch.items():
+                if entry is None:
+                    self.index.delete(entry_id)
+        except Exception as exc:  # pragma: no cover - backend specific failures
+            _LOGGER.warning("Vector index batch of %d failed: %s", len(batch), exc)
+            return False
+        return True
+
+    def _advance_checkpoint(self, batch: dict[str, MemoryEntry | None]) -> None:
+        if self.source is None:
+            return
+        for entry in batch.values():
+            if entry is not None:
+                stamp = _updated_at(entry)
+                if self._high_water is None or stamp > self._high_water:
+                    self._high_water = stamp
+        pending = [_updated_at(entry) for entry in self._pending.values() if entry]
+        checkpoint = min(pending) if pending else self._high_water
+        if checkpoint is None or (
+            self._checkpoint is not None and checkpoint <= self._checkpoint
+        ):
+            return
+        try:
+            self.source.set_meta(VECTOR_CHECKPOINT_KEY, checkpoint)
+        except Exception as exc:  # pragma: no cover - sqlite failures
+            _LOGGER.warning("Failed to store vector checkpoint: %s", exc)
+            return
+        self._checkpoint = checkpoint
+
+    def _replay(self) -> None:
+        if self.source is None:
+            return
+        try:
+            checkpoint = self.source.get_meta(VECTOR_CHECKPOINT_KEY)
+            if checkpoint is None:
+                # First start with write-behind: earlier writes were indexed
+                # inline, so start tracking from the newest row.
+                latest = self.source.latest_updated_at()
+                if latest is not None:
+                    self.source.set_meta(VECTOR_CHECKPOINT_KEY, latest)
+                self._checkpoint = latest
+                return
+            self._checkpoint = checkpoint
+            replayed = 0
+            for entry in self.source.iter_entries(updated_since=checkpoint):
+                with self._condition:
+                    if entry.id not in self._pending:
+                        self._pending[entry.id] = entry
+                        replayed += 1
+            if replayed:
+                _LOGGER.info(
+                    "Replaying %d memory entries into the vector index", replayed
+                )
+        except Exception as exc:  # pragma: no cover - sqlite failures
+            _LOGGER.warning("Vector index replay failed: %s", exc)
+
+
+def _updated_at(entry: MemoryEntry) -> str:
+    # Matches the value SqliteMemoryStore stores in ``updated_at``.
+    return (entry.updated_at or entry.created_at).isoformat()
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import logging
 import os
 from pathlib import Path
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from autogen_core.memory import ListMemory
 
@@ -15,11 +16,14 @@ from src.cyberagent.memory.backends.hybrid import HybridMemoryStore
 from src.cyberagent.memory.backends.vector_index import MemoryVectorIndex
 from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
 from src.cyberagent.memory.backends.vector_index import NoopVectorIndex
+from src.cyberagent.memory.backends.write_behind import WriteBehindVectorIndex
 from src.cyberagent.memory.registry import StaticScopeRegistry
 
 if TYPE_CHECKING:
     from autogen_ext.memory.chromadb._chroma_configs import ChromaDBVectorMemoryConfig
 
+_LOGGER = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class MemoryBackendConfig:
@@ -32,6 +36,12 @@ class MemoryBackendConfig:
     sqlite_path: str
     vector_backend: str
     vector_collection: str
+    vector_path: str = ""
+    vector_embedder: str = "hashing"
+    vector_ivf_lists: int = 0
+    vector_write_behind: bool = True
+    embedding_cache_path: str = ""
+    embedding_cache_max_entries: int = 50000
 
 
 def load_memory_backend_config() -> MemoryBackendConfig:
@@ -48,6 +58,16 @@ def load_memory_backend_config() -> MemoryBackendConfig:
         chroma_port = 8000
     chroma_ssl_raw = os.environ.get("MEMORY_CHROMA_SSL", "false")
     chroma_ssl = str(chroma_ssl_raw).lower() in {"1", "true", "yes"}
+    try:
+        vector_ivf_lists = int(os.environ.get("MEMORY_VECTOR_IVF_LISTS", "0"))
+    except ValueError:
+        vector_ivf_lists = 0
+    try:
+        embedding_cache_max_entries = int(
+            os.environ.get("MEMORY_EMBEDDING_CACHE_MAX_ENTRIES", "50000")
+        )
+    except ValueError:
+        embedding_cache_max_entries = 50000
     return MemoryBackendConfig(
         backend=backend,
         chroma_collection=chroma_collection,
@@ -60,6 +80,17 @@ def load_memory_backend_config() -> MemoryBackendConfig:
         ),
         vector_backend=os.environ.get("MEMORY_VECTOR_BACKEND", "none").lower(),
         vector_collection=os.environ.get("MEMORY_VECTOR_COLLECTION", "memory_vectors"),
+        vector_path=os.environ.get(
+            "MEMORY_VECTOR_PATH", str(resolve_data_path("vector_index"))
+        ),
+        vector_embedder=os.environ.get("MEMORY_VECTOR_EMBEDDER", "hashing"),
+        vector_ivf_lists=vector_ivf_lists,
+        vector_write_behind=os.environ.get("MEMORY_VECTOR_WRITE_BEHIND", "true").lower()
+        in {"1", "true", "yes"},
+        embedding_cache_path=os.environ.get(
+            "MEMORY_EMBEDDING_CACHE_PATH", str(resolve_data_path("embedding_cache.db"))
+        ),
+        embedding_cache_max_entries=embedding_cache_max_entries,
     )
 
 
@@ -74,16 +105,21 @@ def build_memory_registry(config: MemoryBackendConfig) -> StaticScopeRegistry:
     if config.backend == "chromadb":
         sqlite_store = SqliteMemoryStore(Path(config.sqlite_path))
         vector_index = _build_vector_index(config)
+        if config.vector_write_behind and not isinstance(vector_index, NoopVectorIndex):
+            vector_index = WriteBehindVectorIndex(vector_index, source=sqlite_store)
+        # One store instance for every scope lets multi-scope retrieval run a
+        # single combined query.
+        store = HybridMemoryStore(sqlite_store, vector_index)
         return StaticScopeRegistry(
-            agent_store=HybridMemoryStore(sqlite_store, vector_index),
-            team_store=HybridMemoryStore(sqlite_store, vector_index),
-            global_store=HybridMemoryStore(sqlite_store, vector_index),
+            agent_store=store, team_store=store, global_store=store
         )
 
     raise ValueError(f"Unsupported memory backend '{config.backend}'.")
 
 
 def _build_vector_index(config: MemoryBackendConfig) -> MemoryVectorIndex:
+    if config.vector_backend == "local":
+        return _build_local_vector_index(config)
     if config.vector_backend != "chromadb":
         return NoopVectorIndex()
     try:
@@ -100,6 +136,56 @@ def _build_vector_index(config: MemoryBackendConfig) -> MemoryVectorIndex:
         return NoopVectorIndex()
 
 
+def _build_local_vector_index(config: MemoryBackendConfig) -> MemoryVectorIndex:
+    try:
+        from src.cyberagent.memory.backends.embedding_cache import (
+            CachedEmbedder,
+            EmbeddingCache,
+        )
+        from src.cyberagent.memory.backends.local_vector import (
+            HashingEmbedder,
+            LocalVectorIndex,
+            MemoryEmbedder,
+            load_embedder,
+        )
+    except ImportError:
+        return NoopVectorIndex()
+    try:
+        embedder: MemoryEmbedder = load_embedder(config.vector_embedder)
+    except (ImportError, AttributeError, ValueError) as exc:
+        _LOGGER.warning(
+            "Memory embedder '%s' unavailable, vector search disabled: %s",
+            config.vector_embedder,
+            exc,
+        )
+        return NoopVectorIndex()
+    # Feature hashing is cheaper than a cache lookup; only model embedders
+    # are worth caching.
+    if config.embedding_cache_max_entries > 0 and not isinstance(
+        embedder, HashingEmbedder
+    ):
+        cache_path = config.embedding_cache_path or resolve_data_path(
+            "embedding_cache.db"
+        )
+        embedder = CachedEmbedder(
+            embedder,
+            EmbeddingCache(
+                Path(cache_path), max_entries=config.embedding_cache_max_entries
+            ),
+            embedder_id=f"{config.vector_embedder}:{embedder.dimension}",
+        )
+    base_path = Path(config.vector_path or resolve_data_path("vector_index"))
+    try:
+        return LocalVectorIndex(
+            base_path / config.vector_collection,
+            embedder=embedder,
+            ivf_lists=config.vector_ivf_lists,
+        )
+    except ValueError as exc:
+        _LOGGER.warning("Local vector index unusable, vector search disabled: %s", exc)
+        return NoopVectorIndex()
+
+
 def _build_chroma_config(
     config: MemoryBackendConfig, *, suffix: str
 ) -> "ChromaDBVectorMemoryConfig":
@@ -147,7 +233,9 @@ def _build_chroma_vector_config(
             "ChromaDB configuration requires the chromadb extra. "
             "Install with `pip install autogen-ext[chromadb]`."
         ) from exc
-
+    embedding: dict[str, Any] = {}
+    if config.embedding_cache_max_entries > 0:
+        embedding = _cached_embedding_config(config)
     if config.chroma_host:
         return cast(
             "ChromaDBVectorMemoryConfig",
@@ -156,6 +244,7 @@ def _build_chroma_vector_config(
                 host=config.chroma_host,
                 port=config.chroma_port,
                 ssl=config.chroma_ssl,
+                **embedding,
             ),
         )
     return cast(
@@ -163,5 +252,32 @@ def _build_chroma_vector_config(
         PersistentChromaDBVectorMemoryConfig(
             collection_name=config.vector_collection,
             persistence_path=config.chroma_persistence_path,
+            **embedding,
         ),
     )
+
+
+def _cached_embedding_config(config: MemoryBackendConfig) -> dict[str, Any]:
+    """Route Chroma's document and query embeddings through the cache."""
+
+    try:
+        from autogen_ext.memory.chromadb._chroma_configs import (
+            CustomEmbeddingFunctionConfig,
+        )
+    except ImportError:
+        # Older autogen-ext releases only offer the built-in functions.
+        return {}
+    from src.cyberagent.memory.backends.chromadb_vector import (
+        cached_default_embedding_function,
+    )
+
+    cache_path = config.embedding_cache_path or resolve_data_path("embedding_cache.db")
+    return {
+        "embedding_function_config": CustomEmbeddingFunctionConfig(
+            function=cached_default_embedding_function,
+            params={
+                "cache_path": str(cache_path),
+                "max_entries": config.embedding_cache_max_entries,
+            },
+        )
+    }
@@ -18,9 +18,18 @@ from src.cyberagent.memory.models import (
     MemoryScope,
     MemorySource,
 )
-from src.cyberagent.memory.observability import MemoryAuditSink, MemoryMetrics
+from src.cyberagent.memory.observability import (
+    MemoryAuditSink,
+    MemoryMetrics,
+    backend_label,
+)
 from src.cyberagent.memory.permissions import MemoryAction, check_memory_permission
 from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.result_cache import (
+    MemoryNamespaceVersions,
+    shared_namespace_versions,
+)
+from src.cyberagent.memory.store import MemoryStore
 from src.enums import SystemType
 
 
@@ -106,6 +115,7 @@ class MemoryCrudService:
         max_page_size: int = 100,
         metrics: MemoryMetrics | None = None,
         audit_sink: MemoryAuditSink | None = None,
+        namespace_versions: MemoryNamespaceVersions | None = None,
     ) -> None:
         self._registry = registry
         self._max_bulk_items = max_bulk_items
@@ -114,6 +124,7 @@ class MemoryCrudService:
         self._max_page_size = max_page_size
         self._metrics = metrics
         self._audit_sink = audit_sink
+        self._namespace_versions = namespace_versions or shared_namespace_versions()
 
     def create_entries(
         self, *, actor: MemoryActorContext, requests: Sequence[MemoryCreateRequest]
@@ -158,6 +169,7 @@ class MemoryCrudService:
             )
             store = self._registry.resolve(scope)
             created_entry = store.add(entry)
+            self._namespace_versions.bump(scope, namespace)
             created.append(created_entry)
             self._record_write(count=1)
             self._record_audit(
@@ -188,7 +200,9 @@ class MemoryCrudService:
         store = self._registry.resolve(scope)
         start = time.perf_counter()
         entry = store.get(request.entry_id, scope, namespace)
-        self._record_read_latency((time.perf_counter() - start) * 1000)
+        self._record_read_latency(
+            (time.perf_counter() - start) * 1000, scope=scope, store=store
+        )
         if entry is None:
             self._record_read(hit=False)
             self._record_audit(
@@ -262,6 +276,7 @@ class MemoryCrudService:
                     extra_tags=["conflict_update"],
                 )
                 created_conflict = store.add(conflict_entry)
+                self._namespace_versions.bump(scope, namespace)
                 self._record_write(count=1)
                 self._record_audit(
                     actor=actor,
@@ -287,6 +302,7 @@ class MemoryCrudService:
             entry.etag = uuid4().hex
             entry.updated_at = _utc_now()
             updated.append(store.update(entry))
+            self._namespace_versions.bump(scope, namespace)
             self._record_write(count=1)
             self._record_audit(
                 actor=actor,
@@ -334,6 +350,7 @@ class MemoryCrudService:
                         extra_tags=["conflict_delete"],
                     )
                     created_conflict = store.add(conflict_entry)
+                    self._namespace_versions.bump(scope, namespace)
                     self._record_write(count=1)
                     self._record_audit(
                         actor=actor,
@@ -346,6 +363,8 @@ class MemoryCrudService:
                     )
                     raise MemoryConflictError(entry.id, created_conflict)
             success = store.delete(request.entry_id, scope, namespace)
+            if success:
+                self._namespace_versions.bump(scope, namespace)
             results.append(success)
             self._record_write(count=1)
             self._record_audit(
@@ -400,7 +419,12 @@ class MemoryCrudService:
                 owner_agent_id=owner_agent_id,
             )
             result = store.query(query)
-        self._record_list_latency((time.perf_counter() - start) * 1000)
+        self._record_list_latency(
+            (time.perf_counter() - start) * 1000,
+            scope=resolved_scope,
+            store=store,
+            size=len(result.items),
+        )
         self._record_list()
         self._record_audit(
             actor=actor,
@@ -467,6 +491,7 @@ class MemoryCrudService:
                 conflict_of=existing.id,
             )
             created_conflict = target_store.add(conflict_entry)
+            self._namespace_versions.bump(target_scope, target_namespace)
             self._record_write(count=1)
             self._record_audit(
                 actor=actor,
@@ -495,6 +520,7 @@ class MemoryCrudService:
             layer=entry.layer,
         )
         created = target_store.add(promoted)
+        self._namespace_versions.bump(target_scope, target_namespace)
         self._record_write(count=1)
         self._record_audit(
             actor=actor,
@@ -534,13 +560,30 @@ class MemoryCrudService:
         if self._metrics:
             self._metrics.record_list()
 
-    def _record_read_latency(self, latency_ms: float) -> None:
+    def _record_read_latency(
+        self, latency_ms: float, *, scope: MemoryScope, store: MemoryStore
+    ) -> None:
         if self._metrics:
-            self._metrics.record_read_latency(latency_ms)
+            self._metrics.record_read_latency(
+                latency_ms, scope=scope.value, backend=backend_label(store)
+            )
 
-    def _record_list_latency(self, latency_ms: float) -> None:
+    def _record_list_latency(
+        self,
+        latency_ms: float,
+        *,
+        scope: MemoryScope,
+        store: MemoryStore,
+        size: int,
+    ) -> None:
         if self._metrics:
-            self._metrics.record_list_latency(latency_ms)
+            backend = backend_label(store)
+            self._metrics.record_list_latency(
+                latency_ms, scope=scope.value, backend=backend
+            )
+            self._metrics.record_result_size(
+                "list", size, scope=scope.value, backend=backend
+            )
 
     def _record_audit(
         self,
@@ -0,0 +1,28 @@
+"""Rank fusion helpers for combining memory result lists."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from src.cyberagent.memory.models import MemoryEntry
+
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[MemoryEntry]], *, k: int = RRF_K
+) -> list[MemoryEntry]:
+    """Merge ranked lists by summing ``1 / (k + rank)`` per entry id.
+
+    Entries found by several lists rise to the top; ties keep the order in
+    which entries were first seen.
+    """
+
+    scores: dict[str, float] = {}
+    entries: dict[str, MemoryEntry] = {}
+    for ranking in rankings:
+        for rank, entry in enumerate(ranking, start=1):
+            scores[entry.id] = scores.get(entry.id, 0.0) + 1.0 / (k + rank)
+            entries.setdefault(entry.id, entry)
+    ordered = sorted(scores, key=lambda entry_id: scores[entry_id], reverse=True)
+    return [entries[entry_id] for entry_id in ordered]
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import time
+from typing import Sequence
 
 from src.cyberagent.memory.crud import MemoryActorContext
 from src.cyberagent.memory.models import (
@@ -12,7 +13,7 @@ from src.cyberagent.memory.models import (
     MemoryQuery,
     MemoryScope,
 )
-from src.cyberagent.memory.observability import MemoryMetrics
+from src.cyberagent.memory.observability import MemoryMetrics, backend_label
 from src.cyberagent.memory.permissions import MemoryAction, check_memory_permission
 from src.cyberagent.memory.registry import StaticScopeRegistry
 
@@ -64,7 +65,15 @@ class MemEngine:
         start = time.perf_counter()
         result = store.query(query)
         if self._metrics:
-            self._metrics.record_query_latency((time.perf_counter() - start) * 1000)
+            backend = backend_label(store)
+            self._metrics.record_query_latency(
+                (time.perf_counter() - start) * 1000,
+                scope=scope.value,
+                backend=backend,
+            )
+            self._metrics.record_result_size(
+                "query", len(result.items), scope=scope.value, backend=backend
+            )
             self._metrics.record_query()
         return result
 
@@ -74,6 +83,14 @@ class MemEngine:
             return joined
         return f"{joined[:self._config.max_summary_chars]}..."
 
+    def summarize_many(self, batches: Sequence[list[str]]) -> list[str]:
+        """Summarize several log batches.
+
+        LLM-backed engines can override this to send one request for all of them.
+        """
+
+        return [self.summarize(entries) for entries in batches]
+
     @staticmethod
     def _require_permission(*, actor: MemoryActorContext, scope: MemoryScope) -> None:
         allowed = check_memory_permission(
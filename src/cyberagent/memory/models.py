@@ -98,6 +98,8 @@ class MemoryListResult:
     items: Sequence[MemoryEntry]
     next_cursor: str | None
     has_more: bool
+    # Highlight-free excerpts around the matched terms, keyed by entry id.
+    snippets: dict[str, str] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
         if self.has_more and not self.next_cursor:
@@ -118,6 +120,16 @@ class MemoryQuery:
     owner_agent_id: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class MemoryQueryTarget:
+    """One (scope, namespace) slice of a multi-scope retrieval."""
+
+    scope: MemoryScope
+    namespace: str
+    limit: int
+    owner_agent_id: str | None = None
+
+
 @dataclass(slots=True)
 class MemoryAuditEvent:
     """Audit event for memory CRUD actions."""
@@ -5,14 +5,52 @@ from __future__ import annotations
 import json
 import logging
 import os
+import sys
+import tempfile
 import time
-from dataclasses import dataclass
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Protocol
 
 from src.cyberagent.memory.models import MemoryAuditEvent
 
 logger = logging.getLogger(__name__)
 
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+)
+SIZE_BUCKETS: tuple[float, ...] = (
+    1.0,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    1000.0,
+    4000.0,
+    16000.0,
+)
+_ALL_LABEL = "all"
+METRICS_SNAPSHOT_FILENAME = "memory_metrics.json"
+METRICS_ENV_KEYS = (
+    "MEMORY_METRICS_LOG",
+    "MEMORY_METRICS_LOG_INTERVAL_SECONDS",
+    "MEMORY_METRICS_SNAPSHOT_PATH",
+)
+
 
 class MemoryAuditSink(Protocol):
     """Sink for memory audit events."""
@@ -41,6 +79,63 @@ class LoggingMemoryAuditSink:
         logger.info("memory_audit %s", payload)
 
 
+@dataclass
+class MemoryHistogram:
+    """Fixed-bucket histogram; percentiles resolve to a bucket upper bound."""
+
+    bounds: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index == len(self.bounds):
+                    return self.max
+                return min(self.bounds[index], self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": [
+                [bound, bucket_count]
+                for bound, bucket_count in zip(
+                    [*self.bounds, "+Inf"], self.counts, strict=True
+                )
+            ],
+        }
+
+
+def backend_label(store: object) -> str:
+    """Short backend name for metrics, e.g. ``SqliteMemoryStore`` -> ``sqlite``."""
+
+    name = type(store).__name__
+    return name.removesuffix("MemoryStore").removesuffix("Store").lower() or name
+
+
 @dataclass
 class MemoryMetrics:
     reporter: "MemoryMetricsReporter | None" = None
@@ -54,6 +149,17 @@ class MemoryMetrics:
     list_latency_ms_total: float = 0.0
     query_latency_ms_total: float = 0.0
     injection_size_total: int = 0
+    result_cache_hit_count: int = 0
+    result_cache_miss_count: int = 0
+    reflection_count: int = 0
+    reflection_lag_seconds_last: float = 0.0
+    reflection_lag_seconds_max: float = 0.0
+    latency_histograms: dict[tuple[str, str, str], MemoryHistogram] = field(
+        default_factory=dict
+    )
+    size_histograms: dict[tuple[str, str, str], MemoryHistogram] = field(
+        default_factory=dict
+    )
 
     def record_read(self, hit: bool) -> None:
         self.read_count += 1
@@ -75,22 +181,137 @@ class MemoryMetrics:
         self.query_count += 1
         self._maybe_report()
 
-    def record_read_latency(self, latency_ms: float) -> None:
+    def record_read_latency(
+        self,
+        latency_ms: float,
+        *,
+        scope: str | None = None,
+        backend: str | None = None,
+    ) -> None:
         self.read_latency_ms_total += latency_ms
+        self._observe_latency("read", latency_ms, scope, backend)
         self._maybe_report()
 
-    def record_list_latency(self, latency_ms: float) -> None:
+    def record_list_latency(
+        self,
+        latency_ms: float,
+        *,
+        scope: str | None = None,
+        backend: str | None = None,
+    ) -> None:
         self.list_latency_ms_total += latency_ms
+        self._observe_latency("list", latency_ms, scope, backend)
         self._maybe_report()
 
-    def record_query_latency(self, latency_ms: float) -> None:
+    def record_query_latency(
+        self,
+        latency_ms: float,
+        *,
+        scope: str | None = None,
+        backend: str | None = None,
+    ) -> None:
         self.query_latency_ms_total += latency_ms
+        self._observe_latency("query", latency_ms, scope, backend)
         self._maybe_report()
 
-    def record_injection_size(self, size: int) -> None:
+    def record_injection_size(
+        self,
+        size: int,
+        *,
+        latency_ms: float | None = None,
+        scope: str | None = None,
+    ) -> None:
         self.injection_size_total += size
+        self.record_result_size("injection", size, scope=scope)
+        if latency_ms is not None:
+            self._observe_latency("injection", latency_ms, scope, None)
+        self._maybe_report()
+
+    def record_result_size(
+        self,
+        operation: str,
+        size: int,
+        *,
+        scope: str | None = None,
+        backend: str | None = None,
+    ) -> None:
+        """Observe a result size: entries for read/list/query, chars for injection."""
+
+        key = (operation, scope or _ALL_LABEL, backend or _ALL_LABEL)
+        histogram = self.size_histograms.get(key)
+        if histogram is None:
+            histogram = self.size_histograms[key] = MemoryHistogram(SIZE_BUCKETS)
+        histogram.observe(float(size))
+
+    def record_result_cache_lookup(self, hit: bool) -> None:
+        if hit:
+            self.result_cache_hit_count += 1
+        else:
+            self.result_cache_miss_count += 1
+        self._maybe_report()
+
+    def record_reflection_lag(self, lag_seconds: float, count: int = 1) -> None:
+        self.reflection_count += count
+        self.reflection_lag_seconds_last = lag_seconds
+        self.reflection_lag_seconds_max = max(
+            self.reflection_lag_seconds_max, lag_seconds
+        )
         self._maybe_report()
 
+    def snapshot(self) -> dict[str, object]:
+        """Counters plus histograms keyed by (operation, scope, backend)."""
+
+        return {
+            "read_count": self.read_count,
+            "write_count": self.write_count,
+            "list_count": self.list_count,
+            "query_count": self.query_count,
+            "hit_rate": self.hit_rate,
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+            "read_latency_ms_total": self.read_latency_ms_total,
+            "list_latency_ms_total": self.list_latency_ms_total,
+            "query_latency_ms_total": self.query_latency_ms_total,
+            "injection_size_total": self.injection_size_total,
+            "result_cache_hit_rate": self.result_cache_hit_rate,
+            "result_cache_hit_count": self.result_cache_hit_count,
+            "result_cache_miss_count": self.result_cache_miss_count,
+            "reflection_count": self.reflection_count,
+            "reflection_lag_seconds_last": self.reflection_lag_seconds_last,
+            "reflection_lag_seconds_max": self.reflection_lag_seconds_max,
+            "histograms": [
+                {
+                    "metric": metric,
+                    "operation": operation,
+                    "scope": scope,
+                    "backend": backend,
+                    **histogram.to_dict(),
+                }
+                for metric, histograms in (
+                    ("latency_ms", self.latency_histograms),
+                    ("size", self.size_histograms),
+                )
+                for (operation, scope, backend), histogram in sorted(
+                    list(histograms.items()), key=lambda item: item[0]
+                )
+            ],
+        }
+
+    def _observe_latency(
+        self,
+        operation: str,
+        latency_ms: float,
+        scope: str | None,
+        backend: str | None,
+    ) -> None:
+        key = (operation, scope or _ALL_LABEL, backend or _ALL_LABEL)
+        histogram = self.latency_histograms.get(key)
+        if histogram is None:
+            histogram = self.latency_histograms[key] = MemoryHistogram(
+                LATENCY_BUCKETS_MS
+            )
+        histogram.observe(latency_ms)
+
     def _maybe_report(self) -> None:
         if self.reporter is None:
             return
@@ -103,10 +324,27 @@ class MemoryMetrics:
             return 0.0
         return self.hit_count / total
 
+    @property
+    def result_cache_hit_rate(self) -> float:
+        total = self.result_cache_hit_count + self.result_cache_miss_count
+        if total == 0:
+            return 0.0
+        return self.result_cache_hit_count / total
+
 
 @dataclass
 class MemoryMetricsReporter:
+    """Log metrics and/or write a JSON snapshot at most once per interval.
+
+    Every process writes its own ``<stem>.<pid><suffix>`` file next to
+    ``snapshot_path``, labelled with its pid and process name, so concurrent
+    processes never overwrite each other. Each file is replaced atomically
+    so readers such as the dashboard never see a partial write.
+    """
+
     interval_seconds: float = 60.0
+    log_enabled: bool = True
+    snapshot_path: Path | None = None
     _last_logged_at: float = 0.0
 
     def maybe_log(self, metrics: MemoryMetrics) -> None:
@@ -117,29 +355,73 @@ class MemoryMetricsReporter:
         ):
             return
         self._last_logged_at = now
-        payload = {
-            "read_count": metrics.read_count,
-            "write_count": metrics.write_count,
-            "list_count": metrics.list_count,
-            "query_count": metrics.query_count,
-            "hit_rate": metrics.hit_rate,
-            "hit_count": metrics.hit_count,
-            "miss_count": metrics.miss_count,
-            "read_latency_ms_total": metrics.read_latency_ms_total,
-            "list_latency_ms_total": metrics.list_latency_ms_total,
-            "query_latency_ms_total": metrics.query_latency_ms_total,
-            "injection_size_total": metrics.injection_size_total,
-        }
-        logger.info("memory_metrics %s", json.dumps(payload))
+        payload = metrics.snapshot()
+        if self.log_enabled:
+            logger.info("memory_metrics %s", json.dumps(payload))
+        if self.snapshot_path is not None:
+            _write_snapshot(process_snapshot_path(self.snapshot_path), payload)
+
+
+def process_snapshot_path(path: Path, pid: int | None = None) -> Path:
+    """This process's snapshot file, e.g. ``memory_metrics.<pid>.json``."""
+
+    resolved_pid = os.getpid() if pid is None else pid
+    return path.with_name(f"{path.stem}.{resolved_pid}{path.suffix}")
+
+
+def process_snapshot_paths(path: Path) -> list[Path]:
+    """Every per-process snapshot file written for ``path``."""
+
+    return sorted(
+        candidate
+        for candidate in path.parent.glob(f"{path.stem}.*{path.suffix}")
+        if candidate.name.removesuffix(path.suffix).rpartition(".")[2].isdigit()
+    )
+
+
+def _write_snapshot(path: Path, payload: dict[str, object]) -> None:
+    snapshot = {
+        "generated_at": time.time(),
+        "pid": os.getpid(),
+        "process": Path(sys.argv[0]).name if sys.argv and sys.argv[0] else "python",
+        **payload,
+    }
+    temp_name: str | None = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp name keeps threads of one process from clobbering
+        # each other's half-written file before the atomic replace.
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=path.parent,
+            prefix=f".{path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as handle:
+            temp_name = handle.name
+            handle.write(json.dumps(snapshot))
+        os.replace(temp_name, path)
+    except OSError as exc:
+        logger.warning("Failed to write memory metrics snapshot: %s", exc)
+        if temp_name is not None:
+            Path(temp_name).unlink(missing_ok=True)
+
+
+def build_memory_metrics(snapshot_path: str | None = None) -> MemoryMetrics:
+    """Build metrics from env.
 
+    ``MEMORY_METRICS_SNAPSHOT_PATH`` overrides ``snapshot_path``; an empty
+    value disables the JSON snapshot.
+    """
 
-def build_memory_metrics() -> MemoryMetrics:
     enabled = os.environ.get("MEMORY_METRICS_LOG", "false").lower() in {
         "1",
         "true",
         "yes",
     }
-    if not enabled:
+    snapshot_raw = os.environ.get("MEMORY_METRICS_SNAPSHOT_PATH", snapshot_path or "")
+    if not enabled and not snapshot_raw:
         return MemoryMetrics()
     interval_raw = os.environ.get("MEMORY_METRICS_LOG_INTERVAL_SECONDS", "60")
     try:
@@ -148,5 +430,9 @@ def build_memory_metrics() -> MemoryMetrics:
         raise ValueError(
             "MEMORY_METRICS_LOG_INTERVAL_SECONDS must be a number."
         ) from exc
-    reporter = MemoryMetricsReporter(interval_seconds=interval)
+    reporter = MemoryMetricsReporter(
+        interval_seconds=interval,
+        log_enabled=enabled,
+        snapshot_path=Path(snapshot_raw) if snapshot_raw else None,
+    )
     return MemoryMetrics(reporter=reporter)
@@ -9,11 +9,31 @@ from src.cyberagent.memory.crud import MemoryActorContext
 from src.cyberagent.memory.models import MemoryEntry, MemoryPriority, MemoryScope
 from src.cyberagent.memory.permissions import MemoryAction, check_memory_permission
 from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.result_cache import (
+    MemoryNamespaceVersions,
+    shared_namespace_versions,
+)
+from src.cyberagent.memory.store import PrunableMemoryStore
+
+# Stores that page with keyset cursors seek straight to each page, so a
+# larger page only trades memory for fewer round trips.
+_COLLECT_PAGE_SIZE = 500
 
 
 @dataclass(frozen=True)
 class MemoryPruningConfig:
     max_entries_per_namespace: int = 1000
+    # ``maybe_prune`` waits until a namespace holds this many entries, then
+    # prunes back down to ``max_entries_per_namespace``. 0 means max + 10%.
+    high_water_entries: int = 0
+
+    @property
+    def high_water_mark(self) -> int:
+        if self.high_water_entries > 0:
+            return max(self.high_water_entries, self.max_entries_per_namespace)
+        return self.max_entries_per_namespace + max(
+            1, self.max_entries_per_namespace // 10
+        )
 
 
 class MemoryPruner:
@@ -22,9 +42,11 @@ class MemoryPruner:
         *,
         registry: StaticScopeRegistry,
         config: MemoryPruningConfig | None = None,
+        namespace_versions: MemoryNamespaceVersions | None = None,
     ) -> None:
         self._registry = registry
         self._config = config or MemoryPruningConfig()
+        self._namespace_versions = namespace_versions or shared_namespace_versions()
 
     def prune(
         self,
@@ -36,6 +58,48 @@ class MemoryPruner:
         self._require_permission(actor=actor, scope=scope)
         store = self._registry.resolve(scope)
         owner_agent_id = actor.agent_id if scope == MemoryScope.AGENT else None
+        prunable = _sql_prunable(store)
+        if prunable is not None:
+            deleted = prunable.prune_namespace(
+                scope,
+                namespace,
+                max_entries=self._config.max_entries_per_namespace,
+                owner_agent_id=owner_agent_id,
+            )
+        else:
+            deleted = self._prune_in_python(store, scope, namespace, owner_agent_id)
+        if deleted:
+            self._namespace_versions.bump(scope, namespace)
+        return deleted
+
+    def maybe_prune(
+        self,
+        *,
+        actor: MemoryActorContext,
+        scope: MemoryScope,
+        namespace: str,
+    ) -> list[str]:
+        """Prune only once the namespace count crosses the high-water mark.
+
+        Stores without SQL pruning cannot count cheaply and always prune.
+        """
+
+        self._require_permission(actor=actor, scope=scope)
+        prunable = _sql_prunable(self._registry.resolve(scope))
+        if prunable is not None:
+            owner_agent_id = actor.agent_id if scope == MemoryScope.AGENT else None
+            count = prunable.count_entries(scope, namespace, owner_agent_id)
+            if count <= self._config.high_water_mark:
+                return []
+        return self.prune(actor=actor, scope=scope, namespace=namespace)
+
+    def _prune_in_python(
+        self,
+        store,
+        scope: MemoryScope,
+        namespace: str,
+        owner_agent_id: str | None,
+    ) -> list[str]:
         entries = _collect_entries(store, scope, namespace, owner_agent_id)
         deleted: list[str] = []
 
@@ -76,6 +140,14 @@ class MemoryPruner:
             )
 
 
+def _sql_prunable(store) -> PrunableMemoryStore | None:
+    if not isinstance(store, PrunableMemoryStore):
+        return None
+    if not getattr(store, "supports_sql_pruning", True):
+        return None
+    return store
+
+
 def _collect_entries(
     store,
     scope: MemoryScope,
@@ -86,7 +158,11 @@ def _collect_entries(
     cursor = None
     while True:
         result = store.list(
-            scope, namespace, limit=100, cursor=cursor, owner_agent_id=owner_agent_id
+            scope,
+            namespace,
+            limit=_COLLECT_PAGE_SIZE,
+            cursor=cursor,
+            owner_agent_id=owner_agent_id,
         )
         entries.extend(result.items)
         if not result.has_more:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Sequence
 
 from src.cyberagent.memory.crud import (
     MemoryActorContext,
@@ -11,6 +12,7 @@ from src.cyberagent.memory.crud import (
 )
 from src.cyberagent.memory.memengine import MemEngine
 from src.cyberagent.memory.models import (
+    MemoryEntry,
     MemoryLayer,
     MemoryPriority,
     MemoryScope,
@@ -24,6 +26,15 @@ class MemoryReflectionConfig:
     max_chars: int = 1200
 
 
+@dataclass(frozen=True)
+class MemoryReflectionRequest:
+    actor: MemoryActorContext
+    scope: MemoryScope
+    namespace: str
+    session_logs: list[str]
+    layer: MemoryLayer
+
+
 class MemoryReflectionService:
     """Summarize session logs into memory entries."""
 
@@ -48,25 +59,70 @@ class MemoryReflectionService:
         session_logs: list[str],
         layer: MemoryLayer,
     ):
-        if not session_logs:
-            return None
+        return self.reflect_many(
+            [
+                MemoryReflectionRequest(
+                    actor=actor,
+                    scope=scope,
+                    namespace=namespace,
+                    session_logs=session_logs,
+                    layer=layer,
+                )
+            ]
+        )[0]
+
+    def reflect_many(
+        self, requests: Sequence[MemoryReflectionRequest]
+    ) -> list[MemoryEntry | None]:
+        """Summarize every request in one engine call, then store each summary."""
+
+        return [
+            self.store_summary(request, summary)
+            for request, summary in zip(requests, self.summarize_many(requests))
+        ]
+
+    def summarize_many(
+        self, requests: Sequence[MemoryReflectionRequest]
+    ) -> list[str | None]:
+        """Summaries aligned with ``requests``; ``None`` where there are no logs."""
+
+        pending = [request for request in requests if request.session_logs]
         if self._engine is None:
-            summary = _summarize(session_logs, max_chars=self._config.max_chars)
+            summaries = [
+                _summarize(request.session_logs, max_chars=self._config.max_chars)
+                for request in pending
+            ]
         else:
-            summary = self._engine.summarize(session_logs)
-        request = MemoryCreateRequest(
-            content=summary,
-            namespace=namespace,
-            scope=scope,
-            tags=["reflection"],
-            priority=MemoryPriority.MEDIUM,
-            source=MemorySource.REFLECTION,
-            confidence=0.6,
-            expires_at=None,
-            layer=layer,
-            owner_agent_id=actor.agent_id,
+            summaries = self._engine.summarize_many(
+                [request.session_logs for request in pending]
+            )
+        by_request = {
+            id(request): summary for request, summary in zip(pending, summaries)
+        }
+        return [by_request.get(id(request)) for request in requests]
+
+    def store_summary(
+        self, request: MemoryReflectionRequest, summary: str | None
+    ) -> MemoryEntry | None:
+        if summary is None:
+            return None
+        created = self._crud.create_entries(
+            actor=request.actor,
+            requests=[
+                MemoryCreateRequest(
+                    content=summary,
+                    namespace=request.namespace,
+                    scope=request.scope,
+                    tags=["reflection"],
+                    priority=MemoryPriority.MEDIUM,
+                    source=MemorySource.REFLECTION,
+                    confidence=0.6,
+                    expires_at=None,
+                    layer=request.layer,
+                    owner_agent_id=request.actor.agent_id,
+                )
+            ],
         )
-        created = self._crud.create_entries(actor=actor, requests=[request])
         return created[0] if created else None
 
 
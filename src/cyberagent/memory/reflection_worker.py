@@ -0,0 +1,367 @@
+"""Durable session-log buffers and the background reflection worker."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence
+
+from src.cyberagent.memory.crud import MemoryActorContext
+from src.cyberagent.memory.memengine import MemEngine
+from src.cyberagent.memory.models import MemoryLayer, MemoryScope
+from src.cyberagent.memory.observability import MemoryMetrics
+from src.cyberagent.memory.reflection import (
+    MemoryReflectionRequest,
+    MemoryReflectionService,
+)
+from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.enums import SystemType
+
+_LOGGER = logging.getLogger(__name__)
+DEFAULT_POLL_INTERVAL_SECONDS = 30.0
+DEFAULT_MAX_BATCH = 16
+_BUFFER_FILENAME = "memory_reflection_buffer.db"
+REFLECTION_WORKER_ENV_KEYS = (
+    "MEMORY_REFLECTION_WORKER",
+    "MEMORY_REFLECTION_BUFFER_PATH",
+    "MEMORY_COMPACTION_THRESHOLD_CHARS",
+    "MEMORY_REFLECTION_INTERVAL_SECONDS",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PendingReflection:
+    """Buffered logs for one (agent, scope, namespace) that are due."""
+
+    buffer_key: str
+    actor: MemoryActorContext
+    scope: MemoryScope
+    namespace: str
+    logs: list[str]
+    up_to_id: int
+    oldest_created_at: float
+
+
+@dataclass(slots=True)
+class ReflectionBuffer:
+    """SQLite-backed per-namespace buffer of session logs awaiting reflection.
+
+    Rows are deleted only after their summary has been stored, so a crash
+    between the two replays the buffer instead of dropping it.
+    """
+
+    path: Path
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS reflection_buffer (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    buffer_key TEXT NOT NULL,
+                    log TEXT NOT NULL,
+                    chars INTEGER NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reflection_buffer_key "
+                "ON reflection_buffer(buffer_key, id)"
+            )
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS reflection_buffer_state (
+                    buffer_key TEXT PRIMARY KEY,
+                    agent_id TEXT NOT NULL,
+                    system_id INTEGER NOT NULL,
+                    team_id INTEGER NOT NULL,
+                    system_type TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    namespace TEXT NOT NULL,
+                    last_reflected_at REAL NOT NULL DEFAULT 0
+                )
+                """)
+            connection.commit()
+
+    def append(
+        self,
+        *,
+        actor: MemoryActorContext,
+        scope: MemoryScope,
+        namespace: str,
+        logs: Sequence[str],
+        now: float | None = None,
+    ) -> None:
+        if not logs:
+            return
+        key = buffer_key(actor, scope, namespace)
+        created_at = time.time() if now is None else now
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                """
+                INSERT INTO reflection_buffer_state (
+                    buffer_key, agent_id, system_id, team_id, system_type,
+                    scope, namespace
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(buffer_key) DO NOTHING
+                """,
+                (
+                    key,
+                    actor.agent_id,
+                    actor.system_id,
+                    actor.team_id,
+                    actor.system_type.value,
+                    scope.value,
+                    namespace,
+                ),
+            )
+            connection.executemany(
+                """
+                INSERT INTO reflection_buffer (buffer_key, log, chars, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                [(key, log, len(log), created_at) for log in logs],
+            )
+            connection.commit()
+
+    def due(
+        self,
+        *,
+        threshold_chars: int,
+        interval_seconds: float,
+        limit: int,
+        now: float | None = None,
+    ) -> list[PendingReflection]:
+        """Buffers over the size threshold or past the reflection interval."""
+
+        current = time.time() if now is None else now
+        with self._lock, self._connect() as connection:
+            states = connection.execute(
+                """
+                SELECT s.*, b.max_id, b.oldest FROM reflection_buffer_state AS s
+                JOIN (
+                    SELECT buffer_key, SUM(chars) AS total_chars,
+                        MAX(id) AS max_id, MIN(created_at) AS oldest
+                    FROM reflection_buffer GROUP BY buffer_key
+                ) AS b ON b.buffer_key = s.buffer_key
+                WHERE b.total_chars >= ? OR ? - s.last_reflected_at >= ?
+                ORDER BY b.oldest
+                LIMIT ?
+                """,
+                (threshold_chars, current, interval_seconds, limit),
+            ).fetchall()
+            return [
+                PendingReflection(
+                    buffer_key=state["buffer_key"],
+                    actor=MemoryActorContext(
+                        agent_id=state["agent_id"],
+                        system_id=int(state["system_id"]),
+                        team_id=int(state["team_id"]),
+                        system_type=SystemType(state["system_type"]),
+                    ),
+                    scope=MemoryScope(state["scope"]),
+                    namespace=state["namespace"],
+                    logs=[
+                        row["log"]
+                        for row in connection.execute(
+                            """
+                            SELECT log FROM reflection_buffer
+                            WHERE buffer_key = ? AND id <= ?
+                            ORDER BY id
+                            """,
+                            (state["buffer_key"], state["max_id"]),
+                        )
+                    ],
+                    up_to_id=int(state["max_id"]),
+                    oldest_created_at=float(state["oldest"]),
+                )
+                for state in states
+            ]
+
+    def complete(self, pending: PendingReflection, *, now: float | None = None) -> None:
+        reflected_at = time.time() if now is None else now
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "DELETE FROM reflection_buffer WHERE buffer_key = ? AND id <= ?",
+                (pending.buffer_key, pending.up_to_id),
+            )
+            connection.execute(
+                """
+                UPDATE reflection_buffer_state SET last_reflected_at = ?
+                WHERE buffer_key = ?
+                """,
+                (reflected_at, pending.buffer_key),
+            )
+            connection.commit()
+
+    def pending_count(self) -> int:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT COUNT(*) FROM reflection_buffer"
+            ).fetchone()
+        return int(row[0])
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5.0)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+
+def buffer_key(actor: MemoryActorContext, scope: MemoryScope, namespace: str) -> str:
+    return f"{actor.agent_id}:{scope.value}:{namespace}"
+
+
+@dataclass(slots=True)
+class MemoryReflectionWorker:
+    """Summarize buffered session logs on a daemon thread.
+
+    ``enqueue`` only appends to the durable buffer, so the agent turn never
+    waits on summarization. Each pass summarizes every due namespace with a
+    single engine call, then stores and completes each buffer on its own, and
+    records how long the oldest buffered log waited as the reflection lag.
+    """
+
+    reflection: MemoryReflectionService
+    buffer: ReflectionBuffer
+    compaction_threshold_chars: int = 8000
+    reflection_interval_seconds: float = 3600.0
+    poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS
+    max_batch: int = DEFAULT_MAX_BATCH
+    metrics: MemoryMetrics | None = None
+    _wake: threading.Event = field(default_factory=threading.Event, init=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False)
+    _thread: threading.Thread | None = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="memory-reflection-worker", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def enqueue(
+        self,
+        *,
+        actor: MemoryActorContext,
+        scope: MemoryScope,
+        namespace: str,
+        logs: Sequence[str],
+    ) -> None:
+        self.buffer.append(actor=actor, scope=scope, namespace=namespace, logs=logs)
+        self._wake.set()
+
+    def run_once(self, now: float | None = None) -> int:
+        """Reflect every due buffer in one batch; return buffers reflected."""
+
+        current = time.time() if now is None else now
+        pending = self.buffer.due(
+            threshold_chars=self.compaction_threshold_chars,
+            interval_seconds=self.reflection_interval_seconds,
+            limit=self.max_batch,
+            now=current,
+        )
+        if not pending:
+            return 0
+        requests = [
+            MemoryReflectionRequest(
+                actor=item.actor,
+                scope=item.scope,
+                namespace=item.namespace,
+                session_logs=item.logs,
+                layer=MemoryLayer.LONG_TERM,
+            )
+            for item in pending
+        ]
+        summaries = self.reflection.summarize_many(requests)
+        reflected: list[PendingReflection] = []
+        for item, request, summary in zip(pending, requests, summaries):
+            # Complete each buffer as soon as its own summary is stored so a
+            # failing namespace neither blocks nor duplicates the others.
+            try:
+                self.reflection.store_summary(request, summary)
+            except Exception as exc:
+                _LOGGER.warning(
+                    "Memory reflection for %s failed: %s", item.buffer_key, exc
+                )
+                continue
+            self.buffer.complete(item, now=current)
+            reflected.append(item)
+        if self.metrics is not None and reflected:
+            lag = max(current - item.oldest_created_at for item in reflected)
+            self.metrics.record_reflection_lag(max(lag, 0.0), count=len(reflected))
+        return len(reflected)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                while self.run_once() >= self.max_batch:
+                    if self._stop.is_set():
+                        return
+            except Exception as exc:  # pragma: no cover - sqlite/engine failures
+                _LOGGER.warning("Memory reflection pass failed: %s", exc)
+            self._wake.wait(self.poll_interval_seconds)
+
+
+def build_memory_reflection_worker(
+    *,
+    sqlite_path: str,
+    registry: StaticScopeRegistry,
+    metrics: MemoryMetrics | None = None,
+) -> MemoryReflectionWorker | None:
+    """Start the reflection worker unless ``MEMORY_REFLECTION_WORKER`` is false.
+
+    The buffer lives next to the memory database unless
+    ``MEMORY_REFLECTION_BUFFER_PATH`` points elsewhere.
+    """
+
+    enabled = os.environ.get("MEMORY_REFLECTION_WORKER", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    if not enabled:
+        return None
+    threshold_raw = os.environ.get("MEMORY_COMPACTION_THRESHOLD_CHARS", "8000")
+    interval_raw = os.environ.get("MEMORY_REFLECTION_INTERVAL_SECONDS", "3600")
+    try:
+        threshold = int(threshold_raw)
+    except ValueError as exc:
+        raise ValueError(
+            "MEMORY_COMPACTION_THRESHOLD_CHARS must be an integer."
+        ) from exc
+    try:
+        interval = float(interval_raw)
+    except ValueError as exc:
+        raise ValueError(
+            "MEMORY_REFLECTION_INTERVAL_SECONDS must be a number."
+        ) from exc
+    buffer_path = os.environ.get("MEMORY_REFLECTION_BUFFER_PATH") or str(
+        Path(sqlite_path).with_name(_BUFFER_FILENAME)
+    )
+    worker = MemoryReflectionWorker(
+        reflection=MemoryReflectionService(
+            registry=registry, engine=MemEngine(registry=registry, metrics=metrics)
+        ),
+        buffer=ReflectionBuffer(Path(buffer_path)),
+        compaction_threshold_chars=threshold,
+        reflection_interval_seconds=interval,
+        metrics=metrics,
+    )
+    worker.start()
+    return worker
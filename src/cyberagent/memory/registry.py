@@ -30,3 +30,15 @@ class StaticScopeRegistry:
                 raise ValueError("global store is not configured")
             return self.global_store
         raise ValueError(f"unsupported memory scope: {scope}")
+
+    def close(self) -> None:
+        """Close each distinct store that owns background resources."""
+
+        seen: set[int] = set()
+        for store in (self.agent_store, self.team_store, self.global_store):
+            if store is None or id(store) in seen:
+                continue
+            seen.add(id(store))
+            close = getattr(store, "close", None)
+            if callable(close):
+                close()
@@ -0,0 +1,143 @@
+"""Retrieval result cache invalidated by per-namespace write versions."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Hashable, Sequence
+
+from src.cyberagent.memory.models import MemoryListResult, MemoryScope
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 30.0
+RESULT_CACHE_ENV_KEYS = (
+    "MEMORY_RESULT_CACHE_SIZE",
+    "MEMORY_RESULT_CACHE_TTL_SECONDS",
+)
+
+
+@dataclass(slots=True)
+class MemoryNamespaceVersions:
+    """Monotonic write counters per (scope, namespace).
+
+    ``MemoryCrudService`` bumps the counter after every create, update and
+    delete; cached results stamped with an older version are discarded.
+    """
+
+    _versions: dict[tuple[MemoryScope, str], int] = field(
+        default_factory=dict, init=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def current(self, scope: MemoryScope, namespace: str) -> int:
+        with self._lock:
+            return self._versions.get((scope, namespace), 0)
+
+    def bump(self, scope: MemoryScope, namespace: str) -> int:
+        with self._lock:
+            version = self._versions.get((scope, namespace), 0) + 1
+            self._versions[(scope, namespace)] = version
+            return version
+
+
+_SHARED_VERSIONS = MemoryNamespaceVersions()
+
+
+def shared_namespace_versions() -> MemoryNamespaceVersions:
+    """Process-wide counters, so every CRUD service invalidates every cache."""
+
+    return _SHARED_VERSIONS
+
+
+@dataclass(slots=True)
+class MemoryResultCache:
+    """LRU + TTL cache of retrieval results.
+
+    Callers take a version stamp for the namespaces a query touches *before*
+    running it, then ``get``/``put`` with that stamp. A write that lands while
+    the query runs therefore leaves the stored result already stale.
+    Writes from other processes are only bounded by ``ttl_seconds``.
+    """
+
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    ttl_seconds: float = DEFAULT_TTL_SECONDS
+    versions: MemoryNamespaceVersions = field(default_factory=shared_namespace_versions)
+    _entries: OrderedDict[Hashable, tuple[float, tuple[int, ...], MemoryListResult]] = (
+        field(default_factory=OrderedDict, init=False)
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def version_stamp(
+        self, namespaces: Sequence[tuple[MemoryScope, str]]
+    ) -> tuple[int, ...]:
+        return tuple(
+            self.versions.current(scope, namespace) for scope, namespace in namespaces
+        )
+
+    def get(self, key: Hashable, stamp: tuple[int, ...]) -> MemoryListResult | None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            expires_at, cached_stamp, result = cached
+            if cached_stamp != stamp or time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return _copy_result(result)
+
+    def put(
+        self, key: Hashable, stamp: tuple[int, ...], result: MemoryListResult
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + self.ttl_seconds,
+                stamp,
+                _copy_result(result),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _copy_result(result: MemoryListResult) -> MemoryListResult:
+    return MemoryListResult(
+        items=list(result.items),
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        snippets=dict(result.snippets),
+    )
+
+
+def build_memory_result_cache() -> MemoryResultCache | None:
+    """Build the cache from env; ``MEMORY_RESULT_CACHE_SIZE=0`` disables it."""
+
+    size_raw = os.environ.get("MEMORY_RESULT_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES))
+    ttl_raw = os.environ.get(
+        "MEMORY_RESULT_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS)
+    )
+    try:
+        size = int(size_raw)
+    except ValueError as exc:
+        raise ValueError("MEMORY_RESULT_CACHE_SIZE must be an integer.") from exc
+    try:
+        ttl = float(ttl_raw)
+    except ValueError as exc:
+        raise ValueError("MEMORY_RESULT_CACHE_TTL_SECONDS must be a number.") from exc
+    if size <= 0 or ttl <= 0:
+        return None
+    return MemoryResultCache(max_entries=size, ttl_seconds=ttl)
@@ -4,20 +4,30 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import time
-from typing import Iterable
+import uuid
+from typing import Hashable, Iterable, Sequence
 
 from src.cyberagent.memory.crud import MemoryActorContext
+from src.cyberagent.memory.fusion import reciprocal_rank_fusion
 from src.cyberagent.memory.memengine import MemEngine
 from src.cyberagent.memory.models import (
     MemoryAuditEvent,
     MemoryEntry,
     MemoryLayer,
+    MemoryListResult,
     MemoryQuery,
+    MemoryQueryTarget,
     MemoryScope,
 )
-from src.cyberagent.memory.observability import MemoryAuditSink, MemoryMetrics
+from src.cyberagent.memory.observability import (
+    MemoryAuditSink,
+    MemoryMetrics,
+    backend_label,
+)
 from src.cyberagent.memory.permissions import MemoryAction, check_memory_permission
 from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.result_cache import MemoryResultCache
+from src.cyberagent.memory.store import MemoryStore, MultiTargetMemoryStore
 
 
 @dataclass(frozen=True)
@@ -41,7 +51,9 @@ class MemoryInjector:
     def build_prompt_entries(self, entries: Iterable[MemoryEntry]) -> list[str]:
         max_chars = self._config.max_chars
         per_entry = self._config.per_entry_max_chars
+        start = time.perf_counter()
         output: list[str] = []
+        scopes: set[str] = set()
         total = 0
         for entry in entries:
             content = entry.content.strip().replace("\n", " ")
@@ -56,9 +68,14 @@ class MemoryInjector:
                 content = f"{content[:trim]}{suffix}"
             line = f"{header}{content}"
             output.append(line)
+            scopes.add(entry.scope.value)
             total += len(line)
         if self._metrics:
-            self._metrics.record_injection_size(total)
+            self._metrics.record_injection_size(
+                total,
+                latency_ms=(time.perf_counter() - start) * 1000,
+                scope="+".join(sorted(scopes)) or None,
+            )
         return output
 
 
@@ -73,12 +90,14 @@ class MemoryRetrievalService:
         default_limit: int = 10,
         engine: MemEngine | None = None,
         audit_sink: MemoryAuditSink | None = None,
+        result_cache: MemoryResultCache | None = None,
     ) -> None:
         self._registry = registry
         self._metrics = metrics
         self._default_limit = default_limit
         self._engine = engine
         self._audit_sink = audit_sink
+        self._result_cache = result_cache
 
     def search_entries(
         self,
@@ -94,6 +113,26 @@ class MemoryRetrievalService:
         target_team_id: int | None = None,
     ):
         resolved_limit = limit or self._default_limit
+        # Permission is a function of the actor fields in the key, so a cached
+        # result only exists for a key that already passed the check.
+        cache_key = (
+            "entries",
+            _actor_key(actor),
+            scope,
+            namespace,
+            query_text,
+            tuple(tags or ()),
+            layer,
+            resolved_limit,
+            cursor,
+            target_team_id,
+        )
+        stamp, cached = self._cache_lookup(cache_key, [(scope, namespace)])
+        if cached is not None:
+            self._record_audit(
+                actor=actor, scope=scope, namespace=namespace, result=cached
+            )
+            return cached
         if self._engine is not None:
             result = self._engine.search_entries(
                 actor=actor,
@@ -105,6 +144,7 @@ class MemoryRetrievalService:
                 tags=tags,
                 layer=layer,
             )
+            self._cache_store(cache_key, stamp, result)
             self._record_audit(
                 actor=actor, scope=scope, namespace=namespace, result=result
             )
@@ -127,11 +167,161 @@ class MemoryRetrievalService:
         start = time.perf_counter()
         result = store.query(query)
         if self._metrics:
-            self._metrics.record_query_latency((time.perf_counter() - start) * 1000)
-            self._metrics.record_query()
+            _record_query_metrics(
+                self._metrics,
+                (time.perf_counter() - start) * 1000,
+                scope=scope.value,
+                store=store,
+                size=len(result.items),
+            )
+        self._cache_store(cache_key, stamp, result)
         self._record_audit(actor=actor, scope=scope, namespace=namespace, result=result)
         return result
 
+    def search_targets(
+        self,
+        *,
+        actor: MemoryActorContext,
+        targets: Sequence[tuple[MemoryScope, str]],
+        query_text: str | None,
+        limit: int | None = None,
+        tags: list[str] | None = None,
+        layer: MemoryLayer | None = None,
+    ) -> MemoryListResult:
+        """Search several (scope, namespace) targets and fuse the rankings.
+
+        Targets the actor may not read are skipped. Targets served by the same
+        store are ranked with one ``query_targets`` call when the store
+        supports it; each target contributes at most ``limit`` entries.
+        """
+
+        resolved_limit = limit or self._default_limit
+        allowed: list[MemoryQueryTarget] = []
+        for scope, namespace in targets:
+            try:
+                self._require_permission(actor=actor, scope=scope, target_team_id=None)
+            except PermissionError:
+                continue
+            allowed.append(
+                MemoryQueryTarget(
+                    scope=scope,
+                    namespace=namespace,
+                    limit=resolved_limit,
+                    owner_agent_id=(
+                        actor.agent_id if scope == MemoryScope.AGENT else None
+                    ),
+                )
+            )
+        cache_key = (
+            "targets",
+            _actor_key(actor),
+            tuple((target.scope, target.namespace) for target in allowed),
+            query_text,
+            tuple(tags or ()),
+            layer,
+            resolved_limit,
+        )
+        stamp, cached = self._cache_lookup(
+            cache_key, [(target.scope, target.namespace) for target in allowed]
+        )
+        query_id = uuid.uuid4().hex
+        if cached is not None:
+            self._record_target_audit(
+                actor=actor, targets=allowed, result=cached, query_id=query_id
+            )
+            return cached
+        groups: dict[int, tuple[MemoryStore, list[int]]] = {}
+        for position, target in enumerate(allowed):
+            store = self._registry.resolve(target.scope)
+            groups.setdefault(id(store), (store, []))[1].append(position)
+        results: list[MemoryListResult | None] = [None] * len(allowed)
+        for store, positions in groups.values():
+            group = [allowed[position] for position in positions]
+            start = time.perf_counter()
+            group_results = _query_store_targets(
+                store, query_text, group, layer=layer, tags=tags
+            )
+            if self._metrics:
+                _record_query_metrics(
+                    self._metrics,
+                    (time.perf_counter() - start) * 1000,
+                    scope="+".join(sorted({target.scope.value for target in group})),
+                    store=store,
+                    size=sum(len(result.items) for result in group_results),
+                )
+            for position, result in zip(positions, group_results):
+                results[position] = result
+        snippets: dict[str, str] = {}
+        rankings: list[list[MemoryEntry]] = []
+        for target, result in zip(allowed, results):
+            if result is None:
+                continue
+            self._record_audit(
+                actor=actor,
+                scope=target.scope,
+                namespace=target.namespace,
+                result=result,
+                query_id=query_id,
+            )
+            rankings.append(result.items)
+            for entry_id, snippet in result.snippets.items():
+                snippets.setdefault(entry_id, snippet)
+        items = reciprocal_rank_fusion(rankings)
+        fused = MemoryListResult(
+            items=items,
+            next_cursor=None,
+            has_more=False,
+            snippets={
+                entry.id: snippets[entry.id] for entry in items if entry.id in snippets
+            },
+        )
+        self._cache_store(cache_key, stamp, fused)
+        return fused
+
+    def _cache_lookup(
+        self, key: Hashable, namespaces: Sequence[tuple[MemoryScope, str]]
+    ) -> tuple[tuple[int, ...], MemoryListResult | None]:
+        if self._result_cache is None:
+            return (), None
+        stamp = self._result_cache.version_stamp(namespaces)
+        cached = self._result_cache.get(key, stamp)
+        if self._metrics:
+            self._metrics.record_result_cache_lookup(hit=cached is not None)
+        return stamp, cached
+
+    def _cache_store(
+        self, key: Hashable, stamp: tuple[int, ...], result: MemoryListResult
+    ) -> None:
+        if self._result_cache is not None:
+            self._result_cache.put(key, stamp, result)
+
+    def _record_target_audit(
+        self,
+        *,
+        actor: MemoryActorContext,
+        targets: Sequence[MemoryQueryTarget],
+        result: MemoryListResult,
+        query_id: str,
+    ) -> None:
+        for scope, namespace in dict.fromkeys(
+            (target.scope, target.namespace) for target in targets
+        ):
+            self._record_audit(
+                actor=actor,
+                scope=scope,
+                namespace=namespace,
+                result=MemoryListResult(
+                    items=[
+                        entry
+                        for entry in result.items
+                        if (entry.scope, entry.namespace) == (scope, namespace)
+                    ],
+                    next_cursor=None,
+                    has_more=False,
+                ),
+                query_id=query_id,
+            )
+
     def _record_audit(
         self,
         *,
@@ -139,9 +329,13 @@ class MemoryRetrievalService:
         scope: MemoryScope,
         namespace: str,
         result,
+        query_id: str | None = None,
     ) -> None:
         if not self._audit_sink:
             return
+        # Events from one query share a ``query_id`` so batching sinks can
+        # store them as a single record.
+        details = {"query_id": query_id or uuid.uuid4().hex}
         for entry in result.items:
             event = MemoryAuditEvent(
                 action="memory_retrieval",
@@ -150,7 +344,7 @@ class MemoryRetrievalService:
                 namespace=namespace,
                 resource_id=entry.id,
                 success=True,
-                details={},
+                details=dict(details),
             )
             self._audit_sink.record(event)
 
@@ -173,3 +367,47 @@ class MemoryRetrievalService:
                 "Memory access denied for "
                 f"scope={scope.value} system_type={actor.system_type.value}"
             )
+
+
+def _actor_key(actor: MemoryActorContext) -> tuple[object, ...]:
+    return (actor.agent_id, actor.team_id, actor.system_type)
+
+
+def _query_store_targets(
+    store: MemoryStore,
+    query_text: str | None,
+    targets: Sequence[MemoryQueryTarget],
+    *,
+    layer: MemoryLayer | None,
+    tags: list[str] | None,
+) -> list[MemoryListResult]:
+    if isinstance(store, MultiTargetMemoryStore):
+        return store.query_targets(query_text, targets, layer=layer, tags=tags)
+    return [
+        store.query(
+            MemoryQuery(
+                text=query_text,
+                scope=target.scope,
+                namespace=target.namespace,
+                limit=target.limit,
+                tags=tags,
+                layer=layer,
+                owner_agent_id=target.owner_agent_id,
+            )
+        )
+        for target in targets
+    ]
+
+
+def _record_query_metrics(
+    metrics: MemoryMetrics,
+    latency_ms: float,
+    *,
+    scope: str | None,
+    store: MemoryStore,
+    size: int,
+) -> None:
+    backend = backend_label(store)
+    metrics.record_query_latency(latency_ms, scope=scope, backend=backend)
+    metrics.record_result_size("query", size, scope=scope, backend=backend)
+    metrics.record_query()
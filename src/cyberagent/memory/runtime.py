@@ -0,0 +1,139 @@
+"""Process-wide memory runtime shared by agents, tools and services."""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.cyberagent.memory.audit_buffer import (
+    AUDIT_SINK_ENV_KEYS,
+    BufferedMemoryAuditSink,
+    build_memory_audit_sink,
+)
+from src.cyberagent.memory.config import (
+    MemoryBackendConfig,
+    build_memory_registry,
+    load_memory_backend_config,
+)
+from src.cyberagent.memory.crud import MemoryCrudService
+from src.cyberagent.memory.observability import (
+    LoggingMemoryAuditSink,
+    MemoryAuditSink,
+    METRICS_ENV_KEYS,
+    METRICS_SNAPSHOT_FILENAME,
+    MemoryMetrics,
+    build_memory_metrics,
+)
+from src.cyberagent.memory.reflection_worker import (
+    REFLECTION_WORKER_ENV_KEYS,
+    MemoryReflectionWorker,
+    build_memory_reflection_worker,
+)
+from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.result_cache import (
+    RESULT_CACHE_ENV_KEYS,
+    MemoryResultCache,
+    build_memory_result_cache,
+)
+from src.cyberagent.memory.sweeper import (
+    SWEEPER_ENV_KEYS,
+    MemoryExpirySweeper,
+    build_memory_expiry_sweeper,
+)
+
+# Every env var a runtime component reads; a change rebuilds the runtime.
+_RUNTIME_ENV_KEYS = (
+    *METRICS_ENV_KEYS,
+    *RESULT_CACHE_ENV_KEYS,
+    *SWEEPER_ENV_KEYS,
+    *REFLECTION_WORKER_ENV_KEYS,
+    *AUDIT_SINK_ENV_KEYS,
+)
+
+
+@dataclass(frozen=True)
+class MemoryRuntime:
+    """Registry, metrics and audit sink built once per memory configuration.
+
+    The registry owns the SQLite record store and the vector index, so every
+    caller shares one schema check and one vector client per process.
+    """
+
+    config: MemoryBackendConfig
+    registry: StaticScopeRegistry
+    metrics: MemoryMetrics
+    audit_sink: MemoryAuditSink
+    result_cache: MemoryResultCache | None = None
+    expiry_sweeper: MemoryExpirySweeper | None = None
+    reflection_worker: MemoryReflectionWorker | None = None
+
+    def crud_service(self) -> MemoryCrudService:
+        return MemoryCrudService(
+            registry=self.registry,
+            metrics=self.metrics,
+            audit_sink=self.audit_sink,
+        )
+
+
+_lock = threading.Lock()
+_cached_runtime: MemoryRuntime | None = None
+_cached_key: tuple[object, ...] | None = None
+
+
+def get_memory_runtime() -> MemoryRuntime:
+    """Return the cached runtime, rebuilding it when the memory env changes."""
+
+    global _cached_runtime, _cached_key
+    config = load_memory_backend_config()
+    key = (config, *(os.environ.get(name) for name in _RUNTIME_ENV_KEYS))
+    with _lock:
+        if _cached_runtime is not None and _cached_key == key:
+            return _cached_runtime
+        _close_runtime(_cached_runtime)
+        _cached_runtime = build_memory_runtime(config)
+        _cached_key = key
+        return _cached_runtime
+
+
+def build_memory_runtime(config: MemoryBackendConfig) -> MemoryRuntime:
+    registry = build_memory_registry(config)
+    metrics = build_memory_metrics(
+        snapshot_path=str(Path(config.sqlite_path).with_name(METRICS_SNAPSHOT_FILENAME))
+    )
+    return MemoryRuntime(
+        config=config,
+        registry=registry,
+        metrics=metrics,
+        audit_sink=build_memory_audit_sink(config.sqlite_path)
+        or LoggingMemoryAuditSink(),
+        result_cache=build_memory_result_cache(),
+        expiry_sweeper=build_memory_expiry_sweeper(registry),
+        reflection_worker=build_memory_reflection_worker(
+            sqlite_path=config.sqlite_path, registry=registry, metrics=metrics
+        ),
+    )
+
+
+def reset_memory_runtime_cache() -> None:
+    """Drop the cached runtime so the next caller rebuilds it."""
+
+    global _cached_runtime, _cached_key
+    with _lock:
+        _close_runtime(_cached_runtime)
+        _cached_runtime = None
+        _cached_key = None
+
+
+def _close_runtime(runtime: MemoryRuntime | None) -> None:
+    if runtime is None:
+        return
+    if runtime.expiry_sweeper is not None:
+        runtime.expiry_sweeper.close()
+    if runtime.reflection_worker is not None:
+        runtime.reflection_worker.close()
+    if isinstance(runtime.audit_sink, BufferedMemoryAuditSink):
+        runtime.audit_sink.close()
+    # Last, so writes from the workers above still reach the vector index.
+    runtime.registry.close()
@@ -19,6 +19,7 @@ from src.cyberagent.memory.models import (
 )
 from src.cyberagent.memory.pruning import MemoryPruner, MemoryPruningConfig
 from src.cyberagent.memory.reflection import MemoryReflectionService
+from src.cyberagent.memory.reflection_worker import MemoryReflectionWorker
 from src.cyberagent.memory.registry import StaticScopeRegistry
 
 _REDACT_TOKEN = re.compile(r"[A-Za-z0-9_\-]{24,}")
@@ -30,6 +31,7 @@ class MemorySessionConfig:
     compaction_threshold_chars: int = 8000
     reflection_interval_seconds: int = 3600
     max_entries_per_namespace: int = 1000
+    prune_high_water_entries: int = 0
 
 
 class MemorySessionRecorder:
@@ -39,15 +41,18 @@ class MemorySessionRecorder:
         registry: StaticScopeRegistry,
         reflection_service: MemoryReflectionService,
         config: MemorySessionConfig | None = None,
+        reflection_worker: MemoryReflectionWorker | None = None,
     ) -> None:
         self._registry = registry
+        self._reflection_worker = reflection_worker
         self._crud = MemoryCrudService(registry=registry)
         self._reflection = reflection_service
         self._config = config or MemorySessionConfig()
         self._pruner = MemoryPruner(
             registry=registry,
             config=MemoryPruningConfig(
-                max_entries_per_namespace=self._config.max_entries_per_namespace
+                max_entries_per_namespace=self._config.max_entries_per_namespace,
+                high_water_entries=self._config.prune_high_water_entries,
             ),
         )
         self._buffers: dict[str, list[str]] = {}
@@ -82,7 +87,7 @@ class MemorySessionRecorder:
             owner_agent_id=actor.agent_id,
         )
         self._crud.create_entries(actor=actor, requests=[request])
-        self._pruner.prune(actor=actor, scope=scope, namespace=namespace)
+        self._pruner.maybe_prune(actor=actor, scope=scope, namespace=namespace)
         self._append_buffer(
             actor=actor, scope=scope, namespace=namespace, logs=sanitized
         )
@@ -95,6 +100,12 @@ class MemorySessionRecorder:
         namespace: str,
         logs: list[str],
     ) -> None:
+        if self._reflection_worker is not None:
+            # Durable buffer; summarization happens off the agent's turn.
+            self._reflection_worker.enqueue(
+                actor=actor, scope=scope, namespace=namespace, logs=logs
+            )
+            return
         key = f"{actor.agent_id}:{scope.value}:{namespace}"
         buffer = self._buffers.setdefault(key, [])
         buffer.extend(logs)
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable
+from datetime import datetime
+from typing import Protocol, Sequence, runtime_checkable
 
 from src.cyberagent.memory.models import (
     MemoryEntry,
+    MemoryLayer,
     MemoryListResult,
     MemoryQuery,
+    MemoryQueryTarget,
     MemoryScope,
 )
 
@@ -26,6 +29,23 @@ class MemoryStore(Protocol):
         """Fetch a memory entry by id."""
         ...
 
+    def get_many(
+        self,
+        entry_ids: Sequence[str],
+        scope: MemoryScope,
+        namespace: str,
+        *,
+        layer: MemoryLayer | None = None,
+        owner_agent_id: str | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> list[MemoryEntry]:
+        """Fetch entries by id in one call, in ``entry_ids`` order.
+
+        Ids that are missing or fail the layer, owner or tag filters are
+        skipped.
+        """
+        ...
+
     def update(self, entry: MemoryEntry) -> MemoryEntry:
         """Update an existing memory entry."""
         ...
@@ -48,3 +68,59 @@ class MemoryStore(Protocol):
     ) -> MemoryListResult:
         """List memory entries for a scope."""
         ...
+
+
+@runtime_checkable
+class MultiTargetMemoryStore(Protocol):
+    """Optional capability: rank several (scope, namespace) targets at once."""
+
+    def query_targets(
+        self,
+        text: str | None,
+        targets: Sequence[MemoryQueryTarget],
+        *,
+        layer: MemoryLayer | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> list[MemoryListResult]:
+        """Return one ranked result per target, in ``targets`` order.
+
+        Each result holds at most ``target.limit`` entries and no cursor.
+        """
+        ...
+
+
+@runtime_checkable
+class PrunableMemoryStore(Protocol):
+    """Optional capability: count and prune a namespace without loading it."""
+
+    def count_entries(
+        self,
+        scope: MemoryScope,
+        namespace: str,
+        owner_agent_id: str | None = None,
+    ) -> int:
+        """Return the number of entries in the namespace."""
+        ...
+
+    def prune_namespace(
+        self,
+        scope: MemoryScope,
+        namespace: str,
+        *,
+        max_entries: int,
+        owner_agent_id: str | None = None,
+        now: datetime | None = None,
+    ) -> list[str]:
+        """Delete expired entries and the overflow; return deleted ids."""
+        ...
+
+
+@runtime_checkable
+class ExpiringMemoryStore(Protocol):
+    """Optional capability: bulk-delete expired entries across namespaces."""
+
+    def delete_expired(
+        self, *, limit: int, now: datetime | None = None
+    ) -> list[MemoryEntry]:
+        """Delete at most ``limit`` expired entries and return them."""
+        ...
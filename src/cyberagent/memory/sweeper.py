@@ -0,0 +1,134 @@
+"""Background sweeper that reclaims expired memory entries."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.result_cache import (
+    MemoryNamespaceVersions,
+    shared_namespace_versions,
+)
+from src.cyberagent.memory.store import ExpiringMemoryStore
+
+_LOGGER = logging.getLogger(__name__)
+DEFAULT_INTERVAL_SECONDS = 300.0
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_MAX_BATCHES_PER_SWEEP = 10
+DEFAULT_BATCH_PAUSE_SECONDS = 0.05
+SWEEPER_ENV_KEYS = (
+    "MEMORY_EXPIRY_SWEEP_INTERVAL_SECONDS",
+    "MEMORY_EXPIRY_SWEEP_BATCH_SIZE",
+)
+
+
+@dataclass(slots=True)
+class MemoryExpirySweeper:
+    """Delete expired entries across every namespace on a daemon thread.
+
+    Each sweep removes at most ``batch_size * max_batches_per_sweep`` rows per
+    store, pausing between batches so agent writes are not starved of the
+    SQLite write lock. Deleted entries also leave the vector index when the
+    store is a hybrid store.
+    """
+
+    stores: Sequence[ExpiringMemoryStore]
+    interval_seconds: float = DEFAULT_INTERVAL_SECONDS
+    batch_size: int = DEFAULT_BATCH_SIZE
+    max_batches_per_sweep: int = DEFAULT_MAX_BATCHES_PER_SWEEP
+    batch_pause_seconds: float = DEFAULT_BATCH_PAUSE_SECONDS
+    namespace_versions: MemoryNamespaceVersions = field(
+        default_factory=shared_namespace_versions
+    )
+    reclaimed_total: int = field(default=0, init=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False)
+    _thread: threading.Thread | None = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="memory-expiry-sweeper", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def sweep_once(self) -> int:
+        """Run one bounded sweep over every store; return rows reclaimed."""
+
+        reclaimed = 0
+        for store in self.stores:
+            for batch_index in range(self.max_batches_per_sweep):
+                if batch_index and self._stop.wait(self.batch_pause_seconds):
+                    break
+                deleted = store.delete_expired(limit=self.batch_size)
+                for namespace in {(entry.scope, entry.namespace) for entry in deleted}:
+                    self.namespace_versions.bump(*namespace)
+                reclaimed += len(deleted)
+                if len(deleted) < self.batch_size:
+                    break
+        self.reclaimed_total += reclaimed
+        if reclaimed:
+            _LOGGER.info("Memory expiry sweep reclaimed %d entries", reclaimed)
+        return reclaimed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sweep_once()
+            except Exception as exc:  # pragma: no cover - sqlite failures
+                _LOGGER.warning("Memory expiry sweep failed: %s", exc)
+            if self._stop.wait(self.interval_seconds):
+                return
+
+
+def build_memory_expiry_sweeper(
+    registry: StaticScopeRegistry,
+) -> MemoryExpirySweeper | None:
+    """Start a sweeper for the registry's stores that support bulk expiry.
+
+    ``MEMORY_EXPIRY_SWEEP_INTERVAL_SECONDS=0`` disables it.
+    """
+
+    interval_raw = os.environ.get(
+        "MEMORY_EXPIRY_SWEEP_INTERVAL_SECONDS", str(DEFAULT_INTERVAL_SECONDS)
+    )
+    batch_raw = os.environ.get(
+        "MEMORY_EXPIRY_SWEEP_BATCH_SIZE", str(DEFAULT_BATCH_SIZE)
+    )
+    try:
+        interval = float(interval_raw)
+    except ValueError as exc:
+        raise ValueError(
+            "MEMORY_EXPIRY_SWEEP_INTERVAL_SECONDS must be a number."
+        ) from exc
+    try:
+        batch_size = int(batch_raw)
+    except ValueError as exc:
+        raise ValueError("MEMORY_EXPIRY_SWEEP_BATCH_SIZE must be an integer.") from exc
+    if interval <= 0 or batch_size <= 0:
+        return None
+    stores: dict[int, ExpiringMemoryStore] = {}
+    for store in (registry.agent_store, registry.team_store, registry.global_store):
+        if isinstance(store, ExpiringMemoryStore):
+            stores.setdefault(id(store), store)
+    if not stores:
+        return None
+    sweeper = MemoryExpirySweeper(
+        stores=list(stores.values()),
+        interval_seconds=interval,
+        batch_size=batch_size,
+    )
+    sweeper.start()
+    return sweeper
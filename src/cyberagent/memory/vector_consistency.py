@@ -0,0 +1,87 @@
+"""Consistency check between the SQLite record store and the vector index."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Protocol, runtime_checkable
+
+from src.cyberagent.memory.backends.hybrid import HybridMemoryStore
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
+from src.cyberagent.memory.backends.vector_index import MemoryVectorIndex
+from src.cyberagent.memory.backends.write_behind import WriteBehindVectorIndex
+
+_FLUSH_TIMEOUT_SECONDS = 30.0
+
+
+@runtime_checkable
+class EnumerableVectorIndex(Protocol):
+    def indexed_ids(self) -> set[str]:
+        """Return every entry id currently held by the index."""
+        ...
+
+
+@dataclass(slots=True)
+class VectorConsistencyReport:
+    supported: bool
+    record_count: int = 0
+    indexed_count: int = 0
+    missing: list[str] = field(default_factory=list)
+    orphaned: list[str] = field(default_factory=list)
+    repaired: bool = False
+
+    @property
+    def consistent(self) -> bool:
+        return self.supported and not self.missing and not self.orphaned
+
+
+def check_vector_consistency(
+    store: HybridMemoryStore, *, repair: bool = False
+) -> VectorConsistencyReport:
+    """Compare record ids with vector ids, optionally re-indexing the gaps.
+
+    Pending write-behind operations are flushed first so in-flight upserts
+    are not reported as missing. Only indexes that can enumerate their ids
+    (the local index) are supported.
+    """
+
+    index: MemoryVectorIndex = store.vector_index
+    if isinstance(index, WriteBehindVectorIndex):
+        index.flush(_FLUSH_TIMEOUT_SECONDS)
+        index = index.index
+    records = store.record_store
+    if not isinstance(index, EnumerableVectorIndex) or not isinstance(
+        records, SqliteMemoryStore
+    ):
+        return VectorConsistencyReport(supported=False)
+    record_ids = records.entry_ids()
+    indexed_ids = index.indexed_ids()
+    report = VectorConsistencyReport(
+        supported=True,
+        record_count=len(record_ids),
+        indexed_count=len(indexed_ids),
+        missing=sorted(record_ids - indexed_ids),
+        orphaned=sorted(indexed_ids - record_ids),
+    )
+    if repair and (report.missing or report.orphaned):
+        _repair(records, index, report)
+    return report
+
+
+def _repair(
+    records: SqliteMemoryStore,
+    index: MemoryVectorIndex,
+    report: VectorConsistencyReport,
+) -> None:
+    missing = set(report.missing)
+    batch = []
+    for entry in records.iter_entries():
+        if entry.id in missing:
+            batch.append(entry)
+        if len(batch) >= 256:
+            index.upsert_many(batch)
+            batch = []
+    if batch:
+        index.upsert_many(batch)
+    for entry_id in report.orphaned:
+        index.delete(entry_id)
+    report.repaired = True
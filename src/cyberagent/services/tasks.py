@@ -5,25 +5,14 @@ import logging
 
 from src.cyberagent.db.models.task import Task, get_task as _get_task
 from src.cyberagent.db.session_context import managed_session
-from src.cyberagent.memory.config import (
-    build_memory_registry,
-    load_memory_backend_config,
-)
-from src.cyberagent.memory.crud import (
-    MemoryActorContext,
-    MemoryCreateRequest,
-    MemoryCrudService,
-)
+from src.cyberagent.memory.crud import MemoryActorContext, MemoryCreateRequest
 from src.cyberagent.memory.models import (
     MemoryLayer,
     MemoryPriority,
     MemoryScope,
     MemorySource,
 )
-from src.cyberagent.memory.observability import (
-    LoggingMemoryAuditSink,
-    build_memory_metrics,
-)
+from src.cyberagent.memory.runtime import get_memory_runtime
 from src.cyberagent.services import systems as systems_service
 from src.enums import Status
 from src.enums import SystemType
@@ -460,11 +449,7 @@ def _store_task_result_in_team_memory(task: Task) -> None:
             team_id=control_system.team_id,
             system_type=control_system.type,
         )
-        service = MemoryCrudService(
-            registry=build_memory_registry(load_memory_backend_config()),
-            metrics=build_memory_metrics(),
-            audit_sink=LoggingMemoryAuditSink(),
-        )
+        service = get_memory_runtime().crud_service()
         status_text = (
             task.status.value if isinstance(task.status, Status) else str(task.status)
         )
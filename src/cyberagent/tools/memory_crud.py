@@ -13,10 +13,6 @@ from autogen_core.tools import BaseTool
 from pydantic import BaseModel
 
 from src.cyberagent.db.models.system import get_system_from_agent_id
-from src.cyberagent.memory.config import (
-    build_memory_registry,
-    load_memory_backend_config,
-)
 from src.cyberagent.memory.crud import (
     MemoryActorContext,
     MemoryConflictError,
@@ -26,10 +22,6 @@ from src.cyberagent.memory.crud import (
     MemoryReadRequest,
     MemoryUpdateRequest,
 )
-from src.cyberagent.memory.observability import (
-    LoggingMemoryAuditSink,
-    build_memory_metrics,
-)
 from src.cyberagent.memory.models import (
     MemoryEntry,
     MemoryLayer,
@@ -37,6 +29,7 @@ from src.cyberagent.memory.models import (
     MemoryScope,
     MemorySource,
 )
+from src.cyberagent.memory.runtime import get_memory_runtime
 from src.cyberagent.services import systems as systems_service
 from src.enums import SystemType
 
@@ -431,13 +424,7 @@ class MemoryCrudTool(BaseTool):
 
 
 def _build_memory_service() -> MemoryCrudService:
-    config = load_memory_backend_config()
-    registry = build_memory_registry(config)
-    return MemoryCrudService(
-        registry=registry,
-        metrics=build_memory_metrics(),
-        audit_sink=LoggingMemoryAuditSink(),
-    )
+    return get_memory_runtime().crud_service()
 
 
 def _build_actor_context(agent_id: AgentId) -> MemoryActorContext:
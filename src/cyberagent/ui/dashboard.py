@@ -3,13 +3,18 @@ from __future__ import annotations
 import importlib
 import json
 import os
+import time
 from typing import Any
 
 try:
     from src.cyberagent.core.paths import get_logs_dir
     from src.cyberagent.services import policies as policy_service
     from src.cyberagent.ui.dashboard_log_badge import count_warnings_errors
-    from src.cyberagent.ui.memory_data import load_memory_entries
+    from src.cyberagent.ui.memory_data import (
+        load_memory_entries,
+        load_memory_metrics_snapshots,
+    )
+    from src.cyberagent.ui.queue_data import load_queue_health_snapshot
     from src.cyberagent.ui.teams_data import load_teams_with_members
     from src.cli_session import list_inbox_entries, resolve_pending_question
 except ModuleNotFoundError:
@@ -17,7 +22,8 @@ except ModuleNotFoundError:
     from src.cyberagent.services import policies as policy_service
     from cli_session import list_inbox_entries, resolve_pending_question
     from dashboard_log_badge import count_warnings_errors
-    from memory_data import load_memory_entries
+    from memory_data import load_memory_entries, load_memory_metrics_snapshots
+    from queue_data import load_queue_health_snapshot
     from teams_data import load_teams_with_members
 
 
@@ -357,6 +363,7 @@ def render_memory_page(st: Any) -> None:
         )
     )
     offset = (page - 1) * page_size
+    render_memory_metrics(st)
     try:
         entries, total = load_memory_entries(
             scope=scope,
@@ -413,6 +420,84 @@ def render_memory_page(st: Any) -> None:
             )
 
 
+def render_memory_metrics(st: Any) -> None:
+    snapshots = load_memory_metrics_snapshots()
+    if not snapshots:
+        st.caption("No memory metrics snapshot yet.")
+        return
+    st.subheader("Memory Latency and Size")
+    rows: list[dict[str, Any]] = []
+    for snapshot in snapshots:
+        process = f"{snapshot.get('process', 'python')}:{snapshot.get('pid', '?')}"
+        age = max(0.0, time.time() - float(snapshot["generated_at"]))
+        st.caption(
+            f"{process} | snapshot age: {age:.0f}s"
+            f" | queries: {snapshot['query_count']}"
+            f" | result cache hit rate: {snapshot['result_cache_hit_rate']:.0%}"
+            f" | reflection lag: {snapshot['reflection_lag_seconds_last']:.0f}s"
+        )
+        rows.extend(
+            {
+                "process": process,
+                "metric": histogram["metric"],
+                "operation": histogram["operation"],
+                "scope": histogram["scope"],
+                "backend": histogram["backend"],
+                "count": histogram["count"],
+                "p50": histogram["p50"],
+                "p95": histogram["p95"],
+                "p99": histogram["p99"],
+                "max": histogram["max"],
+            }
+            for histogram in snapshot.get("histograms", [])
+        )
+    if not rows:
+        return
+    st.dataframe(
+        rows,
+        width="stretch",
+        hide_index=True,
+    )
+
+
+def render_queues_page(st: Any) -> None:
+    try:
+        snapshot = load_queue_health_snapshot()
+    except Exception as exc:
+        st.error(f"Failed to load runtime queue health: {exc}")
+        return
+    st.caption(f"Backend: {snapshot['backend']}")
+    queues = snapshot["queues"]
+    st.dataframe(
+        [
+            {
+                "queue": queue["queue"],
+                "pending": queue["depth_by_state"].get("pending", 0),
+                "dead_letter": queue["depth_by_state"].get("dead_letter"),
+                "deferred": queue["deferred"],
+                "leased": queue["leased"],
+                "oldest_age_seconds": queue["oldest_age_seconds"],
+                "ack_p50_seconds": queue["ack_latency"]["p50_seconds"],
+                "ack_p90_seconds": queue["ack_latency"]["p90_seconds"],
+                "ack_p99_seconds": queue["ack_latency"]["p99_seconds"],
+                "ack_samples": queue["ack_latency"]["count"],
+            }
+            for queue in queues
+        ],
+        width="stretch",
+        hide_index=True,
+    )
+    for queue in queues:
+        with st.expander(f"Queue {queue['queue']}"):
+            st.write(
+                {
+                    "depth_by_recipient": queue["depth_by_recipient"],
+                    "depth_by_lane": queue["depth_by_lane"],
+                    "attempts_histogram": queue["attempts_histogram"],
+                }
+            )
+
+
 def render_board() -> None:
     st = _load_streamlit()
     st.set_page_config(page_title="CyberneticAgents Operations Dashboard", layout="wide")
@@ -422,7 +507,7 @@ def render_board() -> None:
     with badge_col:
         st.markdown(f"⚠️ **{warnings}**  ❌ **{errors}**")
 
-    pages = ["Teams", "Inbox", "Memory"]
+    pages = ["Teams", "Inbox", "Memory", "Queues"]
     current_page = st.session_state.get("dashboard_page", "Teams")
     page = _select_page_with_buttons(st, pages, str(current_page))
     st.session_state["dashboard_page"] = page
@@ -437,6 +522,11 @@ def render_board() -> None:
             st.title("CyberneticAgents Memory (Read-Only)")
         render_memory_page(st)
         return
+    if page == "Queues":
+        with title_col:
+            st.title("CyberneticAgents Runtime Queues (Read-Only)")
+        render_queues_page(st)
+        return
 
     with title_col:
         st.title("CyberneticAgents Teams (Read-Only)")
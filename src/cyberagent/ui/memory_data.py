@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+import time
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Any, Optional
 
 from src.cyberagent.memory.config import load_memory_backend_config
+from src.cyberagent.memory.observability import (
+    METRICS_SNAPSHOT_FILENAME,
+    process_snapshot_paths,
+)
+
+# Snapshots from processes that stopped writing a day ago are left out.
+STALE_METRICS_SNAPSHOT_SECONDS = 24 * 60 * 60
 
 
 @dataclass(frozen=True)
@@ -70,6 +80,35 @@ def load_memory_entries(
     return filtered[offset : offset + limit], total
 
 
+def load_memory_metrics_snapshots(now: float | None = None) -> list[dict[str, Any]]:
+    """
+    Load the latest per-process JSON snapshots written by ``MemoryMetricsReporter``.
+    """
+    raw_path = os.environ.get("MEMORY_METRICS_SNAPSHOT_PATH")
+    if raw_path is None:
+        config = load_memory_backend_config()
+        path = Path(config.sqlite_path).with_name(METRICS_SNAPSHOT_FILENAME)
+    elif raw_path:
+        path = Path(raw_path)
+    else:
+        return []
+    cutoff = (time.time() if now is None else now) - STALE_METRICS_SNAPSHOT_SECONDS
+    snapshots: list[dict[str, Any]] = []
+    for snapshot_path in process_snapshot_paths(path):
+        try:
+            snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if not isinstance(snapshot, dict):
+            continue
+        if float(snapshot.get("generated_at", 0.0)) < cutoff:
+            continue
+        snapshots.append(snapshot)
+    return sorted(
+        snapshots, key=lambda item: (str(item.get("process")), item.get("pid", 0))
+    )
+
+
 def _row_to_view(row: sqlite3.Row) -> MemoryEntryView:
     content = str(row["content"])
     tags = _parse_tags(row["tags"])
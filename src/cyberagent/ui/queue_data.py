@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Any
+
+from src.cyberagent.cli.runtime_queue_metrics import build_queue_health_snapshot
+from src.cyberagent.cli.status import collect_queue_health, runtime_queue_backend_name
+
+
+def load_queue_health_snapshot() -> dict[str, Any]:
+    """
+    Load the runtime queue health snapshot shared with `cyberagent status --queues`.
+    """
+    return build_queue_health_snapshot(
+        collect_queue_health(), backend=runtime_queue_backend_name()
+    )
@@ -81,6 +81,12 @@ def test_system1_identity_task_injects_onboarding_profile_by_tags(monkeypatch) -
         "src.agents.system_base_mixin.MemoryRetrievalService.search_entries",
         _fake_search_entries,
     )
+    monkeypatch.setattr(
+        "src.agents.system_base_mixin.MemoryRetrievalService.search_targets",
+        lambda *_args, **_kwargs: MemoryListResult(
+            items=[], next_cursor=None, has_more=False
+        ),
+    )
 
     agent = _DummyAgent()
     message = TextMessage(
@@ -18,6 +18,8 @@ from src.cyberagent.memory.models import (
     MemoryScope,
     MemorySource,
 )
+from src.cyberagent.memory.observability import LoggingMemoryAuditSink, MemoryMetrics
+from src.cyberagent.memory.runtime import MemoryRuntime
 from src.enums import SystemType
 from datetime import datetime, timezone
 
@@ -165,8 +167,13 @@ def test_build_memory_context_ignores_sqlite_open_failures(
 
     monkeypatch.setattr(
         system_base_mixin_module,
-        "build_memory_registry",
-        lambda _config: FailingRegistry(),
+        "get_memory_runtime",
+        lambda: MemoryRuntime(
+            config=load_memory_backend_config(),
+            registry=FailingRegistry(),  # type: ignore[arg-type]
+            metrics=MemoryMetrics(),
+            audit_sink=LoggingMemoryAuditSink(),
+        ),
     )
     system = DummySystem()
     fake_message = type("Msg", (), {"to_text": lambda self: "health check"})()
@@ -174,3 +181,29 @@ def test_build_memory_context_ignores_sqlite_open_failures(
     context = system._build_memory_context(fake_message)  # type: ignore[arg-type]
 
     assert context == []
+
+
+def test_build_memory_context_falls_back_per_scope_when_fused_search_fails(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    _configure_system(monkeypatch, tmp_path)
+    _seed_memory()
+    retrieval_cls = system_base_mixin_module.MemoryRetrievalService
+    search_entries = retrieval_cls.search_entries
+
+    def _failing_targets(*_args, **_kwargs):  # type: ignore[no-untyped-def]
+        raise sqlite3.OperationalError("database disk image is malformed")
+
+    def _agent_scope_only(self, *, scope, **kwargs):  # type: ignore[no-untyped-def]
+        if scope != MemoryScope.AGENT:
+            raise sqlite3.OperationalError("unable to open database file")
+        return search_entries(self, scope=scope, **kwargs)
+
+    monkeypatch.setattr(retrieval_cls, "search_targets", _failing_targets)
+    monkeypatch.setattr(retrieval_cls, "search_entries", _agent_scope_only)
+    system = DummySystem()
+    fake_message = type("Msg", (), {"to_text": lambda self: "unrelated"})()
+
+    context = system._build_memory_context(fake_message)  # type: ignore[arg-type]
+
+    assert any("mem-1" in entry for entry in context)
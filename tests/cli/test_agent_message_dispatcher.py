@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.cyberagent.cli.agent_message_dispatcher import (
+    AgentMessageDispatchConfig,
+    AgentMessageDispatcher,
+    load_agent_message_dispatch_config,
+)
+from src.cyberagent.cli.runtime_queue_backend import QueuedAgentMessage
+
+
+def _message(
+    name: str,
+    recipient: str,
+    next_attempt_at: float = 0.0,
+    lane: str = "control",
+) -> QueuedAgentMessage:
+    return QueuedAgentMessage(
+        path=Path(f"{name}.json"),
+        recipient=recipient,
+        sender="System4/root",
+        message_type="initiative_assign",
+        payload={"initiative_id": 1},
+        idempotency_key=f"agent_message:{name}",
+        queued_at=0.0,
+        attempts=0,
+        next_attempt_at=next_attempt_at,
+        lane=lane,
+    )
+
+
+class _GatedDelivery:
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.gates: dict[str, asyncio.Event] = {}
+
+    async def __call__(self, message: QueuedAgentMessage) -> None:
+        self.started.append(message.path.stem)
+        gate = self.gates.setdefault(message.path.stem, asyncio.Event())
+        await gate.wait()
+
+    def release(self, name: str) -> None:
+        self.gates.setdefault(name, asyncio.Event()).set()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_keeps_recipient_fifo_and_runs_others() -> None:
+    delivery = _GatedDelivery()
+    dispatcher = AgentMessageDispatcher(
+        deliver=delivery,
+        config=AgentMessageDispatchConfig(
+            max_in_flight=4, max_in_flight_per_recipient=1
+        ),
+    )
+    queue = [
+        _message("slow_review", "System3/root"),
+        _message("assign_other", "System1/a"),
+        _message("second_review", "System3/root"),
+    ]
+
+    dispatcher.dispatch_ready(queue, now=1.0)
+    await asyncio.sleep(0)
+
+    assert delivery.started == ["slow_review", "assign_other"]
+
+    delivery.release("slow_review")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    dispatcher.dispatch_ready(queue[1:], now=1.0)
+    await asyncio.sleep(0)
+
+    assert delivery.started == ["slow_review", "assign_other", "second_review"]
+    await dispatcher.aclose()
+    assert dispatcher.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_enforces_global_cap_and_preserves_order() -> None:
+    delivery = _GatedDelivery()
+    completed: list[int] = []
+    dispatcher = AgentMessageDispatcher(
+        deliver=delivery,
+        config=AgentMessageDispatchConfig(
+            max_in_flight=1, max_in_flight_per_recipient=1
+        ),
+        on_complete=lambda: completed.append(1),
+    )
+    queue = [_message("a", "System1/a"), _message("b", "System1/b")]
+
+    dispatcher.dispatch_ready(queue, now=1.0)
+    await asyncio.sleep(0)
+    assert delivery.started == ["a"]
+    assert dispatcher.in_flight == 1
+
+    delivery.release("a")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert completed == [1]
+
+    dispatcher.dispatch_ready(queue[1:], now=1.0)
+    await asyncio.sleep(0)
+    assert delivery.started == ["a", "b"]
+    await dispatcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_skips_messages_until_next_attempt_at() -> None:
+    delivery = _GatedDelivery()
+    dispatcher = AgentMessageDispatcher(deliver=delivery)
+    queue = [
+        _message("deferred", "System3/root", next_attempt_at=50.0),
+        _message("due", "System3/root"),
+        _message("later", "System1/a", next_attempt_at=20.0),
+    ]
+
+    next_due_at = dispatcher.dispatch_ready(queue, now=10.0)
+    await asyncio.sleep(0)
+
+    assert delivery.started == ["due"]
+    assert next_due_at == 20.0
+    await dispatcher.aclose()
+
+
+def test_load_dispatch_config_reads_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CYBERAGENT_AGENT_MESSAGE_MAX_IN_FLIGHT", "8")
+    monkeypatch.setenv("CYBERAGENT_AGENT_MESSAGE_MAX_IN_FLIGHT_PER_RECIPIENT", "0")
+
+    config = load_agent_message_dispatch_config()
+
+    assert config.max_in_flight == 8
+    assert config.max_in_flight_per_recipient == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_holds_recipient_when_claim_is_refused() -> None:
+    delivery = _GatedDelivery()
+    dispatcher = AgentMessageDispatcher(
+        deliver=delivery,
+        claim=lambda message: message.path.stem != "held_elsewhere",
+    )
+    queue = [
+        _message("held_elsewhere", "System3/root"),
+        _message("next_review", "System3/root"),
+        _message("assign_other", "System1/a"),
+    ]
+
+    dispatcher.dispatch_ready(queue, now=1.0)
+    await asyncio.sleep(0)
+
+    assert delivery.started == ["assign_other"]
+    await dispatcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_interleaves_lanes_by_weight() -> None:
+    delivery = _GatedDelivery()
+    dispatcher = AgentMessageDispatcher(
+        deliver=delivery,
+        config=AgentMessageDispatchConfig(
+            max_in_flight=10,
+            lane_weights={"interactive": 2, "control": 1, "backfill": 1},
+        ),
+    )
+    queue = [
+        _message("b1", "System1/a", lane="backfill"),
+        _message("b2", "System1/b", lane="backfill"),
+        _message("b3", "System1/c", lane="backfill"),
+        _message("i1", "System4/root", lane="interactive"),
+        _message("i2", "System3/root", lane="interactive"),
+    ]
+
+    dispatcher.dispatch_ready(queue, now=1.0)
+    await asyncio.sleep(0)
+
+    assert delivery.started == ["i1", "b1", "i2", "b2", "b3"]
+    await dispatcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_lets_backfill_progress_with_one_slot() -> None:
+    delivery = _GatedDelivery()
+    dispatcher = AgentMessageDispatcher(
+        deliver=delivery,
+        config=AgentMessageDispatchConfig(
+            max_in_flight=1,
+            lane_weights={"interactive": 2, "control": 1, "backfill": 1},
+        ),
+    )
+    queue = [_message(f"b{index}", "System1/a", lane="backfill") for index in range(3)]
+    queue += [
+        _message(f"i{index}", "System4/root", lane="interactive") for index in range(3)
+    ]
+
+    for _ in range(4):
+        dispatcher.dispatch_ready(queue, now=1.0)
+        await asyncio.sleep(0)
+        started = delivery.started[-1]
+        delivery.release(started)
+        queue = [item for item in queue if item.path.stem != started]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    assert delivery.started == ["i0", "b0", "i1", "i2"]
+    await dispatcher.aclose()
+
+
+def test_load_dispatch_config_reads_lane_weights(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv(
+        "CYBERAGENT_AGENT_MESSAGE_LANE_WEIGHTS", "interactive=10, backfill=0,bogus=3"
+    )
+
+    config = load_agent_message_dispatch_config()
+
+    assert config.lane_weight("interactive") == 10
+    assert config.lane_weight("control") == 4
+    assert config.lane_weight("backfill") == 1
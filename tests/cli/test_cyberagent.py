@@ -53,6 +53,14 @@ def test_build_parser_includes_dev_system_run() -> None:
     assert parsed.message == "hello"
 
 
+def test_build_parser_includes_dev_memory_check() -> None:
+    parser = cyberagent.build_parser()
+    parsed = parser.parse_args(["dev", "memory-check", "--repair"])
+    assert parsed.dev_command == "memory-check"
+    assert parsed.repair is True
+    assert parsed.json is False
+
+
 def test_start_command_uses_background_spawn(monkeypatch: pytest.MonkeyPatch) -> None:
     called: dict[str, bool] = {"headless": False}
 
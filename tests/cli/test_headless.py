@@ -1,5 +1,6 @@
 import asyncio
 import sqlite3
+import time
 from pathlib import Path
 
 import pytest
@@ -238,6 +239,7 @@ async def test_agent_message_queue_defers_on_non_disk_error(
         headless, "read_queued_agent_messages", lambda: [queued_message]
     )
     monkeypatch.setattr(headless, "SUGGEST_QUEUE_POLL_SECONDS", 0)
+    monkeypatch.setattr(headless, "claim_agent_message", lambda *_, **__: True)
 
     def _defer(**kwargs: object) -> bool:
         calls["defer"] += 1
@@ -283,13 +285,14 @@ async def test_agent_message_queue_skips_already_processed_messages(
         headless, "read_queued_agent_messages", lambda: [queued_message]
     )
     monkeypatch.setattr(headless, "SUGGEST_QUEUE_POLL_SECONDS", 0)
+    monkeypatch.setattr(headless, "claim_agent_message", lambda *_, **__: True)
     monkeypatch.setattr(headless, "was_processed_message", lambda *_: True)
 
-    def _ack(_path: Path) -> None:
-        calls["acked"] += 1
+    def _ack(paths: list[Path]) -> None:
+        calls["acked"] += len(paths)
         stop_event.set()
 
-    monkeypatch.setattr(headless, "ack_agent_message", _ack)
+    monkeypatch.setattr(headless, "ack_agent_messages", _ack)
 
     await asyncio.wait_for(
         headless._process_agent_message_queue(RuntimeSpy(), stop_event),
@@ -329,6 +332,7 @@ async def test_agent_message_queue_marks_processed_before_ack(
         headless, "read_queued_agent_messages", lambda: [queued_message]
     )
     monkeypatch.setattr(headless, "SUGGEST_QUEUE_POLL_SECONDS", 0)
+    monkeypatch.setattr(headless, "claim_agent_message", lambda *_, **__: True)
     monkeypatch.setattr(headless, "was_processed_message", lambda *_: False)
 
     def _mark(_scope: str, _key: str) -> None:
@@ -378,3 +382,95 @@ def test_build_task_review_message_normalizes_invalid_source_name() -> None:
     assert message.task_id == 42
     assert message.assignee_agent_id_str == "System1/root"
     assert message.source == "System1_root"
+
+
+@pytest.mark.asyncio
+async def test_agent_message_queue_slow_recipient_does_not_block_others(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    def _queued(name: str, recipient: str) -> agent_message_queue.QueuedAgentMessage:
+        return agent_message_queue.QueuedAgentMessage(
+            path=tmp_path / f"{name}.json",
+            recipient=recipient,
+            sender="System4/root",
+            message_type="initiative_assign",
+            payload={"initiative_id": 1, "source": "System4_root", "content": "Go."},
+            idempotency_key=f"agent_message:{name}",
+            queued_at=0.0,
+            attempts=0,
+            next_attempt_at=0.0,
+        )
+
+    queued = [_queued("slow", "System3/root"), _queued("fast", "System1/root")]
+    stop_event = asyncio.Event()
+    release_slow = asyncio.Event()
+    acked: list[str] = []
+
+    class RuntimeSlowForSystem3:
+        async def send_message(self, *args, **kwargs):  # noqa: ANN001
+            if kwargs["recipient"].type == "System3":
+                await release_slow.wait()
+            return None
+
+    monkeypatch.setattr(headless, "read_queued_agent_messages", lambda: list(queued))
+    monkeypatch.setattr(headless, "SUGGEST_QUEUE_POLL_SECONDS", 0)
+    monkeypatch.setattr(headless, "claim_agent_message", lambda *_, **__: True)
+    monkeypatch.setattr(headless, "was_processed_message", lambda *_: False)
+    monkeypatch.setattr(headless, "mark_processed_message", lambda *_: None)
+
+    def _ack(path: Path) -> None:
+        acked.append(path.stem)
+        queued[:] = [item for item in queued if item.path != path]
+        stop_event.set()
+
+    monkeypatch.setattr(headless, "ack_agent_message", _ack)
+
+    await asyncio.wait_for(
+        headless._process_agent_message_queue(RuntimeSlowForSystem3(), stop_event),
+        timeout=1,
+    )
+
+    assert acked == ["fast"]
+
+
+@pytest.mark.asyncio
+async def test_agent_message_queue_skips_messages_leased_by_another_worker(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    leased = agent_message_queue.QueuedAgentMessage(
+        path=tmp_path / "leased.json",
+        recipient="System3/root",
+        sender="System4/root",
+        message_type="initiative_assign",
+        payload={"initiative_id": 1, "source": "System4_root", "content": "Go."},
+        idempotency_key="agent_message:leased",
+        queued_at=0.0,
+        attempts=0,
+        next_attempt_at=0.0,
+        lease_owner="other-worker",
+        lease_expires_at=time.time() + 60,
+    )
+    stop_event = asyncio.Event()
+    claimed: list[Path] = []
+
+    class RuntimeSpy:
+        async def send_message(self, *args, **kwargs):  # noqa: ANN001
+            raise AssertionError("leased message must not be delivered")
+
+    def _claim(path: Path, **_: object) -> bool:
+        claimed.append(path)
+        return True
+
+    monkeypatch.setattr(headless, "read_queued_agent_messages", lambda: [leased])
+    monkeypatch.setattr(headless, "claim_agent_message", _claim)
+    monkeypatch.setattr(headless, "was_processed_message", lambda *_: False)
+    asyncio.get_running_loop().call_later(0.1, stop_event.set)
+
+    await asyncio.wait_for(
+        headless._process_agent_message_queue(RuntimeSpy(), stop_event),
+        timeout=2,
+    )
+
+    assert claimed == []
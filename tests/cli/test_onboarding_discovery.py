@@ -10,6 +10,7 @@ import pytest
 
 from src.cyberagent.cli import onboarding_discovery
 from src.cyberagent.cli import agent_message_queue
+from src.cyberagent.cli.runtime_queue_backend import LANE_INTERACTIVE
 from src.cyberagent.db.db_utils import get_db
 from src.cyberagent.db.models.initiative import Initiative
 from src.cyberagent.db.models.procedure import Procedure
@@ -534,6 +535,7 @@ def test_auto_execute_onboarding_sop_creates_run_tasks_and_queue(
     assert len(queued) == 1
     assert queued[0].message_type == "initiative_assign"
     assert queued[0].payload.get("initiative_id") == run.initiative_id
+    assert queued[0].lane == LANE_INTERACTIVE
 
 
 def test_prompt_continue_without_pkm_handles_eof(
@@ -1,8 +1,17 @@
+import json
+import sqlite3
 from pathlib import Path
 
 from src.cyberagent.cli import processed_message_journal as journal
 
 
+def _count_rows(tmp_path: Path) -> int:
+    with sqlite3.connect(tmp_path / journal.JOURNAL_DB_FILENAME) as conn:
+        return int(
+            conn.execute("SELECT COUNT(*) FROM processed_messages").fetchone()[0]
+        )
+
+
 def test_mark_processed_message_round_trip(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.setattr(journal, "JOURNAL_DIR", tmp_path)
     assert journal.was_processed_message("agent_message", "k1") is False
@@ -10,6 +19,7 @@ def test_mark_processed_message_round_trip(tmp_path: Path, monkeypatch) -> None:
     journal.mark_processed_message("agent_message", "k1")
 
     assert journal.was_processed_message("agent_message", "k1") is True
+    assert journal.was_processed_message("suggestion", "k1") is False
 
 
 def test_mark_processed_message_is_idempotent(tmp_path: Path, monkeypatch) -> None:
@@ -17,6 +27,44 @@ def test_mark_processed_message_is_idempotent(tmp_path: Path, monkeypatch) -> No
     journal.mark_processed_message("agent_message", "k1")
     journal.mark_processed_message("agent_message", "k1")
 
-    journal_path = tmp_path / "agent_message.jsonl"
-    lines = journal_path.read_text(encoding="utf-8").strip().splitlines()
-    assert len(lines) == 1
+    assert _count_rows(tmp_path) == 1
+
+
+def test_mark_processed_messages_batches_keys(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(journal, "JOURNAL_DIR", tmp_path)
+
+    journal.mark_processed_messages("agent_message", ["k1", "k2", "k1"])
+
+    assert _count_rows(tmp_path) == 2
+    assert journal.was_processed_message("agent_message", "k2") is True
+
+
+def test_compact_processed_messages_drops_expired_keys(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(journal, "JOURNAL_DIR", tmp_path)
+    journal.mark_processed_message("agent_message", "old")
+
+    removed = journal.compact_processed_messages(max_age_seconds=10, now=1e12)
+
+    assert removed == 1
+    assert journal.was_processed_message("agent_message", "old") is False
+
+
+def test_legacy_jsonl_journal_is_migrated_once(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(journal, "JOURNAL_DIR", tmp_path)
+    legacy = tmp_path / "agent_message.jsonl"
+    legacy.write_text(
+        "\n".join(
+            [
+                json.dumps({"idempotency_key": "legacy", "recorded_at": 1.0}),
+                "not json",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setenv(journal.JOURNAL_TTL_ENV, str(10**12))
+
+    assert journal.was_processed_message("agent_message", "legacy") is True
+    assert not legacy.exists()
+    assert (tmp_path / "agent_message.jsonl.migrated").exists()
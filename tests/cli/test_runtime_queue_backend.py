@@ -5,10 +5,17 @@ from typing import Callable
 
 import pytest
 
+from src.cyberagent.cli import agent_message_queue, suggestion_queue
 from src.cyberagent.cli.runtime_queue_backend import (
+    AgentMessageEnqueueRequest,
     FileRuntimeQueueBackend,
     RuntimeQueueBackend,
     SQLiteRuntimeQueueBackend,
+    reset_runtime_queue_backend_cache,
+)
+from src.cyberagent.cli.runtime_queue_notify import (
+    AGENT_MESSAGE_QUEUE,
+    SUGGESTION_QUEUE,
 )
 
 
@@ -114,3 +121,439 @@ def test_runtime_queue_backend_agent_message_contract(
     replay = backend.read_queued_agent_messages()
     assert len(replay) == 1
     assert replay[0].attempts == 0
+
+
+def _enqueue_resume(backend: RuntimeQueueBackend, initiative_id: int) -> Path:
+    return backend.enqueue_agent_message(
+        recipient="System3/root",
+        sender="System4/root",
+        message_type="initiative_assign",
+        payload={"initiative_id": initiative_id},
+        idempotency_key=f"resume:initiative:{initiative_id}",
+    )
+
+
+def test_file_backend_dedupe_does_not_scan_queue(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    backend = _build_file_backend(tmp_path)
+    for initiative_id in range(20):
+        _enqueue_resume(backend, initiative_id)
+
+    read_calls: list[Path] = []
+    original_read_text = Path.read_text
+
+    def _counting_read_text(self: Path, *args, **kwargs):  # noqa: ANN002, ANN003
+        read_calls.append(self)
+        return original_read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", _counting_read_text)
+    first = _enqueue_resume(backend, 5)
+    new_path = _enqueue_resume(backend, 99)
+
+    assert first.exists()
+    assert new_path != first
+    assert len(read_calls) <= 4
+
+
+def test_file_backend_skips_unchanged_files_on_reread(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    backend = _build_file_backend(tmp_path)
+    paths = [_enqueue_resume(backend, initiative_id) for initiative_id in range(10)]
+    for path in paths[1:]:
+        backend.defer_agent_message(path=path, error="boom")
+    assert "\n" not in paths[0].read_text(encoding="utf-8")
+    backend.read_queued_agent_messages()
+
+    read_calls: list[Path] = []
+    original_read_text = Path.read_text
+
+    def _counting_read_text(self: Path, *args, **kwargs):  # noqa: ANN002, ANN003
+        read_calls.append(self)
+        return original_read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", _counting_read_text)
+    backend.defer_agent_message(path=paths[0], error="boom")
+    read_calls.clear()
+    queued = backend.read_queued_agent_messages()
+
+    assert read_calls == [paths[0]]
+    assert [item.attempts for item in queued] == [1] * 10
+
+
+def test_file_backend_index_allows_reenqueue_after_ack_and_dead_letter(
+    tmp_path: Path,
+) -> None:
+    backend = _build_file_backend(tmp_path)
+    first = _enqueue_resume(backend, 1)
+    backend.ack_agent_message(first)
+
+    second = _enqueue_resume(backend, 1)
+    assert second != first
+    assert backend.defer_agent_message(path=second, error="boom", max_attempts=1)
+
+    third = _enqueue_resume(backend, 1)
+    assert third not in {first, second}
+    assert [item.path for item in backend.read_queued_agent_messages()] == [third]
+
+
+def test_file_backend_rebuilds_corrupt_or_missing_index(tmp_path: Path) -> None:
+    backend = FileRuntimeQueueBackend(
+        suggest_queue_dir=tmp_path / "suggest_queue",
+        agent_message_queue_dir=tmp_path / "agent_queue",
+        agent_message_dead_letter_dir=tmp_path / "agent_dead_letter",
+    )
+    original = _enqueue_resume(backend, 1)
+    index_dir = tmp_path / "agent_queue_index"
+    markers = [path for path in index_dir.iterdir() if not path.name.startswith(".")]
+    assert len(markers) == 1
+
+    markers[0].write_text("not-a-queue-file.json", encoding="utf-8")
+    assert _enqueue_resume(backend, 1) == original
+
+    for path in index_dir.iterdir():
+        path.unlink()
+    index_dir.rmdir()
+    assert _enqueue_resume(backend, 1) == original
+    assert len(backend.read_queued_agent_messages()) == 1
+
+
+def test_queue_modules_reuse_backend_until_env_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reset_runtime_queue_backend_cache()
+    monkeypatch.setenv("CYBERAGENT_RUNTIME_QUEUE_BACKEND", "sqlite")
+    monkeypatch.setenv("CYBERAGENT_RUNTIME_QUEUE_DB_PATH", str(tmp_path / "a.db"))
+
+    first = agent_message_queue._build_backend()
+    assert agent_message_queue._build_backend() is first
+    assert suggestion_queue._build_backend() is first
+
+    monkeypatch.setenv("CYBERAGENT_RUNTIME_QUEUE_DB_PATH", str(tmp_path / "b.db"))
+    assert agent_message_queue._build_backend() is not first
+
+    monkeypatch.setenv("CYBERAGENT_RUNTIME_QUEUE_BACKEND", "file")
+    assert isinstance(agent_message_queue._build_backend(), FileRuntimeQueueBackend)
+    reset_runtime_queue_backend_cache()
+
+
+def test_sqlite_backend_reuses_one_wal_connection_per_thread(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import sqlite3
+
+    connects: list[str] = []
+    original_connect = sqlite3.connect
+
+    def _counting_connect(*args, **kwargs):  # noqa: ANN002, ANN003
+        connects.append(str(args[0]))
+        return original_connect(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", _counting_connect)
+    backend = SQLiteRuntimeQueueBackend(db_path=tmp_path / "runtime_queue.db")
+    for index in range(5):
+        backend.enqueue_suggestion(f"s{index}")
+    queued = backend.read_queued_suggestions()
+    backend.ack_suggestion(queued[0].path)
+
+    assert len(connects) == 1
+    conn = backend._connect()
+    assert str(conn.execute("PRAGMA journal_mode;").fetchone()[0]).lower() == "wal"
+    assert int(conn.execute("PRAGMA busy_timeout;").fetchone()[0]) == 5000
+
+    backend.close()
+    assert len(backend.read_queued_suggestions()) == 4
+    assert len(connects) == 2
+
+
+def test_sqlite_backend_close_releases_other_threads_connections(
+    tmp_path: Path,
+) -> None:
+    import sqlite3
+    import threading
+
+    backend = SQLiteRuntimeQueueBackend(db_path=tmp_path / "runtime_queue.db")
+    opened = threading.Event()
+    closed = threading.Event()
+    errors: list[str] = []
+
+    def _worker() -> None:
+        backend.enqueue_suggestion("from worker")
+        conn = backend._connect()
+        opened.set()
+        closed.wait(5)
+        try:
+            conn.execute("SELECT 1;")
+        except sqlite3.ProgrammingError as exc:
+            errors.append(str(exc))
+
+    worker = threading.Thread(target=_worker)
+    worker.start()
+    opened.wait(5)
+    backend.close()
+    closed.set()
+    worker.join()
+
+    assert errors == ["Cannot operate on a closed database."]
+    assert [item.payload_text for item in backend.read_queued_suggestions()] == [
+        "from worker"
+    ]
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [_build_file_backend, _build_sqlite_backend],
+    ids=["file", "sqlite"],
+)
+def test_runtime_queue_backend_claims_are_exclusive_until_lease_expires(
+    tmp_path: Path,
+    factory: Callable[[Path], RuntimeQueueBackend],
+) -> None:
+    worker_a = factory(tmp_path)
+    worker_b = factory(tmp_path)
+    path = _enqueue_resume(worker_a, 1)
+
+    assert worker_a.claim_agent_message(
+        path, consumer_id="a", lease_seconds=30, now_ts=100.0
+    )
+    assert not worker_b.claim_agent_message(
+        path, consumer_id="b", lease_seconds=30, now_ts=110.0
+    )
+    queued = worker_b.read_queued_agent_messages()
+    assert queued[0].lease_owner == "a"
+    assert queued[0].is_leased_by_other("b", 110.0)
+
+    # Renewal keeps the lease alive past the original expiry.
+    assert (
+        worker_a.renew_leases(
+            AGENT_MESSAGE_QUEUE, consumer_id="a", lease_seconds=30, now_ts=125.0
+        )
+        == 1
+    )
+    assert not worker_b.claim_agent_message(
+        path, consumer_id="b", lease_seconds=30, now_ts=140.0
+    )
+
+    # A crashed worker never renews, so the message becomes claimable again.
+    assert worker_b.claim_agent_message(
+        path, consumer_id="b", lease_seconds=30, now_ts=160.0
+    )
+    assert worker_b.read_queued_agent_messages()[0].lease_owner == "b"
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [_build_file_backend, _build_sqlite_backend],
+    ids=["file", "sqlite"],
+)
+def test_runtime_queue_backend_release_defer_and_ack_drop_leases(
+    tmp_path: Path,
+    factory: Callable[[Path], RuntimeQueueBackend],
+) -> None:
+    backend = factory(tmp_path)
+    first = _enqueue_resume(backend, 1)
+    second = _enqueue_resume(backend, 2)
+    suggestion = backend.enqueue_suggestion("hello")
+    for path in (first, second):
+        assert backend.claim_agent_message(path, consumer_id="a", lease_seconds=30)
+    assert backend.claim_suggestion(suggestion, consumer_id="a", lease_seconds=30)
+    assert not backend.claim_suggestion(suggestion, consumer_id="b", lease_seconds=30)
+
+    assert backend.release_leases(SUGGESTION_QUEUE, consumer_id="a") == 1
+    assert backend.claim_suggestion(suggestion, consumer_id="b", lease_seconds=30)
+
+    backend.defer_agent_message(path=first, error="boom")
+    deferred = backend.read_queued_agent_messages()[0]
+    assert deferred.lease_owner is None
+
+    backend.ack_agent_message(second)
+    assert (
+        backend.renew_leases(AGENT_MESSAGE_QUEUE, consumer_id="a", lease_seconds=30)
+        == 0
+    )
+    assert not backend.claim_agent_message(second, consumer_id="a", lease_seconds=30)
+
+
+def test_sqlite_backend_adds_lease_columns_to_existing_database(
+    tmp_path: Path,
+) -> None:
+    import sqlite3
+
+    db_path = tmp_path / "runtime_queue.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE queue_suggestions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload_text TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL,
+                queued_at REAL NOT NULL
+            );
+            """)
+        conn.execute(
+            "INSERT INTO queue_suggestions(payload_text, idempotency_key, queued_at) "
+            "VALUES ('legacy', 'suggestion:legacy', 1.0);"
+        )
+    conn.close()
+
+    backend = SQLiteRuntimeQueueBackend(db_path=db_path)
+    queued = backend.read_queued_suggestions()
+
+    assert [item.payload_text for item in queued] == ["legacy"]
+    assert queued[0].lease_owner is None
+    assert backend.claim_suggestion(queued[0].path, consumer_id="a", lease_seconds=5)
+    backend.close()
+
+
+def _resume_request(initiative_id: int) -> AgentMessageEnqueueRequest:
+    return AgentMessageEnqueueRequest(
+        recipient="System3/root",
+        sender="System4/root",
+        message_type="initiative_assign",
+        payload={"initiative_id": initiative_id},
+        idempotency_key=f"resume:initiative:{initiative_id}",
+    )
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [_build_file_backend, _build_sqlite_backend],
+    ids=["file", "sqlite"],
+)
+def test_runtime_queue_backend_batch_enqueue_ack_and_requeue(
+    tmp_path: Path,
+    factory: Callable[[Path], RuntimeQueueBackend],
+) -> None:
+    backend = factory(tmp_path)
+    existing = _enqueue_resume(backend, 1)
+
+    paths = backend.enqueue_agent_messages(
+        [_resume_request(index) for index in (1, 2, 3, 2)]
+    )
+
+    assert paths[0] == existing
+    assert paths[1] == paths[3]
+    queued = backend.read_queued_agent_messages()
+    assert [item.payload["initiative_id"] for item in queued] == [1, 2, 3]
+    assert backend.enqueue_agent_messages([]) == []
+
+    backend.ack_agent_messages([queued[0].path, queued[2].path])
+    remaining = backend.read_queued_agent_messages()
+    assert [item.payload["initiative_id"] for item in remaining] == [2]
+
+    for _ in range(2):
+        backend.defer_agent_message(
+            path=remaining[0].path, error="boom", max_attempts=2
+        )
+    dead_letters = backend.list_dead_letter_agent_messages()
+    assert len(dead_letters) == 1
+
+    requeued = backend.requeue_dead_letter_agent_messages(
+        [dead_letters[0].path, Path("missing.json")]
+    )
+
+    assert len(requeued) == 1
+    assert backend.list_dead_letter_agent_messages() == []
+    assert [item.attempts for item in backend.read_queued_agent_messages()] == [0]
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [_build_file_backend, _build_sqlite_backend],
+    ids=["file", "sqlite"],
+)
+def test_runtime_queue_backend_persists_lanes(
+    tmp_path: Path,
+    factory: Callable[[Path], RuntimeQueueBackend],
+) -> None:
+    backend = factory(tmp_path)
+    backend.enqueue_agent_message(
+        recipient="System4/root",
+        sender=None,
+        message_type="initiative_assign",
+        payload={"initiative_id": 1},
+        lane="interactive",
+    )
+    path = _enqueue_resume(backend, 2)
+
+    assert [item.lane for item in backend.read_queued_agent_messages()] == [
+        "interactive",
+        "control",
+    ]
+    with pytest.raises(ValueError):
+        AgentMessageEnqueueRequest(
+            recipient="System3/root",
+            sender=None,
+            message_type="initiative_assign",
+            payload={},
+            lane="urgent",
+        )
+
+    backend.defer_agent_message(path=path, error="boom", max_attempts=1)
+    backend.requeue_dead_letter_agent_messages(
+        [item.path for item in backend.list_dead_letter_agent_messages()]
+    )
+
+    assert [item.lane for item in backend.read_queued_agent_messages()] == [
+        "interactive",
+        "backfill",
+    ]
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [_build_file_backend, _build_sqlite_backend],
+    ids=["file", "sqlite"],
+)
+def test_runtime_queue_backend_reports_queue_health(
+    tmp_path: Path,
+    factory: Callable[[Path], RuntimeQueueBackend],
+) -> None:
+    backend = factory(tmp_path)
+    first = _enqueue_resume(backend, 1)
+    deferred = _enqueue_resume(backend, 2)
+    doomed = _enqueue_resume(backend, 3)
+    backend.enqueue_agent_message(
+        recipient="System1/a",
+        sender=None,
+        message_type="initiative_assign",
+        payload={"initiative_id": 4},
+        lane="interactive",
+    )
+    backend.defer_agent_message(path=deferred, error="boom")
+    backend.defer_agent_message(path=doomed, error="boom", max_attempts=1)
+    backend.ack_agent_messages([first])
+    backend.enqueue_suggestion("hello")
+    backend.ack_suggestion(backend.read_queued_suggestions()[0].path)
+
+    health = backend.queue_health(AGENT_MESSAGE_QUEUE)
+
+    assert health.depth_by_state == {"pending": 2, "dead_letter": 1}
+    assert health.depth_by_recipient == {"System3/root": 1, "System1/a": 1}
+    assert health.depth_by_lane == {"control": 1, "interactive": 1}
+    assert health.attempts_histogram == {"0": 1, "1": 1}
+    assert health.deferred == 1
+    assert health.oldest_age_seconds is not None
+    assert health.ack_latency.count == 1
+    suggestions = backend.queue_health(SUGGESTION_QUEUE)
+    assert suggestions.depth_by_state == {"pending": 0}
+    assert suggestions.ack_latency.count == 1
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [_build_file_backend, _build_sqlite_backend],
+    ids=["file", "sqlite"],
+)
+def test_runtime_queue_backend_single_ack_records_latency(
+    tmp_path: Path,
+    factory: Callable[[Path], RuntimeQueueBackend],
+) -> None:
+    backend = factory(tmp_path)
+    path = _enqueue_resume(backend, 1)
+
+    backend.ack_agent_message(path)
+
+    health = backend.queue_health(AGENT_MESSAGE_QUEUE)
+    assert health.depth_by_state["pending"] == 0
+    assert health.ack_latency.count == 1
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from src.cyberagent.cli.runtime_queue_metrics import (
+    AckLatencyLog,
+    QueueItemSample,
+    render_queue_health_json,
+    summarize_latencies,
+    summarize_queue,
+)
+
+
+def test_summarize_latencies_uses_nearest_rank() -> None:
+    summary = summarize_latencies([float(value) for value in range(1, 101)])
+
+    assert summary.count == 100
+    assert summary.p50_seconds == 50.0
+    assert summary.p90_seconds == 90.0
+    assert summary.p99_seconds == 99.0
+    assert summary.max_seconds == 100.0
+    assert summarize_latencies([]).p50_seconds is None
+
+
+def test_summarize_queue_buckets_attempts_and_counts_leases() -> None:
+    health = summarize_queue(
+        "agent_message",
+        pending=[
+            QueueItemSample(queued_at=10.0, recipient="a", attempts=7),
+            QueueItemSample(
+                queued_at=20.0,
+                recipient="a",
+                next_attempt_at=200.0,
+                lease_owner="worker",
+                lease_expires_at=150.0,
+            ),
+        ],
+        dead_letter_count=0,
+        now=100.0,
+    )
+
+    assert health.attempts_histogram == {"0": 1, "5+": 1}
+    assert health.depth_by_recipient == {"a": 2}
+    assert health.deferred == 1
+    assert health.leased == 1
+    assert health.oldest_age_seconds == 90.0
+    snapshot = json.loads(render_queue_health_json([health], backend="file", now=1.0))
+    assert snapshot["queues"][0]["depth_by_state"] == {"pending": 2, "dead_letter": 0}
+
+
+def test_ack_latency_log_keeps_most_recent_samples(tmp_path: Path) -> None:
+    log = AckLatencyLog(tmp_path / "acks.log", limit=3)
+
+    for value in range(40):
+        log.record([float(value)])
+
+    assert log.read() == [37.0, 38.0, 39.0]
+    assert len((tmp_path / "acks.log").read_text().splitlines()) < 40
+    assert [path.name for path in tmp_path.iterdir()] == ["acks.log"]
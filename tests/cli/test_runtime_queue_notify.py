@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from src.cyberagent.cli.runtime_queue_backend import (
+    FileRuntimeQueueBackend,
+    RuntimeQueueBackend,
+    SQLiteRuntimeQueueBackend,
+)
+from src.cyberagent.cli.runtime_queue_notify import (
+    AGENT_MESSAGE_QUEUE,
+    SUGGESTION_QUEUE,
+    RuntimeQueueWaiter,
+    notify_queue_changed,
+)
+
+
+def _build_file_backend(tmp_path: Path) -> RuntimeQueueBackend:
+    return FileRuntimeQueueBackend(
+        suggest_queue_dir=tmp_path / "suggest_queue",
+        agent_message_queue_dir=tmp_path / "agent_queue",
+        agent_message_dead_letter_dir=tmp_path / "agent_dead_letter",
+    )
+
+
+def _build_sqlite_backend(tmp_path: Path) -> RuntimeQueueBackend:
+    return SQLiteRuntimeQueueBackend(db_path=tmp_path / "runtime_queue.db")
+
+
+def _build_waiter(
+    backend: RuntimeQueueBackend, queue: str, poll_seconds: float
+) -> RuntimeQueueWaiter:
+    return RuntimeQueueWaiter(
+        queue=queue,
+        change_token=lambda: backend.queue_change_token(queue),
+        watch_targets=backend.queue_watch_targets(queue),
+        poll_seconds=poll_seconds,
+    )
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [_build_file_backend, _build_sqlite_backend],
+    ids=["file", "sqlite"],
+)
+def test_queue_change_token_tracks_enqueue_and_ack(
+    tmp_path: Path,
+    factory: Callable[[Path], RuntimeQueueBackend],
+) -> None:
+    backend = factory(tmp_path)
+    backend.enqueue_agent_message(
+        recipient="System3/root",
+        sender=None,
+        message_type="initiative_assign",
+        payload={"initiative_id": 1},
+    )
+    before = backend.queue_change_token(AGENT_MESSAGE_QUEUE)
+    suggestion_before = backend.queue_change_token(SUGGESTION_QUEUE)
+
+    assert backend.queue_change_token(AGENT_MESSAGE_QUEUE) == before
+
+    queued = backend.read_queued_agent_messages()
+    backend.ack_agent_message(queued[0].path)
+
+    assert backend.queue_change_token(AGENT_MESSAGE_QUEUE) != before
+    assert backend.queue_change_token(SUGGESTION_QUEUE) == suggestion_before
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "factory",
+    [_build_file_backend, _build_sqlite_backend],
+    ids=["file", "sqlite"],
+)
+async def test_waiter_wakes_on_out_of_process_style_enqueue(
+    tmp_path: Path,
+    factory: Callable[[Path], RuntimeQueueBackend],
+) -> None:
+    consumer_backend = factory(tmp_path)
+    producer_backend = factory(tmp_path)
+    producer_backend.enqueue_suggestion("warmup")
+    waiter = _build_waiter(consumer_backend, SUGGESTION_QUEUE, poll_seconds=0.05)
+    stop_event = asyncio.Event()
+    try:
+        waiter.snapshot()
+        loop = asyncio.get_running_loop()
+        loop.call_later(
+            0.05,
+            lambda: threading.Thread(
+                target=producer_backend.enqueue_suggestion, args=("hello",)
+            ).start(),
+        )
+        started = time.monotonic()
+        await asyncio.wait_for(waiter.wait(stop_event), timeout=2)
+        assert time.monotonic() - started < 1.5
+    finally:
+        waiter.close()
+
+
+@pytest.mark.asyncio
+async def test_waiter_wakes_on_in_process_notification(tmp_path: Path) -> None:
+    waiter = RuntimeQueueWaiter(
+        queue=AGENT_MESSAGE_QUEUE,
+        change_token=lambda: 0,
+        poll_seconds=60.0,
+    )
+    stop_event = asyncio.Event()
+    try:
+        waiter.snapshot()
+        asyncio.get_running_loop().call_later(
+            0.01, notify_queue_changed, AGENT_MESSAGE_QUEUE
+        )
+        await asyncio.wait_for(waiter.wait(stop_event), timeout=1)
+    finally:
+        waiter.close()
+
+
+@pytest.mark.asyncio
+async def test_waiter_returns_on_timeout_and_stop() -> None:
+    waiter = RuntimeQueueWaiter(
+        queue=SUGGESTION_QUEUE,
+        change_token=lambda: 0,
+        poll_seconds=60.0,
+    )
+    stop_event = asyncio.Event()
+    try:
+        waiter.snapshot()
+        await asyncio.wait_for(waiter.wait(stop_event, timeout=0.01), timeout=1)
+
+        asyncio.get_running_loop().call_later(0.01, stop_event.set)
+        await asyncio.wait_for(waiter.wait(stop_event), timeout=1)
+    finally:
+        waiter.close()
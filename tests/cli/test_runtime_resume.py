@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
+from dataclasses import asdict
 from pathlib import Path
 
 import pytest
@@ -73,17 +74,20 @@ def test_queue_in_progress_initiatives_enqueues_messages(
     recorded: list[dict[str, object]] = []
     monkeypatch.setattr(runtime_resume, "get_database_path", lambda: str(db_path))
 
-    def _fake_enqueue(**kwargs: object) -> Path:
-        recorded.append(dict(kwargs))
-        return tmp_path / "queued.json"
+    def _fake_enqueue(
+        requests: list[runtime_resume.AgentMessageEnqueueRequest],
+    ) -> list[Path]:
+        recorded.extend(asdict(request) for request in requests)
+        return [tmp_path / "queued.json" for _ in requests]
 
-    monkeypatch.setattr(runtime_resume, "enqueue_agent_message", _fake_enqueue)
+    monkeypatch.setattr(runtime_resume, "enqueue_agent_messages", _fake_enqueue)
 
     queued = runtime_resume.queue_in_progress_initiatives(team_id=7)
 
     assert queued == 5
     assert len(recorded) == 5
     assert recorded[0]["recipient"] == "System3/root"
+    assert {entry["lane"] for entry in recorded} == {"backfill"}
     assert recorded[0]["message_type"] == "initiative_assign"
     assert recorded[0]["payload"] == {
         "initiative_id": 1,
@@ -151,13 +155,15 @@ def test_queue_in_progress_initiatives_uses_fresh_idempotency_keys(
     monkeypatch.setattr(runtime_resume, "get_database_path", lambda: str(db_path))
     recorded_keys: list[str] = []
 
-    def _fake_enqueue(**kwargs: object) -> Path:
-        key = kwargs.get("idempotency_key")
-        assert isinstance(key, str)
-        recorded_keys.append(key)
-        return tmp_path / "queued.json"
+    def _fake_enqueue(
+        requests: list[runtime_resume.AgentMessageEnqueueRequest],
+    ) -> list[Path]:
+        for request in requests:
+            assert isinstance(request.idempotency_key, str)
+            recorded_keys.append(request.idempotency_key)
+        return [tmp_path / "queued.json" for _ in requests]
 
-    monkeypatch.setattr(runtime_resume, "enqueue_agent_message", _fake_enqueue)
+    monkeypatch.setattr(runtime_resume, "enqueue_agent_messages", _fake_enqueue)
 
     first = runtime_resume.queue_in_progress_initiatives(team_id=7)
     second = runtime_resume.queue_in_progress_initiatives(team_id=7)
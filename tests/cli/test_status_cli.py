@@ -353,3 +353,42 @@ def test_status_render_no_tasks_does_not_show_suggest_hint() -> None:
 
     assert "No tasks found." in output
     assert 'Next: run cyberagent suggest --payload "Describe the task"' not in output
+
+
+def test_status_queues_renders_queue_health(monkeypatch, capsys) -> None:
+    from src.cyberagent.cli import status as status_module
+    from src.cyberagent.cli.runtime_queue_metrics import (
+        QueueItemSample,
+        summarize_queue,
+    )
+
+    health = [
+        summarize_queue("suggestion", pending=[], ack_latencies=[0.5]),
+        summarize_queue(
+            "agent_message",
+            pending=[
+                QueueItemSample(
+                    queued_at=1.0, recipient="System3/root", lane="control"
+                )
+            ],
+            dead_letter_count=2,
+        ),
+    ]
+    monkeypatch.setattr(status_module, "collect_queue_health", lambda: health)
+    monkeypatch.setenv("CYBERAGENT_RUNTIME_QUEUE_BACKEND", "sqlite")
+
+    assert status_module.main(["--queues"]) == 0
+    output = capsys.readouterr().out
+    assert "Runtime queues (backend: sqlite)" in output
+    assert "Queue agent_message: 1 pending, 0 deferred, 0 leased" in output
+    assert "Dead letter: 2" in output
+    assert "By recipient: System3/root=1" in output
+    assert "Ack latency (last 1): p50 0.50s" in output
+
+    assert status_module.main(["--queues", "--json"]) == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["backend"] == "sqlite"
+    assert [queue["queue"] for queue in payload["queues"]] == [
+        "suggestion",
+        "agent_message",
+    ]
@@ -15,6 +15,7 @@ from src.cyberagent.db.models.team import Team
 from src.cyberagent.testing.pytest_worker import get_pytest_worker_id
 from src.cyberagent.testing.thread_exceptions import ThreadExceptionTracker
 from src.cyberagent.authz import skill_permissions_enforcer
+from src.cyberagent.memory.runtime import reset_memory_runtime_cache
 
 _WORKER_ID = get_pytest_worker_id(os.environ, os.getpid())
 _TEST_DB_ROOT = (Path(".pytest_db") / _WORKER_ID).resolve()
@@ -83,6 +84,7 @@ def _clear_active_team_env(monkeypatch: pytest.MonkeyPatch) -> None:
     if TEST_MEMORY_DB_PATH.exists():
         os.chmod(TEST_MEMORY_DB_PATH, 0o666)
         TEST_MEMORY_DB_PATH.unlink()
+    reset_memory_runtime_cache()
     session = next(get_db())
     try:
         for table in reversed(init_db.Base.metadata.sorted_tables):
@@ -460,6 +460,7 @@ def test_render_memory_page_shows_entries(monkeypatch) -> None:
             1,
         ),
     )
+    monkeypatch.setattr(dashboard, "load_memory_metrics_snapshots", lambda: [])
     st = _MemoryStreamlit()
     dashboard.render_memory_page(st)
 
@@ -470,6 +471,104 @@ def test_render_memory_page_shows_entries(monkeypatch) -> None:
     assert st.expander_calls == ["Entry mem-1"]
 
 
+
+def test_render_memory_metrics_shows_histograms(monkeypatch) -> None:
+    def _snapshot(pid: int, p95: float) -> dict[str, object]:
+        return {
+            "generated_at": 0.0,
+            "pid": pid,
+            "process": "cyberagent",
+            "query_count": 3,
+            "result_cache_hit_rate": 0.5,
+            "reflection_lag_seconds_last": 12.0,
+            "histograms": [
+                {
+                    "metric": "latency_ms",
+                    "operation": "query",
+                    "scope": "agent",
+                    "backend": "sqlite",
+                    "count": 3,
+                    "p50": 5.0,
+                    "p95": p95,
+                    "p99": 25.0,
+                    "max": 21.0,
+                    "buckets": [],
+                }
+            ],
+        }
+
+    monkeypatch.setattr(
+        dashboard,
+        "load_memory_metrics_snapshots",
+        lambda: [_snapshot(101, 25.0), _snapshot(202, 50.0)],
+    )
+    st = _FakeStreamlit()
+    dashboard.render_memory_metrics(st)
+
+    rows = st.dataframe_data[0]
+    assert isinstance(rows, list)
+    assert [row["process"] for row in rows] == ["cyberagent:101", "cyberagent:202"]
+    assert rows[0]["operation"] == "query"
+    assert [row["p95"] for row in rows] == [25.0, 50.0]
+
+
+def test_render_queues_page_shows_queue_health(monkeypatch) -> None:
+    class _QueueStreamlit(_FakeStreamlit):
+        def __init__(self) -> None:
+            super().__init__()
+            self.expander_calls: list[str] = []
+
+        class _ExpanderCtx:
+            def __enter__(self):
+                return None
+
+            def __exit__(self, exc_type, exc, tb):
+                return False
+
+        def expander(self, label: str):
+            self.expander_calls.append(label)
+            return self._ExpanderCtx()
+
+    monkeypatch.setattr(
+        dashboard,
+        "load_queue_health_snapshot",
+        lambda: {
+            "backend": "file",
+            "generated_at": 1.0,
+            "queues": [
+                {
+                    "queue": "agent_message",
+                    "depth_by_state": {"pending": 3, "dead_letter": 1},
+                    "depth_by_recipient": {"System3/root": 3},
+                    "depth_by_lane": {"control": 3},
+                    "attempts_histogram": {"0": 2, "1": 1},
+                    "deferred": 1,
+                    "leased": 0,
+                    "oldest_queued_at": 1.0,
+                    "oldest_age_seconds": 12.5,
+                    "ack_latency": {
+                        "count": 4,
+                        "p50_seconds": 0.2,
+                        "p90_seconds": 0.4,
+                        "p99_seconds": 0.4,
+                        "max_seconds": 0.4,
+                    },
+                }
+            ],
+        },
+    )
+    st = _QueueStreamlit()
+    dashboard.render_queues_page(st)
+
+    assert st.captions == ["Backend: file"]
+    rows = st.dataframe_data[0]
+    assert isinstance(rows, list)
+    assert rows[0]["pending"] == 3
+    assert rows[0]["dead_letter"] == 1
+    assert rows[0]["ack_p90_seconds"] == 0.4
+    assert st.expander_calls == ["Queue agent_message"]
+
+
 def test_select_page_with_buttons_returns_current_when_no_clicks() -> None:
     class _Sidebar:
         def __init__(self) -> None:
@@ -102,3 +102,24 @@ def test_load_memory_entries_filters_and_preview(monkeypatch, tmp_path: Path) ->
     assert entries[0].id == "mem-1"
     assert "pkm_file" in entries[0].tags
     assert "PKM file: notes/alpha.md" in entries[0].content_preview
+
+
+def test_load_memory_metrics_snapshots_reads_every_process(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("MEMORY_SQLITE_PATH", str(tmp_path / "memory.db"))
+    monkeypatch.delenv("MEMORY_METRICS_SNAPSHOT_PATH", raising=False)
+    assert memory_data.load_memory_metrics_snapshots() == []
+
+    for pid, generated_at in ((202, 100_000.0), (101, 99_990.0), (303, 1.0)):
+        (tmp_path / f"memory_metrics.{pid}.json").write_text(
+            f'{{"generated_at": {generated_at}, "pid": {pid}, '
+            '"process": "cyberagent", "histograms": []}',
+            encoding="utf-8",
+        )
+    (tmp_path / ".memory_metrics.404.json.abc.tmp").write_text("{", encoding="utf-8")
+
+    snapshots = memory_data.load_memory_metrics_snapshots(now=100_000.0 + 3600)
+
+    # pid 303 stopped writing more than a day ago.
+    assert [snapshot["pid"] for snapshot in snapshots] == [101, 202]
@@ -0,0 +1,202 @@
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.cyberagent.memory.audit_buffer import (
+    BufferedMemoryAuditSink,
+    build_memory_audit_sink,
+)
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
+from src.cyberagent.memory.crud import MemoryActorContext
+from src.cyberagent.memory.models import (
+    MemoryAuditEvent,
+    MemoryEntry,
+    MemoryLayer,
+    MemoryPriority,
+    MemoryScope,
+    MemorySource,
+)
+from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.retrieval import MemoryRetrievalService
+from src.enums import SystemType
+
+
+def _actor() -> MemoryActorContext:
+    return MemoryActorContext(
+        agent_id="root_sys1",
+        system_id=1,
+        team_id=1,
+        system_type=SystemType.OPERATION,
+    )
+
+
+def _entry(entry_id: str, content: str) -> MemoryEntry:
+    now = datetime.now(timezone.utc)
+    return MemoryEntry(
+        id=entry_id,
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        owner_agent_id="root_sys1",
+        content=content,
+        tags=[],
+        priority=MemoryPriority.MEDIUM,
+        created_at=now,
+        updated_at=now,
+        expires_at=None,
+        source=MemorySource.MANUAL,
+        confidence=0.9,
+        layer=MemoryLayer.LONG_TERM,
+    )
+
+
+def _event(resource_id: str, action: str = "create") -> MemoryAuditEvent:
+    return MemoryAuditEvent(
+        action=action,
+        actor_id="root_sys1",
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        resource_id=resource_id,
+        success=True,
+        details={},
+    )
+
+
+def _rows(path) -> list[sqlite3.Row]:
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    try:
+        return connection.execute(
+            "SELECT * FROM memory_audit_events ORDER BY id"
+        ).fetchall()
+    finally:
+        connection.close()
+
+
+def test_retrieval_events_are_stored_as_one_record_per_query(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    for index in range(3):
+        store.add(_entry(f"mem-{index}", f"alpha {index}"))
+    sink = BufferedMemoryAuditSink(tmp_path / "audit.db")
+    service = MemoryRetrievalService(
+        registry=StaticScopeRegistry(store, store, store), audit_sink=sink
+    )
+
+    result = service.search_entries(
+        actor=_actor(),
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        query_text="alpha",
+        limit=10,
+    )
+    sink.record(_event("mem-0"))
+
+    assert sink.backlog == 4
+    assert sink.flush() == 2
+    assert sink.backlog == 0
+    retrieval, create = _rows(tmp_path / "audit.db")
+    details = json.loads(retrieval["details_json"])
+    assert retrieval["action"] == "memory_retrieval"
+    assert sorted(details["entry_ids"]) == sorted(entry.id for entry in result.items)
+    assert list(details["targets"]) == ["agent:root"]
+    assert create["resource_id"] == "mem-0"
+
+
+def test_ring_buffer_drops_oldest_events(tmp_path) -> None:
+    sink = BufferedMemoryAuditSink(
+        tmp_path / "audit.db", max_buffer=2, flush_threshold=100
+    )
+    for index in range(3):
+        sink.record(_event(f"mem-{index}"))
+
+    assert sink.backlog == 2
+    assert sink.dropped_count == 1
+    sink.flush()
+    assert [row["resource_id"] for row in _rows(tmp_path / "audit.db")] == [
+        "mem-1",
+        "mem-2",
+    ]
+
+
+def test_flush_threshold_wakes_background_flusher(tmp_path) -> None:
+    sink = BufferedMemoryAuditSink(
+        tmp_path / "audit.db", flush_threshold=2, flush_interval_seconds=60
+    )
+    sink.start()
+    try:
+        sink.record(_event("mem-0"))
+        sink.record(_event("mem-1"))
+        for _ in range(200):
+            if sink.written_count == 2:
+                break
+            time.sleep(0.01)
+        # Written by the flusher thread, well before the 60s interval.
+        written_before_close = sink.written_count
+    finally:
+        sink.close()
+
+    assert written_before_close == 2
+    assert sink.backlog == 0
+
+
+def test_build_memory_audit_sink_reads_env(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("MEMORY_AUDIT_SINK", "log")
+    assert build_memory_audit_sink(str(tmp_path / "memory.db")) is None
+
+    monkeypatch.setenv("MEMORY_AUDIT_SINK", "buffered")
+    monkeypatch.setenv("MEMORY_AUDIT_FLUSH_THRESHOLD", "50")
+    sink = build_memory_audit_sink(str(tmp_path / "memory.db"))
+    assert sink is not None
+    sink.close()
+    assert sink.flush_threshold == 50
+    assert sink.path == tmp_path / "memory_audit.db"
+
+    monkeypatch.setenv("MEMORY_AUDIT_SINK", "kafka")
+    with pytest.raises(ValueError):
+        build_memory_audit_sink(str(tmp_path / "memory.db"))
+
+
+def test_failed_flush_requeues_events_within_buffer_limit(
+    tmp_path, monkeypatch
+) -> None:
+    sink = BufferedMemoryAuditSink(
+        tmp_path / "audit.db", max_buffer=3, flush_threshold=100
+    )
+    sink.record(_event("mem-0"))
+    sink.record(_event("mem-1"))
+
+    def _locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(sqlite3, "connect", _locked)
+    with pytest.raises(sqlite3.OperationalError):
+        sink.flush()
+    monkeypatch.undo()
+    sink.record(_event("mem-2"))
+    sink.record(_event("mem-3"))
+
+    assert sink.backlog == 3
+    assert sink.dropped_count == 1
+    assert sink.flush() == 3
+    assert [row["resource_id"] for row in _rows(tmp_path / "audit.db")] == [
+        "mem-1",
+        "mem-2",
+        "mem-3",
+    ]
+
+
+def test_flush_prunes_rows_past_retention(tmp_path) -> None:
+    sink = BufferedMemoryAuditSink(
+        tmp_path / "audit.db", flush_threshold=100, retention_seconds=3600
+    )
+    stale = _event("mem-old")
+    stale.timestamp = datetime.now(timezone.utc) - timedelta(hours=2)
+    sink.record(stale)
+    sink.flush(now=time.time() - 7200)
+    sink.record(_event("mem-new"))
+
+    sink.flush()
+
+    assert [row["resource_id"] for row in _rows(tmp_path / "audit.db")] == ["mem-new"]
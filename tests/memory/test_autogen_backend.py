@@ -57,3 +57,14 @@ def test_autogen_store_update_raises() -> None:
     store = AutoGenMemoryStore(memory)
     with pytest.raises(NotImplementedError):
         store.update(_entry("mem-2"))
+
+
+def test_autogen_store_get_many_preserves_requested_order() -> None:
+    memory = ListMemory(name="test")
+    store = AutoGenMemoryStore(memory)
+    store.add(_entry("mem-1"))
+    store.add(_entry("mem-2"))
+
+    entries = store.get_many(["mem-2", "missing", "mem-1"], MemoryScope.AGENT, "root")
+
+    assert [entry.id for entry in entries] == ["mem-2", "mem-1"]
@@ -87,3 +87,28 @@ def test_chromadb_vector_index_roundtrip() -> None:
     memory._items.append(content)  # type: ignore[attr-defined]
     ids = index.query("direct", limit=5)
     assert "mem-2" in ids
+
+
+def test_chromadb_vector_index_upserts_batch_in_one_call() -> None:
+    _install_fake_autogen_chromadb()
+    from src.cyberagent.memory.backends.chromadb_vector import ChromaDBVectorIndex
+
+    class FakeCollection:
+        def __init__(self) -> None:
+            self.upserts: list[dict[str, Any]] = []
+
+        def upsert(self, **kwargs: Any) -> None:
+            self.upserts.append(kwargs)
+
+    index = ChromaDBVectorIndex(config=object())
+    memory = cast(Any, getattr(index, "_memory"))
+    memory._collection = FakeCollection()
+    memory._ensure_initialized = lambda: None
+
+    index.upsert_many([_entry("mem-1"), _entry("mem-2")])
+
+    (call,) = memory._collection.upserts
+    assert call["ids"] == ["mem-1", "mem-2"]
+    assert call["documents"] == ["hello world", "hello world"]
+    assert call["metadatas"][1]["id"] == "mem-2"
+    assert memory._items == []
@@ -2,10 +2,14 @@ import sys
 from types import ModuleType
 from typing import Any, cast
 
+from src.cyberagent.memory.backends.chromadb_vector import (
+    cached_default_embedding_function,
+)
 from src.cyberagent.memory.config import (
     MemoryBackendConfig,
     build_memory_registry,
     load_memory_backend_config,
+    _build_chroma_vector_config,
     _build_vector_index,
 )
 from src.cyberagent.memory.models import MemoryScope
@@ -22,6 +26,9 @@ def test_load_memory_backend_config_defaults(monkeypatch) -> None:
     monkeypatch.delenv("MEMORY_SQLITE_PATH", raising=False)
     monkeypatch.delenv("MEMORY_VECTOR_BACKEND", raising=False)
     monkeypatch.delenv("MEMORY_VECTOR_COLLECTION", raising=False)
+    monkeypatch.delenv("MEMORY_VECTOR_PATH", raising=False)
+    monkeypatch.delenv("MEMORY_VECTOR_EMBEDDER", raising=False)
+    monkeypatch.delenv("MEMORY_VECTOR_IVF_LISTS", raising=False)
 
     config = load_memory_backend_config()
     assert config.backend == "chromadb"
@@ -33,6 +40,9 @@ def test_load_memory_backend_config_defaults(monkeypatch) -> None:
     assert config.sqlite_path == str(resolve_data_path("memory.db"))
     assert config.vector_backend == "none"
     assert config.vector_collection == "memory_vectors"
+    assert config.vector_path == str(resolve_data_path("vector_index"))
+    assert config.vector_embedder == "hashing"
+    assert config.vector_ivf_lists == 0
 
 
 def test_build_memory_registry_list_backend() -> None:
@@ -95,3 +105,45 @@ def test_build_vector_index_prefers_chromadb_vector_backend() -> None:
     assert index.__class__.__name__ == "ChromaDBVectorIndex"
     memory = cast(Any, getattr(index, "_memory"))
     assert memory.config.collection_name == "memory_vectors"
+
+
+def test_chroma_vector_config_routes_embeddings_through_cache(
+    monkeypatch, tmp_path
+) -> None:
+    class FakeConfig:
+        def __init__(self, **kwargs):  # type: ignore[no-untyped-def]
+            self.params = kwargs
+
+    configs_module = ModuleType("autogen_ext.memory.chromadb._chroma_configs")
+    setattr(configs_module, "PersistentChromaDBVectorMemoryConfig", FakeConfig)
+    setattr(configs_module, "HttpChromaDBVectorMemoryConfig", FakeConfig)
+    setattr(configs_module, "CustomEmbeddingFunctionConfig", FakeConfig)
+    monkeypatch.setitem(
+        sys.modules, "autogen_ext.memory.chromadb._chroma_configs", configs_module
+    )
+
+    def config(max_entries: int) -> MemoryBackendConfig:
+        return MemoryBackendConfig(
+            backend="chromadb",
+            chroma_collection="memory_store",
+            chroma_persistence_path=str(tmp_path / "chroma"),
+            chroma_host="",
+            chroma_port=8000,
+            chroma_ssl=False,
+            sqlite_path=str(tmp_path / "memory.db"),
+            vector_backend="chromadb",
+            vector_collection="memory_vectors",
+            embedding_cache_path=str(tmp_path / "cache.db"),
+            embedding_cache_max_entries=max_entries,
+        )
+
+    cached = cast(Any, _build_chroma_vector_config(config(100)))
+    plain = cast(Any, _build_chroma_vector_config(config(0)))
+
+    embedding = cached.params["embedding_function_config"].params
+    assert embedding["function"] is cached_default_embedding_function
+    assert embedding["params"] == {
+        "cache_path": str(tmp_path / "cache.db"),
+        "max_entries": 100,
+    }
+    assert "embedding_function_config" not in plain.params
@@ -0,0 +1,141 @@
+import time
+from typing import Sequence
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.cyberagent.memory.backends.embedding_cache import (  # noqa: E402
+    CachedEmbedder,
+    CachedEmbeddingFunction,
+    EmbeddingCache,
+    FunctionEmbedder,
+    content_hash,
+)
+from src.cyberagent.memory.backends.local_vector import (  # noqa: E402
+    HashingEmbedder,
+    LocalVectorIndex,
+)
+from src.cyberagent.memory.config import (  # noqa: E402
+    MemoryBackendConfig,
+    _build_vector_index,
+)
+
+
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self._inner = HashingEmbedder(16)
+
+    @property
+    def dimension(self) -> int:
+        return self._inner.dimension
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return self._inner.embed(texts)
+
+
+def _counting_embedder() -> _CountingEmbedder:
+    return _CountingEmbedder()
+
+
+def test_cached_embedder_only_embeds_new_text(tmp_path) -> None:
+    inner = _CountingEmbedder()
+    cache = EmbeddingCache(tmp_path / "cache.db")
+    embedder = CachedEmbedder(inner, cache, embedder_id="counting:16")
+
+    first = embedder.embed(["alpha", "beta", "alpha"])
+    second = embedder.embed(["beta", "gamma"])
+
+    assert inner.calls == [["alpha", "beta"], ["gamma"]]
+    assert np.array_equal(first[0], first[2])
+    assert np.array_equal(first[1], second[0])
+
+
+def test_cached_embedder_reuses_disk_cache_across_instances(tmp_path) -> None:
+    warm = CachedEmbedder(
+        _CountingEmbedder(), EmbeddingCache(tmp_path / "cache.db"), "counting:16"
+    )
+    expected = warm.embed(["session log line"])
+    inner = _CountingEmbedder()
+    cold = CachedEmbedder(inner, EmbeddingCache(tmp_path / "cache.db"), "counting:16")
+    other_model = CachedEmbedder(
+        _CountingEmbedder(), EmbeddingCache(tmp_path / "cache.db"), "other:16"
+    )
+
+    assert np.array_equal(cold.embed(["session log line"]), expected)
+    assert inner.calls == []
+    other_model.embed(["session log line"])
+    assert other_model.embedder.calls == [["session log line"]]  # type: ignore[attr-defined]
+
+
+def test_embedding_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = EmbeddingCache(tmp_path / "cache.db", max_entries=2)
+    vector = np.ones(4, dtype=np.float32)
+    for text in ("old", "kept", "new"):
+        cache.put_many("model", {content_hash(text): vector})
+        time.sleep(0.01)
+    cache.get_many("model", [content_hash("old")])
+
+    assert cache.evict() == 1
+
+    remaining = cache.get_many(
+        "model", [content_hash(text) for text in ("old", "kept", "new")]
+    )
+    assert set(remaining) == {content_hash("old"), content_hash("new")}
+
+
+def test_local_backend_caches_model_embedders(tmp_path) -> None:
+    def config(embedder: str) -> MemoryBackendConfig:
+        return MemoryBackendConfig(
+            backend="chromadb",
+            chroma_collection="memory_store",
+            chroma_persistence_path=str(tmp_path / "chroma"),
+            chroma_host="",
+            chroma_port=8000,
+            chroma_ssl=False,
+            sqlite_path=str(tmp_path / "memory.db"),
+            vector_backend="local",
+            vector_collection=embedder.replace(":", "_").replace(".", "_"),
+            vector_path=str(tmp_path / "vector_index"),
+            vector_embedder=embedder,
+            embedding_cache_path=str(tmp_path / "cache.db"),
+        )
+
+    cached = _build_vector_index(
+        config("tests.memory.test_embedding_cache:_counting_embedder")
+    )
+    plain = _build_vector_index(config("hashing"))
+
+    assert isinstance(cached, LocalVectorIndex)
+    assert isinstance(cached.embedder, CachedEmbedder)
+    assert cached.embedder.embedder_id.endswith(":16")
+    assert isinstance(plain, LocalVectorIndex)
+    assert isinstance(plain.embedder, HashingEmbedder)
+
+
+def test_chroma_embedding_function_serves_repeated_text_from_cache(tmp_path) -> None:
+    calls: list[list[str]] = []
+
+    def chroma_function(texts: list[str]) -> list[list[float]]:
+        calls.append(list(texts))
+        return HashingEmbedder(8).embed(texts).tolist()
+
+    def function(path) -> CachedEmbeddingFunction:
+        return CachedEmbeddingFunction(
+            CachedEmbedder(
+                FunctionEmbedder(chroma_function),
+                EmbeddingCache(path),
+                embedder_id="chroma-default",
+            )
+        )
+
+    documents = function(tmp_path / "cache.db")
+    stored = documents(["deploy window is friday", "rollback plan"])
+    query = documents(["deploy window is friday"])
+    restarted = function(tmp_path / "cache.db")(["rollback plan"])
+
+    assert calls == [["deploy window is friday", "rollback plan"]]
+    assert query == [stored[0]]
+    assert restarted == [stored[1]]
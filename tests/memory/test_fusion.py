@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+from src.cyberagent.memory.fusion import reciprocal_rank_fusion
+from src.cyberagent.memory.models import (
+    MemoryEntry,
+    MemoryPriority,
+    MemoryScope,
+    MemorySource,
+)
+
+
+def _entry(entry_id: str) -> MemoryEntry:
+    now = datetime.now(timezone.utc)
+    return MemoryEntry(
+        id=entry_id,
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        owner_agent_id="root_sys1",
+        content=entry_id,
+        priority=MemoryPriority.MEDIUM,
+        created_at=now,
+        updated_at=now,
+        source=MemorySource.MANUAL,
+        confidence=0.9,
+    )
+
+
+def test_reciprocal_rank_fusion_promotes_shared_hits() -> None:
+    a, b, c, d = (_entry(entry_id) for entry_id in "abcd")
+
+    fused = reciprocal_rank_fusion([[a, b, c], [d, c]])
+
+    assert [entry.id for entry in fused] == ["c", "a", "d", "b"]
+
+
+def test_reciprocal_rank_fusion_keeps_first_seen_order_on_ties() -> None:
+    a, b = _entry("a"), _entry("b")
+
+    fused = reciprocal_rank_fusion([[a], [b], []])
+
+    assert [entry.id for entry in fused] == ["a", "b"]
+    assert reciprocal_rank_fusion([]) == []
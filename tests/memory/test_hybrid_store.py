@@ -0,0 +1,206 @@
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+
+from src.cyberagent.memory.backends.hybrid import HybridMemoryStore
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
+from src.cyberagent.memory.models import (
+    MemoryEntry,
+    MemoryLayer,
+    MemoryPriority,
+    MemoryQuery,
+    MemoryQueryTarget,
+    MemoryScope,
+    MemorySource,
+)
+
+
+@dataclass
+class _FixedVectorIndex:
+    ids: list[str]
+    upserted: list[str] = field(default_factory=list)
+
+    def upsert(self, entry: MemoryEntry) -> None:
+        self.upserted.append(entry.id)
+
+    def delete(self, entry_id: str) -> None:
+        return None
+
+    def query(self, text: str, limit: int) -> list[str]:
+        return list(self.ids)
+
+
+class _CountingSqliteStore(SqliteMemoryStore):
+    def __init__(self, db_path) -> None:
+        super().__init__(db_path)
+        self.fetches = 0
+        self.gets = 0
+
+    def _fetch(self, query, params):  # type: ignore[override]
+        self.fetches += 1
+        return super()._fetch(query, params)
+
+    def get(self, entry_id, scope, namespace):  # type: ignore[override]
+        self.gets += 1
+        return super().get(entry_id, scope, namespace)
+
+
+def _entry(
+    entry_id: str,
+    content: str,
+    *,
+    tags: list[str] | None = None,
+    layer: MemoryLayer = MemoryLayer.SESSION,
+) -> MemoryEntry:
+    now = datetime.now(timezone.utc)
+    return MemoryEntry(
+        id=entry_id,
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        owner_agent_id="root_sys1",
+        content=content,
+        tags=tags or ["note"],
+        priority=MemoryPriority.MEDIUM,
+        created_at=now,
+        updated_at=now,
+        expires_at=None,
+        source=MemorySource.MANUAL,
+        confidence=0.9,
+        layer=layer,
+    )
+
+
+def test_sqlite_get_many_keeps_order_and_applies_filters(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    store.add(_entry("mem-1", "one", tags=["alpha"]))
+    store.add(_entry("mem-2", "two", tags=["alpha"], layer=MemoryLayer.LONG_TERM))
+    store.add(_entry("mem-3", "three", tags=["beta"]))
+
+    everything = store.get_many(
+        ["mem-3", "missing", "mem-1", "mem-3"], MemoryScope.AGENT, "root"
+    )
+    filtered = store.get_many(
+        ["mem-1", "mem-2", "mem-3"],
+        MemoryScope.AGENT,
+        "root",
+        layer=MemoryLayer.SESSION,
+        tags=["alpha"],
+    )
+
+    assert [entry.id for entry in everything] == ["mem-3", "mem-1"]
+    assert [entry.id for entry in filtered] == ["mem-1"]
+    assert store.get_many([], MemoryScope.AGENT, "root") == []
+
+
+def test_hybrid_query_hydrates_vector_hits_in_one_round_trip(tmp_path) -> None:
+    record_store = _CountingSqliteStore(tmp_path / "memory.db")
+    for index in range(5):
+        record_store.add(_entry(f"mem-{index}", f"unrelated {index}"))
+    record_store.add(_entry("mem-long", "long term", layer=MemoryLayer.LONG_TERM))
+    store = HybridMemoryStore(
+        record_store,
+        _FixedVectorIndex(["mem-4", "mem-long", "mem-0", "mem-2", "gone"]),
+    )
+
+    result = store.query(
+        MemoryQuery(
+            text="semantic",
+            scope=MemoryScope.AGENT,
+            namespace="root",
+            limit=10,
+            layer=MemoryLayer.SESSION,
+        )
+    )
+
+    assert [entry.id for entry in result.items] == ["mem-4", "mem-0", "mem-2"]
+    assert record_store.gets == 0
+    # One keyword query plus one batched hydration.
+    assert record_store.fetches == 2
+
+
+def _seed_scopes(store: SqliteMemoryStore) -> None:
+    for index in range(3):
+        store.add(_entry(f"agent-{index}", f"deploy checklist {index}"))
+        store.add(
+            replace(
+                _entry(f"team-{index}", f"deploy runbook {index}"),
+                scope=MemoryScope.TEAM,
+                namespace="team_1",
+            )
+        )
+    store.add(
+        replace(_entry("other-agent", "deploy notes"), owner_agent_id="root_sys3")
+    )
+
+
+_TARGETS = [
+    MemoryQueryTarget(MemoryScope.AGENT, "root", 2, owner_agent_id="root_sys1"),
+    MemoryQueryTarget(MemoryScope.TEAM, "team_1", 1),
+]
+
+
+def test_sqlite_query_targets_ranks_all_targets_in_one_statement(tmp_path) -> None:
+    store = _CountingSqliteStore(tmp_path / "memory.db")
+    _seed_scopes(store)
+    store.fetches = 0
+
+    agent, team = store.query_targets("deploy", _TARGETS)
+
+    assert store.fetches == 1
+    assert len(agent.items) == 2
+    assert all(entry.id.startswith("agent-") for entry in agent.items)
+    assert [entry.scope for entry in team.items] == [MemoryScope.TEAM]
+    assert agent.next_cursor is None and not agent.has_more
+    assert set(agent.snippets) == {entry.id for entry in agent.items}
+
+
+def test_sqlite_query_targets_without_text_queries_each_target(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    _seed_scopes(store)
+
+    agent, team = store.query_targets(None, _TARGETS)
+
+    assert len(agent.items) == 2
+    assert "other-agent" not in {entry.id for entry in agent.items}
+    assert len(team.items) == 1
+    assert agent.next_cursor is None
+
+
+def test_hybrid_query_targets_shares_one_vector_query(tmp_path) -> None:
+    record_store = SqliteMemoryStore(tmp_path / "memory.db")
+    _seed_scopes(record_store)
+    record_store.add(_entry("agent-semantic", "rollout procedure"))
+    vector_index = _FixedVectorIndex(["agent-semantic", "team-2"])
+    calls: list[int] = []
+    original_query = vector_index.query
+
+    def _query(text: str, limit: int) -> list[str]:
+        calls.append(limit)
+        return original_query(text, limit)
+
+    vector_index.query = _query  # type: ignore[method-assign]
+    store = HybridMemoryStore(record_store, vector_index)
+
+    agent, team = store.query_targets("deploy", _TARGETS)
+
+    assert calls == [3]
+    assert len(agent.items) == 2
+    assert "agent-semantic" in {entry.id for entry in agent.items}
+    # team-2 is both a keyword and a vector hit, so fusion ranks it first.
+    assert [entry.id for entry in team.items] == ["team-2"]
+
+
+def test_hybrid_prune_namespace_drops_vectors(tmp_path) -> None:
+    deleted_vectors: list[str] = []
+    vector_index = _FixedVectorIndex([])
+    vector_index.delete = deleted_vectors.append  # type: ignore[method-assign]
+    store = HybridMemoryStore(SqliteMemoryStore(tmp_path / "memory.db"), vector_index)
+    for index in range(3):
+        store.add(_entry(f"mem-{index}", f"note {index}"))
+
+    deleted = store.prune_namespace(
+        MemoryScope.AGENT, "root", max_entries=1, owner_agent_id="root_sys1"
+    )
+
+    assert len(deleted) == 2
+    assert deleted_vectors == deleted
+    assert store.count_entries(MemoryScope.AGENT, "root") == 1
@@ -0,0 +1,248 @@
+from datetime import datetime, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.cyberagent.memory.backends.local_vector import (  # noqa: E402
+    HashingEmbedder,
+    LocalVectorIndex,
+    load_embedder,
+)
+from src.cyberagent.memory.backends.vector_index import (  # noqa: E402
+    NoopVectorIndex,
+)
+from src.cyberagent.memory.backends.write_behind import (  # noqa: E402
+    WriteBehindVectorIndex,
+)
+from src.cyberagent.memory.config import (  # noqa: E402
+    MemoryBackendConfig,
+    _build_vector_index,
+    build_memory_registry,
+)
+from src.cyberagent.memory.models import (  # noqa: E402
+    MemoryEntry,
+    MemoryPriority,
+    MemoryScope,
+    MemorySource,
+)
+
+
+def _entry(entry_id: str, content: str) -> MemoryEntry:
+    now = datetime.now(timezone.utc)
+    return MemoryEntry(
+        id=entry_id,
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        owner_agent_id="root_sys1",
+        content=content,
+        priority=MemoryPriority.MEDIUM,
+        created_at=now,
+        updated_at=now,
+        source=MemorySource.MANUAL,
+        confidence=0.9,
+    )
+
+
+def _seed(index: LocalVectorIndex) -> None:
+    index.upsert(_entry("mem-deploy", "deploy the release to production servers"))
+    index.upsert(_entry("mem-budget", "quarterly budget review with finance"))
+    index.upsert(_entry("mem-cat", "the cat sleeps on the warm windowsill"))
+
+
+def test_local_index_ranks_by_similarity(tmp_path) -> None:
+    index = LocalVectorIndex(tmp_path / "vectors")
+    _seed(index)
+
+    assert index.query("production deploy", 2)[0] == "mem-deploy"
+    assert index.query("finance budgets", 1) == ["mem-budget"]
+    assert index.query("zzzz qqqq", 5) == []
+
+
+def test_local_index_delete_and_row_reuse(tmp_path) -> None:
+    index = LocalVectorIndex(tmp_path / "vectors")
+    _seed(index)
+
+    index.delete("mem-deploy")
+    index.upsert(_entry("mem-ship", "ship the production release"))
+
+    assert "mem-deploy" not in index.query("production release", 5)
+    assert index.query("production release", 1) == ["mem-ship"]
+    assert index.size == 3
+
+
+def test_local_index_persists_across_instances(tmp_path) -> None:
+    writer = LocalVectorIndex(tmp_path / "vectors")
+    _seed(writer)
+    reader = LocalVectorIndex(tmp_path / "vectors")
+
+    writer.upsert(_entry("mem-dog", "the dog barks at the mail carrier"))
+
+    assert reader.query("cat windowsill", 1) == ["mem-cat"]
+    assert reader.query("dog barks", 1) == ["mem-dog"]
+
+
+def test_local_index_appends_id_changes_instead_of_rewriting_map(tmp_path) -> None:
+    writer = LocalVectorIndex(tmp_path / "vectors")
+    _seed(writer)
+    reader = LocalVectorIndex(tmp_path / "vectors")
+    ids_path = tmp_path / "vectors" / "ids.json"
+    log_path = tmp_path / "vectors" / "ids.log"
+    id_map = ids_path.read_bytes()
+
+    writer.upsert(_entry("mem-dog", "the dog barks at the mail carrier"))
+    writer.delete("mem-budget")
+
+    assert ids_path.read_bytes() == id_map
+    assert log_path.read_text(encoding="utf-8").splitlines()[-2:] == [
+        '[3,"mem-dog"]',
+        "[1,null]",
+    ]
+    assert reader.query("dog barks", 1) == ["mem-dog"]
+    assert reader.indexed_ids() == {"mem-deploy", "mem-cat", "mem-dog"}
+    assert LocalVectorIndex(tmp_path / "vectors").indexed_ids() == {
+        "mem-deploy",
+        "mem-cat",
+        "mem-dog",
+    }
+
+
+def test_local_index_compacts_log_into_id_map(tmp_path) -> None:
+    index = LocalVectorIndex(tmp_path / "vectors")
+    _seed(index)
+
+    for copy in range(300):
+        index.upsert(_entry(f"mem-{copy}", f"note {copy}"))
+
+    log_lines = (tmp_path / "vectors" / "ids.log").read_text(encoding="utf-8")
+    assert len(log_lines.splitlines()) < 300
+    reopened = LocalVectorIndex(tmp_path / "vectors")
+    assert reopened.size == 303
+    assert reopened.query("note 42", 1) == ["mem-42"]
+
+
+def test_local_index_rejects_dimension_change(tmp_path) -> None:
+    _seed(LocalVectorIndex(tmp_path / "vectors"))
+
+    with pytest.raises(ValueError):
+        LocalVectorIndex(tmp_path / "vectors", embedder=HashingEmbedder(64))
+
+
+def test_local_index_ivf_probe_finds_nearest(tmp_path) -> None:
+    index = LocalVectorIndex(
+        tmp_path / "vectors", ivf_lists=4, ivf_probe=2, ivf_min_rows=8
+    )
+    topics = ["deploy release", "budget finance", "cat windowsill", "dog mail"]
+    index.upsert_many(
+        [
+            _entry(f"mem-{topic_index}-{copy}", f"{topic} note {copy}")
+            for topic_index, topic in enumerate(topics)
+            for copy in range(5)
+        ]
+    )
+
+    hits = index.query("budget finance note", 3)
+
+    assert hits and all(hit.startswith("mem-1-") for hit in hits)
+
+
+def test_load_embedder_specs() -> None:
+    assert load_embedder("hashing").dimension == HashingEmbedder().dimension
+    assert load_embedder("hashing:128").dimension == 128
+    custom = load_embedder("tests.memory.test_local_vector:_small_embedder")
+    assert custom.dimension == 32
+    with pytest.raises(ValueError):
+        load_embedder("unknown")
+
+
+def _small_embedder() -> HashingEmbedder:
+    return HashingEmbedder(32)
+
+
+def test_build_vector_index_local_backend(tmp_path) -> None:
+    config = MemoryBackendConfig(
+        backend="chromadb",
+        chroma_collection="memory_store",
+        chroma_persistence_path=str(tmp_path / "chroma"),
+        chroma_host="",
+        chroma_port=8000,
+        chroma_ssl=False,
+        sqlite_path=str(tmp_path / "memory.db"),
+        vector_backend="local",
+        vector_collection="memory_vectors",
+        vector_path=str(tmp_path / "vector_index"),
+    )
+
+    index = _build_vector_index(config)
+
+    assert isinstance(index, LocalVectorIndex)
+    assert index.path == tmp_path / "vector_index" / "memory_vectors"
+
+
+def test_build_memory_registry_wraps_local_index_in_write_behind(tmp_path) -> None:
+    config = MemoryBackendConfig(
+        backend="chromadb",
+        chroma_collection="memory_store",
+        chroma_persistence_path=str(tmp_path / "chroma"),
+        chroma_host="",
+        chroma_port=8000,
+        chroma_ssl=False,
+        sqlite_path=str(tmp_path / "memory.db"),
+        vector_backend="local",
+        vector_collection="memory_vectors",
+        vector_path=str(tmp_path / "vector_index"),
+    )
+
+    store = build_memory_registry(config).resolve(MemoryScope.AGENT)
+    vector_index = getattr(store, "vector_index")
+    store.add(_entry("mem-1", "write behind keeps turns fast"))
+
+    assert isinstance(vector_index, WriteBehindVectorIndex)
+    assert vector_index.flush(timeout=5.0) is True
+    assert vector_index.query("write behind", 1) == ["mem-1"]
+    vector_index.close()
+
+
+@pytest.mark.parametrize(
+    "embedder",
+    ["missing_module_for_tests:factory", "tests.memory:missing", "unknown"],
+)
+def test_build_vector_index_falls_back_when_embedder_is_unusable(
+    tmp_path, embedder
+) -> None:
+    config = MemoryBackendConfig(
+        backend="chromadb",
+        chroma_collection="memory_store",
+        chroma_persistence_path=str(tmp_path / "chroma"),
+        chroma_host="",
+        chroma_port=8000,
+        chroma_ssl=False,
+        sqlite_path=str(tmp_path / "memory.db"),
+        vector_backend="local",
+        vector_collection="memory_vectors",
+        vector_path=str(tmp_path / "vector_index"),
+        vector_embedder=embedder,
+    )
+
+    assert isinstance(_build_vector_index(config), NoopVectorIndex)
+
+
+def test_build_vector_index_falls_back_on_dimension_mismatch(tmp_path) -> None:
+    LocalVectorIndex(
+        tmp_path / "vector_index" / "memory_vectors", embedder=HashingEmbedder(8)
+    ).upsert(_entry("mem-1", "alpha"))
+    config = MemoryBackendConfig(
+        backend="chromadb",
+        chroma_collection="memory_store",
+        chroma_persistence_path=str(tmp_path / "chroma"),
+        chroma_host="",
+        chroma_port=8000,
+        chroma_ssl=False,
+        sqlite_path=str(tmp_path / "memory.db"),
+        vector_backend="local",
+        vector_collection="memory_vectors",
+        vector_path=str(tmp_path / "vector_index"),
+        vector_embedder="hashing:16",
+    )
+
+    assert isinstance(_build_vector_index(config), NoopVectorIndex)
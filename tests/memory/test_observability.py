@@ -15,11 +15,17 @@ from src.cyberagent.memory.models import (
 )
 import json
 import logging
+import os
 
 from src.cyberagent.memory.observability import (
     MemoryAuditSink,
+    MemoryHistogram,
     MemoryMetrics,
     MemoryMetricsReporter,
+    backend_label,
+    build_memory_metrics,
+    process_snapshot_path,
+    process_snapshot_paths,
 )
 from src.cyberagent.memory.registry import StaticScopeRegistry
 from src.cyberagent.memory.store import MemoryStore
@@ -131,3 +137,69 @@ def test_metrics_reporter_logs_summary(caplog) -> None:
     assert payload["hit_rate"] == 1.0
     assert payload["injection_size_total"] == 120
     assert payload["query_latency_ms_total"] == 24.0
+
+
+def test_histogram_percentiles_resolve_to_bucket_bounds() -> None:
+    histogram = MemoryHistogram((1.0, 10.0, 100.0))
+    for value in [0.5] * 90 + [8.0] * 9 + [400.0]:
+        histogram.observe(value)
+
+    assert histogram.count == 100
+    assert histogram.percentile(0.50) == 1.0
+    assert histogram.percentile(0.95) == 10.0
+    assert histogram.percentile(0.999) == 400.0
+    assert histogram.to_dict()["buckets"] == [
+        [1.0, 90],
+        [10.0, 9],
+        [100.0, 0],
+        ["+Inf", 1],
+    ]
+
+
+def test_metrics_histograms_break_down_by_scope_and_backend() -> None:
+    store = InMemoryStore()
+    metrics = MemoryMetrics()
+    service = MemoryCrudService(
+        registry=StaticScopeRegistry(store, store, store), metrics=metrics
+    )
+    service.list_entries(
+        actor=_actor(),
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        limit=10,
+        cursor=None,
+    )
+    metrics.record_query_latency(3.0, scope="global", backend="sqlite")
+    metrics.record_query_latency(300.0, scope="global", backend="sqlite")
+
+    backend = backend_label(store)
+    snapshot = metrics.snapshot()
+    rows = {
+        (row["metric"], row["operation"], row["scope"], row["backend"]): row
+        for row in snapshot["histograms"]
+    }
+    assert rows[("latency_ms", "list", "agent", backend)]["count"] == 1
+    assert rows[("size", "list", "agent", backend)]["max"] == 0.0
+    assert rows[("latency_ms", "query", "global", "sqlite")]["p99"] == 300.0
+    json.dumps(snapshot)
+
+
+def test_reporter_writes_json_snapshot(tmp_path, monkeypatch) -> None:
+    snapshot_path = tmp_path / "metrics" / "memory_metrics.json"
+    monkeypatch.delenv("MEMORY_METRICS_LOG", raising=False)
+    monkeypatch.setenv("MEMORY_METRICS_SNAPSHOT_PATH", str(snapshot_path))
+    monkeypatch.setenv("MEMORY_METRICS_LOG_INTERVAL_SECONDS", "0")
+    metrics = build_memory_metrics()
+
+    metrics.record_injection_size(120, latency_ms=0.4, scope="agent")
+
+    written = process_snapshot_paths(snapshot_path)
+    assert written == [process_snapshot_path(snapshot_path)]
+    assert [path.name for path in snapshot_path.parent.iterdir()] == [written[0].name]
+    snapshot = json.loads(written[0].read_text(encoding="utf-8"))
+    assert snapshot["pid"] == os.getpid()
+    assert snapshot["injection_size_total"] == 120
+    assert {row["operation"] for row in snapshot["histograms"]} == {"injection"}
+    assert metrics.reporter is not None and not metrics.reporter.log_enabled
+    monkeypatch.setenv("MEMORY_METRICS_SNAPSHOT_PATH", "")
+    assert build_memory_metrics(snapshot_path=str(snapshot_path)).reporter is None
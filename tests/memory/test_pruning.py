@@ -71,3 +71,57 @@ def test_prune_respects_priority(tmp_path) -> None:
     assert "low" in deleted
     assert store.get("low", MemoryScope.AGENT, "root") is None
     assert store.get("high", MemoryScope.AGENT, "root") is not None
+
+
+class _NoListSqliteStore(SqliteMemoryStore):
+    def list(self, *args, **kwargs):  # type: ignore[override]
+        raise AssertionError("SQL pruning must not page through the namespace")
+
+
+def test_prune_runs_in_sql_with_priority_then_age_order(tmp_path) -> None:
+    store = _NoListSqliteStore(tmp_path / "memory.db")
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for index, priority in enumerate(
+        [MemoryPriority.HIGH, MemoryPriority.LOW, MemoryPriority.MEDIUM]
+        + [MemoryPriority.LOW] * 2
+    ):
+        entry = _entry(f"mem-{index}", priority=priority)
+        entry.created_at = base + timedelta(minutes=index)
+        store.add(entry)
+    # Non-UTC expiry is normalised on write so SQL can compare it as text.
+    expired = datetime.now(timezone(timedelta(hours=5))) - timedelta(minutes=1)
+    store.add(_entry("expired", priority=MemoryPriority.HIGH, expires_at=expired))
+
+    pruner = MemoryPruner(
+        registry=StaticScopeRegistry(store, store, store),
+        config=MemoryPruningConfig(max_entries_per_namespace=3),
+    )
+    deleted = pruner.prune(actor=_actor(), scope=MemoryScope.AGENT, namespace="root")
+
+    assert deleted == ["expired", "mem-1", "mem-3"]
+    assert store.count_entries(MemoryScope.AGENT, "root", "root_sys1") == 3
+    assert store.get("mem-0", MemoryScope.AGENT, "root") is not None
+
+
+def test_maybe_prune_waits_for_high_water_mark(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    pruner = MemoryPruner(
+        registry=StaticScopeRegistry(store, store, store),
+        config=MemoryPruningConfig(max_entries_per_namespace=4, high_water_entries=6),
+    )
+
+    for index in range(6):
+        store.add(_entry(f"mem-{index}", priority=MemoryPriority.LOW))
+        assert (
+            pruner.maybe_prune(
+                actor=_actor(), scope=MemoryScope.AGENT, namespace="root"
+            )
+            == []
+        )
+    store.add(_entry("mem-6", priority=MemoryPriority.LOW))
+    deleted = pruner.maybe_prune(
+        actor=_actor(), scope=MemoryScope.AGENT, namespace="root"
+    )
+
+    assert len(deleted) == 3
+    assert store.count_entries(MemoryScope.AGENT, "root", "root_sys1") == 4
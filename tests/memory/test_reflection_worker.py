@@ -0,0 +1,198 @@
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
+from src.cyberagent.memory.crud import MemoryActorContext
+from src.cyberagent.memory.memengine import MemEngine
+from src.cyberagent.memory.models import MemoryLayer, MemoryScope
+from src.cyberagent.memory.observability import MemoryMetrics
+from src.cyberagent.memory.reflection import MemoryReflectionService
+from src.cyberagent.memory.reflection_worker import (
+    MemoryReflectionWorker,
+    ReflectionBuffer,
+    build_memory_reflection_worker,
+)
+from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.session import MemorySessionConfig, MemorySessionRecorder
+from src.enums import SystemType
+
+
+class _CountingEngine(MemEngine):
+    def __init__(self, registry: StaticScopeRegistry) -> None:
+        super().__init__(registry=registry)
+        self.batches: list[int] = []
+
+    def summarize_many(self, batches):  # type: ignore[override]
+        self.batches.append(len(batches))
+        return super().summarize_many(batches)
+
+
+def _actor(agent_id: str = "root_sys1") -> MemoryActorContext:
+    return MemoryActorContext(
+        agent_id=agent_id,
+        system_id=1,
+        team_id=1,
+        system_type=SystemType.OPERATION,
+    )
+
+
+def _long_term(store: SqliteMemoryStore, namespace: str) -> list[str]:
+    result = store.list(
+        MemoryScope.AGENT,
+        namespace,
+        limit=10,
+        cursor=None,
+        owner_agent_id=namespace,
+    )
+    return [
+        entry.content for entry in result.items if entry.layer == MemoryLayer.LONG_TERM
+    ]
+
+
+def _worker(tmp_path, **overrides):
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    registry = StaticScopeRegistry(store, store, store)
+    engine = _CountingEngine(registry)
+    worker = MemoryReflectionWorker(
+        reflection=MemoryReflectionService(registry=registry, engine=engine),
+        buffer=ReflectionBuffer(tmp_path / "buffer.db"),
+        **overrides,
+    )
+    return store, registry, engine, worker
+
+
+def test_buffered_logs_survive_restart(tmp_path) -> None:
+    store, _, _, worker = _worker(tmp_path, compaction_threshold_chars=1000)
+    worker.enqueue(
+        actor=_actor(),
+        scope=MemoryScope.AGENT,
+        namespace="root_sys1",
+        logs=["user: remember the deploy window"],
+    )
+
+    restarted = MemoryReflectionWorker(
+        reflection=worker.reflection,
+        buffer=ReflectionBuffer(tmp_path / "buffer.db"),
+        compaction_threshold_chars=1000,
+    )
+
+    assert restarted.buffer.pending_count() == 1
+    assert restarted.run_once() == 1
+    assert _long_term(store, "root_sys1") == ["user: remember the deploy window"]
+    assert restarted.buffer.pending_count() == 0
+
+
+def test_due_namespaces_are_summarized_in_one_batch(tmp_path) -> None:
+    store, _, engine, worker = _worker(
+        tmp_path, compaction_threshold_chars=20, reflection_interval_seconds=9999
+    )
+    now = 10_000.0
+    for agent_id in ("root_sys1", "root_sys2"):
+        worker.buffer.append(
+            actor=_actor(agent_id),
+            scope=MemoryScope.AGENT,
+            namespace=agent_id,
+            logs=[f"{agent_id}: " + "status " * 5],
+            now=now,
+        )
+    worker.run_once(now=now)
+    worker.buffer.append(
+        actor=_actor(),
+        scope=MemoryScope.AGENT,
+        namespace="root_sys1",
+        logs=["short"],
+        now=now + 1,
+    )
+
+    assert engine.batches == [2]
+    assert _long_term(store, "root_sys2")
+    assert worker.run_once(now=now + 2) == 0
+
+
+def test_reflection_lag_is_recorded(tmp_path) -> None:
+    metrics = MemoryMetrics()
+    _, _, _, worker = _worker(tmp_path, metrics=metrics)
+    worker.buffer.append(
+        actor=_actor(),
+        scope=MemoryScope.AGENT,
+        namespace="root_sys1",
+        logs=["user: hello"],
+        now=5000.0,
+    )
+
+    worker.run_once(now=5045.0)
+
+    assert metrics.reflection_count == 1
+    assert metrics.reflection_lag_seconds_last == 45.0
+    assert metrics.reflection_lag_seconds_max == 45.0
+
+
+def test_session_recorder_enqueues_instead_of_reflecting(tmp_path) -> None:
+    store, registry, engine, worker = _worker(tmp_path)
+    recorder = MemorySessionRecorder(
+        registry=registry,
+        reflection_service=worker.reflection,
+        config=MemorySessionConfig(compaction_threshold_chars=10),
+        reflection_worker=worker,
+    )
+
+    recorder.record(
+        actor=_actor(),
+        scope=MemoryScope.AGENT,
+        namespace="root_sys1",
+        logs=["user: " + "hello " * 10],
+    )
+
+    assert engine.batches == []
+    assert worker.buffer.pending_count() == 1
+    worker.run_once()
+    assert _long_term(store, "root_sys1")
+
+
+def test_build_memory_reflection_worker_reads_env(tmp_path, monkeypatch) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    registry = StaticScopeRegistry(store, store, store)
+    monkeypatch.setenv("MEMORY_REFLECTION_WORKER", "false")
+    assert (
+        build_memory_reflection_worker(
+            sqlite_path=str(tmp_path / "memory.db"), registry=registry
+        )
+        is None
+    )
+
+    monkeypatch.setenv("MEMORY_REFLECTION_WORKER", "true")
+    monkeypatch.setenv("MEMORY_COMPACTION_THRESHOLD_CHARS", "500")
+    worker = build_memory_reflection_worker(
+        sqlite_path=str(tmp_path / "memory.db"), registry=registry
+    )
+    assert worker is not None
+    worker.close()
+    assert worker.compaction_threshold_chars == 500
+    assert worker.buffer.path == tmp_path / "memory_reflection_buffer.db"
+
+
+def test_failing_namespace_does_not_duplicate_other_reflections(
+    tmp_path, monkeypatch
+) -> None:
+    store, _, engine, worker = _worker(tmp_path, compaction_threshold_chars=1)
+    for agent_id in ("root_sys1", "root_sys2"):
+        worker.buffer.append(
+            actor=_actor(agent_id),
+            scope=MemoryScope.AGENT,
+            namespace=agent_id,
+            logs=[f"{agent_id}: status"],
+            now=1000.0,
+        )
+    store_summary = worker.reflection.store_summary
+
+    def _fail_first(request, summary):
+        if request.namespace == "root_sys1":
+            raise RuntimeError("store unavailable")
+        return store_summary(request, summary)
+
+    monkeypatch.setattr(worker.reflection, "store_summary", _fail_first)
+    assert worker.run_once(now=1001.0) == 1
+    monkeypatch.setattr(worker.reflection, "store_summary", store_summary)
+    assert worker.run_once(now=1002.0) == 1
+
+    assert engine.batches == [2, 1]
+    assert _long_term(store, "root_sys1") == ["root_sys1: status"]
+    assert _long_term(store, "root_sys2") == ["root_sys2: status"]
+    assert worker.buffer.pending_count() == 0
@@ -0,0 +1,151 @@
+import time
+
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
+from src.cyberagent.memory.crud import (
+    MemoryActorContext,
+    MemoryCreateRequest,
+    MemoryCrudService,
+    MemoryDeleteRequest,
+)
+from src.cyberagent.memory.models import MemoryPriority, MemoryScope, MemorySource
+from src.cyberagent.memory.observability import MemoryMetrics
+from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.result_cache import (
+    MemoryNamespaceVersions,
+    MemoryResultCache,
+    build_memory_result_cache,
+)
+from src.cyberagent.memory.retrieval import MemoryRetrievalService
+from src.enums import SystemType
+
+
+class _CountingSqliteStore(SqliteMemoryStore):
+    def __init__(self, db_path) -> None:
+        super().__init__(db_path)
+        self.queries = 0
+
+    def query(self, query):  # type: ignore[override]
+        self.queries += 1
+        return super().query(query)
+
+    def query_targets(self, text, targets, **filters):  # type: ignore[override]
+        self.queries += 1
+        return super().query_targets(text, targets, **filters)
+
+
+def _actor() -> MemoryActorContext:
+    return MemoryActorContext(
+        agent_id="root_sys1",
+        system_id=1,
+        team_id=1,
+        system_type=SystemType.OPERATION,
+    )
+
+
+def _create(service: MemoryCrudService, content: str) -> str:
+    created = service.create_entries(
+        actor=_actor(),
+        requests=[
+            MemoryCreateRequest(
+                content=content,
+                namespace="root",
+                scope=MemoryScope.AGENT,
+                tags=None,
+                priority=MemoryPriority.MEDIUM,
+                source=MemorySource.MANUAL,
+                confidence=0.9,
+                expires_at=None,
+            )
+        ],
+    )
+    return created[0].id
+
+
+def _services(tmp_path, *, ttl_seconds: float = 30.0):
+    store = _CountingSqliteStore(tmp_path / "memory.db")
+    registry = StaticScopeRegistry(store, store, store)
+    versions = MemoryNamespaceVersions()
+    metrics = MemoryMetrics()
+    crud = MemoryCrudService(registry=registry, namespace_versions=versions)
+    retrieval = MemoryRetrievalService(
+        registry=registry,
+        metrics=metrics,
+        result_cache=MemoryResultCache(ttl_seconds=ttl_seconds, versions=versions),
+    )
+    return store, crud, retrieval, metrics
+
+
+def _search(retrieval: MemoryRetrievalService):
+    return retrieval.search_entries(
+        actor=_actor(),
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        query_text="deploy",
+        limit=5,
+    )
+
+
+def test_repeated_search_is_served_from_cache(tmp_path) -> None:
+    store, crud, retrieval, metrics = _services(tmp_path)
+    _create(crud, "deploy checklist")
+
+    first = _search(retrieval)
+    second = _search(retrieval)
+
+    assert [entry.id for entry in second.items] == [entry.id for entry in first.items]
+    assert store.queries == 1
+    assert metrics.result_cache_hit_count == 1
+    assert metrics.result_cache_miss_count == 1
+    assert metrics.result_cache_hit_rate == 0.5
+
+
+def test_crud_writes_invalidate_cached_namespace(tmp_path) -> None:
+    store, crud, retrieval, _ = _services(tmp_path)
+    first_id = _create(crud, "deploy checklist")
+    _search(retrieval)
+
+    second_id = _create(crud, "deploy runbook")
+    after_create = _search(retrieval)
+    crud.delete_entries(
+        actor=_actor(),
+        requests=[
+            MemoryDeleteRequest(
+                entry_id=first_id, namespace="root", scope=MemoryScope.AGENT
+            )
+        ],
+    )
+    after_delete = _search(retrieval)
+
+    assert {entry.id for entry in after_create.items} == {first_id, second_id}
+    assert [entry.id for entry in after_delete.items] == [second_id]
+    assert store.queries == 3
+
+
+def test_cached_search_targets_and_ttl_expiry(tmp_path) -> None:
+    store, crud, retrieval, _ = _services(tmp_path, ttl_seconds=0.05)
+    _create(crud, "deploy checklist")
+    targets = [(MemoryScope.AGENT, "root"), (MemoryScope.GLOBAL, "user")]
+
+    first = retrieval.search_targets(
+        actor=_actor(), targets=targets, query_text="deploy"
+    )
+    second = retrieval.search_targets(
+        actor=_actor(), targets=targets, query_text="deploy"
+    )
+    time.sleep(0.06)
+    retrieval.search_targets(actor=_actor(), targets=targets, query_text="deploy")
+
+    assert len(first.items) == 1
+    assert [entry.id for entry in second.items] == [first.items[0].id]
+    assert store.queries == 2
+
+
+def test_build_memory_result_cache_reads_env(monkeypatch) -> None:
+    monkeypatch.setenv("MEMORY_RESULT_CACHE_SIZE", "16")
+    monkeypatch.setenv("MEMORY_RESULT_CACHE_TTL_SECONDS", "5")
+    cache = build_memory_result_cache()
+
+    assert cache is not None
+    assert (cache.max_entries, cache.ttl_seconds) == (16, 5.0)
+    monkeypatch.setenv("MEMORY_RESULT_CACHE_SIZE", "0")
+    assert build_memory_result_cache() is None
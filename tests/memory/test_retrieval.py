@@ -1,3 +1,4 @@
+from dataclasses import replace
 from datetime import datetime, timezone
 
 from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
@@ -11,6 +12,7 @@ from src.cyberagent.memory.models import (
 )
 from src.cyberagent.memory.observability import MemoryAuditSink, MemoryMetrics
 from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory import retrieval as retrieval_module
 from src.cyberagent.memory.retrieval import (
     MemoryInjectionConfig,
     MemoryInjector,
@@ -132,3 +134,59 @@ def test_retrieval_logs_audit_events(tmp_path) -> None:
     ids = {event.resource_id for event in audit_sink.events}
     assert ids.issuperset({entry.id for entry in result.items})
     assert all(event.timestamp for event in audit_sink.events)
+
+
+def test_search_targets_fuses_scopes_and_skips_denied_targets(
+    tmp_path, monkeypatch
+) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    for index in range(3):
+        store.add(_entry(f"agent-{index}", f"alpha agent {index}"))
+        store.add(
+            replace(
+                _entry(f"team-{index}", f"alpha team {index}"),
+                scope=MemoryScope.TEAM,
+                namespace="team_1",
+            )
+        )
+        store.add(
+            replace(
+                _entry(f"global-{index}", f"alpha global {index}"),
+                scope=MemoryScope.GLOBAL,
+                namespace="user",
+            )
+        )
+    monkeypatch.setattr(
+        retrieval_module,
+        "check_memory_permission",
+        lambda *, scope, **_kwargs: scope != MemoryScope.TEAM,
+    )
+    metrics = MemoryMetrics()
+    audit_sink = _ListAuditSink()
+    service = MemoryRetrievalService(
+        registry=StaticScopeRegistry(store, store, store),
+        metrics=metrics,
+        audit_sink=audit_sink,
+    )
+
+    result = service.search_targets(
+        actor=_actor(),
+        targets=[
+            (MemoryScope.AGENT, "root"),
+            (MemoryScope.TEAM, "team_1"),
+            (MemoryScope.GLOBAL, "user"),
+        ],
+        query_text="alpha",
+        limit=2,
+    )
+
+    ids = [entry.id for entry in result.items]
+    assert len(ids) == 4
+    assert ids[0].startswith("agent-") and ids[1].startswith("global-")
+    assert not any(entry_id.startswith("team-") for entry_id in ids)
+    # Every target shares one store, so it is queried once.
+    assert metrics.query_count == 1
+    assert {event.scope for event in audit_sink.events} == {
+        MemoryScope.AGENT,
+        MemoryScope.GLOBAL,
+    }
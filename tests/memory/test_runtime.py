@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import importlib
+import re
+from pathlib import Path
+
+import pytest
+
+from src.cyberagent.memory import runtime as runtime_module
+from src.cyberagent.memory.runtime import (
+    get_memory_runtime,
+    reset_memory_runtime_cache,
+)
+
+
+def test_get_memory_runtime_reuses_registry_until_config_changes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("MEMORY_BACKEND", "chromadb")
+    monkeypatch.setenv("MEMORY_SQLITE_PATH", str(tmp_path / "a.db"))
+    built: list[object] = []
+    original = runtime_module.build_memory_registry
+
+    def _counting_build(config):  # type: ignore[no-untyped-def]
+        built.append(config)
+        return original(config)
+
+    monkeypatch.setattr(runtime_module, "build_memory_registry", _counting_build)
+
+    first = get_memory_runtime()
+    assert get_memory_runtime() is first
+    assert len(built) == 1
+
+    monkeypatch.setenv("MEMORY_SQLITE_PATH", str(tmp_path / "b.db"))
+    second = get_memory_runtime()
+    assert second is not first
+    assert second.config.sqlite_path == str(tmp_path / "b.db")
+
+    monkeypatch.setenv("MEMORY_METRICS_LOG", "true")
+    third = get_memory_runtime()
+    assert third is not second
+    assert third.metrics.reporter is not None
+
+    reset_memory_runtime_cache()
+    assert get_memory_runtime() is not third
+    assert len(built) == 4
+
+
+def test_memory_runtime_crud_service_shares_metrics(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MEMORY_BACKEND", "list")
+    runtime = get_memory_runtime()
+
+    service = runtime.crud_service()
+
+    assert service._registry is runtime.registry
+    assert service._metrics is runtime.metrics
+    assert service._audit_sink is runtime.audit_sink
+
+
+def test_reset_memory_runtime_closes_write_behind_vector_index(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    pytest.importorskip("numpy")
+    from src.cyberagent.memory.backends.write_behind import WriteBehindVectorIndex
+
+    monkeypatch.setenv("MEMORY_BACKEND", "chromadb")
+    monkeypatch.setenv("MEMORY_SQLITE_PATH", str(tmp_path / "memory.db"))
+    monkeypatch.setenv("MEMORY_VECTOR_BACKEND", "local")
+    monkeypatch.setenv("MEMORY_VECTOR_PATH", str(tmp_path / "vectors"))
+    reset_memory_runtime_cache()
+    store = get_memory_runtime().registry.agent_store
+    index = getattr(store, "vector_index")
+    assert isinstance(index, WriteBehindVectorIndex)
+    thread = index._thread
+    assert thread is not None and thread.is_alive()
+
+    reset_memory_runtime_cache()
+
+    assert not thread.is_alive()
+
+
+@pytest.mark.parametrize(
+    "module_name, env_keys",
+    [
+        ("observability", "METRICS_ENV_KEYS"),
+        ("result_cache", "RESULT_CACHE_ENV_KEYS"),
+        ("sweeper", "SWEEPER_ENV_KEYS"),
+        ("reflection_worker", "REFLECTION_WORKER_ENV_KEYS"),
+        ("audit_buffer", "AUDIT_SINK_ENV_KEYS"),
+    ],
+)
+def test_runtime_cache_key_covers_every_component_env_var(
+    module_name: str, env_keys: str
+) -> None:
+    module = importlib.import_module(f"src.cyberagent.memory.{module_name}")
+    source = Path(module.__file__ or "").read_text(encoding="utf-8")
+    read = set(re.findall(r'"(MEMORY_[A-Z_]+)"', source))
+
+    assert read == set(getattr(module, env_keys))
+    assert read <= set(runtime_module._RUNTIME_ENV_KEYS)
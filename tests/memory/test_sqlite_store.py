@@ -1,5 +1,8 @@
+import sqlite3
 from datetime import datetime, timezone
 
+import pytest
+
 from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
 from src.cyberagent.memory.models import (
     MemoryEntry,
@@ -78,6 +81,62 @@ def test_sqlite_store_list_pagination(tmp_path) -> None:
     assert page2.next_cursor is None
 
 
+def test_sqlite_store_list_keyset_cursor_survives_deletes(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    for index in range(5):
+        store.add(_entry(f"mem-{index}", f"entry {index}"))
+
+    page1 = store.list(MemoryScope.AGENT, "root", limit=2, cursor=None)
+    assert page1.next_cursor is not None
+    assert page1.next_cursor.startswith("key:")
+    for entry in page1.items:
+        store.delete(entry.id, MemoryScope.AGENT, "root")
+
+    page2 = store.list(MemoryScope.AGENT, "root", limit=2, cursor=page1.next_cursor)
+    assert [entry.id for entry in page2.items] == ["mem-2", "mem-3"]
+
+
+def test_sqlite_store_list_accepts_offset_cursor(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    for index in range(3):
+        store.add(_entry(f"mem-{index}", f"entry {index}"))
+
+    page = store.list(MemoryScope.AGENT, "root", limit=1, cursor="offset:1")
+
+    assert [entry.id for entry in page.items] == ["mem-1"]
+    assert page.next_cursor is not None
+    assert page.next_cursor.startswith("key:")
+    last = store.list(MemoryScope.AGENT, "root", limit=5, cursor=page.next_cursor)
+    assert [entry.id for entry in last.items] == ["mem-2"]
+
+
+def test_sqlite_store_list_rejects_malformed_keyset_cursor(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+
+    with pytest.raises(ValueError):
+        store.list(MemoryScope.AGENT, "root", limit=1, cursor="key:missing-id")
+
+
+def test_sqlite_store_keyset_page_seeks_index(tmp_path) -> None:
+    SqliteMemoryStore(tmp_path / "memory.db")
+    with sqlite3.connect(tmp_path / "memory.db") as connection:
+        plan = connection.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT m.* FROM memory_entries AS m
+            WHERE m.scope = ? AND m.namespace = ?
+            AND (m.created_at, m.id) > (?, ?)
+            ORDER BY m.created_at ASC, m.id ASC
+            LIMIT 10
+            """,
+            ("agent", "root", "2026-01-01", "mem-1"),
+        ).fetchall()
+
+    details = " ".join(str(row[-1]) for row in plan)
+    assert "idx_memory_scope_namespace_created" in details
+    assert "TEMP B-TREE" not in details
+
+
 def test_sqlite_store_query_filters(tmp_path) -> None:
     store = SqliteMemoryStore(tmp_path / "memory.db")
     store.add(_entry("mem-1", "alpha beta gamma", tags=["alpha"]))
@@ -109,3 +168,126 @@ def test_sqlite_store_falls_back_when_db_path_is_unopenable(
     expected_fallback = tmp_path / "data" / "memory.db"
     assert store.db_path == expected_fallback
     assert expected_fallback.exists()
+
+
+def _text_query(text: str, **kwargs: object) -> MemoryQuery:
+    return MemoryQuery(
+        text=text,
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        limit=10,
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def test_sqlite_store_query_ranks_with_fts(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    assert store.fts_enabled
+    store.add(_entry("mem-1", "deploy notes mention the budget once"))
+    store.add(_entry("mem-2", "budget budget budget review for the budget"))
+    store.add(_entry("mem-3", "unrelated entry"))
+
+    result = store.query(_text_query('budget "OR *'))
+
+    assert [entry.id for entry in result.items] == ["mem-2", "mem-1"]
+    assert "budget" in result.snippets["mem-1"]
+
+
+def test_sqlite_store_fts_index_follows_updates_and_deletes(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    entry = store.add(_entry("mem-1", "alpha", tags=["note"]))
+    store.add(_entry("mem-2", "alpha too", tags=["note"]))
+
+    entry.content = "omega"
+    store.update(entry)
+    store.delete("mem-2", MemoryScope.AGENT, "root")
+
+    assert store.query(_text_query("alpha")).items == []
+    assert [item.id for item in store.query(_text_query("omega")).items] == ["mem-1"]
+
+
+def test_sqlite_store_backfills_fts_for_existing_database(tmp_path) -> None:
+    db_path = tmp_path / "memory.db"
+    store = SqliteMemoryStore(db_path)
+    store.add(_entry("mem-1", "legacy content", tags=["history"]))
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("DROP TABLE memory_entries_fts")
+
+    reopened = SqliteMemoryStore(db_path)
+
+    result = reopened.query(_text_query("history", tags=["history"]))
+    assert [item.id for item in result.items] == ["mem-1"]
+
+
+def test_sqlite_store_query_falls_back_without_fts(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    store.fts_enabled = False
+    store.add(_entry("mem-1", "alpha beta gamma"))
+    store.add(_entry("mem-2", "delta", tags=["note"]))
+
+    result = store.query(_text_query("alpha"))
+
+    assert [item.id for item in result.items] == ["mem-1"]
+    assert result.snippets == {}
+
+
+def test_sqlite_store_query_filters_tags_owner_and_layer_in_sql(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    store.add(_entry("mem-1", "profile", tags=["user_profile", "onboarding"]))
+    store.add(_entry("mem-2", "profile draft", tags=["onboarding"]))
+    other_owner = _entry("mem-3", "profile", tags=["user_profile"])
+    other_owner.owner_agent_id = "root_sys4"
+    store.add(other_owner)
+
+    result = store.query(
+        MemoryQuery(
+            text=None,
+            scope=MemoryScope.AGENT,
+            namespace="root",
+            limit=10,
+            layer=MemoryLayer.SESSION,
+            tags=["user_profile", "onboarding"],
+            owner_agent_id="root_sys1",
+        )
+    )
+
+    assert [entry.id for entry in result.items] == ["mem-1"]
+    with sqlite3.connect(tmp_path / "memory.db") as connection:
+        plan = " ".join(
+            str(row[-1])
+            for row in connection.execute(
+                "EXPLAIN QUERY PLAN SELECT entry_id FROM memory_entry_tags "
+                "WHERE tag = ?",
+                ("user_profile",),
+            )
+        )
+    assert "SCAN" not in plan
+
+
+def test_sqlite_store_tag_table_tracks_updates_and_backfills(tmp_path) -> None:
+    db_path = tmp_path / "memory.db"
+    store = SqliteMemoryStore(db_path)
+    entry = store.add(_entry("mem-1", "content", tags=["old"]))
+    entry.tags = ["new"]
+    store.update(entry)
+    store.add(_entry("mem-2", "content", tags=["new"]))
+    store.delete("mem-2", MemoryScope.AGENT, "root")
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute(
+            "SELECT tag, entry_id FROM memory_entry_tags ORDER BY tag"
+        ).fetchall()
+        connection.execute("DROP TABLE memory_entry_tags")
+    assert rows == [("new", "mem-1")]
+
+    reopened = SqliteMemoryStore(db_path)
+
+    listed = reopened.query(
+        MemoryQuery(
+            text=None,
+            scope=MemoryScope.AGENT,
+            namespace="root",
+            limit=10,
+            tags=["new"],
+        )
+    )
+    assert [item.id for item in listed.items] == ["mem-1"]
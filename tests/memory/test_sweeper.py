@@ -0,0 +1,119 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from src.cyberagent.memory.backends.hybrid import HybridMemoryStore
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
+from src.cyberagent.memory.models import (
+    MemoryEntry,
+    MemoryPriority,
+    MemoryScope,
+    MemorySource,
+)
+from src.cyberagent.memory.registry import StaticScopeRegistry
+from src.cyberagent.memory.result_cache import MemoryNamespaceVersions
+from src.cyberagent.memory.sweeper import (
+    MemoryExpirySweeper,
+    build_memory_expiry_sweeper,
+)
+
+
+@dataclass
+class _RecordingVectorIndex:
+    deleted: list[str] = field(default_factory=list)
+
+    def upsert(self, entry: MemoryEntry) -> None:
+        return None
+
+    def delete(self, entry_id: str) -> None:
+        self.deleted.append(entry_id)
+
+    def query(self, text: str, limit: int) -> list[str]:
+        return []
+
+
+def _entry(
+    entry_id: str, scope: MemoryScope, namespace: str, *, expires_in: float | None
+) -> MemoryEntry:
+    now = datetime.now(timezone.utc)
+    return MemoryEntry(
+        id=entry_id,
+        scope=scope,
+        namespace=namespace,
+        owner_agent_id="root_sys4",
+        content=f"content {entry_id}",
+        priority=MemoryPriority.MEDIUM,
+        created_at=now,
+        updated_at=now,
+        expires_at=(
+            None if expires_in is None else now + timedelta(minutes=expires_in)
+        ),
+        source=MemorySource.MANUAL,
+        confidence=0.7,
+    )
+
+
+def _seed(store) -> None:  # type: ignore[no-untyped-def]
+    for index in range(5):
+        store.add(_entry(f"team-{index}", MemoryScope.TEAM, "team_1", expires_in=-5))
+    store.add(_entry("global-old", MemoryScope.GLOBAL, "user", expires_in=-1))
+    store.add(_entry("global-live", MemoryScope.GLOBAL, "user", expires_in=60))
+    store.add(_entry("agent-forever", MemoryScope.AGENT, "root", expires_in=None))
+
+
+def test_sweeper_reclaims_expired_entries_in_bounded_batches(tmp_path, caplog) -> None:
+    vectors = _RecordingVectorIndex()
+    store = HybridMemoryStore(SqliteMemoryStore(tmp_path / "memory.db"), vectors)
+    _seed(store)
+    versions = MemoryNamespaceVersions()
+    sweeper = MemoryExpirySweeper(
+        stores=[store],
+        batch_size=2,
+        max_batches_per_sweep=2,
+        batch_pause_seconds=0.0,
+        namespace_versions=versions,
+    )
+
+    with caplog.at_level(logging.INFO, logger="src.cyberagent.memory.sweeper"):
+        first = sweeper.sweep_once()
+    second = sweeper.sweep_once()
+
+    assert (first, second) == (4, 2)
+    assert sweeper.reclaimed_total == 6
+    assert sorted(vectors.deleted) == sorted(
+        [f"team-{index}" for index in range(5)] + ["global-old"]
+    )
+    assert store.get("global-live", MemoryScope.GLOBAL, "user") is not None
+    assert store.get("agent-forever", MemoryScope.AGENT, "root") is not None
+    assert versions.current(MemoryScope.TEAM, "team_1") >= 1
+    assert "reclaimed 4 entries" in caplog.text
+
+
+def test_delete_expired_reads_the_expiry_index(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    connection = store._connect()
+    plan = " ".join(
+        str(row["detail"])
+        for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM memory_entries "
+            "WHERE expires_at IS NOT NULL AND expires_at <= ? "
+            "ORDER BY expires_at LIMIT 10",
+            ("2026-01-01T00:00:00+00:00",),
+        )
+    )
+    connection.close()
+
+    assert "idx_memory_expires_at" in plan
+
+
+def test_build_memory_expiry_sweeper_dedupes_stores(tmp_path, monkeypatch) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    monkeypatch.setenv("MEMORY_EXPIRY_SWEEP_INTERVAL_SECONDS", "3600")
+
+    sweeper = build_memory_expiry_sweeper(StaticScopeRegistry(store, store, store))
+
+    assert sweeper is not None
+    assert list(sweeper.stores) == [store]
+    sweeper.close()
+    monkeypatch.setenv("MEMORY_EXPIRY_SWEEP_INTERVAL_SECONDS", "0")
+    assert build_memory_expiry_sweeper(StaticScopeRegistry(store, store, store)) is None
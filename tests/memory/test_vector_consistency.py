@@ -0,0 +1,105 @@
+import argparse
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.cyberagent.cli import dev as dev_cli  # noqa: E402
+from src.cyberagent.memory.backends.hybrid import HybridMemoryStore  # noqa: E402
+from src.cyberagent.memory.backends.local_vector import (  # noqa: E402
+    LocalVectorIndex,
+)
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore  # noqa: E402
+from src.cyberagent.memory.backends.vector_index import (  # noqa: E402
+    NoopVectorIndex,
+)
+from src.cyberagent.memory.backends.write_behind import (  # noqa: E402
+    WriteBehindVectorIndex,
+)
+from src.cyberagent.memory.models import (  # noqa: E402
+    MemoryEntry,
+    MemoryPriority,
+    MemoryScope,
+    MemorySource,
+)
+from src.cyberagent.memory.vector_consistency import (  # noqa: E402
+    check_vector_consistency,
+)
+
+
+def _entry(entry_id: str, content: str) -> MemoryEntry:
+    now = datetime.now(timezone.utc)
+    return MemoryEntry(
+        id=entry_id,
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        owner_agent_id="root_sys1",
+        content=content,
+        priority=MemoryPriority.MEDIUM,
+        created_at=now,
+        updated_at=now,
+        source=MemorySource.MANUAL,
+        confidence=0.9,
+    )
+
+
+def _drifted_store(tmp_path) -> tuple[HybridMemoryStore, LocalVectorIndex]:
+    records = SqliteMemoryStore(tmp_path / "memory.db")
+    vectors = LocalVectorIndex(tmp_path / "vectors")
+    store = HybridMemoryStore(records, WriteBehindVectorIndex(vectors, source=records))
+    store.add(_entry("mem-1", "indexed normally"))
+    records.add(_entry("mem-2", "never reached the index"))
+    vectors.upsert(_entry("mem-ghost", "deleted while the worker was down"))
+    return store, vectors
+
+
+def test_check_vector_consistency_reports_and_repairs(tmp_path) -> None:
+    store, vectors = _drifted_store(tmp_path)
+
+    report = check_vector_consistency(store)
+
+    assert report.supported is True
+    assert report.missing == ["mem-2"]
+    assert report.orphaned == ["mem-ghost"]
+    assert report.consistent is False
+
+    repaired = check_vector_consistency(store, repair=True)
+
+    assert repaired.repaired is True
+    assert vectors.indexed_ids() == {"mem-1", "mem-2"}
+    assert check_vector_consistency(store).consistent is True
+
+
+def test_check_vector_consistency_unsupported_for_noop_index(tmp_path) -> None:
+    store = HybridMemoryStore(
+        SqliteMemoryStore(tmp_path / "memory.db"), NoopVectorIndex()
+    )
+
+    assert check_vector_consistency(store).supported is False
+
+
+def test_dev_memory_check_prints_json_and_exit_code(tmp_path, capsys) -> None:
+    store, _ = _drifted_store(tmp_path)
+    runtime = SimpleNamespace(registry=SimpleNamespace(resolve=lambda scope: store))
+    args = argparse.Namespace(repair=False, json=True)
+
+    exit_code = dev_cli.handle_memory_check(
+        args, get_memory_runtime=lambda: runtime  # type: ignore[arg-type]
+    )
+
+    payload = json.loads(capsys.readouterr().out)
+    assert exit_code == 1
+    assert payload["missing"] == ["mem-2"]
+    assert payload["orphaned"] == ["mem-ghost"]
+
+    args = argparse.Namespace(repair=True, json=False)
+    assert (
+        dev_cli.handle_memory_check(
+            args, get_memory_runtime=lambda: runtime  # type: ignore[arg-type]
+        )
+        == 0
+    )
+    assert "missing from index: 1" in capsys.readouterr().out
@@ -108,6 +108,8 @@ def test_vector_backend_enables_semantic_recall(monkeypatch, tmp_path) -> None:
     registry = build_memory_registry(load_memory_backend_config())
     store = registry.resolve(MemoryScope.AGENT)
     store.add(_entry("mem-1", "unrelated content"))
+    # Vector upserts are write-behind; wait for the batch to land.
+    assert getattr(store, "vector_index").flush(timeout=5.0) is True
 
     actor = MemoryActorContext(
         agent_id="root_sys1",
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+import pytest
+
+from src.cyberagent.memory.backends import write_behind
+from src.cyberagent.memory.backends.sqlite import SqliteMemoryStore
+from src.cyberagent.memory.backends.write_behind import (
+    VECTOR_CHECKPOINT_KEY,
+    WriteBehindVectorIndex,
+)
+from src.cyberagent.memory.models import (
+    MemoryEntry,
+    MemoryPriority,
+    MemoryScope,
+    MemorySource,
+)
+
+_BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class _RecordingIndex:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+        self.contents: dict[str, str] = {}
+        self.deleted: list[str] = []
+
+    def upsert(self, entry: MemoryEntry) -> None:
+        self.upsert_many([entry])
+
+    def upsert_many(self, entries: Sequence[MemoryEntry]) -> None:
+        self.batches.append([entry.id for entry in entries])
+        for entry in entries:
+            self.contents[entry.id] = entry.content
+
+    def delete(self, entry_id: str) -> None:
+        self.deleted.append(entry_id)
+        self.contents.pop(entry_id, None)
+
+    def query(self, text: str, limit: int) -> list[str]:
+        return list(self.contents)[:limit]
+
+
+class _RejectingIndex(_RecordingIndex):
+    def __init__(self, rejected: str) -> None:
+        super().__init__()
+        self.rejected = rejected
+        self.rejections = 0
+
+    def upsert_many(self, entries: Sequence[MemoryEntry]) -> None:
+        if any(entry.id == self.rejected for entry in entries):
+            self.rejections += 1
+            raise ValueError("embedder rejected entry")
+        super().upsert_many(entries)
+
+
+def _entry(entry_id: str, content: str, *, minutes: int = 0) -> MemoryEntry:
+    stamp = _BASE_TIME + timedelta(minutes=minutes)
+    return MemoryEntry(
+        id=entry_id,
+        scope=MemoryScope.AGENT,
+        namespace="root",
+        owner_agent_id="root_sys1",
+        content=content,
+        priority=MemoryPriority.MEDIUM,
+        created_at=stamp,
+        updated_at=stamp,
+        source=MemorySource.MANUAL,
+        confidence=0.9,
+    )
+
+
+def test_write_behind_batches_and_keeps_latest_update() -> None:
+    inner = _RecordingIndex()
+    index = WriteBehindVectorIndex(inner, flush_interval_seconds=5.0)
+
+    index.upsert(_entry("mem-1", "first"))
+    index.upsert(_entry("mem-2", "second"))
+    index.upsert(_entry("mem-1", "first, edited"))
+    assert index.flush(timeout=5.0) is True
+    index.close()
+
+    assert inner.batches == [["mem-2", "mem-1"]]
+    assert inner.contents == {"mem-2": "second", "mem-1": "first, edited"}
+
+
+def test_write_behind_delete_supersedes_pending_upsert() -> None:
+    inner = _RecordingIndex()
+    index = WriteBehindVectorIndex(inner, flush_interval_seconds=5.0)
+
+    index.upsert(_entry("mem-1", "doomed"))
+    index.delete("mem-1")
+    index.flush(timeout=5.0)
+    index.close()
+
+    assert inner.batches == []
+    assert inner.deleted == ["mem-1"]
+
+
+def test_write_behind_flushes_full_batches_without_waiting() -> None:
+    inner = _RecordingIndex()
+    index = WriteBehindVectorIndex(inner, batch_size=2, flush_interval_seconds=60.0)
+
+    index.upsert_many([_entry(f"mem-{i}", f"entry {i}") for i in range(4)])
+    assert index.flush(timeout=5.0) is True
+    index.close()
+
+    assert inner.batches == [["mem-0", "mem-1"], ["mem-2", "mem-3"]]
+
+
+def test_write_behind_first_start_checkpoints_without_replay(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    store.add(_entry("mem-1", "indexed inline", minutes=1))
+    inner = _RecordingIndex()
+
+    index = WriteBehindVectorIndex(inner, source=store)
+    index.flush(timeout=5.0)
+    index.close()
+
+    assert inner.batches == []
+    assert (
+        store.get_meta(VECTOR_CHECKPOINT_KEY)
+        == _entry("mem-1", "", minutes=1).updated_at.isoformat()
+    )
+
+
+def test_write_behind_replays_rows_after_checkpoint(tmp_path) -> None:
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    store.add(_entry("mem-old", "already indexed", minutes=1))
+    store.add(_entry("mem-new", "lost in a crash", minutes=5))
+    store.set_meta(
+        VECTOR_CHECKPOINT_KEY, (_BASE_TIME + timedelta(minutes=2)).isoformat()
+    )
+    inner = _RecordingIndex()
+
+    index = WriteBehindVectorIndex(inner, source=store)
+    index.upsert(_entry("mem-live", "written after start", minutes=9))
+    assert index.flush(timeout=5.0) is True
+    index.close()
+
+    assert "mem-old" not in inner.contents
+    assert set(inner.contents) == {"mem-new", "mem-live"}
+    assert store.get_meta(VECTOR_CHECKPOINT_KEY) == (
+        (_BASE_TIME + timedelta(minutes=9)).isoformat()
+    )
+
+
+def test_write_behind_drops_an_entry_that_keeps_failing(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setattr(write_behind, "_RETRY_DELAY_SECONDS", 0.0)
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    inner = _RejectingIndex("mem-bad")
+
+    index = WriteBehindVectorIndex(inner, source=store, flush_interval_seconds=5.0)
+    index.upsert(_entry("mem-1", "before", minutes=1))
+    index.upsert(_entry("mem-bad", "unembeddable", minutes=2))
+    index.upsert(_entry("mem-2", "after", minutes=3))
+    assert index.flush(timeout=5.0) is True
+    index.upsert(_entry("mem-3", "later", minutes=4))
+    assert index.flush(timeout=5.0) is True
+    index.close()
+
+    assert set(inner.contents) == {"mem-1", "mem-2", "mem-3"}
+    # One batch attempt plus the single-entry retries.
+    assert inner.rejections == 1 + write_behind._MAX_ATTEMPTS
+    assert store.get_meta(VECTOR_CHECKPOINT_KEY) == (
+        (_BASE_TIME + timedelta(minutes=4)).isoformat()
+    )
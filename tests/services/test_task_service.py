@@ -118,11 +118,12 @@ def test_store_task_result_in_team_memory_creates_team_entry(
         "get_system_by_type",
         lambda team_id, system_type: _ControlSystem(),
     )
-    monkeypatch.setattr(task_service, "load_memory_backend_config", lambda: object())
-    monkeypatch.setattr(task_service, "build_memory_registry", lambda _config: object())
-    monkeypatch.setattr(task_service, "build_memory_metrics", lambda: object())
-    monkeypatch.setattr(task_service, "LoggingMemoryAuditSink", lambda: object())
-    monkeypatch.setattr(task_service, "MemoryCrudService", _FakeMemoryService)
+
+    class _FakeRuntime:
+        def crud_service(self) -> _FakeMemoryService:
+            return _FakeMemoryService()
+
+    monkeypatch.setattr(task_service, "get_memory_runtime", _FakeRuntime)
 
     task = Task(
         team_id=1,